@@ -0,0 +1,310 @@
+"""
+analytics_rollup.py
+-------------------
+Incrementally maintained rollup tables behind the admin dashboard, so the
+analytics endpoints stop aggregating the full scan/session history per page load.
+
+    TBL_SCAN_DAILY_ROLLUP   one row per day x card x actual category x predicted category
+                            (counts, correct counts, confidence and latency sums)
+    TBL_STUDENT_ROLLUP      one row per nickname x mode, completed sessions only
+                            (active sessions are few and read live)
+
+Maintenance:
+- scan rows: ScanLogWriter upserts the batch's per-group deltas in the same
+  transaction as the INSERT (build_scan_rollup_upsert);
+- sessions: /session/end folds the completed session in (add_completed_session);
+  scans of an already completed session (a write-behind row that landed after
+  that snapshot) are folded in by ScanLogWriter in the batch's transaction
+  (fold_late_scans);
+- deleting a student: forget_student + rebuild_scan_rollup_days;
+- backfill / repair (maintenance only, rewrites whole tables):
+      python analytics_rollup.py --rebuild  (or --reconcile for students only)
+
+Raw history is read through vw_scan_history, so archived scans (scan_archive.py)
+are still counted on rebuilds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import date, timedelta
+
+DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '',
+    'database': 'ecolearn_db'
+}
+
+# Portable DDL (valid for MySQL and SQLite); also in both schema files.
+ROLLUP_TABLES_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS TBL_SCAN_DAILY_ROLLUP (
+        rollup_date DATE NOT NULL,
+        card_id INT NOT NULL,
+        actual_category_id INT NOT NULL,
+        predicted_category_id INT NOT NULL,
+        scan_count INT NOT NULL DEFAULT 0,
+        correct_count INT NOT NULL DEFAULT 0,
+        confidence_sum DECIMAL(14,4) NOT NULL DEFAULT 0,
+        confidence_count INT NOT NULL DEFAULT 0,
+        response_time_sum BIGINT NOT NULL DEFAULT 0,
+        response_time_count INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (rollup_date, card_id, actual_category_id, predicted_category_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS TBL_STUDENT_ROLLUP (
+        student_nickname VARCHAR(50) NOT NULL,
+        session_mode VARCHAR(20) NOT NULL,
+        completed_sessions INT NOT NULL DEFAULT 0,
+        total_scans INT NOT NULL DEFAULT 0,
+        correct_scans INT NOT NULL DEFAULT 0,
+        accuracy_sum DECIMAL(12,2) NOT NULL DEFAULT 0,
+        best_accuracy DECIMAL(5,2) NULL,
+        last_start_time TIMESTAMP NULL,
+        last_end_time TIMESTAMP NULL,
+        PRIMARY KEY (student_nickname, session_mode)
+    )
+    """,
+)
+
+SCAN_ROLLUP_UPSERT_SQL = """
+    INSERT INTO TBL_SCAN_DAILY_ROLLUP
+    (rollup_date, card_id, actual_category_id, predicted_category_id,
+     scan_count, correct_count, confidence_sum, confidence_count,
+     response_time_sum, response_time_count)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        scan_count = scan_count + VALUES(scan_count),
+        correct_count = correct_count + VALUES(correct_count),
+        confidence_sum = confidence_sum + VALUES(confidence_sum),
+        confidence_count = confidence_count + VALUES(confidence_count),
+        response_time_sum = response_time_sum + VALUES(response_time_sum),
+        response_time_count = response_time_count + VALUES(response_time_count)
+"""
+
+SCAN_ROLLUP_SELECT_SQL = """
+    SELECT DATE(scan_timestamp), card_id, actual_category_id, predicted_category_id,
+           COUNT(*), COALESCE(SUM(is_correct), 0),
+           COALESCE(SUM(confidence_score), 0), COUNT(confidence_score),
+           COALESCE(SUM(response_time), 0), COUNT(response_time)
+    FROM vw_scan_history
+"""
+SCAN_ROLLUP_GROUP_BY = " GROUP BY DATE(scan_timestamp), card_id, actual_category_id, predicted_category_id"
+SCAN_ROLLUP_COLUMNS = """
+    (rollup_date, card_id, actual_category_id, predicted_category_id,
+     scan_count, correct_count, confidence_sum, confidence_count,
+     response_time_sum, response_time_count)
+"""
+
+STUDENT_ROLLUP_COLUMNS = """
+    (student_nickname, session_mode, completed_sessions, total_scans, correct_scans,
+     accuracy_sum, best_accuracy, last_start_time, last_end_time)
+"""
+STUDENT_ROLLUP_SELECT_SQL = """
+    SELECT student_nickname, session_mode, COUNT(*),
+           COALESCE(SUM(total_scans), 0), COALESCE(SUM(correct_scans), 0),
+           COALESCE(SUM(accuracy_percentage), 0), MAX(accuracy_percentage),
+           MAX(start_time), MAX(end_time)
+    FROM TBL_SESSIONS
+    WHERE session_status = 'completed' AND session_mode IS NOT NULL
+"""
+
+ADD_COMPLETED_SESSION_SQL = f"""
+    INSERT INTO TBL_STUDENT_ROLLUP {STUDENT_ROLLUP_COLUMNS}
+    SELECT student_nickname, session_mode, 1, total_scans, correct_scans,
+           COALESCE(accuracy_percentage, 0), accuracy_percentage, start_time, end_time
+    FROM TBL_SESSIONS
+    WHERE session_id = %s AND session_status = 'completed' AND session_mode IS NOT NULL
+    ON DUPLICATE KEY UPDATE
+        completed_sessions = completed_sessions + VALUES(completed_sessions),
+        total_scans = total_scans + VALUES(total_scans),
+        correct_scans = correct_scans + VALUES(correct_scans),
+        accuracy_sum = accuracy_sum + VALUES(accuracy_sum),
+        best_accuracy = GREATEST(COALESCE(best_accuracy, 0), COALESCE(VALUES(best_accuracy), 0)),
+        last_start_time = GREATEST(COALESCE(last_start_time, VALUES(last_start_time)), VALUES(last_start_time)),
+        last_end_time = GREATEST(COALESCE(last_end_time, VALUES(last_end_time)), VALUES(last_end_time))
+"""
+
+
+def ensure_rollup_tables(cursor) -> bool:
+    """Create missing rollup tables. Returns True when raw history exists but the rollups are empty."""
+    for ddl in ROLLUP_TABLES_DDL:
+        cursor.execute(ddl)
+
+    def has_rows(sql):
+        cursor.execute(sql)
+        return cursor.fetchone() is not None
+
+    scans_missing = (
+        has_rows("SELECT 1 FROM vw_scan_history LIMIT 1")
+        and not has_rows("SELECT 1 FROM TBL_SCAN_DAILY_ROLLUP LIMIT 1")
+    )
+    students_missing = (
+        has_rows("SELECT 1 FROM TBL_SESSIONS WHERE session_status = 'completed' LIMIT 1")
+        and not has_rows("SELECT 1 FROM TBL_STUDENT_ROLLUP LIMIT 1")
+    )
+    return scans_missing or students_missing
+
+
+def build_scan_rollup_upsert(rows) -> list[tuple]:
+    """Per-group deltas for a batch of scan_log_writer.ScanRow, as SCAN_ROLLUP_UPSERT_SQL params."""
+    groups: dict[tuple, list] = {}
+    for row in rows:
+        key = (row.scan_timestamp.date(), row.card_id, row.actual_category_id, row.predicted_category_id)
+        g = groups.setdefault(key, [0, 0, 0.0, 0, 0, 0])
+        g[0] += 1
+        g[1] += 1 if row.predicted_category_id == row.actual_category_id else 0
+        if row.confidence_score is not None:
+            g[2] += float(row.confidence_score)
+            g[3] += 1
+        if row.response_time is not None:
+            g[4] += int(row.response_time)
+            g[5] += 1
+    return [key + (g[0], g[1], round(g[2], 4), g[3], g[4], g[5]) for key, g in groups.items()]
+
+
+def add_completed_session(cursor, session_id: int) -> None:
+    """Fold one just-completed session into TBL_STUDENT_ROLLUP (same transaction as the status change)."""
+    cursor.execute(ADD_COMPLETED_SESSION_SQL, (session_id,))
+
+
+def fold_late_scans(cursor, rows) -> None:
+    """Add a scan batch's deltas to the student rollup for sessions that already completed.
+
+    Runs after the batch's TBL_SESSIONS counter update, in the same transaction: the
+    rows read here are the updated ones, so a session completed by a concurrent
+    /session/end is either already in its snapshot (status still active here) or
+    gets these deltas (status completed here), never both.
+    """
+    deltas: dict[int, list] = {}
+    for row in rows:
+        d = deltas.setdefault(row.session_id, [0, 0])
+        d[0] += 1
+        d[1] += 1 if row.predicted_category_id == row.actual_category_id else 0
+    if not deltas:
+        return
+
+    placeholders = ','.join(['%s'] * len(deltas))
+    cursor.execute(f"""
+        SELECT session_id, student_nickname, session_mode, total_scans, correct_scans, accuracy_percentage
+        FROM TBL_SESSIONS
+        WHERE session_id IN ({placeholders}) AND session_status = 'completed' AND session_mode IS NOT NULL
+    """, tuple(deltas))
+    groups: dict[tuple, list] = {}
+    for session_id, nickname, mode, total, correct, accuracy in cursor.fetchall():
+        scans, correct_delta = deltas[int(session_id)]
+        old_total, old_correct = int(total or 0) - scans, int(correct or 0) - correct_delta
+        old_accuracy = round(old_correct * 100.0 / old_total, 2) if old_total > 0 else 0.0
+        g = groups.setdefault((nickname, mode), [0, 0, 0.0])
+        g[0] += scans
+        g[1] += correct_delta
+        g[2] += float(accuracy or 0) - old_accuracy
+    for (nickname, mode), (scans, correct, accuracy_delta) in groups.items():
+        # A late wrong answer can lower the best session, so best_accuracy is re-read
+        # from this student's own sessions rather than only raised.
+        cursor.execute("""
+            UPDATE TBL_STUDENT_ROLLUP
+            SET total_scans = total_scans + %s,
+                correct_scans = correct_scans + %s,
+                accuracy_sum = accuracy_sum + %s,
+                best_accuracy = (
+                    SELECT MAX(accuracy_percentage) FROM TBL_SESSIONS
+                    WHERE student_nickname = %s AND session_mode = %s AND session_status = 'completed'
+                )
+            WHERE student_nickname = %s AND session_mode = %s
+        """, (scans, correct, round(accuracy_delta, 2), nickname, mode, nickname, mode))
+
+
+def forget_student(cursor, nickname: str) -> None:
+    cursor.execute("DELETE FROM TBL_STUDENT_ROLLUP WHERE student_nickname = %s", (nickname,))
+
+
+def rebuild_scan_rollup_days(cursor, days) -> None:
+    """Recompute the scan rollup for the given dates from raw transactions (after deletes)."""
+    for day in sorted(set(days)):
+        start, end = day, day + timedelta(days=1)
+        cursor.execute("DELETE FROM TBL_SCAN_DAILY_ROLLUP WHERE rollup_date = %s", (day,))
+        cursor.execute(
+            f"INSERT INTO TBL_SCAN_DAILY_ROLLUP {SCAN_ROLLUP_COLUMNS} {SCAN_ROLLUP_SELECT_SQL}"
+            f" WHERE scan_timestamp >= %s AND scan_timestamp < %s {SCAN_ROLLUP_GROUP_BY}",
+            (start, end),
+        )
+
+
+def scan_days_for_student(cursor, nickname: str) -> list[date]:
+    cursor.execute("""
+        SELECT DISTINCT DATE(st.scan_timestamp)
+        FROM vw_scan_history st
+        JOIN TBL_SESSIONS s ON st.session_id = s.session_id
+        WHERE s.student_nickname = %s
+    """, (nickname,))
+    days = []
+    for (value,) in cursor.fetchall():
+        if value is None:
+            continue
+        days.append(value if isinstance(value, date) else date.fromisoformat(str(value)[:10]))
+    return days
+
+
+def reconcile_student_rollup(cursor) -> None:
+    """Recompute TBL_STUDENT_ROLLUP from TBL_SESSIONS (maintenance: rewrites the whole table).
+
+    The backend keeps the rollup current incrementally (add_completed_session,
+    fold_late_scans); this is for repairs and --reconcile, not for a schedule.
+    """
+    cursor.execute("DELETE FROM TBL_STUDENT_ROLLUP")
+    cursor.execute(
+        f"INSERT INTO TBL_STUDENT_ROLLUP {STUDENT_ROLLUP_COLUMNS} {STUDENT_ROLLUP_SELECT_SQL}"
+        " GROUP BY student_nickname, session_mode"
+    )
+
+
+def rebuild_all(cursor) -> None:
+    """Recompute both rollups from scratch (backfill for existing installs, or repair)."""
+    cursor.execute("DELETE FROM TBL_SCAN_DAILY_ROLLUP")
+    cursor.execute(f"INSERT INTO TBL_SCAN_DAILY_ROLLUP {SCAN_ROLLUP_COLUMNS} {SCAN_ROLLUP_SELECT_SQL} {SCAN_ROLLUP_GROUP_BY}")
+    reconcile_student_rollup(cursor)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='EcoLearn dashboard rollup maintenance')
+    parser.add_argument('--rebuild', action='store_true', help='Recompute all rollups from raw history')
+    parser.add_argument('--reconcile', action='store_true',
+                        help='Recompute only the student rollup from TBL_SESSIONS')
+    args = parser.parse_args()
+    if not (args.rebuild or args.reconcile):
+        parser.print_help()
+        return 0
+
+    from db import configured_backend, open_connection
+    from scan_archive import ensure_archive
+
+    conn = open_connection(DB_CONFIG)
+    try:
+        cursor = conn.cursor()
+        ensure_archive(cursor, configured_backend())
+        if args.rebuild:
+            rebuild_all(cursor)
+        else:
+            reconcile_student_rollup(cursor)
+        conn.commit()
+        cursor.execute("SELECT COUNT(*) FROM TBL_SCAN_DAILY_ROLLUP")
+        scan_groups = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM TBL_STUDENT_ROLLUP")
+        students = cursor.fetchone()[0]
+        cursor.close()
+        print(f"✅ Rollups rebuilt: {scan_groups} scan groups, {students} student rows")
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Rollup rebuild failed: {e}")
+        return 1
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,23 +1,49 @@
-from flask import Flask, request, jsonify, send_from_directory, Response
+import time
+_import_started = time.perf_counter()  # For the startup timing report
+
+from flask import Flask, request, jsonify, send_file, send_from_directory, Response
 from flask_cors import CORS
 from flask_compress import Compress
+try:
+    from flask_sock import Sock
+except ImportError:
+    Sock = None
 import cv2
 import numpy as np
-import mysql.connector
-from mysql.connector import pooling
 import pickle
 import base64
 from datetime import datetime
 import hashlib
 import json
 import os
-import io
+import shutil
 import sys
 import subprocess
 import threading
 import random
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import wraps
 from pathlib import Path
-from gtts import gTTS
+from image_ingest import ingest_image_bytes
+from inference_cache import ResultCache, SingleFlight, perceptual_hash
+from response_cache import ResponseCache, etag_matches, make_etag
+from pagination import CursorError, Keyset, decode_cursor, iter_rows, page_size
+from report_jobs import ReportJobs
+from catalog import Catalog, asset_counts_payload, asset_repository_payload, cards_minimal_payload
+from thumbnails import THUMB_WIDTHS, ThumbnailStore
+from asset_cache import AssetCache
+from tts_cache import FIXED_PHRASES_TL, TTSCache, TTSError, card_phrases, engine_from_env, validate_request
+from session_store import KioskSession, SessionStore, normalize_client_token, start_reaper
+from inference_rpc import InferenceClient
+from scan_log_writer import ScanLogWriter, ScanRow
+from db import create_database, open_connection
+import analytics_rollup
+import scan_archive
+import scan_export
+import training_progress
+from training_progress import ProgressWriter
 
 # Avoid UnicodeEncodeError on some Windows consoles (e.g., cp1252) when printing
 # status markers like ✅/⚠️.
@@ -41,17 +67,6 @@ try:
 except Exception:
     pass
 
-try:
-    from generate_variants import build_variants as gv_build_variants
-    from generate_variants import read_image as gv_read_image
-    from generate_variants import write_image as gv_write_image
-    from generate_variants import frame_as_ecocard as gv_frame_as_ecocard
-except Exception:
-    gv_build_variants = None
-    gv_read_image = None
-    gv_write_image = None
-    gv_frame_as_ecocard = None
-
 # --- CONFIGURATION ---
 DB_CONFIG = {
     'host': 'localhost',
@@ -61,18 +76,18 @@ DB_CONFIG = {
 }
 
 # --- CONNECTION POOLING FOR FASTER DB ACCESS ---
-# Pre-create connections to avoid connection overhead
-try:
-    db_pool = pooling.MySQLConnectionPool(
-        pool_name="ecolearn_pool",
-        pool_size=5,
-        pool_reset_session=True,
-        **DB_CONFIG
-    )
-    print("✅ Database connection pool created (5 connections)")
-except Exception as e:
-    print(f"⚠️ Connection pool failed, using direct connections: {e}")
-    db_pool = None
+# Pool size follows ECOLEARN_DB_POOL_SIZE, else this process's thread count (see db.py).
+# A checkout waits up to DB_CHECKOUT_TIMEOUT_SECONDS for a free connection.
+# ECOLEARN_DB_BACKEND=sqlite swaps MySQL for a single-file database (db_sqlite.py).
+DB_CHECKOUT_TIMEOUT_SECONDS = float(os.environ.get('ECOLEARN_DB_CHECKOUT_TIMEOUT', '10'))
+db = create_database(DB_CONFIG, pool_name="ecolearn_pool", checkout_timeout=DB_CHECKOUT_TIMEOUT_SECONDS)
+
+
+def create_db_pool():
+    """(Re)create the connection pool; connect_db() uses direct connections until then."""
+    db.open()
+    return db
+
 
 # --- OPTIMIZED CONFIGURATION FOR BETTER ACCURACY ---
 ORB_FEATURES = 1000      # Increased from 500 for more detailed feature detection
@@ -92,6 +107,19 @@ ORB_LABELS_PATH = os.path.join(os.path.dirname(__file__), 'models', 'waste_label
 ORB_IMPORT_MARKER_PATH = os.path.join(os.path.dirname(__file__), 'models', '.teachable_import.done.json')
 ORB_INCREMENTAL_MODEL_PATH = os.path.join(os.path.dirname(__file__), 'models', 'waste_incremental.onnx')
 ORB_INCREMENTAL_LABELS_PATH = os.path.join(os.path.dirname(__file__), 'models', 'waste_incremental_labels.txt')
+ORB_ONNX_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'models', 'onnx_cache')  # <keras sha256>.onnx
+DATASET_STAMP_PATH = os.path.join(os.path.dirname(__file__), 'models', '.golden_dataset.stamp')  # Touched after auto-train
+STARTUP_STATUS_PATH = os.path.join(os.path.dirname(__file__), 'models', '.startup_status.json')  # Shared with forked workers
+BACKGROUND_JOBS_LOCK_PATH = os.path.join(os.path.dirname(__file__), 'models', '.background_jobs.lock')  # Held by the jobs worker
+ADMIN_CACHE_STAMP_PATH = os.path.join(os.path.dirname(__file__), 'models', '.admin_cache.stamp')  # Touched on admin data edits
+CATALOG_STAMP_PATH = os.path.join(os.path.dirname(__file__), 'models', '.catalog.stamp')  # Touched on card catalog edits
+TRAINING_PROGRESS_PATH = os.path.join(os.path.dirname(__file__), 'models', 'orb_retrain_progress.jsonl')  # Retrain events (training_progress.py)
+ASSET_CACHE_STAMP_PATH = os.path.join(os.path.dirname(__file__), 'models', '.asset_cache.stamp')  # Touched on asset writes
+SCAN_LOG_SYNC_DIR = os.path.join(os.path.dirname(__file__), 'models', 'scan_log_sync')  # Cross-worker flush requests
+REPORTS_DIR = os.path.join(os.path.dirname(__file__), 'data', 'reports')  # Rendered report cache (report_jobs.py)
+TTS_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'data', 'tts')  # Spoken feedback audio (tts_cache.py)
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), '..', 'assets')  # Card display images (WebP)
+THUMBS_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'data', 'thumbs')  # Gallery derivatives (thumbnails.py)
 ORB_INPUT_SIZE = (224, 224)
 ORB_CONFIDENCE_THRESHOLD = 0.72
 ORB_INCREMENTAL_CONFIDENCE_THRESHOLD = 0.90
@@ -104,6 +132,55 @@ CNN_ENSEMBLE_EARLY_EXIT_MARGIN = 0.18
 CNN_ENSEMBLE_MARGIN_THRESHOLD = 0.10
 INCREMENTAL_OVERRIDE_MARGIN = 0.14
 PREFER_BASE_MODEL = True
+STREAM_SCAN_ENABLED = False  # Off until the kiosk streams frames: it captures the whole burst before uploading
+STREAM_BURST_FRAMES = 4
+STREAM_BURST_MAX_FRAMES = 8  # Hard cap on frames accepted per streaming scan request
+LIVE_CHANNEL_MAX_FRAME_BYTES = 2 * 1024 * 1024  # Reject oversized live frames instead of decoding them
+CAPTURE_MAX_SIDE = 448  # Upper bound on the advertised upload side (the profile sends scan_working_side())
+CAPTURE_QUALITY = 0.80
+CAPTURE_FORMATS = ['image/webp', 'image/jpeg']  # Client picks the first one its canvas can encode
+CAPTURE_PROFILE_HEADER = 'X-Capture-Profile'
+ONE_SHOT_ORB_MAX_SIDE = 1024  # Working size for one-shot ORB features
+ONE_SHOT_ASSET_MAX_SIDE = 2048  # Saved card assets (4x5in @ 300 DPI needs 1200x1500)
+SCAN_CACHE_TTL_SECONDS = 2.0  # Covers double taps / retries of the same frozen frame
+SCAN_CACHE_MAX_ENTRIES = 64
+# Server-side TTLs for polled admin endpoints; edits invalidate them immediately (see response_cache.py).
+ADMIN_STATS_CACHE_TTL_SECONDS = 5.0  # Recent scans show up within this window
+ADMIN_NICKNAMES_CACHE_TTL_SECONDS = 30.0
+PROFICIENCY_REPORT_FORMAT = 'v2'  # Part of the report cache key; bump when the PDF layout changes
+REPORT_INLINE_WAIT_SECONDS = 3.0  # /admin/proficiency-reports/pdf waits this long before answering 202
+SCAN_EXPORT_CHUNK_ROWS = 5000  # Rows per export query (scan_export.py)
+SCAN_EXPORT_PAUSE_SECONDS = 0.02  # Breather between export chunks so kiosk writes are not starved
+# Full months of scans kept in TBL_SCAN_TRANSACTIONS; older ones of closed sessions move to the archive (0 = never).
+SCAN_ARCHIVE_KEEP_MONTHS = int(os.environ.get('ECOLEARN_SCAN_ARCHIVE_MONTHS', str(scan_archive.DEFAULT_KEEP_MONTHS)))
+SCAN_ARCHIVE_PAUSE_SECONDS = 0.05  # Between archive batches, so kiosk inserts get the table in between
+TTS_CACHE_MAX_BYTES = 256 * 1024 * 1024  # Least recently played phrases are evicted past this
+TTS_BROWSER_CACHE_SECONDS = 7 * 24 * 3600  # GET /tts audio is immutable for a given text
+THUMB_BROWSER_CACHE_SECONDS = 24 * 3600  # Thumbnail URLs are not versioned; replaced cards revalidate by ETag
+ASSET_CACHE_MAX_BYTES = 64 * 1024 * 1024  # In-memory /assets cache (asset_cache.py)
+ASSET_CACHE_MAX_FILE_BYTES = 4 * 1024 * 1024  # Larger files are streamed from disk
+ASSET_CACHE_REVALIDATE_SECONDS = 30.0  # Catches files changed outside the backend (e.g. copied in by hand)
+TRAINING_EVENTS_POLL_SECONDS = 0.5  # How often an open SSE stream checks the progress file
+TRAINING_EVENTS_MAX_SECONDS = 300  # Streams then end; EventSource reconnects and resumes by event id
+TRAINING_EVENTS_MAX_STREAMS = 2  # Per worker: each open stream holds a request thread
+KIOSK_TOKEN_HEADER = 'X-Kiosk-Token'  # Stable per-browser id; one session per kiosk
+KIOSK_SESSION_HEADER = 'X-Kiosk-Session'  # Session id the kiosk believes is active (rehydration hint)
+SESSION_STORE_MAX_SESSIONS = 256
+SESSION_REAPER_INTERVAL_SECONDS = 60
+MODEL_RELOAD_CHECK_SECONDS = 5  # How often each worker checks model files for retrains done elsewhere
+MODEL_RELOAD_SETTLE_SECONDS = 2  # Skip files modified this recently (still being written)
+INFERENCE_SIDECAR_ADDRESS = os.environ.get('ECOLEARN_INFERENCE_ADDR', '').strip()  # e.g. unix:/tmp/ecolearn-inference.sock
+SCAN_LOG_FLUSH_SECONDS = 1.0  # Write-behind interval for scan transaction rows
+SCAN_LOG_MAX_BATCH = 200  # Flush early once this many rows are queued
+SCAN_LOG_SYNC_TIMEOUT_SECONDS = 2.0  # Longest /session/end waits for other workers' queues
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 def ensure_default_orb_model_assets() -> bool:
@@ -135,15 +212,26 @@ def ensure_default_orb_model_assets() -> bool:
         print("ℹ️ Auto-import skipped: converted_keras model/labels not found")
         return False
 
-    print("ℹ️ ONNX model/labels missing. Auto-importing from converted_keras...")
+    # Conversion is keyed by the h5 content hash so the same export is never converted twice.
+    keras_sha256 = file_sha256(keras_path)
+    cached_onnx = os.path.join(ORB_ONNX_CACHE_DIR, f"{keras_sha256}.onnx")
+    cache_hit = os.path.exists(cached_onnx)
+    os.makedirs(ORB_ONNX_CACHE_DIR, exist_ok=True)
+
+    if cache_hit:
+        print(f"ℹ️ ONNX model/labels missing. Reusing cached conversion {keras_sha256[:12]}...")
+    else:
+        print("ℹ️ ONNX model/labels missing. Auto-importing from converted_keras...")
     cmd = [
         sys.executable,
         'import_teachable_model.py',
         '--keras-model', os.path.join('..', 'converted_keras', 'keras_model.h5'),
         '--labels', os.path.join('..', 'converted_keras', 'labels.txt'),
-        '--out-onnx', os.path.join('models', 'waste_mobilenet.onnx'),
+        '--out-onnx', cached_onnx + '.partial',
         '--out-labels', os.path.join('models', 'waste_labels.txt'),
     ]
+    if cache_hit:
+        cmd.append('--skip-convert')  # Label mapping only (DB lookup, no TensorFlow)
 
     try:
         proc = subprocess.run(
@@ -155,11 +243,17 @@ def ensure_default_orb_model_assets() -> bool:
             check=False,
         )
         if proc.returncode == 0:
+            if not cache_hit:
+                os.replace(cached_onnx + '.partial', cached_onnx)
+            tmp_model_path = ORB_MODEL_PATH + '.tmp'
+            shutil.copyfile(cached_onnx, tmp_model_path)
+            os.replace(tmp_model_path, ORB_MODEL_PATH)
             try:
                 marker_payload = {
                     'imported_at': datetime.now().isoformat(timespec='seconds'),
-                    'source': 'converted_keras_auto_import',
+                    'source': 'onnx_cache' if cache_hit else 'converted_keras_auto_import',
                     'keras_path': keras_path,
+                    'keras_sha256': keras_sha256,
                     'labels_path': labels_path,
                     'onnx_path': ORB_MODEL_PATH,
                     'backend_labels_path': ORB_LABELS_PATH,
@@ -196,6 +290,10 @@ SYSTEM_CONFIG_DEFAULTS = [
     ('cnn_ensemble_margin_threshold', '0.10', 'float', 'Minimum top1-top2 confidence gap after averaging', 1),
     ('incremental_override_margin', '0.14', 'float', 'Minimum confidence gap required for incremental model to override base model', 1),
     ('prefer_base_model', 'true', 'boolean', 'Prefer base model on incremental/base disagreements unless override margin is met', 1),
+    ('stream_scan_enabled', 'false', 'boolean', 'Send a short burst of frames per scan and fuse CNN probabilities across them (slower than a single scan: the burst is captured before upload)', 1),
+    ('stream_burst_frames', '4', 'integer', 'Frames captured per streaming scan (2-8)', 1),
+    ('live_recognition_enabled', 'false', 'boolean', 'Stream live camera frames over WebSocket to highlight the scan box when a card is seen', 1),
+    ('capture_max_side', '448', 'integer', 'Upper bound (px) on the scan image side kiosks upload; the recognizer uses less (224-1280)', 1),
     ('model_version', 'ORB-KNN-v2.0', 'string', 'Current algorithm version identifier', 0),
     ('session_timeout_minutes', '30', 'integer', 'Auto-abandon sessions after N minutes of inactivity', 1),
     ('min_confidence_score', '0.60', 'float', 'Minimum confidence to accept a classification', 1),
@@ -223,21 +321,51 @@ app.config['COMPRESS_MIN_SIZE'] = 500  # Only compress responses > 500 bytes
 # --- STATIC FILE CACHING (1 year for images) ---
 app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000  # 1 year in seconds
 
+# --- LIVE CLASSIFICATION CHANNEL (optional flask-sock dependency) ---
+sock = Sock(app) if Sock is not None else None
+
 # --- GLOBAL MEMORY ---
 golden_dataset = []
 card_metadata = {}
 category_metadata = {}
-current_session_id = None
-current_session_mode = None
-current_session_subset_card_ids = set()
-current_session_scanned_card_ids = set()
-session_subset_lock = threading.Lock()
+kiosk_sessions = SessionStore(SESSION_TIMEOUT_MINUTES * 60, SESSION_STORE_MAX_SESSIONS)
+scan_log_writer = ScanLogWriter(lambda: connect_db(), SCAN_LOG_FLUSH_SECONDS, SCAN_LOG_MAX_BATCH)
+MULTI_PROCESS_SERVING = False  # True when several worker processes each hold their own session store
+runtime_initialized = False
+runtime_init_pid = os.getpid()
+worker_pid = None
+worker_init_lock = threading.Lock()
+orb_model_stamp = None
+incremental_model_stamp = None
+last_model_reload_check = 0.0
+model_reload_lock = threading.Lock()
+runtime_config_stamp = None
+# When set, recognition runs in inference_server.py and this process holds no nets.
+inference_client = InferenceClient(INFERENCE_SIDECAR_ADDRESS) if INFERENCE_SIDECAR_ADDRESS else None
 SESSION_CARD_SUBSET_SIZE = 10
 orb_fallback_net = None
 orb_fallback_class_to_card_id = {}
 incremental_orb_net = None
 incremental_orb_class_to_card_id = {}
 incremental_allowed_card_ids = set()
+recognizer_version = 0  # Bumped whenever models, card data or recognition config change
+scan_result_cache = ResultCache(SCAN_CACHE_TTL_SECONDS, SCAN_CACHE_MAX_ENTRIES)
+scan_inflight = SingleFlight()
+admin_response_cache = ResponseCache(stamp_path=ADMIN_CACHE_STAMP_PATH)
+report_jobs = ReportJobs(REPORTS_DIR)
+tts_cache = TTSCache(TTS_CACHE_DIR, engine_from_env(), TTS_CACHE_MAX_BYTES)
+thumbnail_store = ThumbnailStore(ASSETS_DIR, THUMBS_CACHE_DIR)
+asset_cache = AssetCache(
+    ASSETS_DIR, ASSET_CACHE_MAX_BYTES, ASSET_CACHE_MAX_FILE_BYTES,
+    ASSET_CACHE_REVALIDATE_SECONDS, stamp_path=ASSET_CACHE_STAMP_PATH,
+)
+card_catalog = Catalog()  # Versioned snapshot behind the card/asset admin endpoints
+catalog_stamp = None
+startup_status_lock = threading.Lock()
+startup_status = {'state': 'idle', 'stages': {}, 'pid': None}
+background_jobs_lock = None  # Open lock file while this process runs the startup jobs
+analytics_backfill_needed = False  # Set by create_app(); backfilled by the startup jobs
+dataset_stamp = None
 training_status_lock = threading.Lock()
 training_status = {
     'state': 'idle',
@@ -249,6 +377,28 @@ training_status = {
     'last_card_id': None,
     'last_card_name': None,
 }
+card_asset_status_lock = threading.Lock()
+card_asset_status = {
+    'state': 'idle',
+    'pending': 0,
+    'card_id': None,
+    'card_name': None,
+    'started_at': None,
+    'ended_at': None,
+    'last_error': None,
+}
+card_asset_executor = None  # One worker: image writes for the same card never interleave
+card_asset_executor_pid = None
+orb_progress = ProgressWriter(None)  # Event writer of the current/last retrain run
+training_event_streams = 0
+training_event_streams_lock = threading.Lock()
+
+
+def bump_recognizer_version():
+    """Invalidate cached recognition results after models/cards/config change."""
+    global recognizer_version
+    recognizer_version += 1
+    scan_result_cache.clear()
 
 
 def _update_training_status(**kwargs):
@@ -261,6 +411,224 @@ def get_training_status_snapshot():
         return dict(training_status)
 
 
+def _finish_orb_training(state: str, error: str | None = None):
+    """Record the end of a retrain run in the status and the progress stream."""
+    _update_training_status(
+        state=state,
+        ended_at=datetime.now().isoformat(timespec='seconds'),
+        last_error=error,
+    )
+    orb_progress.emit(training_progress.TERMINAL_EVENT, state=state, error=error)
+
+
+def _update_card_asset_status(**kwargs):
+    with card_asset_status_lock:
+        card_asset_status.update(kwargs)
+
+
+def get_card_asset_status_snapshot():
+    with card_asset_status_lock:
+        return dict(card_asset_status)
+
+
+def _update_startup_status(state: str | None = None, stage: str | None = None, stage_fields: dict | None = None):
+    """Set the overall startup state and/or update one stage's fields (its own 'state' included)."""
+    with startup_status_lock:
+        startup_status['pid'] = os.getpid()
+        if state is not None:
+            startup_status['state'] = state
+        if stage is not None:
+            entry = startup_status['stages'].setdefault(stage, {
+                'state': 'pending', 'started_at': None, 'ended_at': None, 'message': None,
+            })
+            entry.update(stage_fields or {})
+        snapshot = json.dumps({'state': startup_status['state'], 'stages': startup_status['stages']})
+
+    # Jobs run in one process (the worker holding the background-jobs lock); the others read this file.
+    try:
+        tmp_path = STARTUP_STATUS_PATH + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(snapshot)
+        os.replace(tmp_path, STARTUP_STATUS_PATH)
+    except OSError:
+        pass
+
+
+def _update_startup_stage(stage: str, **fields):
+    _update_startup_status(stage=stage, stage_fields=fields)
+
+
+def get_startup_status_snapshot():
+    with startup_status_lock:
+        if startup_status['pid'] in (None, os.getpid()):
+            return {
+                'state': startup_status['state'],
+                'stages': {name: dict(entry) for name, entry in startup_status['stages'].items()},
+            }
+    try:
+        with open(STARTUP_STATUS_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'state': 'unknown', 'stages': {}}
+
+
+def _run_startup_stage(stage: str, needed: bool, job):
+    """Run one background startup stage and record its outcome."""
+    if not needed:
+        _update_startup_stage(stage, state='skipped', message='Not needed')
+        return
+    _update_startup_stage(stage, state='running', started_at=datetime.now().isoformat(timespec='seconds'))
+    try:
+        ok = bool(job())
+        _update_startup_stage(
+            stage,
+            state='completed' if ok else 'failed',
+            message=None if ok else 'See server log',
+        )
+    except Exception as e:
+        print(f"⚠️ Startup stage {stage} failed: {e}")
+        _update_startup_stage(stage, state='failed', message=str(e))
+    finally:
+        _update_startup_stage(stage, ended_at=datetime.now().isoformat(timespec='seconds'))
+
+
+def _run_startup_jobs(recognizer_stages: bool = True):
+    """Slow first-boot work, run after the server is already accepting requests.
+
+    Each stage hot-attaches its result: auto-train reloads the golden dataset, the
+    Teachable Machine import loads the ONNX fallback as soon as it exists. Other worker
+    processes pick both up through the model/dataset stamps (maybe_reload_models_from_disk).
+    The dashboard rollups are backfilled once when an existing install first gets them,
+    and scans of closed terms are moved to the archive (scan_archive.py).
+    """
+    def auto_train():
+        ok = maybe_auto_run_training_if_needed()
+        if ok:
+            Path(DATASET_STAMP_PATH).touch()
+        return ok
+
+    def import_model():
+        return ensure_default_orb_model_assets() and load_orb_model()
+
+    _update_startup_status(state='running')
+    _run_startup_stage('analytics_backfill', analytics_backfill_needed, backfill_analytics_rollups)
+    _run_startup_stage('scan_archive', SCAN_ARCHIVE_KEEP_MONTHS > 0, archive_scan_history)
+    _run_startup_stage('tts_prerender', ENABLE_AUDIO_FEEDBACK, prerender_tts_phrases)
+    if recognizer_stages:
+        _run_startup_stage('auto_train', len(golden_dataset) == 0 and len(card_metadata) > 0, auto_train)
+        _run_startup_stage(
+            'model_import',
+            not (os.path.exists(ORB_MODEL_PATH) and os.path.exists(ORB_LABELS_PATH)),
+            import_model,
+        )
+    _update_startup_status(state='ready')
+    print("✅ Background startup jobs finished")
+
+
+def start_startup_jobs(recognizer_stages: bool = True):
+    stages = ('analytics_backfill', 'scan_archive', 'tts_prerender')
+    if recognizer_stages:
+        stages += ('auto_train', 'model_import')
+    for stage in stages:
+        _update_startup_stage(stage)
+    threading.Thread(
+        target=_run_startup_jobs, args=(recognizer_stages,), name='startup-jobs', daemon=True
+    ).start()
+
+
+def claim_background_jobs() -> bool:
+    """Take the background-jobs lock file; True in exactly one serving process.
+
+    The lock is held until the process exits, so when the claiming worker dies, the worker
+    gunicorn forks in its place takes the startup jobs over.
+    """
+    global background_jobs_lock
+
+    if background_jobs_lock is not None:
+        return True
+    try:
+        import fcntl
+    except ImportError:  # Windows: waitress serves from a single process
+        return True
+    lock_file = open(BACKGROUND_JOBS_LOCK_PATH, 'a')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    background_jobs_lock = lock_file
+    return True
+
+
+def ensure_analytics_rollups() -> bool:
+    """Create the scan archive and dashboard rollup tables if missing; True when the rollups
+    still need a backfill."""
+    try:
+        with db.cursor(commit=True) as cursor:
+            scan_archive.ensure_archive(cursor, db.backend)
+            return analytics_rollup.ensure_rollup_tables(cursor)
+    except Exception as e:
+        print(f"⚠️ Analytics rollup check failed: {e}")
+        return False
+
+
+def backfill_analytics_rollups() -> bool:
+    scan_log_writer.flush()
+    with db.cursor(commit=True) as cursor:
+        analytics_rollup.rebuild_all(cursor)
+    print("✅ Analytics rollups backfilled from scan history")
+    return True
+
+
+def archive_scan_history() -> bool:
+    """Move scans of closed terms out of the live table (own connection; batches commit as they go)."""
+    cutoff = scan_archive.default_cutoff(SCAN_ARCHIVE_KEEP_MONTHS)
+    conn = open_connection(DB_CONFIG)
+    try:
+        moved = scan_archive.archive_before(conn, db.backend, cutoff, pause_seconds=SCAN_ARCHIVE_PAUSE_SECONDS)
+    finally:
+        conn.close()
+    if moved:
+        print(f"🗄️ Archived {moved} scans from before {cutoff}")
+    return True
+
+
+def tts_card_phrases(card) -> list[str]:
+    category = card_catalog.snapshot.categories.get(card.category_id)
+    return card_phrases(card.name, category.name) if category else []
+
+
+def prerender_tts_phrases() -> bool:
+    """Render the fixed feedback lines and every card's phrases into the TTS cache."""
+    phrases = list(FIXED_PHRASES_TL)
+    for card in card_catalog.snapshot.ordered_cards():
+        phrases.extend(tts_card_phrases(card))
+    rendered = tts_cache.prerender(phrases)
+    print(f"🔊 TTS cache ready ({rendered} new phrases, {len(phrases)} total)")
+    return True
+
+
+def prerender_card_tts(card_id: int) -> None:
+    """Queue a new/renamed card's feedback phrases so its first scan already plays instantly."""
+    card = card_catalog.snapshot.cards.get(card_id)
+    if card is not None and ENABLE_AUDIO_FEEDBACK:
+        tts_cache.prerender_async(tts_card_phrases(card))
+
+
+def asset_relative_path(image_path: str | None) -> str | None:
+    """'assets/Recyclable/bottle.webp' -> 'Recyclable/bottle.webp' (path under ASSETS_DIR)."""
+    if not image_path or not image_path.startswith('assets/'):
+        return None
+    return image_path[len('assets/'):]
+
+
+def generate_card_thumbnails(image_path: str) -> None:
+    """Render a new/replaced card's gallery sizes in the background (otherwise done on first request)."""
+    rel = asset_relative_path(image_path)
+    if rel:
+        thumbnail_store.generate_async([rel])
+
+
 def select_random_card_subset(card_ids: list[int], subset_size: int) -> set[int]:
     """Pick a random subset of active card IDs for a session."""
     unique_ids: list[int] = []
@@ -282,60 +650,62 @@ def select_random_card_subset(card_ids: list[int], subset_size: int) -> set[int]
 
 def generate_variants_for_card(png_full_path: str, variants_category_dir: str, stem: str) -> int:
     """Generate all variants for a single card image into assets_variants/category."""
-    if gv_build_variants is None or gv_read_image is None or gv_write_image is None:
-        raise RuntimeError("generate_variants.py helpers unavailable")
+    try:
+        import generate_variants as gv  # Only the one-shot pipeline needs the augmentation stack
+    except Exception as e:
+        raise RuntimeError("generate_variants.py helpers unavailable") from e
 
-    image = gv_read_image(Path(png_full_path))
+    image = gv.read_image(Path(png_full_path))
     if image is None:
         raise RuntimeError(f"Failed to read PNG for variant generation: {png_full_path}")
 
     # IMPORTANT: Keep variant generation bounded in size.
     # Admin one-shot uploads can be huge (phone camera), which makes heavy augmentations
     # (esp. elastic distortion) extremely slow and can appear "stuck".
-    if gv_frame_as_ecocard is not None:
-        image = gv_frame_as_ecocard(
+    if hasattr(gv, 'frame_as_ecocard'):
+        image = gv.frame_as_ecocard(
             image,
             title="EcoLearn Eco-Card",
             subtitle="Scan to identify and sort correctly",
             out_size=(800, 1000),
         )
-    variants = gv_build_variants(image)
+    variants = gv.build_variants(image)
     os.makedirs(variants_category_dir, exist_ok=True)
 
     written = 0
     for variant_name, variant_img in variants.items():
         out_path = Path(variants_category_dir) / f"{stem}__{variant_name}.png"
-        gv_write_image(out_path, variant_img, ext='.png')
+        gv.write_image(out_path, variant_img, ext='.png')
         written += 1
     return written
 
 
+def card_category_name(card_id: int) -> str | None:
+    """Category (asset folder) name of a card, or None when the card has no asset row."""
+    row = db.query_one(
+        """
+        SELECT c.category_name
+        FROM TBL_CARD_ASSETS ca
+        JOIN TBL_CATEGORIES c ON c.category_id = ca.category_id
+        WHERE ca.card_id = %s
+        LIMIT 1
+        """,
+        (card_id,),
+    )
+    return str(row['category_name']) if row and row.get('category_name') else None
+
+
 def cleanup_variants_for_card(card_id: int | None, card_name: str | None) -> int:
     """Remove generated one-shot variants after retraining completes."""
     if card_id is None:
         return 0
 
-    conn = None
-    cursor = None
     deleted = 0
     try:
-        conn = connect_db()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(
-            """
-            SELECT c.category_name
-            FROM TBL_CARD_ASSETS ca
-            JOIN TBL_CATEGORIES c ON c.category_id = ca.category_id
-            WHERE ca.card_id = %s
-            LIMIT 1
-            """,
-            (card_id,),
-        )
-        row = cursor.fetchone()
-        if not row:
+        category_name = card_category_name(card_id)
+        if not category_name:
             return 0
 
-        category_name = str(row['category_name'])
         safe_name = (card_name or '').replace(' ', '_').replace('-', '_')
         safe_name = ''.join(ch for ch in safe_name if ch.isalnum() or ch == '_')
         if not safe_name:
@@ -357,66 +727,15 @@ def cleanup_variants_for_card(card_id: int | None, card_name: str | None) -> int
     except Exception as e:
         print(f"⚠️ Variant cleanup failed for card_id={card_id}: {e}")
         return deleted
-    finally:
-        try:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
-        except Exception:
-            pass
-
-
-def decode_uploaded_image_to_bgr(file_storage):
-    """Decode uploaded image and flatten alpha onto white to avoid black backgrounds."""
-    raw = file_storage.read()
-    if not raw:
-        return None
-
-    npbuf = np.frombuffer(raw, dtype=np.uint8)
-    img = cv2.imdecode(npbuf, cv2.IMREAD_UNCHANGED)
-    if img is None:
-        return None
-
-    if img.ndim == 2:
-        return cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
-
-    if img.shape[2] == 4:
-        bgr = img[:, :, :3].astype(np.float32)
-        alpha = (img[:, :, 3].astype(np.float32) / 255.0)[..., None]
-        bg = np.full_like(bgr, 255.0)
-        flat = bgr * alpha + bg * (1.0 - alpha)
-        return np.clip(flat, 0, 255).astype(np.uint8)
-
-    return img[:, :, :3]
-
-
-def decode_uploaded_image_keep_alpha(file_storage):
-    """Decode uploaded image as-is so alpha can be preserved when saving assets."""
-    raw = file_storage.read()
-    if not raw:
-        return None
-
-    npbuf = np.frombuffer(raw, dtype=np.uint8)
-    return cv2.imdecode(npbuf, cv2.IMREAD_UNCHANGED)
-
-
-def to_bgr_for_ml(img):
-    """Convert decoded image to BGR for ORB/fallback processing while handling alpha safely."""
-    if img is None:
-        return None
 
-    if img.ndim == 2:
-        return cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
 
-    if img.shape[2] == 4:
-        bgr = img[:, :, :3].astype(np.float32)
-        alpha = (img[:, :, 3].astype(np.float32) / 255.0)[..., None]
-        bg = np.full_like(bgr, 255.0)
-        flat = bgr * alpha + bg * (1.0 - alpha)
-        return np.clip(flat, 0, 255).astype(np.uint8)
+def decode_image_bytes_to_bgr(raw, max_side: int | None = None):
+    """Decode raw encoded image bytes to BGR, flattening alpha onto white.
 
-    return img[:, :, :3]
+    max_side lets JPEGs decode at reduced resolution when the working size is known.
+    """
+    ingested = ingest_image_bytes(raw, ml_max_side=max_side)
+    return ingested.ml if ingested is not None else None
 
 
 def downscale_max_dim(image_bgr: np.ndarray, max_dim: int = 1024) -> np.ndarray:
@@ -439,6 +758,52 @@ def downscale_max_dim(image_bgr: np.ndarray, max_dim: int = 1024) -> np.ndarray:
     return cv2.resize(image_bgr, (new_w, new_h), interpolation=cv2.INTER_AREA)
 
 
+def get_capture_profile() -> dict:
+    """Capture settings kiosks should honor before uploading scan frames.
+
+    max_side is the size decode_scan_frame() reduces every frame to, so kiosks never
+    upload pixels the recognizer throws away; it doubles as the profile version.
+    """
+    working_side = scan_working_side()
+    return {
+        "version": working_side,
+        "max_side": working_side,
+        "formats": list(CAPTURE_FORMATS),
+        "quality": CAPTURE_QUALITY,
+        "header": CAPTURE_PROFILE_HEADER,
+    }
+
+
+def scan_working_side() -> int:
+    """Longest scan-frame side the recognizer actually uses.
+
+    The CNN sees a ORB_FOCUS_ROI_SCALE center crop resized to ORB_INPUT_SIZE, so a frame
+    whose crop still covers the CNN input carries all the detail inference can use.
+    Capped by CAPTURE_MAX_SIDE; get_capture_profile() advertises this size to kiosks.
+    """
+    needed = int(np.ceil(max(ORB_INPUT_SIZE) / max(float(ORB_FOCUS_ROI_SCALE), 0.01)))
+    return max(max(ORB_INPUT_SIZE), min(CAPTURE_MAX_SIDE, needed))
+
+
+def decode_scan_frame(raw):
+    """Decode scan-frame bytes straight to the recognizer's working size (one resize).
+
+    Card detection, perceptual hashing and every CNN crop then run on the reduced frame.
+    """
+    return decode_image_bytes_to_bgr(raw, max_side=scan_working_side())
+
+
+def capture_profile_stale(client_profile: str | None) -> bool:
+    """True when a kiosk tagged its upload with a profile other than the advertised one.
+
+    Only the currently advertised profile version is accepted; anything else means the
+    kiosk is resizing for old settings and should re-fetch /capture-profile.
+    """
+    if client_profile is None:
+        return False
+    return str(client_profile).strip() != str(get_capture_profile()['version'])
+
+
 def _run_orb_training_job(trigger: str, card_id: int | None, card_name: str | None):
     backend_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(backend_dir)
@@ -455,6 +820,7 @@ def _run_orb_training_job(trigger: str, card_id: int | None, card_name: str | No
         last_card_id=card_id,
         last_card_name=card_name,
     )
+    orb_progress.emit('started', trigger=trigger, card_id=card_id, card_name=card_name)
 
     # Prefer explicit override, then project .venv, then current interpreter.
     env_python = os.environ.get('ECOLEARN_TRAIN_PYTHON')
@@ -472,11 +838,7 @@ def _run_orb_training_job(trigger: str, card_id: int | None, card_name: str | No
     if trigger in {'card_add', 'card_replace'}:
         incremental_ids = get_incremental_card_ids()
         if not incremental_ids:
-            _update_training_status(
-                state='completed',
-                ended_at=datetime.now().isoformat(timespec='seconds'),
-                last_error=None,
-            )
+            _finish_orb_training('completed')
             print('ℹ️ No incremental cards found; skipping incremental ORB retrain')
             return
 
@@ -502,6 +864,7 @@ def _run_orb_training_job(trigger: str, card_id: int | None, card_name: str | No
         ])
         if card_id is not None:
             cmd.extend(['--focus-card-id', str(card_id)])
+    cmd.extend(['--progress-file', os.path.relpath(TRAINING_PROGRESS_PATH, backend_dir)])
     try:
         with open(log_path, 'w', encoding='utf-8') as logf:
             logf.write(f"[{datetime.now().isoformat(timespec='seconds')}] Starting ORB retrain\n")
@@ -512,33 +875,10 @@ def _run_orb_training_job(trigger: str, card_id: int | None, card_name: str | No
             # (so the HTTP request can return immediately).
             if trigger in {'card_add', 'card_replace'} and card_id is not None and card_name:
                 try:
-                    conn = None
-                    cursor = None
-                    conn = connect_db()
-                    cursor = conn.cursor(dictionary=True)
-                    cursor.execute(
-                        """
-                        SELECT c.category_name
-                        FROM TBL_CARD_ASSETS ca
-                        JOIN TBL_CATEGORIES c ON c.category_id = ca.category_id
-                        WHERE ca.card_id = %s
-                        LIMIT 1
-                        """,
-                        (card_id,),
-                    )
-                    row = cursor.fetchone()
-                    category_name = str(row['category_name']) if row and row.get('category_name') else None
+                    category_name = card_category_name(card_id)
                 except Exception as variant_db_err:
                     category_name = None
                     logf.write(f"[{datetime.now().isoformat(timespec='seconds')}] Variant lookup failed: {variant_db_err}\n")
-                finally:
-                    try:
-                        if cursor:
-                            cursor.close()
-                        if conn:
-                            conn.close()
-                    except Exception:
-                        pass
 
                 if category_name:
                     safe_name = card_name.replace(' ', '_').replace('-', '_')
@@ -549,12 +889,15 @@ def _run_orb_training_job(trigger: str, card_id: int | None, card_name: str | No
                         logf.write(f"[{datetime.now().isoformat(timespec='seconds')}] Generating variants from {png_full_path}\n")
                         logf.flush()
                         try:
+                            orb_progress.emit('phase', phase='variants')
                             written = generate_variants_for_card(png_full_path, variants_dir, safe_name)
                             logf.write(f"[{datetime.now().isoformat(timespec='seconds')}] Variants generated: {written}\n")
                             logf.flush()
+                            orb_progress.emit('variants', written=written)
                         except Exception as variant_err:
                             logf.write(f"[{datetime.now().isoformat(timespec='seconds')}] Variant generation failed: {variant_err}\n")
                             logf.flush()
+                            orb_progress.emit('variants', written=0, error=str(variant_err))
                     else:
                         logf.write(f"[{datetime.now().isoformat(timespec='seconds')}] PNG not found for variants: {png_full_path}\n")
                         logf.flush()
@@ -571,27 +914,26 @@ def _run_orb_training_job(trigger: str, card_id: int | None, card_name: str | No
             )
             logf.write(f"\n[{datetime.now().isoformat(timespec='seconds')}] Finished with exit_code={proc.returncode}\n")
             logf.flush()
+        orb_progress.emit('trainer_exit', exit_code=proc.returncode)
 
         if proc.returncode != 0:
-            _update_training_status(
-                state='failed',
-                ended_at=datetime.now().isoformat(timespec='seconds'),
-                last_error=f"train_orb.py exited with code {proc.returncode}",
-            )
+            _finish_orb_training('failed', f"train_orb.py exited with code {proc.returncode}")
             print(f"❌ ORB retrain failed (code {proc.returncode}). See log: {log_path}")
             return
 
-        if trigger in {'card_add', 'card_replace'}:
+        if inference_client is not None:
+            if trigger in {'card_add', 'card_replace'}:
+                reloaded = notify_recognizer_reload('cards', 'incremental')
+            else:
+                reloaded = notify_recognizer_reload('cards', 'orb', 'incremental')
+        elif trigger in {'card_add', 'card_replace'}:
             reloaded = load_incremental_orb_model()
         else:
             reloaded = load_orb_model()
             load_incremental_orb_model()
+        orb_progress.emit('reload', ok=bool(reloaded))
         if not reloaded:
-            _update_training_status(
-                state='failed',
-                ended_at=datetime.now().isoformat(timespec='seconds'),
-                last_error='Training finished but ORB reload failed',
-            )
+            _finish_orb_training('failed', 'Training finished but ORB reload failed')
             print("❌ ORB retrain completed but model reload failed")
             return
 
@@ -600,18 +942,10 @@ def _run_orb_training_job(trigger: str, card_id: int | None, card_name: str | No
             if removed > 0:
                 print(f"🧹 Cleaned up {removed} generated variant files for card_id={card_id}")
 
-        _update_training_status(
-            state='completed',
-            ended_at=datetime.now().isoformat(timespec='seconds'),
-            last_error=None,
-        )
+        _finish_orb_training('completed')
         print("✅ ORB retrain completed and model reloaded")
     except Exception as e:
-        _update_training_status(
-            state='failed',
-            ended_at=datetime.now().isoformat(timespec='seconds'),
-            last_error=str(e),
-        )
+        _finish_orb_training('failed', str(e))
         try:
             with open(log_path, 'a', encoding='utf-8') as logf:
                 logf.write(f"\n[{datetime.now().isoformat(timespec='seconds')}] Exception: {e}\n")
@@ -620,33 +954,136 @@ def _run_orb_training_job(trigger: str, card_id: int | None, card_name: str | No
         print(f"❌ ORB retrain exception: {e}")
 
 
-def maybe_start_orb_retrain(trigger: str, card_id: int | None, card_name: str | None) -> tuple[bool, str]:
-    snap = get_training_status_snapshot()
-    if snap.get('state') == 'running':
-        return False, 'ORB retraining already running'
+def reserve_orb_retrain(trigger: str, card_id: int | None, card_name: str | None) -> tuple[bool, str]:
+    """Mark a retrain as queued unless one is already queued or running, and start its event stream."""
+    global orb_progress
+    with training_status_lock:
+        if training_status.get('state') in ('queued', 'running'):
+            return False, 'ORB retraining already running'
+        try:
+            orb_progress = ProgressWriter.start_run(
+                TRAINING_PROGRESS_PATH, trigger=trigger, card_id=card_id, card_name=card_name,
+            )
+        except OSError as e:
+            print(f"⚠️ Could not start retrain progress file: {e}")
+            orb_progress = ProgressWriter(None)
+        training_status.update(
+            state='queued',
+            started_at=None,
+            ended_at=None,
+            last_error=None,
+            last_trigger=trigger,
+            last_card_id=card_id,
+            last_card_name=card_name,
+        )
+    return True, 'ORB retraining queued'
 
+
+def start_orb_retrain_thread(trigger: str, card_id: int | None, card_name: str | None) -> None:
+    """Run a reserved retrain (see reserve_orb_retrain) in a background thread."""
     thread = threading.Thread(
         target=_run_orb_training_job,
         args=(trigger, card_id, card_name),
         daemon=True,
     )
-    _update_training_status(
-        state='queued',
-        started_at=None,
+    thread.start()
+
+
+def maybe_start_orb_retrain(trigger: str, card_id: int | None, card_name: str | None) -> tuple[bool, str]:
+    reserved, msg = reserve_orb_retrain(trigger, card_id, card_name)
+    if not reserved:
+        return False, msg
+    start_orb_retrain_thread(trigger, card_id, card_name)
+    return True, 'ORB retraining started in background'
+
+
+def _get_card_asset_executor() -> ThreadPoolExecutor:
+    # Threads do not survive fork(); each worker process gets its own.
+    global card_asset_executor, card_asset_executor_pid
+    if card_asset_executor is None or card_asset_executor_pid != os.getpid():
+        card_asset_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='card-assets')
+        card_asset_executor_pid = os.getpid()
+    return card_asset_executor
+
+
+def _write_encoded_image(path: str, img, ext: str, params: list) -> None:
+    """Encode and write atomically, so /assets and thumbnails never read a half-written file."""
+    ok, encoded = cv2.imencode(ext, img, params)
+    if not ok:
+        raise ValueError(f"Could not encode {os.path.basename(path)}")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(encoded.tobytes())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _run_card_asset_job(card_id: int, card_name: str, img_saved, png_full_path: str, webp_full_path: str,
+                        webp_db_path: str, old_image_path: str | None, retrain_trigger: str | None):
+    """Background half of one-shot learning: save the training PNG and display WebP,
+    refresh the asset caches, then start the reserved incremental retrain (it reads the PNG)."""
+    _update_card_asset_status(
+        state='running',
+        card_id=card_id,
+        card_name=card_name,
+        started_at=datetime.now().isoformat(timespec='seconds'),
         ended_at=None,
         last_error=None,
-        last_trigger=trigger,
-        last_card_id=card_id,
-        last_card_name=card_name,
     )
-    thread.start()
-    return True, 'ORB retraining started in background'
+    try:
+        _write_encoded_image(png_full_path, img_saved, '.png', [cv2.IMWRITE_PNG_COMPRESSION, 1])
+        print(f"📸 Saved training PNG: {png_full_path}")
+        _write_encoded_image(webp_full_path, img_saved, '.webp', [cv2.IMWRITE_WEBP_QUALITY, 85])
+        print(f"🌐 Saved display WebP: {webp_full_path}")
+        asset_cache.invalidate(*filter(None, (asset_relative_path(webp_db_path), asset_relative_path(old_image_path))))
+        generate_card_thumbnails(webp_db_path)
+    except Exception as e:
+        with card_asset_status_lock:
+            card_asset_status['pending'] = max(0, card_asset_status['pending'] - 1)
+            card_asset_status.update(state='failed', ended_at=datetime.now().isoformat(timespec='seconds'), last_error=str(e))
+        print(f"❌ Saving card images failed for card_id={card_id}: {e}")
+        if retrain_trigger:
+            orb_progress.emit('assets', ok=False, card_id=card_id, error=str(e))
+            _finish_orb_training('failed', f"Saving card images failed: {e}")
+        return
+
+    with card_asset_status_lock:
+        card_asset_status['pending'] = max(0, card_asset_status['pending'] - 1)
+        card_asset_status.update(state='completed', ended_at=datetime.now().isoformat(timespec='seconds'))
+    if retrain_trigger:
+        orb_progress.emit('assets', ok=True, card_id=card_id)
+        start_orb_retrain_thread(retrain_trigger, card_id, card_name)
+
+
+def queue_card_assets(card_id: int, card_name: str, img_saved, png_full_path: str, webp_full_path: str,
+                      webp_db_path: str, old_image_path: str | None, retrain_trigger: str | None) -> None:
+    with card_asset_status_lock:
+        card_asset_status['pending'] += 1
+        if card_asset_status['state'] != 'running':
+            card_asset_status.update(state='queued', card_id=card_id, card_name=card_name)
+    _get_card_asset_executor().submit(
+        _run_card_asset_job, card_id, card_name, img_saved, png_full_path, webp_full_path,
+        webp_db_path, old_image_path, retrain_trigger,
+    )
 
 
 def rebuild_orb_extractor():
-    """Rebuild ORB extractor when dynamic feature settings change."""
+    """Drop the ORB extractor so the next use rebuilds it with current feature settings."""
+    global orb
+    orb = None
+
+
+def get_orb_extractor():
+    """ORB extractor, created on first use (only ORB matching and one-shot need it)."""
     global orb
-    orb = cv2.ORB_create(
+    extractor = orb
+    if extractor is not None:
+        return extractor
+    extractor = cv2.ORB_create(
         nfeatures=max(100, int(ORB_FEATURES)),
         scaleFactor=1.2,
         nlevels=8,
@@ -657,6 +1094,15 @@ def rebuild_orb_extractor():
         patchSize=31,
         fastThreshold=20
     )
+    orb = extractor
+    return extractor
+
+
+def get_bf_matcher():
+    global bf
+    if bf is None:
+        bf = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=False)
+    return bf
 
 
 def _to_bool(value):
@@ -671,6 +1117,7 @@ def apply_config_value(config_key, config_value):
     global CNN_ENSEMBLE_ENABLED, CNN_ENSEMBLE_RUNS, CNN_ENSEMBLE_EARLY_EXIT_CONFIDENCE
     global CNN_ENSEMBLE_EARLY_EXIT_MARGIN, CNN_ENSEMBLE_MARGIN_THRESHOLD
     global INCREMENTAL_OVERRIDE_MARGIN, PREFER_BASE_MODEL
+    global STREAM_SCAN_ENABLED, STREAM_BURST_FRAMES, CAPTURE_MAX_SIDE
 
     if config_key == 'orb_feature_count':
         ORB_FEATURES = max(100, int(config_value))
@@ -702,10 +1149,17 @@ def apply_config_value(config_key, config_value):
         INCREMENTAL_OVERRIDE_MARGIN = max(0.0, min(0.6, float(config_value)))
     elif config_key == 'prefer_base_model':
         PREFER_BASE_MODEL = _to_bool(config_value)
+    elif config_key == 'stream_scan_enabled':
+        STREAM_SCAN_ENABLED = _to_bool(config_value)
+    elif config_key == 'stream_burst_frames':
+        STREAM_BURST_FRAMES = max(2, min(STREAM_BURST_MAX_FRAMES, int(config_value)))
+    elif config_key == 'capture_max_side':
+        CAPTURE_MAX_SIDE = max(224, min(1280, int(config_value)))
     elif config_key == 'min_confidence_score':
         CONFIDENCE_THRESHOLD = max(0.1, min(1.0, float(config_value)))
     elif config_key == 'session_timeout_minutes':
         SESSION_TIMEOUT_MINUTES = max(1, int(config_value))
+        kiosk_sessions.timeout_seconds = SESSION_TIMEOUT_MINUTES * 60
     elif config_key == 'webcam_fps':
         WEBCAM_FPS = max(1, int(config_value))
     elif config_key == 'roi_box_color':
@@ -715,45 +1169,38 @@ def apply_config_value(config_key, config_value):
     elif config_key == 'model_version':
         MODEL_VERSION = str(config_value)
 
+    bump_recognizer_version()
+
 
 def ensure_system_config_defaults():
     """Seed missing config keys without overwriting existing admin-tuned values."""
-    conn = connect_db()
-    cursor = conn.cursor(dictionary=True)
-
-    if DEPRECATED_CONFIG_KEYS:
-        placeholders = ','.join(['%s'] * len(DEPRECATED_CONFIG_KEYS))
-        cursor.execute(
-            f"DELETE FROM TBL_SYSTEM_CONFIG WHERE config_key IN ({placeholders})",
-            tuple(DEPRECATED_CONFIG_KEYS),
-        )
+    with db.cursor(dictionary=True, commit=True) as cursor:
+        if DEPRECATED_CONFIG_KEYS:
+            placeholders = ','.join(['%s'] * len(DEPRECATED_CONFIG_KEYS))
+            cursor.execute(
+                f"DELETE FROM TBL_SYSTEM_CONFIG WHERE config_key IN ({placeholders})",
+                tuple(DEPRECATED_CONFIG_KEYS),
+            )
 
-    cursor.execute("SELECT config_key FROM TBL_SYSTEM_CONFIG")
-    existing = {row['config_key'] for row in cursor.fetchall()}
-
-    missing = [cfg for cfg in SYSTEM_CONFIG_DEFAULTS if cfg[0] not in existing]
-    if missing:
-        cursor.executemany(
-            """
-            INSERT INTO TBL_SYSTEM_CONFIG (config_key, config_value, value_type, description, is_editable)
-            VALUES (%s, %s, %s, %s, %s)
-            """,
-            missing,
-        )
-        conn.commit()
+        cursor.execute("SELECT config_key FROM TBL_SYSTEM_CONFIG")
+        existing = {row['config_key'] for row in cursor.fetchall()}
 
-    cursor.close()
-    conn.close()
+        missing = [cfg for cfg in SYSTEM_CONFIG_DEFAULTS if cfg[0] not in existing]
+        if missing:
+            cursor.executemany(
+                """
+                INSERT INTO TBL_SYSTEM_CONFIG (config_key, config_value, value_type, description, is_editable)
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                missing,
+            )
 
 
 def load_runtime_config_from_db():
     """Load dynamic settings from TBL_SYSTEM_CONFIG on startup."""
     try:
         ensure_system_config_defaults()
-        conn = connect_db()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT config_key, config_value FROM TBL_SYSTEM_CONFIG")
-        rows = cursor.fetchall()
+        rows = db.query("SELECT config_key, config_value FROM TBL_SYSTEM_CONFIG")
 
         for row in rows:
             try:
@@ -761,47 +1208,44 @@ def load_runtime_config_from_db():
             except Exception as cfg_err:
                 print(f"⚠️ Skipping config '{row['config_key']}': {cfg_err}")
 
-        cursor.close()
-        conn.close()
         print("✅ Runtime config loaded from database")
     except Exception as e:
         print(f"⚠️ Runtime config load failed, using defaults: {e}")
 
 def connect_db():
-    """Get connection from pool for faster access"""
-    if db_pool:
-        try:
-            return db_pool.get_connection()
-        except Exception:
-            pass
-    return mysql.connector.connect(**DB_CONFIG)
+    """Check out a pooled connection; close() returns it (see db.Database.connect)."""
+    return db.connect()
 
 def load_model():
     """Loads the database into RAM on startup (Warm Start)"""
-    global golden_dataset, card_metadata, category_metadata
+    global golden_dataset, card_metadata, category_metadata, dataset_stamp, catalog_stamp
+
+    dataset_stamp = model_file_stamp(DATASET_STAMP_PATH)
+    catalog_stamp = model_file_stamp(CATALOG_STAMP_PATH)
     
     print("🧠 Loading Universal Golden Dataset...")
     try:
-        conn = connect_db()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Load Categories
-        cursor.execute("SELECT category_id, category_name FROM TBL_CATEGORIES")
-        for row in cursor.fetchall():
-            category_metadata[row['category_id']] = row['category_name']
-            
-        # Load Card Names and metadata
-        cursor.execute("SELECT card_id, card_name, category_id, image_path FROM TBL_CARD_ASSETS WHERE is_active = 1")
-        for row in cursor.fetchall():
-            card_metadata[row['card_id']] = {
-                'name': row['card_name'],
-                'category_id': row['category_id'],
-                'image_path': row.get('image_path') or ''
-            }
-            
-        # Load Feature Vectors
-        cursor.execute("SELECT card_id, feature_vector FROM TBL_GOLDEN_DATASET")
-        rows = cursor.fetchall()
+        with db.cursor(dictionary=True) as cursor:
+            # Load Categories
+            cursor.execute("SELECT category_id, category_name FROM TBL_CATEGORIES")
+            for row in cursor.fetchall():
+                category_metadata[row['category_id']] = row['category_name']
+
+            # Load Card Names and metadata
+            cursor.execute("SELECT card_id, card_name, category_id, image_path FROM TBL_CARD_ASSETS WHERE is_active = 1")
+            for row in cursor.fetchall():
+                card_metadata[row['card_id']] = {
+                    'name': row['card_name'],
+                    'category_id': row['category_id'],
+                    'image_path': row.get('image_path') or ''
+                }
+
+            # Versioned snapshot for the gallery/asset endpoints (catalog.py)
+            card_catalog.load(cursor)
+
+            # Load Feature Vectors
+            cursor.execute("SELECT card_id, feature_vector FROM TBL_GOLDEN_DATASET")
+            rows = cursor.fetchall()
         
         golden_dataset = []
         for row in rows:
@@ -812,7 +1256,7 @@ def load_model():
             })
             
         print(f"✅ Model Loaded: {len(golden_dataset)} feature sets, {len(card_metadata)} unique cards")
-        conn.close()
+        bump_recognizer_version()
         return True
     except Exception as e:
         print(f"❌ Error loading model: {e}")
@@ -869,12 +1313,144 @@ def maybe_auto_run_training_if_needed() -> bool:
         return False
 
 
+def model_file_stamp(*paths):
+    """mtime fingerprint of model/label files (None for missing files)."""
+    stamp = []
+    for path in paths:
+        try:
+            stamp.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def maybe_reload_models_from_disk():
+    """Reload models another worker process retrained (throttled, non-blocking).
+
+    Each worker holds its own copy of the nets; the worker that ran train_orb.py reloads
+    itself, the others notice the new model files here.
+    """
+    global last_model_reload_check
+
+    now = time.monotonic()
+    if now - last_model_reload_check < MODEL_RELOAD_CHECK_SECONDS:
+        return
+    if not model_reload_lock.acquire(blocking=False):
+        return
+    try:
+        last_model_reload_check = now
+        if MULTI_PROCESS_SERVING:
+            maybe_reload_runtime_config()
+            maybe_reload_catalog()
+
+        if inference_client is not None:
+            return  # The sidecar watches the model files itself.
+
+        orb_stamp = model_file_stamp(ORB_MODEL_PATH, ORB_LABELS_PATH)
+        incremental_stamp = model_file_stamp(ORB_INCREMENTAL_MODEL_PATH, ORB_INCREMENTAL_LABELS_PATH)
+        current_dataset_stamp = model_file_stamp(DATASET_STAMP_PATH)
+        orb_changed = orb_stamp != orb_model_stamp
+        incremental_changed = incremental_stamp != incremental_model_stamp
+        dataset_changed = current_dataset_stamp != dataset_stamp
+        if not orb_changed and not incremental_changed and not dataset_changed:
+            return
+
+        newest = max([t for t in orb_stamp + incremental_stamp + current_dataset_stamp if t is not None], default=0)
+        if time.time_ns() - newest < MODEL_RELOAD_SETTLE_SECONDS * 1_000_000_000:
+            return
+
+        print("🔄 Model files changed on disk; reloading in this worker")
+        # Retrains follow card changes, so refresh card data alongside the nets.
+        load_model()
+        if orb_changed:
+            load_orb_model()
+        if incremental_changed:
+            load_incremental_orb_model()
+    finally:
+        model_reload_lock.release()
+
+
+def reload_catalog() -> bool:
+    global catalog_stamp
+    try:
+        catalog_stamp = model_file_stamp(CATALOG_STAMP_PATH)
+        with db.cursor(dictionary=True) as cursor:
+            card_catalog.load(cursor)
+        return True
+    except Exception as e:
+        print(f"⚠️ Catalog reload failed: {e}")
+        return False
+
+
+def publish_catalog_change():
+    """Let other worker processes know their catalog snapshot is stale."""
+    global catalog_stamp
+    try:
+        Path(CATALOG_STAMP_PATH).touch()
+        catalog_stamp = model_file_stamp(CATALOG_STAMP_PATH)
+    except OSError as e:
+        print(f"⚠️ Could not touch catalog stamp: {e}")
+
+
+def maybe_reload_catalog():
+    """Reload the card catalog when another worker process edited it."""
+    if model_file_stamp(CATALOG_STAMP_PATH) != catalog_stamp:
+        reload_catalog()
+
+
+def maybe_reload_runtime_config():
+    """Re-apply TBL_SYSTEM_CONFIG when another worker process changed it."""
+    global runtime_config_stamp
+    try:
+        row = db.query_one("SELECT MAX(last_modified), COUNT(*) FROM TBL_SYSTEM_CONFIG", dictionary=False)
+        stamp = tuple(row or ())
+    except Exception as e:
+        print(f"⚠️ Config change check failed: {e}")
+        return
+
+    if runtime_config_stamp is None:
+        runtime_config_stamp = stamp
+    elif stamp != runtime_config_stamp:
+        runtime_config_stamp = stamp
+        load_runtime_config_from_db()
+
+
+def reload_recognizer(parts) -> dict:
+    """Reload selected recognizer state: 'cards', 'config', 'orb', 'incremental'."""
+    parts = set(parts or [])
+    reloaded = {}
+    if 'cards' in parts:
+        reloaded['cards'] = load_model()
+    if 'config' in parts:
+        load_runtime_config_from_db()
+        reloaded['config'] = True
+    if 'orb' in parts:
+        reloaded['orb'] = load_orb_model()
+    if 'incremental' in parts:
+        reloaded['incremental'] = load_incremental_orb_model()
+    return {"status": "success", "reloaded": reloaded, "recognizer_version": recognizer_version}
+
+
+def notify_recognizer_reload(*parts) -> bool:
+    """Tell the inference sidecar to reload; no-op (True) when recognition is in-process."""
+    if inference_client is None:
+        return True
+    try:
+        response = inference_client.reload(parts)
+        return all(response.get('reloaded', {}).values())
+    except Exception as e:
+        print(f"⚠️ Inference sidecar reload failed ({', '.join(parts)}): {e}")
+        return False
+
+
 def load_orb_model():
     """Loads optional ONNX ORB-fallback model and class mappings for hybrid fallback."""
-    global orb_fallback_net, orb_fallback_class_to_card_id
+    global orb_fallback_net, orb_fallback_class_to_card_id, orb_model_stamp
 
     orb_fallback_net = None
     orb_fallback_class_to_card_id = {}
+    orb_model_stamp = model_file_stamp(ORB_MODEL_PATH, ORB_LABELS_PATH)
+    bump_recognizer_version()
 
     if not os.path.exists(ORB_MODEL_PATH):
         print("ℹ️ ORB fallback disabled: model file not found")
@@ -912,6 +1488,7 @@ def load_orb_model():
 
         orb_fallback_net = net
         orb_fallback_class_to_card_id = class_map
+        bump_recognizer_version()
         print(f"✅ ORB fallback loaded: {len(orb_fallback_class_to_card_id)} classes")
         return True
     except Exception as e:
@@ -924,23 +1501,20 @@ def load_orb_model():
 def get_incremental_card_ids() -> list[int]:
     """Returns active cards created/updated via one-shot flow for incremental model."""
     try:
-        conn = connect_db()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(
-            """
-            SELECT card_id
-            FROM TBL_CARD_ASSETS
-            WHERE is_active = 1
-              AND (
-                description LIKE '%One-shot learned card%'
-                OR description LIKE '%One-Shot Learning%'
-              )
-            ORDER BY card_id
-            """
-        )
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        with db.cursor(dictionary=True) as cursor:
+            cursor.execute(
+                """
+                SELECT card_id
+                FROM TBL_CARD_ASSETS
+                WHERE is_active = 1
+                  AND (
+                    description LIKE '%One-shot learned card%'
+                    OR description LIKE '%One-Shot Learning%'
+                  )
+                ORDER BY card_id
+                """
+            )
+            rows = cursor.fetchall()
         return [int(r['card_id']) for r in rows]
     except Exception as e:
         print(f"⚠️ Failed to fetch incremental card IDs: {e}")
@@ -950,33 +1524,23 @@ def get_incremental_card_ids() -> list[int]:
 def get_anchor_card_id(exclude_ids: set[int]) -> int | None:
     """Pick one active non-incremental card as anchor for one-class training."""
     try:
-        conn = connect_db()
-        cursor = conn.cursor(dictionary=True)
-
         if exclude_ids:
             placeholders = ','.join(['%s'] * len(exclude_ids))
-            sql = f"""
+            row = db.query_one(f"""
                 SELECT card_id
                 FROM TBL_CARD_ASSETS
                 WHERE is_active = 1 AND card_id NOT IN ({placeholders})
                 ORDER BY card_id
                 LIMIT 1
-            """
-            cursor.execute(sql, tuple(sorted(exclude_ids)))
+            """, tuple(sorted(exclude_ids)))
         else:
-            cursor.execute(
-                """
+            row = db.query_one("""
                 SELECT card_id
                 FROM TBL_CARD_ASSETS
                 WHERE is_active = 1
                 ORDER BY card_id
                 LIMIT 1
-                """
-            )
-
-        row = cursor.fetchone()
-        cursor.close()
-        conn.close()
+            """)
         return int(row['card_id']) if row else None
     except Exception as e:
         print(f"⚠️ Failed to fetch anchor card: {e}")
@@ -986,10 +1550,13 @@ def get_anchor_card_id(exclude_ids: set[int]) -> int | None:
 def load_incremental_orb_model():
     """Loads incremental ONNX model trained only on one-shot cards."""
     global incremental_orb_net, incremental_orb_class_to_card_id, incremental_allowed_card_ids
+    global incremental_model_stamp
 
     incremental_orb_net = None
     incremental_orb_class_to_card_id = {}
+    incremental_model_stamp = model_file_stamp(ORB_INCREMENTAL_MODEL_PATH, ORB_INCREMENTAL_LABELS_PATH)
     incremental_allowed_card_ids = set(get_incremental_card_ids())
+    bump_recognizer_version()
 
     if not os.path.exists(ORB_INCREMENTAL_MODEL_PATH):
         print('ℹ️ Incremental ORB disabled: model file not found')
@@ -1021,6 +1588,7 @@ def load_incremental_orb_model():
 
         incremental_orb_net = net
         incremental_orb_class_to_card_id = class_map
+        bump_recognizer_version()
         print(f"✅ Incremental ORB loaded: {len(incremental_orb_class_to_card_id)} classes")
         return True
     except Exception as e:
@@ -1189,21 +1757,92 @@ def run_cnn_ensemble(net, image_bgr, class_to_card_map, allowed_card_ids: set[in
     return mean_probs, len(all_probs), margin
 
 
-def predict_waste_orb_fallback(image_bgr, allowed_card_ids: set[int] | None = None):
-    """Runs ORB fallback inference and returns ORB-compatible response shape.
+class BurstFusion:
+    """Running mean of one CNN pass per frame and model over a streaming-scan burst.
 
-    When allowed_card_ids is provided, the prediction is constrained to those card IDs.
+    Frames are added one at a time. A model stops taking passes once its fused
+    distribution clears its confidence threshold and the ambiguity margin; the burst
+    is settled when every model is settled or already agrees with a settled model,
+    so the caller can stop before decoding or card-checking the remaining frames.
+    """
+
+    def __init__(self, models, allowed_card_ids: set[int] | None = None):
+        """models maps a name to (net, class_to_card_map, confidence_threshold)."""
+        self.allowed_card_ids = allowed_card_ids
+        self.frames = 0
+        self._models = {
+            name: {'net': net, 'map': class_map, 'threshold': threshold,
+                   'sum': None, 'used': 0, 'settled': False}
+            for name, (net, class_map, threshold) in models.items()
+            if net is not None and class_map
+        }
+
+    def add(self, frame) -> None:
+        self.frames += 1
+        for state in self._models.values():
+            if state['settled']:
+                continue
+            probs = _infer_best_probs_from_net(state['net'], frame)
+            probs = _mask_probs_to_allowed_cards(probs, state['map'], self.allowed_card_ids)
+            if probs is None:
+                continue
+
+            state['sum'] = probs.copy() if state['sum'] is None else state['sum'] + probs
+            state['used'] += 1
+            fused_conf, fused_margin, _ = _top_confidence_and_margin(state['sum'] / state['used'])
+            state['settled'] = fused_conf >= state['threshold'] and fused_margin >= CNN_ENSEMBLE_MARGIN_THRESHOLD
+
+    @staticmethod
+    def _top_card(state):
+        if state['sum'] is None:
+            return None
+        return state['map'].get(int(np.argmax(state['sum'])))
+
+    def settled(self) -> bool:
+        states = list(self._models.values())
+        if not states:
+            return self.frames > 0  # No recognizer loaded: more frames cannot help
+        settled_cards = {self._top_card(s) for s in states if s['settled']}
+        if not settled_cards:
+            return False
+        return all(s['settled'] or self._top_card(s) in settled_cards for s in states)
+
+    def fused(self, name: str):
+        """(mean_probs, frames_used, margin) for one model, shaped like run_cnn_ensemble()."""
+        state = self._models.get(name)
+        if state is None or state['sum'] is None:
+            return None, 0, 0.0
+
+        mean_probs = state['sum'] / state['used']
+        total = float(np.sum(mean_probs))
+        if total <= 0.0:
+            return None, 0, 0.0
+
+        mean_probs = mean_probs / total
+        _, margin, _ = _top_confidence_and_margin(mean_probs)
+        return mean_probs, state['used'], margin
+
+
+def predict_waste_orb_fallback(image_bgr, allowed_card_ids: set[int] | None = None, fused=None):
+    """Runs ORB fallback inference and returns ORB-compatible response shape.
+
+    When allowed_card_ids is provided, the prediction is constrained to those card IDs.
+    When fused is provided (BurstFusion.fused() of a streaming burst), it is used
+    instead of running the brightness ensemble on image_bgr.
     """
     if orb_fallback_net is None or not orb_fallback_class_to_card_id:
         return {"status": "unknown", "reason": "orb_unavailable"}
 
     try:
-        probs, used_runs, conf_margin = run_cnn_ensemble(
-            orb_fallback_net,
-            image_bgr,
-            orb_fallback_class_to_card_id,
-            allowed_card_ids=allowed_card_ids,
-        )
+        if fused is not None:
+            probs, used_runs, conf_margin = fused
+        else:
+            probs, used_runs, conf_margin = run_cnn_ensemble(
+                orb_fallback_net,
+                image_bgr,
+                orb_fallback_class_to_card_id,
+                allowed_card_ids=allowed_card_ids,
+            )
 
         if probs is None:
             return {"status": "unknown", "reason": "orb_inference_failed"}
@@ -1258,21 +1897,25 @@ def predict_waste_orb_fallback(image_bgr, allowed_card_ids: set[int] | None = No
         return {"status": "unknown", "reason": f"orb_fallback_error:{str(e)}"}
 
 
-def predict_waste_incremental_orb(image_bgr, allowed_card_ids: set[int] | None = None):
+def predict_waste_incremental_orb(image_bgr, allowed_card_ids: set[int] | None = None, fused=None):
     """Runs incremental ORB first for one-shot classes only.
 
     When allowed_card_ids is provided, the prediction is constrained to those card IDs.
+    When fused is provided (BurstFusion.fused() of a streaming burst), it is used as-is.
     """
     if incremental_orb_net is None or not incremental_orb_class_to_card_id:
         return {"status": "unknown", "reason": "incremental_orb_unavailable"}
 
     try:
-        probs, used_runs, conf_margin = run_cnn_ensemble(
-            incremental_orb_net,
-            image_bgr,
-            incremental_orb_class_to_card_id,
-            allowed_card_ids=allowed_card_ids,
-        )
+        if fused is not None:
+            probs, used_runs, conf_margin = fused
+        else:
+            probs, used_runs, conf_margin = run_cnn_ensemble(
+                incremental_orb_net,
+                image_bgr,
+                incremental_orb_class_to_card_id,
+                allowed_card_ids=allowed_card_ids,
+            )
 
         if probs is None:
             return {"status": "unknown", "reason": "incremental_orb_inference_failed"}
@@ -1413,10 +2056,8 @@ def mask_white_background(image_bgr):
     return result
 
 # --- IMPROVED ORB-KNN ALGORITHM ---
-orb = None
-rebuild_orb_extractor()
-
-bf = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=False)
+orb = None  # See get_orb_extractor()
+bf = None  # See get_bf_matcher()
 
 
 def get_orb_fallback_topk(image_bgr, top_k=3):
@@ -1503,7 +2144,7 @@ def get_orb_topk(image_bgr, top_k=3):
 
     masked = mask_white_background(image_bgr)
     preprocessed = preprocess_image(masked, aggressive=is_blurry)
-    kp, des = orb.detectAndCompute(preprocessed, None)
+    kp, des = get_orb_extractor().detectAndCompute(preprocessed, None)
     if des is None or len(kp) < 8:
         return []
 
@@ -1515,7 +2156,7 @@ def get_orb_topk(image_bgr, top_k=3):
             continue
         try:
             k_neighbors = max(2, int(KNN_K))
-            matches = bf.knnMatch(des, train_des, k=k_neighbors)
+            matches = get_bf_matcher().knnMatch(des, train_des, k=k_neighbors)
             good = 0
             for pair in matches:
                 if len(pair) < 2:
@@ -1673,7 +2314,7 @@ def predict_waste(image_bgr):
             else:
                 scaled = preprocessed
 
-            kp, des = orb.detectAndCompute(scaled, None)
+            kp, des = get_orb_extractor().detectAndCompute(scaled, None)
 
             if des is None or len(kp) < 8:
                 continue
@@ -1686,7 +2327,7 @@ def predict_waste(image_bgr):
                     continue
                 try:
                     k_neighbors = max(2, int(KNN_K))
-                    matches = bf.knnMatch(des, train_des, k=k_neighbors)
+                    matches = get_bf_matcher().knnMatch(des, train_des, k=k_neighbors)
                     good_matches = []
                     for pair in matches:
                         if len(pair) >= 2:
@@ -1810,6 +2451,294 @@ def predict_waste(image_bgr):
         "classifier": "orb"
     }
 
+def arbitrate_cnn_results(base_result, incremental_result):
+    """Combine base and incremental CNN results with base-preferred arbitration."""
+    inc_ok = incremental_result.get('status') == 'success'
+    base_ok = base_result.get('status') == 'success'
+
+    if base_ok and inc_ok:
+        base_card_id = base_result.get('card_id')
+        inc_card_id = incremental_result.get('card_id')
+        base_conf = float(base_result.get('confidence', 0.0) or 0.0)
+        inc_conf = float(incremental_result.get('confidence', 0.0) or 0.0)
+
+        if base_card_id == inc_card_id:
+            result = dict(base_result)
+            result['confidence'] = round((base_conf + inc_conf) / 2.0, 2)
+            result['classifier'] = 'cnn_consensus'
+        elif PREFER_BASE_MODEL:
+            if inc_conf >= base_conf + INCREMENTAL_OVERRIDE_MARGIN:
+                result = dict(incremental_result)
+                result['classifier'] = 'incremental_override'
+            else:
+                result = dict(base_result)
+                result['classifier'] = 'base_preferred'
+        else:
+            if base_conf >= inc_conf + INCREMENTAL_OVERRIDE_MARGIN:
+                result = dict(base_result)
+                result['classifier'] = 'base_override'
+            else:
+                result = dict(incremental_result)
+                result['classifier'] = 'incremental_preferred'
+    elif base_ok:
+        result = dict(base_result)
+        result['classifier'] = result.get('classifier', 'orb_fallback_only')
+    elif inc_ok:
+        result = dict(incremental_result)
+        result['classifier'] = result.get('classifier', 'incremental_orb_only')
+    else:
+        # Surface the more actionable unknown reason if available.
+        if base_result.get('reason') in {'ambiguous_match', 'orb_low_confidence'}:
+            result = dict(base_result)
+        else:
+            result = dict(incremental_result) if incremental_result.get('reason') else dict(base_result)
+
+    result['classifier'] = result.get('classifier', 'orb_fallback_only')
+    return result
+
+
+def card_logged_in_session(session_id, card_id) -> bool:
+    try:
+        return db.query_one("""
+            SELECT 1 FROM TBL_SCAN_TRANSACTIONS
+            WHERE session_id = %s AND card_id = %s
+            LIMIT 1
+        """, (session_id, card_id), dictionary=False) is not None
+    except Exception as e:
+        print(f"⚠️ Scan history lookup failed: {e}")
+        return False
+
+
+def apply_session_scan_effects(result, session):
+    """Apply per-session side effects of a successful scan.
+
+    Returns a replacement response when the scan must be rejected (already scanned),
+    otherwise None after logging the transaction.
+    """
+    # Don't auto-log in assessment mode - wait for user choice
+    if session is None or result['status'] != 'success':
+        return None
+
+    # Auto-log for instructional mode only
+    # Assessment mode will call /assessment/submit separately
+    if session.mode != 'instructional':
+        return None
+
+    card_id = result.get('card_id')
+    try:
+        card_id = int(card_id)
+    except (TypeError, ValueError):
+        card_id = None
+
+    with session.lock:
+        scanned = session.scanned_card_ids
+
+        if (card_id is not None and card_id not in scanned and MULTI_PROCESS_SERVING
+                and card_logged_in_session(session.session_id, card_id)):
+            # Scanned through another worker process since this copy was loaded.
+            scanned.add(card_id)
+
+        if card_id is not None and card_id in scanned:
+            return {
+                "status": "unknown",
+                "reason": "already_scanned",
+                "message": "Card already scanned in this session",
+                "card_id": card_id,
+                "card_name": result.get('card_name', ''),
+            }
+
+        if card_id is not None:
+            scanned.add(card_id)
+
+    log_scan_transaction(result, session.session_id)
+    return None
+
+
+def classify_image_bgr(img):
+    """Card-presence check plus both CNN models and arbitration, without session effects."""
+    if not is_eco_card_present(img):
+        return no_card_result()
+
+    # Run both models, then arbitrate with base-preferred logic.
+    incremental_result = predict_waste_incremental_orb(img)
+    base_result = predict_waste_orb_fallback(img)
+    return arbitrate_cnn_results(base_result, incremental_result)
+
+
+def frames_cache_key(frames) -> str:
+    """Result-cache key: recognizer version plus a perceptual hash of every frame."""
+    return f"{recognizer_version}:{len(frames)}:" + ','.join(perceptual_hash(f) for f in frames)
+
+
+def encoded_burst_cache_key(raw_frames) -> str:
+    """Result-cache key for a burst of still-encoded uploads (no decode needed to look it up)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for raw in raw_frames:
+        digest.update(len(raw).to_bytes(8, 'big'))
+        digest.update(raw)
+    return f"{recognizer_version}:burst:{digest.hexdigest()}"
+
+
+def classify_cached(key: str, compute):
+    """Run compute() through the short-lived result cache and in-flight coalescing.
+
+    A re-uploaded frozen frame is answered from memory and identical concurrent
+    uploads share one inference. Returns (result, cache_state) with cache_state in
+    hit/shared/miss.
+    """
+    cached = scan_result_cache.get(key)
+    if cached is not None:
+        return cached, 'hit'
+
+    def run():
+        value = compute()
+        scan_result_cache.put(key, value)
+        return value
+
+    value, shared = scan_inflight.do(key, run)
+    return dict(value), 'shared' if shared else 'miss'
+
+
+def no_card_result() -> dict:
+    return {
+        "status": "unknown",
+        "reason": "no_card_detected",
+        "classifier": "pre_check"
+    }
+
+
+def fuse_cnn_burst(frames, card_checked: bool = False):
+    """Both CNN models over a streaming burst, one pass per frame and model, then arbitration.
+
+    frames may be a lazy iterable that decodes on demand: fusion stops at the first
+    frame where the votes are settled, so later frames are never decoded or card-checked.
+    A burst with a single usable frame is answered from that frame's passes; it never
+    falls back to the brightness ensemble.
+    """
+    fusion = BurstFusion({
+        'base': (orb_fallback_net, orb_fallback_class_to_card_id, ORB_CONFIDENCE_THRESHOLD),
+        'incremental': (incremental_orb_net, incremental_orb_class_to_card_id,
+                        ORB_INCREMENTAL_CONFIDENCE_THRESHOLD),
+    })
+    for frame in frames:
+        if frame is None:
+            continue
+        # Frames where the card slipped out of view only dilute the fused vote.
+        if not card_checked and not is_eco_card_present(frame):
+            continue
+        fusion.add(frame)
+        if fusion.settled():
+            break
+
+    if fusion.frames == 0:
+        return no_card_result()
+
+    incremental_result = predict_waste_incremental_orb(None, fused=fusion.fused('incremental'))
+    base_result = predict_waste_orb_fallback(None, fused=fusion.fused('base'))
+    result = arbitrate_cnn_results(base_result, incremental_result)
+    result['frames_usable'] = fusion.frames
+    return result
+
+
+def classify_frames_local(frames):
+    """In-process recognition of one frame: card pre-check plus the brightness ensemble."""
+    return classify_cached(frames_cache_key(frames[:1]), lambda: classify_image_bgr(frames[0]))
+
+
+def preview_image_bgr(img):
+    """Live-preview recognition: card pre-check plus one CNN pass of one model.
+
+    Previews only light up the scan box, so they skip the brightness ensemble, the
+    second model and arbitration; the committed scan (classify_image_bgr) keeps them.
+    """
+    if not is_eco_card_present(img):
+        return no_card_result()
+
+    if orb_fallback_net is not None and orb_fallback_class_to_card_id:
+        net, predict = orb_fallback_net, predict_waste_orb_fallback
+    elif incremental_orb_net is not None and incremental_orb_class_to_card_id:
+        net, predict = incremental_orb_net, predict_waste_incremental_orb
+    else:
+        return {"status": "unknown", "reason": "orb_unavailable"}
+
+    probs = _infer_best_probs_from_net(net, img)
+    if probs is None:
+        return {"status": "unknown", "reason": "orb_inference_failed"}
+    _, margin, _ = _top_confidence_and_margin(probs)
+    return predict(None, fused=(probs, 1, margin))
+
+
+def classify_preview_local(frame):
+    """In-process live preview of one frame (sidecar entry point)."""
+    return classify_cached(frames_cache_key([frame]) + ':preview', lambda: preview_image_bgr(frame))
+
+
+def classify_burst_local(frames):
+    """In-process fusion of a burst of already card-checked frames (sidecar entry point)."""
+    return classify_cached(frames_cache_key(frames) + ':burst', lambda: fuse_cnn_burst(frames, card_checked=True))
+
+
+def recognize_frames(frames):
+    """Recognize one frame in-process or via the inference sidecar. Returns (result, cache_state)."""
+    if inference_client is None:
+        return classify_frames_local(frames)
+    result = inference_client.classify(frames)
+    return result, result.pop('result_cache', 'miss')
+
+
+def recognize_preview(frame):
+    """Live-preview one frame in-process or via the inference sidecar. Returns (result, cache_state)."""
+    if inference_client is None:
+        return classify_preview_local(frame)
+    result = inference_client.preview(frame)
+    return result, result.pop('result_cache', 'miss')
+
+
+def recognize_burst(raw_frames):
+    """Recognize a streaming burst of encoded frames. Returns (result, cache_state).
+
+    In-process, frames are decoded and card-checked one at a time and fusion stops as
+    soon as the votes settle. With the sidecar, the card-bearing frames are decoded
+    here and fused there.
+    """
+    if inference_client is None:
+        frames = (decode_scan_frame(raw) for raw in raw_frames)
+        return classify_cached(encoded_burst_cache_key(raw_frames), lambda: fuse_cnn_burst(frames))
+
+    frames = []
+    for raw in raw_frames:
+        frame = decode_scan_frame(raw)
+        if frame is not None and is_eco_card_present(frame):
+            frames.append(frame)
+    if not frames:
+        return no_card_result(), 'miss'
+    result = inference_client.classify_burst(frames)
+    return result, result.pop('result_cache', 'miss')
+
+
+def rank_top3_candidates(img):
+    """Top-3 ORB-fallback candidates for one frame as a response dict."""
+    candidates = get_orb_fallback_topk(img, top_k=3)
+    ranked = []
+    for c in candidates:
+        card = card_metadata.get(c['card_id'])
+        if not card:
+            continue
+        ranked.append({
+            'card_id': c['card_id'],
+            'card_name': card['name'],
+            'category_id': card['category_id'],
+            'category': category_metadata.get(card['category_id']),
+            'orb_fallback_score': round(float(c['score']), 4)
+        })
+
+    return {
+        'status': 'success' if ranked else 'unknown',
+        'classifier': 'orb_fallback_only',
+        'top_candidates': ranked
+    }
+
+
 # --- API ROUTES ---
 @app.route('/classify', methods=['POST'])
 def classify():
@@ -1817,143 +2746,270 @@ def classify():
     try:
         start_time = datetime.now()
         file = request.files['image']
-        img = decode_uploaded_image_to_bgr(file)
+        img = decode_scan_frame(file.read())
         
         if img is None:
             return jsonify({"status": "error", "message": "Invalid image"})
+
+        result, cache_state = recognize_frames([img])
+        result['result_cache'] = cache_state
+        if capture_profile_stale(request.headers.get(CAPTURE_PROFILE_HEADER)):
+            result['capture_profile_stale'] = True
+        if result.get('classifier') == 'pre_check':
+            return jsonify(result)
+
+        response_time = (datetime.now() - start_time).total_seconds() * 1000
+        result['response_time'] = round(response_time, 2)
+
+        rejected = apply_session_scan_effects(result, get_kiosk_session())
+        if rejected is not None:
+            return jsonify(rejected)
         
-        # --- NEW: CHECK FOR CARD PRESENCE ---
-        if not is_eco_card_present(img):
-            return jsonify({
-                "status": "unknown", 
-                "reason": "no_card_detected",
-                "classifier": "pre_check"
-            })
-        # ------------------------------------
+        return jsonify(result)
         
-        # Run both models, then arbitrate with base-preferred logic.
-        incremental_result = predict_waste_incremental_orb(img)
-        base_result = predict_waste_orb_fallback(img)
+    except Exception as e:
+        print(f"❌ Classification error: {e}")
+        return jsonify({"status": "error", "message": str(e)})
 
-        inc_ok = incremental_result.get('status') == 'success'
-        base_ok = base_result.get('status') == 'success'
 
-        if base_ok and inc_ok:
-            base_card_id = base_result.get('card_id')
-            inc_card_id = incremental_result.get('card_id')
-            base_conf = float(base_result.get('confidence', 0.0) or 0.0)
-            inc_conf = float(incremental_result.get('confidence', 0.0) or 0.0)
+@app.route('/classify/stream', methods=['POST'])
+def classify_stream():
+    """Streaming scan: fuse CNN probabilities across a short burst of frames.
 
-            if base_card_id == inc_card_id:
-                result = dict(base_result)
-                result['confidence'] = round((base_conf + inc_conf) / 2.0, 2)
-                result['classifier'] = 'cnn_consensus'
-            elif PREFER_BASE_MODEL:
-                if inc_conf >= base_conf + INCREMENTAL_OVERRIDE_MARGIN:
-                    result = dict(incremental_result)
-                    result['classifier'] = 'incremental_override'
-                else:
-                    result = dict(base_result)
-                    result['classifier'] = 'base_preferred'
-            else:
-                if base_conf >= inc_conf + INCREMENTAL_OVERRIDE_MARGIN:
-                    result = dict(base_result)
-                    result['classifier'] = 'base_override'
-                else:
-                    result = dict(incremental_result)
-                    result['classifier'] = 'incremental_preferred'
-        elif base_ok:
-            result = dict(base_result)
-            result['classifier'] = result.get('classifier', 'orb_fallback_only')
-        elif inc_ok:
-            result = dict(incremental_result)
-            result['classifier'] = result.get('classifier', 'incremental_orb_only')
-        else:
-            # Surface the more actionable unknown reason if available.
-            if base_result.get('reason') in {'ambiguous_match', 'orb_low_confidence'}:
-                result = dict(base_result)
-            else:
-                result = dict(incremental_result) if incremental_result.get('reason') else dict(base_result)
+    Expects multipart field 'frames' repeated once per frame (first frame = button press).
+    Frames are decoded, card-checked and given one CNN pass each in order; fusion stops
+    as soon as the running means are settled, so a confident first frame costs one pass.
+    """
+    try:
+        start_time = datetime.now()
+        uploads = request.files.getlist('frames')[:STREAM_BURST_MAX_FRAMES]
+        if not uploads:
+            return jsonify({"status": "error", "message": "No frames provided"})
+
+        result, cache_state = recognize_burst([upload.read() for upload in uploads])
+        result['result_cache'] = cache_state
+        result['frames_received'] = len(uploads)
+        if capture_profile_stale(request.headers.get(CAPTURE_PROFILE_HEADER)):
+            result['capture_profile_stale'] = True
+        if result.get('classifier') == 'pre_check':
+            return jsonify(result)
 
         response_time = (datetime.now() - start_time).total_seconds() * 1000
         result['response_time'] = round(response_time, 2)
-        result['classifier'] = result.get('classifier', 'orb_fallback_only')
-        
-        # Don't auto-log in assessment mode - wait for user choice
-        if current_session_id and result['status'] == 'success':
-            # Auto-log for instructional mode only
-            # Assessment mode will call /assessment/submit separately
-            if current_session_mode == 'instructional':
-                card_id = result.get('card_id')
-                try:
-                    card_id = int(card_id)
-                except (TypeError, ValueError):
-                    card_id = None
 
-                with session_subset_lock:
-                    scanned = current_session_scanned_card_ids
+        rejected = apply_session_scan_effects(result, get_kiosk_session())
+        if rejected is not None:
+            return jsonify(rejected)
 
-                    if card_id is not None and card_id in scanned:
-                        return jsonify({
-                            "status": "unknown",
-                            "reason": "already_scanned",
-                            "message": "Card already scanned in this session",
-                            "card_id": card_id,
-                            "card_name": result.get('card_name', ''),
-                        })
-
-                    if card_id is not None:
-                        scanned.add(card_id)
-
-                log_scan_transaction(result)
-        
         return jsonify(result)
-        
+
     except Exception as e:
-        print(f"❌ Classification error: {e}")
+        print(f"❌ Stream classification error: {e}")
         return jsonify({"status": "error", "message": str(e)})
 
+def _live_classify_channel(ws):
+    """Serve one kiosk WebSocket: binary frames in, JSON results out.
+
+    A reader thread keeps only the newest frame; when the kiosk pushes frames faster
+    than the recognizer can classify them, older pending frames are dropped so results
+    always describe what the camera sees now. Results are previews only (one CNN pass,
+    see preview_image_bgr): scans are still committed (logged, de-duplicated) through
+    /classify with the full ensemble.
+    """
+    pending = {'frame': None, 'seq': 0}
+    stats = {'received': 0, 'dropped': 0, 'closed': False}
+    cond = threading.Condition()
+
+    def reader():
+        try:
+            while True:
+                message = ws.receive()
+                if message is None:
+                    break
+                if isinstance(message, str):
+                    if message.strip().lower() == 'close':
+                        break
+                    continue
+                with cond:
+                    stats['received'] += 1
+                    if pending['frame'] is not None:
+                        stats['dropped'] += 1
+                    pending['frame'] = message
+                    pending['seq'] = stats['received']
+                    cond.notify()
+        except Exception:
+            pass
+        finally:
+            with cond:
+                stats['closed'] = True
+                cond.notify()
+
+    threading.Thread(target=reader, daemon=True).start()
+
+    while True:
+        with cond:
+            while pending['frame'] is None and not stats['closed']:
+                cond.wait()
+            if pending['frame'] is None:
+                break
+            raw = pending['frame']
+            seq = pending['seq']
+            pending['frame'] = None
+            dropped = stats['dropped']
+
+        start_time = datetime.now()
+        if len(raw) > LIVE_CHANNEL_MAX_FRAME_BYTES:
+            result = {"status": "error", "message": "Frame too large"}
+        else:
+            img = decode_scan_frame(raw)
+            if img is None:
+                result = {"status": "error", "message": "Invalid image"}
+            else:
+                try:
+                    result, cache_state = recognize_preview(img)
+                    result['result_cache'] = cache_state
+                except Exception as e:
+                    result = {"status": "error", "message": str(e)}
+
+        result['response_time'] = round((datetime.now() - start_time).total_seconds() * 1000, 2)
+        result['frame_seq'] = seq
+        result['frames_dropped'] = dropped
+        try:
+            ws.send(json.dumps(result))
+        except Exception:
+            break
+
+
+if sock is not None:
+    sock.route('/ws/classify')(_live_classify_channel)
+
+
 @app.route('/classify/top3', methods=['POST'])
 def classify_top3():
     """Returns top-3 fallback-only candidates."""
     try:
         file = request.files['image']
-        npimg = np.fromfile(file, np.uint8)
-        img = cv2.imdecode(npimg, cv2.IMREAD_COLOR)
+        img = decode_scan_frame(file.read())
 
         if img is None:
             return jsonify({"status": "error", "message": "Invalid image"})
 
-        candidates = get_orb_fallback_topk(img, top_k=3)
-        ranked = []
-        for c in candidates:
-            card = card_metadata.get(c['card_id'])
-            if not card:
-                continue
-            ranked.append({
-                'card_id': c['card_id'],
-                'card_name': card['name'],
-                'category_id': card['category_id'],
-                'category': category_metadata.get(card['category_id']),
-                'orb_fallback_score': round(float(c['score']), 4)
-            })
-
-        result = {
-            'status': 'success' if ranked else 'unknown',
-            'classifier': 'orb_fallback_only',
-            'top_candidates': ranked
-        }
-        return jsonify(result)
+        if inference_client is not None:
+            return jsonify(inference_client.top3(img))
+        return jsonify(rank_top3_candidates(img))
     except Exception as e:
         print(f"❌ Top3 classification error: {e}")
         return jsonify({"status": "error", "message": str(e)})
 
+def get_client_token() -> str:
+    """Kiosk token for the current request; requests without one share the default kiosk."""
+    return normalize_client_token(request.headers.get(KIOSK_TOKEN_HEADER))
+
+
+def mark_sessions_abandoned(sessions):
+    """Close DB rows of sessions dropped from the store (idle, evicted or replaced)."""
+    session_ids = [s.session_id for s in sessions if s and s.session_id]
+    if not session_ids:
+        return
+    try:
+        placeholders = ','.join(['%s'] * len(session_ids))
+        with db.cursor(commit=True) as cursor:
+            cursor.execute(f"""
+                UPDATE TBL_SESSIONS
+                SET end_time = NOW(), session_status = 'abandoned'
+                WHERE session_id IN ({placeholders}) AND session_status = 'active'
+            """, tuple(session_ids))
+        print(f"🧹 Marked {len(session_ids)} idle session(s) abandoned")
+    except Exception as e:
+        print(f"⚠️ Failed to mark sessions abandoned: {e}")
+
+
+def session_row_idle_expired(row) -> bool:
+    """Apply the session store's idle-expiry rule to a TBL_SESSIONS row."""
+    stamps = [t for t in (row.get('start_time'), row.get('last_scan_time')) if isinstance(t, datetime)]
+    if not stamps:
+        return False
+    return kiosk_sessions.is_idle_expired((datetime.now() - max(stamps)).total_seconds())
+
+
+def requested_session_id() -> int | None:
+    """Session id the kiosk believes is active (X-Kiosk-Session), or None."""
+    try:
+        return int(request.headers.get(KIOSK_SESSION_HEADER, ''))
+    except (TypeError, ValueError):
+        return None
+
+
+def rehydrate_kiosk_session(token: str):
+    """Rebuild a kiosk's session from the DB when this process has no copy of it.
+
+    Covers backend restarts (the kiosk restores its session from localStorage) and
+    requests landing on a different worker process than /session/start. A row that
+    is still 'active' but has been idle past the session timeout (start or last logged
+    scan) is expired exactly as the reaper would expire it: it is marked abandoned
+    instead of being revived.
+    """
+    session_id = requested_session_id()
+    if session_id is None:
+        return None
+
+    try:
+        row = db.query_one("""
+            SELECT s.session_id, s.student_nickname, s.session_mode, s.start_time,
+                   (SELECT MAX(t.scan_timestamp) FROM TBL_SCAN_TRANSACTIONS t
+                    WHERE t.session_id = s.session_id) AS last_scan_time
+            FROM TBL_SESSIONS s
+            WHERE s.session_id = %s AND s.session_status = 'active'
+        """, (session_id,))
+        if row and session_row_idle_expired(row):
+            mark_sessions_abandoned([KioskSession(session_id=int(row['session_id']), mode=row['session_mode'])])
+            return None
+        scanned = set()
+        if row:
+            scanned = {int(r['card_id']) for r in db.query("""
+                SELECT DISTINCT card_id FROM TBL_SCAN_TRANSACTIONS
+                WHERE session_id = %s AND card_id IS NOT NULL
+            """, (session_id,))}
+    except Exception as e:
+        print(f"⚠️ Session rehydrate failed: {e}")
+        return None
+
+    if not row:
+        return None
+
+    session = KioskSession(
+        session_id=int(row['session_id']),
+        mode=row['session_mode'],
+        nickname=row['student_nickname'],
+        scanned_card_ids=scanned,
+    )
+    mark_sessions_abandoned(kiosk_sessions.put(token, session))
+    return session
+
+
+def get_kiosk_session():
+    """Active session of the kiosk making this request, or None.
+
+    Under pre-fork serving this worker's cached copy can be an older session than
+    the one the kiosk started on another worker, so the cached session is used only
+    when it is the one named by X-Kiosk-Session. Otherwise the named session is
+    rehydrated from the DB (replacing the stale copy); if it is not active there
+    either, the request gets no session. Kiosks that send no session id keep using
+    the cached session.
+    """
+    token = get_client_token()
+    session_id = requested_session_id()
+    session = kiosk_sessions.get(token)
+    if session is not None and (session_id is None or session.session_id == session_id):
+        return session
+    return rehydrate_kiosk_session(token)
+
+
 @app.route('/assessment/submit', methods=['POST'])
 def submit_assessment():
     """Submit assessment answer for scoring"""
-    global current_session_id
-    
-    if not current_session_id:
+    session = get_kiosk_session()
+    if session is None:
         return jsonify({"status": "error", "message": "No active session"})
     
     try:
@@ -1971,40 +3027,23 @@ def submit_assessment():
         response_time = max(0, min(response_time, 600000))
         
         is_correct = selected_category == correct_category
-        
-        conn = connect_db()
-        cursor = conn.cursor()
-        
-        # Log the assessment transaction
-        sql = """INSERT INTO TBL_SCAN_TRANSACTIONS 
-                (session_id, card_id, predicted_category_id, actual_category_id, 
-                confidence_score, response_time, scan_timestamp)
-                VALUES (%s, %s, 
-                    (SELECT category_id FROM TBL_CATEGORIES WHERE category_name = %s),
-                    (SELECT category_id FROM TBL_CATEGORIES WHERE category_name = %s),
-                    %s, %s, NOW())"""
-        
-        cursor.execute(sql, (
-            current_session_id,
-            card_id,
-            selected_category,
-            correct_category,
-            confidence,
-            response_time
+
+        predicted_category_id = category_id_for_name(selected_category)
+        actual_category_id = category_id_for_name(correct_category)
+        if predicted_category_id is None or actual_category_id is None:
+            return jsonify({"status": "error", "message": "Unknown category"})
+        
+        # Log the assessment transaction (written behind; counters applied at flush)
+        scan_log_writer.submit(ScanRow(
+            session_id=session.session_id,
+            card_id=int(card_id),
+            predicted_category_id=predicted_category_id,
+            actual_category_id=actual_category_id,
+            confidence_score=confidence,
+            response_time=response_time,
+            scan_timestamp=datetime.now(),
         ))
         
-        # Update session stats  
-        update_sql = """UPDATE TBL_SESSIONS 
-                       SET total_scans = total_scans + 1,
-                           correct_scans = correct_scans + %s
-                       WHERE session_id = %s"""
-        
-        cursor.execute(update_sql, (1 if is_correct else 0, current_session_id))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
         return jsonify({
             "status": "success",
             "is_correct": is_correct,
@@ -2018,42 +3057,29 @@ def submit_assessment():
 
 @app.route('/session/start', methods=['POST'])
 def start_session():
-    """Start a new student session"""
-    global current_session_id, current_session_mode
-    global current_session_subset_card_ids, current_session_scanned_card_ids
-    
+    """Start a new student session for the calling kiosk"""
     try:
         data = request.json
         nickname = data.get('nickname', 'Guest')
         mode = data.get('mode', 'instructional')
         
-        conn = connect_db()
-        cursor = conn.cursor()
-        
         sql = """INSERT INTO TBL_SESSIONS 
-                (student_nickname, session_mode, start_time, session_status) 
-                VALUES (%s, %s, NOW(), 'active')"""
+                (student_nickname, session_mode, start_time, session_status, ip_address) 
+                VALUES (%s, %s, NOW(), 'active', %s)"""
         
-        cursor.execute(sql, (nickname, mode))
-        conn.commit()
+        with db.cursor(commit=True) as cursor:
+            cursor.execute(sql, (nickname, mode, (request.remote_addr or '')[:45]))
+            session_id = cursor.lastrowid
         
-        current_session_id = cursor.lastrowid
-        current_session_mode = mode
-
         # Learn Mode protocol: enforce no-repeat scans within the session.
-        with session_subset_lock:
-            if mode == 'instructional':
-                current_session_subset_card_ids = set()
-            else:
-                current_session_subset_card_ids = set()
-            current_session_scanned_card_ids = set()
-        
-        cursor.close()
-        conn.close()
+        session = KioskSession(session_id=session_id, mode=mode, nickname=nickname)
+
+        # A kiosk runs one session at a time; a replaced or evicted one is abandoned.
+        mark_sessions_abandoned(kiosk_sessions.put(get_client_token(), session))
         
         return jsonify({
             "status": "success",
-            "session_id": current_session_id,
+            "session_id": session.session_id,
             "nickname": nickname
         })
         
@@ -2063,47 +3089,39 @@ def start_session():
 
 @app.route('/session/end', methods=['POST'])
 def end_session():
-    """End current session"""
-    global current_session_id, current_session_mode
-    global current_session_subset_card_ids, current_session_scanned_card_ids
-    
-    if not current_session_id:
+    """End the calling kiosk's current session"""
+    session = get_kiosk_session()
+    if session is None:
         return jsonify({"status": "error", "message": "No active session"})
     
     try:
-        conn = connect_db()
-        cursor = conn.cursor()
-        
+        # Scans of this session may still be queued in any worker; they must land before
+        # the final stats are read.
+        scan_log_writer.flush_all_workers(SCAN_LOG_SYNC_TIMEOUT_SECONDS)
+
         # Update session
         sql = """UPDATE TBL_SESSIONS 
                 SET end_time = NOW(), session_status = 'completed'
-                WHERE session_id = %s"""
-        
-        cursor.execute(sql, (current_session_id,))
-        conn.commit()
-        
-        # Get session stats
-        cursor.execute("""
-            SELECT total_scans, correct_scans, accuracy_percentage 
-            FROM TBL_SESSIONS WHERE session_id = %s
-        """, (current_session_id,))
-        
-        stats = cursor.fetchone()
+                WHERE session_id = %s AND session_status != 'completed'"""
         
-        cursor.close()
-        conn.close()
-        
-        session_id = current_session_id
-        current_session_id = None
-        current_session_mode = None
+        with db.cursor(commit=True) as cursor:
+            cursor.execute(sql, (session.session_id,))
+            if cursor.rowcount == 1:
+                analytics_rollup.add_completed_session(cursor, session.session_id)
 
-        with session_subset_lock:
-            current_session_subset_card_ids = set()
-            current_session_scanned_card_ids = set()
+            # Get session stats
+            cursor.execute("""
+                SELECT total_scans, correct_scans, accuracy_percentage 
+                FROM TBL_SESSIONS WHERE session_id = %s
+            """, (session.session_id,))
+            stats = cursor.fetchone()
+        admin_response_cache.invalidate('sessions')
+        
+        kiosk_sessions.pop(get_client_token())
         
         return jsonify({
             "status": "success",
-            "session_id": session_id,
+            "session_id": session.session_id,
             "stats": {
                 "total_scans": stats[0] if stats else 0,
                 "correct_scans": stats[1] if stats else 0,
@@ -2127,9 +3145,6 @@ def tutorial_should_show():
         if not nickname:
             return jsonify({"status": "success", "should_show": False})
 
-        conn = connect_db()
-        cursor = conn.cursor()
-
         query = """
             SELECT COUNT(*)
             FROM TBL_SESSIONS
@@ -2143,13 +3158,9 @@ def tutorial_should_show():
             query += " AND session_id != %s"
             params.append(current_session_id)
 
-        cursor.execute(query, tuple(params))
-        row = cursor.fetchone()
+        row = db.query_one(query, params, dictionary=False)
         prior_sessions = int(row[0]) if row and row[0] is not None else 0
 
-        cursor.close()
-        conn.close()
-
         return jsonify({
             "status": "success",
             "should_show": prior_sessions == 0,
@@ -2159,101 +3170,119 @@ def tutorial_should_show():
         print(f"❌ Tutorial should-show error: {e}")
         return jsonify({"status": "error", "message": str(e), "should_show": False})
 
-def log_scan_transaction(result):
-    """Log scan to database"""
+def log_scan_transaction(result, session_id):
+    """Queue a scan for the write-behind logger (session counters are applied at flush)."""
     try:
-        conn = connect_db()
-        cursor = conn.cursor()
-        
-        sql = """INSERT INTO TBL_SCAN_TRANSACTIONS 
-                (session_id, card_id, predicted_category_id, actual_category_id, 
-                confidence_score, response_time, scan_timestamp)
-                VALUES (%s, %s, %s, %s, %s, %s, NOW())"""
-        
-        cursor.execute(sql, (
-            current_session_id,
-            result['card_id'],
-            result['category_id'],
-            result['category_id'],  # Assuming correct for now
-            result['confidence'],
-            result['response_time']
+        scan_log_writer.submit(ScanRow(
+            session_id=int(session_id),
+            card_id=int(result['card_id']),
+            predicted_category_id=int(result['category_id']),
+            actual_category_id=int(result['category_id']),  # Assuming correct for now
+            confidence_score=result['confidence'],
+            response_time=int(round(float(result['response_time']))),
+            scan_timestamp=datetime.now(),
         ))
-        
-        # Update session stats
-        cursor.execute("""
-            UPDATE TBL_SESSIONS 
-            SET total_scans = total_scans + 1,
-                correct_scans = correct_scans + 1
-            WHERE session_id = %s
-        """, (current_session_id,))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
     except Exception as e:
         print(f"⚠️ Logging error: {e}")
 
-@app.route('/admin/stats', methods=['GET'])
-def get_admin_stats():
-    """Returns analytics for Admin Dashboard"""
+
+def category_id_for_name(category_name):
+    """Resolve a category name from the in-memory catalog (no DB round trip)."""
+    for category_id, name in category_metadata.items():
+        if name == category_name:
+            return int(category_id)
+    return None
+
+def _admin_cached_response(entry, cache_state: str):
+    if etag_matches(request.headers.get('If-None-Match'), entry.etag):
+        admin_response_cache.record_not_modified()
+        response = Response(status=304)
+    else:
+        response = Response(entry.body, mimetype=entry.mimetype)
+    response.set_etag(entry.etag)
+    # Browsers keep the body but revalidate every poll; unchanged data costs a 304.
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.headers['X-Cache'] = cache_state
+    return response
+
+def cached_admin_endpoint(ttl_seconds: float, *tags: str):
+    """Serve a GET admin endpoint from admin_response_cache (keyed by path + query string).
+
+    Error payloads are never cached. Mutating routes call admin_response_cache.invalidate()
+    with the matching tags.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = request.full_path
+            entry = admin_response_cache.get(key)
+            if entry is not None:
+                return _admin_cached_response(entry, 'HIT')
+
+            response = app.make_response(view(*args, **kwargs))
+            payload = response.get_json(silent=True) if response.is_json else None
+            if response.status_code != 200 or not isinstance(payload, dict) or payload.get('status') == 'error':
+                return response
+            entry = admin_response_cache.put(
+                key, response.get_data(), response.mimetype, ttl_seconds, tags
+            )
+            return _admin_cached_response(entry, 'MISS')
+        return wrapper
+    return decorator
+
+@app.route('/admin/stats', methods=['GET'])
+@cached_admin_endpoint(ADMIN_STATS_CACHE_TTL_SECONDS, 'scans', 'sessions', 'cards')
+def get_admin_stats():
+    """Returns analytics for Admin Dashboard"""
     try:
-        conn = connect_db()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Total scans
-        cursor.execute("SELECT COUNT(*) as count FROM TBL_SCAN_TRANSACTIONS")
-        total_scans = cursor.fetchone()['count']
-        
-        # Calculate accuracy
-        cursor.execute("""
-            SELECT 
-                SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END) as correct,
-                COUNT(*) as total
-            FROM TBL_SCAN_TRANSACTIONS
-        """)
-        result = cursor.fetchone()
-        accuracy = round((result['correct'] / result['total'] * 100), 1) if result['total'] > 0 else 0
-        
-        # Total sessions
-        cursor.execute("SELECT COUNT(*) as count FROM TBL_SESSIONS WHERE session_status = 'completed'")
-        total_sessions = cursor.fetchone()['count']
-        
-        # Recent logs with nickname
-        cursor.execute("""
-            SELECT 
-                t.transaction_id, 
-                t.scan_timestamp, 
-                c.card_name, 
-                cat.category_name, 
-                t.confidence_score,
-                t.is_correct,
-                s.student_nickname,
-                c.image_path
-            FROM TBL_SCAN_TRANSACTIONS t
-            JOIN TBL_CARD_ASSETS c ON t.card_id = c.card_id
-            JOIN TBL_CATEGORIES cat ON c.category_id = cat.category_id
-            LEFT JOIN TBL_SESSIONS s ON t.session_id = s.session_id
-            ORDER BY t.scan_timestamp DESC 
-            LIMIT 15
-        """)
-        logs = cursor.fetchall()
-        
-        formatted_logs = []
-        for log in logs:
-            formatted_logs.append({
-                "id": log['transaction_id'],
-                "time": log['scan_timestamp'].strftime("%H:%M:%S"),
-                "card": log['card_name'],
-                "category": log['category_name'],
-                "confidence": int(log['confidence_score'] * 100),
-                "correct": bool(log['is_correct']),
-                "nickname": log['student_nickname'] or 'Guest',
-                "image_path": log['image_path'] or ''
-            })
-        
-        cursor.close()
-        conn.close()
+        with db.cursor(dictionary=True) as cursor:
+            # Total scans and accuracy (daily rollup, see analytics_rollup.py)
+            cursor.execute("""
+                SELECT 
+                    COALESCE(SUM(correct_count), 0) as correct,
+                    COALESCE(SUM(scan_count), 0) as total
+                FROM TBL_SCAN_DAILY_ROLLUP
+            """)
+            result = cursor.fetchone()
+            total_scans = int(result['total'])
+            accuracy = round((int(result['correct']) / total_scans * 100), 1) if total_scans > 0 else 0
+
+            # Total sessions
+            cursor.execute("SELECT COALESCE(SUM(completed_sessions), 0) as count FROM TBL_STUDENT_ROLLUP")
+            total_sessions = int(cursor.fetchone()['count'])
+
+            # Recent logs with nickname
+            cursor.execute("""
+                SELECT 
+                    t.transaction_id, 
+                    t.scan_timestamp, 
+                    c.card_name, 
+                    cat.category_name, 
+                    t.confidence_score,
+                    t.is_correct,
+                    s.student_nickname,
+                    c.image_path
+                FROM TBL_SCAN_TRANSACTIONS t
+                JOIN TBL_CARD_ASSETS c ON t.card_id = c.card_id
+                JOIN TBL_CATEGORIES cat ON c.category_id = cat.category_id
+                LEFT JOIN TBL_SESSIONS s ON t.session_id = s.session_id
+                ORDER BY t.scan_timestamp DESC 
+                LIMIT 15
+            """)
+            logs = cursor.fetchall()
+
+            formatted_logs = []
+            for log in logs:
+                formatted_logs.append({
+                    "id": log['transaction_id'],
+                    "time": log['scan_timestamp'].strftime("%H:%M:%S"),
+                    "card": log['card_name'],
+                    "category": log['category_name'],
+                    "confidence": int(log['confidence_score'] * 100),
+                    "correct": bool(log['is_correct']),
+                    "nickname": log['student_nickname'] or 'Guest',
+                    "image_path": log['image_path'] or ''
+                })
         
         return jsonify({
             "total_scans": total_scans,
@@ -2266,50 +3295,87 @@ def get_admin_stats():
         print(f"❌ Admin stats error: {e}")
         return jsonify({"status": "error", "message": str(e)})
 
+def _like_prefix(value: str) -> str:
+    """LIKE pattern matching values that start with `value` (used with ESCAPE '!')."""
+    return value.replace('!', '!!').replace('%', '!%').replace('_', '!_') + '%'
+
+def listing_page_request(keyset: Keyset, filters: dict):
+    """(paginated, limit, key, position) from ?limit=&cursor=; raises CursorError.
+
+    Listings stay unpaginated (every row) unless the caller asks for a page.
+    """
+    paginated = 'limit' in request.args or 'cursor' in request.args
+    if not paginated:
+        return False, None, None, 0
+    limit = page_size(request.args.get('limit'))
+    key, position = decode_cursor(request.args.get('cursor'), keyset.listing, filters)
+    return True, limit, key, position
+
+NICKNAMES_KEYSET = Keyset('nicknames', [('student_nickname', 'ASC')], ['nickname'])
+
 @app.route('/admin/nicknames', methods=['GET'])
+@cached_admin_endpoint(ADMIN_NICKNAMES_CACHE_TTL_SECONDS, 'sessions')
 def get_admin_nicknames():
-    """Get list of unique nicknames with stats for admin management"""
+    """Get list of unique nicknames with stats for admin management.
+
+    Optional: ?q=<nickname prefix>, ?limit=N and ?cursor=<next_cursor> for keyset pages.
+    """
     try:
-        conn = connect_db()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Get nicknames with session stats
-        cursor.execute("""
-            SELECT 
-                student_nickname as nickname,
-                COUNT(CASE WHEN session_status = 'completed' THEN 1 END) as sessions,
-                ROUND(AVG(CASE WHEN session_status = 'completed' THEN accuracy_percentage END), 0) as accuracy,
-                MAX(CASE WHEN session_status = 'completed' THEN start_time END) as last_active,
-                MIN(start_time) as created_at
-            FROM TBL_SESSIONS 
-            WHERE student_nickname IS NOT NULL 
-            AND student_nickname != '' 
-            AND student_nickname != 'Guest'
-            GROUP BY student_nickname
-            ORDER BY student_nickname ASC
-        """)
-        
-        nicknames = cursor.fetchall()
-        
-        # Convert to proper format
-        nickname_list = []
-        for nick in nicknames:
-            nickname_list.append({
-                'nickname': nick['nickname'],
-                'sessions': nick['sessions'] or 0,
-                'accuracy': int(nick['accuracy']) if nick['accuracy'] else None,
-                'last_active': nick['last_active'].isoformat() if nick['last_active'] else None,
-                'created_at': nick['created_at'].isoformat() if nick['created_at'] else None
-            })
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify({
+        filters = {'q': request.args.get('q', '').strip()}
+        paginated, limit, key, position = listing_page_request(NICKNAMES_KEYSET, filters)
+        seek_sql, params = NICKNAMES_KEYSET.seek(key)
+        filter_sql = ''
+        if filters['q']:
+            filter_sql = "AND student_nickname LIKE %s ESCAPE '!'"
+            params = [_like_prefix(filters['q'])] + params
+
+        with db.cursor(dictionary=True) as cursor:
+
+            # Get nicknames with session stats (grouping follows idx_nickname, so pages stay cheap)
+            cursor.execute(f"""
+                SELECT 
+                    student_nickname as nickname,
+                    COUNT(CASE WHEN session_status = 'completed' THEN 1 END) as sessions,
+                    ROUND(AVG(CASE WHEN session_status = 'completed' THEN accuracy_percentage END), 0) as accuracy,
+                    MAX(CASE WHEN session_status = 'completed' THEN start_time END) as last_active,
+                    MIN(start_time) as created_at
+                FROM TBL_SESSIONS 
+                WHERE student_nickname IS NOT NULL 
+                AND student_nickname != '' 
+                AND student_nickname != 'Guest'
+                {filter_sql}
+                AND {seek_sql}
+                GROUP BY student_nickname
+                ORDER BY {NICKNAMES_KEYSET.order_by()}
+                {'LIMIT %s' if paginated else ''}
+            """, tuple(params + ([limit + 1] if paginated else [])))
+
+            if paginated:
+                nicknames, next_cursor = NICKNAMES_KEYSET.page(cursor, limit, filters, position)
+            else:
+                nicknames, next_cursor = iter_rows(cursor), None
+
+            # Convert to proper format
+            nickname_list = []
+            for nick in nicknames:
+                nickname_list.append({
+                    'nickname': nick['nickname'],
+                    'sessions': nick['sessions'] or 0,
+                    'accuracy': int(nick['accuracy']) if nick['accuracy'] else None,
+                    'last_active': nick['last_active'].isoformat() if nick['last_active'] else None,
+                    'created_at': nick['created_at'].isoformat() if nick['created_at'] else None
+                })
+        
+        response = {
             "status": "success",
             "nicknames": nickname_list
-        })
+        }
+        if paginated:
+            response["next_cursor"] = next_cursor
+        return jsonify(response)
         
+    except CursorError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
     except Exception as e:
         print(f"❌ Admin nicknames error: {e}")
         return jsonify({"status": "error", "message": str(e)})
@@ -2324,19 +3390,13 @@ def add_admin_nickname():
         if not nickname or len(nickname) < 2:
             return jsonify({"status": "error", "message": "Nickname must be at least 2 characters"})
         
-        conn = connect_db()
-        cursor = conn.cursor()
-        
         # Create a preset entry - session_mode is NULL since student will choose when playing
         sql = """INSERT INTO TBL_SESSIONS 
                 (student_nickname, session_mode, start_time, session_status) 
                 VALUES (%s, NULL, NOW(), 'admin_preset')"""
         
-        cursor.execute(sql, (nickname,))
-        conn.commit()
-        
-        cursor.close()
-        conn.close()
+        db.execute(sql, (nickname,))
+        admin_response_cache.invalidate('sessions')
         
         return jsonify({
             "status": "success",
@@ -2354,27 +3414,30 @@ def delete_admin_nickname(nickname):
         if not nickname or len(nickname) < 2:
             return jsonify({"status": "error", "message": "Invalid nickname"})
         
-        conn = connect_db()
-        cursor = conn.cursor()
-        
-        # First delete all scan transactions for this student's sessions
-        cursor.execute("""
-            DELETE st FROM TBL_SCAN_TRANSACTIONS st
-            INNER JOIN TBL_SESSIONS s ON st.session_id = s.session_id
-            WHERE s.student_nickname = %s
-        """, (nickname,))
-        
-        # Then delete all sessions for this nickname
-        cursor.execute("""
-            DELETE FROM TBL_SESSIONS 
-            WHERE student_nickname = %s
-        """, (nickname,))
-        
-        deleted_count = cursor.rowcount
-        conn.commit()
-        
-        cursor.close()
-        conn.close()
+        # Queued scans of this student (in any worker) must not land after the delete
+        scan_log_writer.flush_all_workers(SCAN_LOG_SYNC_TIMEOUT_SECONDS)
+
+        with db.cursor(commit=True) as cursor:
+            scan_days = analytics_rollup.scan_days_for_student(cursor, nickname)
+
+            # First delete all scan transactions for this student's sessions
+            cursor.execute("""
+                DELETE FROM TBL_SCAN_TRANSACTIONS
+                WHERE session_id IN (SELECT session_id FROM TBL_SESSIONS WHERE student_nickname = %s)
+            """, (nickname,))
+
+            scan_archive.forget_sessions(cursor, nickname)  # No foreign key cascades into the archive
+
+            # Then delete all sessions for this nickname
+            cursor.execute("""
+                DELETE FROM TBL_SESSIONS 
+                WHERE student_nickname = %s
+            """, (nickname,))
+
+            deleted_count = cursor.rowcount
+            analytics_rollup.forget_student(cursor, nickname)
+            analytics_rollup.rebuild_scan_rollup_days(cursor, scan_days)
+        admin_response_cache.invalidate('sessions', 'scans')
         
         if deleted_count > 0:
             return jsonify({
@@ -2402,7 +3465,21 @@ def health_check():
         "orb_fallback_classes": len(orb_fallback_class_to_card_id),
         "cards_loaded": len(card_metadata),
         "categories": len(category_metadata),
-        "active_session": current_session_id is not None,
+        "active_session": len(kiosk_sessions) > 0,
+        "active_sessions": len(kiosk_sessions),
+        "live_channel": sock is not None,
+        "capture_profile": get_capture_profile(),
+        "recognizer_version": recognizer_version,
+        "inference_sidecar": INFERENCE_SIDECAR_ADDRESS or None,
+        "startup": get_startup_status_snapshot()['state'],
+        "startup_timing_ms": startup_timing_ms,
+        "scan_log": scan_log_writer.stats(),
+        "db_pool": db.stats(),
+        "admin_cache": admin_response_cache.stats(),
+        "report_jobs": report_jobs.stats(),
+        "tts_cache": tts_cache.stats(),
+        "thumbnails": thumbnail_store.stats(),
+        "asset_cache": asset_cache.stats(),
         "runtime_config": {
             "orb_feature_count": ORB_FEATURES,
             "knn_k_value": KNN_K,
@@ -2418,6 +3495,8 @@ def health_check():
             "cnn_ensemble_margin_threshold": CNN_ENSEMBLE_MARGIN_THRESHOLD,
             "incremental_override_margin": INCREMENTAL_OVERRIDE_MARGIN,
             "prefer_base_model": PREFER_BASE_MODEL,
+            "stream_scan_enabled": STREAM_SCAN_ENABLED,
+            "stream_burst_frames": STREAM_BURST_FRAMES,
             "session_timeout_minutes": SESSION_TIMEOUT_MINUTES,
             "webcam_fps": WEBCAM_FPS,
             "roi_box_color": ROI_BOX_COLOR,
@@ -2425,6 +3504,13 @@ def health_check():
         }
     })
 
+@app.route('/capture-profile', methods=['GET'])
+def capture_profile():
+    """Negotiated scan upload profile (max side, encodings, quality) for kiosks."""
+    response = jsonify({"status": "success", "profile": get_capture_profile()})
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 # ============================================================
 # ADVANCED ADMIN FEATURES (From Thesis Proposal)
 # ============================================================
@@ -2437,26 +3523,22 @@ def get_confusion_matrix():
     (As defined in Definition of Terms - Technical Terms)
     """
     try:
-        conn = connect_db()
-        cursor = conn.cursor(dictionary=True)
-        
         # Get confusion matrix data
-        cursor.execute("""
+        matrix_data = db.query("""
             SELECT 
                 actual_cat.category_name as actual_category,
                 pred_cat.category_name as predicted_category,
-                COUNT(*) as count
-            FROM TBL_SCAN_TRANSACTIONS t
-            JOIN TBL_CATEGORIES actual_cat ON t.actual_category_id = actual_cat.category_id
-            JOIN TBL_CATEGORIES pred_cat ON t.predicted_category_id = pred_cat.category_id
-            GROUP BY t.actual_category_id, t.predicted_category_id
+                SUM(r.scan_count) as count
+            FROM TBL_SCAN_DAILY_ROLLUP r
+            JOIN TBL_CATEGORIES actual_cat ON r.actual_category_id = actual_cat.category_id
+            JOIN TBL_CATEGORIES pred_cat ON r.predicted_category_id = pred_cat.category_id
+            GROUP BY r.actual_category_id, r.predicted_category_id
             ORDER BY actual_cat.display_order, pred_cat.display_order
         """)
-        matrix_data = cursor.fetchall()
         
         # Get all categories for matrix structure
-        cursor.execute("SELECT category_name FROM TBL_CATEGORIES WHERE is_active = 1 ORDER BY display_order")
-        categories = [row['category_name'] for row in cursor.fetchall()]
+        categories = [row['category_name'] for row in
+                      db.query("SELECT category_name FROM TBL_CATEGORIES WHERE is_active = 1 ORDER BY display_order")]
         
         # Build matrix structure
         matrix = {}
@@ -2465,7 +3547,7 @@ def get_confusion_matrix():
         
         for row in matrix_data:
             if row['actual_category'] in matrix and row['predicted_category'] in matrix[row['actual_category']]:
-                matrix[row['actual_category']][row['predicted_category']] = row['count']
+                matrix[row['actual_category']][row['predicted_category']] = int(row['count'])
         
         # Calculate per-category accuracy
         category_stats = []
@@ -2480,9 +3562,6 @@ def get_confusion_matrix():
                 "accuracy": accuracy
             })
         
-        cursor.close()
-        conn.close()
-        
         return jsonify({
             "status": "success",
             "categories": categories,
@@ -2502,18 +3581,11 @@ def get_system_config():
     """
     try:
         ensure_system_config_defaults()
-        conn = connect_db()
-        cursor = conn.cursor(dictionary=True)
-        
-        cursor.execute("""
+        configs = db.query("""
             SELECT config_key, config_value, value_type, description, is_editable
             FROM TBL_SYSTEM_CONFIG
             ORDER BY config_key
         """)
-        configs = cursor.fetchall()
-        
-        cursor.close()
-        conn.close()
         
         return jsonify({
             "status": "success",
@@ -2539,33 +3611,27 @@ def update_system_config():
         config_key = data.get('config_key')
         config_value = data.get('config_value')
         
-        conn = connect_db()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Check if config is editable
-        cursor.execute("SELECT is_editable FROM TBL_SYSTEM_CONFIG WHERE config_key = %s", (config_key,))
-        result = cursor.fetchone()
-        
-        if not result:
-            return jsonify({"status": "error", "message": "Configuration key not found"})
-        
-        if not result['is_editable']:
-            return jsonify({"status": "error", "message": "This configuration is locked and cannot be modified"})
-        
-        # Update the config
-        cursor.execute("""
-            UPDATE TBL_SYSTEM_CONFIG 
-            SET config_value = %s, last_modified = NOW()
-            WHERE config_key = %s
-        """, (config_value, config_key))
-        
-        conn.commit()
-        
+        with db.cursor(dictionary=True, commit=True) as cursor:
+            # Check if config is editable
+            cursor.execute("SELECT is_editable FROM TBL_SYSTEM_CONFIG WHERE config_key = %s", (config_key,))
+            result = cursor.fetchone()
+
+            if not result:
+                return jsonify({"status": "error", "message": "Configuration key not found"})
+
+            if not result['is_editable']:
+                return jsonify({"status": "error", "message": "This configuration is locked and cannot be modified"})
+
+            # Update the config
+            cursor.execute("""
+                UPDATE TBL_SYSTEM_CONFIG 
+                SET config_value = %s, last_modified = NOW()
+                WHERE config_key = %s
+            """, (config_value, config_key))
+
         # Apply changes to runtime variables
         apply_config_value(config_key, config_value)
-        
-        cursor.close()
-        conn.close()
+        notify_recognizer_reload('config')
         
         return jsonify({
             "status": "success",
@@ -2576,6 +3642,26 @@ def update_system_config():
         print(f"❌ Config update error: {e}")
         return jsonify({"status": "error", "message": str(e)})
 
+@app.route('/admin/db-pool-stats', methods=['GET'])
+def get_db_pool_stats():
+    """Connection pool telemetry for this worker process (checkout waits, leaks, prepared-statement reuse)."""
+    return jsonify({"status": "success", "pid": os.getpid(), "pool": db.stats()})
+
+def catalog_response(name: str, build):
+    """Serve a pre-rendered catalog payload, or 304 when the client has this version."""
+    snapshot = card_catalog.snapshot
+    if snapshot.version == 0:
+        reload_catalog()  # Startup load failed (DB was down); retry now
+        snapshot = card_catalog.snapshot
+    body, etag = snapshot.rendered(name, build)
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 @app.route('/admin/asset-repository', methods=['GET'])
 def get_asset_repository():
     """
@@ -2584,54 +3670,7 @@ def get_asset_repository():
     digital templates of the Eco-Cards for PDF generation"
     """
     try:
-        conn = connect_db()
-        cursor = conn.cursor(dictionary=True)
-        
-        cursor.execute("""
-            SELECT 
-                c.card_id,
-                c.card_name,
-                c.card_code,
-                c.image_filename,
-                c.image_path,
-                c.description,
-                c.pdf_generated,
-                c.is_active,
-                cat.category_name,
-                cat.bin_color
-            FROM TBL_CARD_ASSETS c
-            JOIN TBL_CATEGORIES cat ON c.category_id = cat.category_id
-            WHERE c.is_active = 1
-            ORDER BY cat.display_order, c.card_name
-        """)
-        cards = cursor.fetchall()
-        
-        # Group by category
-        by_category = {}
-        for card in cards:
-            cat_name = card['category_name']
-            if cat_name not in by_category:
-                by_category[cat_name] = {
-                    "bin_color": card['bin_color'],
-                    "cards": []
-                }
-            by_category[cat_name]["cards"].append({
-                "card_id": card['card_id'],
-                "card_name": card['card_name'],
-                "card_code": card['card_code'],
-                "image_path": card['image_path'],
-                "pdf_generated": bool(card['pdf_generated'])
-            })
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify({
-            "status": "success",
-            "total_cards": len(cards),
-            "categories": by_category
-        })
-        
+        return catalog_response('asset_repository', asset_repository_payload)
     except Exception as e:
         print(f"❌ Asset repository error: {e}")
         return jsonify({"status": "error", "message": str(e)})
@@ -2645,39 +3684,10 @@ def get_asset_repository():
 def get_asset_counts_fast():
     """
     FAST ENDPOINT - Returns only card counts per category
-    Lightweight response for quick UI updates
+    Lightweight response for quick UI updates (served from the catalog snapshot)
     """
     try:
-        conn = connect_db()
-        cursor = conn.cursor(dictionary=True)
-        
-        cursor.execute("""
-            SELECT 
-                cat.category_name,
-                COUNT(c.card_id) as count
-            FROM TBL_CATEGORIES cat
-            LEFT JOIN TBL_CARD_ASSETS c ON cat.category_id = c.category_id AND c.is_active = 1
-            WHERE cat.is_active = 1
-            GROUP BY cat.category_id, cat.category_name
-            ORDER BY cat.display_order
-        """)
-        counts = cursor.fetchall()
-        
-        total = sum(c['count'] for c in counts)
-        
-        cursor.close()
-        conn.close()
-        
-        response = jsonify({
-            "status": "success",
-            "total_cards": total,
-            "counts": {c['category_name']: c['count'] for c in counts}
-        })
-        
-        # Add cache headers for browser caching
-        response.headers['Cache-Control'] = 'public, max-age=10'
-        return response
-        
+        return catalog_response('asset_counts', asset_counts_payload)
     except Exception as e:
         print(f"❌ Fast counts error: {e}")
         return jsonify({"status": "error", "message": str(e)})
@@ -2686,38 +3696,10 @@ def get_asset_counts_fast():
 def get_cards_minimal():
     """
     FAST ENDPOINT - Returns minimal card data for gallery
-    Only essential fields: id, name, category, image_path
+    Only essential fields: id, name, category, image_path (served from the catalog snapshot)
     """
     try:
-        conn = connect_db()
-        cursor = conn.cursor(dictionary=True)
-        
-        cursor.execute("""
-            SELECT 
-                c.card_id,
-                c.card_name,
-                c.image_path,
-                cat.category_name,
-                cat.bin_color
-            FROM TBL_CARD_ASSETS c
-            JOIN TBL_CATEGORIES cat ON c.category_id = cat.category_id
-            WHERE c.is_active = 1
-            ORDER BY cat.display_order, c.card_name
-        """)
-        cards = cursor.fetchall()
-        
-        cursor.close()
-        conn.close()
-        
-        response = jsonify({
-            "status": "success",
-            "cards": cards
-        })
-        
-        # Add cache headers
-        response.headers['Cache-Control'] = 'public, max-age=10'
-        return response
-        
+        return catalog_response('cards_minimal', cards_minimal_payload)
     except Exception as e:
         print(f"❌ Minimal cards error: {e}")
         return jsonify({"status": "error", "message": str(e)})
@@ -2729,29 +3711,39 @@ def generate_card_pdf(card_id):
     Returns the card image path for printing
     """
     try:
-        conn = connect_db()
-        cursor = conn.cursor(dictionary=True)
-        
-        cursor.execute("""
-            SELECT 
-                c.card_id, c.card_name, c.card_code, c.image_path,
-                cat.category_name, cat.bin_color
-            FROM TBL_CARD_ASSETS c
-            JOIN TBL_CATEGORIES cat ON c.category_id = cat.category_id
-            WHERE c.card_id = %s
-        """, (card_id,))
-        
-        card = cursor.fetchone()
-        
-        if not card:
-            return jsonify({"status": "error", "message": "Card not found"})
+        snapshot = card_catalog.snapshot
+        cached = snapshot.cards.get(card_id)
+        category = snapshot.categories.get(cached.category_id) if cached else None
+        if cached is not None and category is not None:
+            card = {
+                'card_id': cached.card_id,
+                'card_name': cached.name,
+                'card_code': cached.card_code,
+                'image_path': cached.image_path,
+                'category_name': category.name,
+                'bin_color': category.bin_color,
+            }
+            already_generated = cached.pdf_generated
+        else:
+            # Deactivated cards are not in the snapshot
+            card = db.query_one("""
+                SELECT 
+                    c.card_id, c.card_name, c.card_code, c.image_path, c.pdf_generated,
+                    cat.category_name, cat.bin_color
+                FROM TBL_CARD_ASSETS c
+                JOIN TBL_CATEGORIES cat ON c.category_id = cat.category_id
+                WHERE c.card_id = %s
+            """, (card_id,))
+            if not card:
+                return jsonify({"status": "error", "message": "Card not found"})
+            already_generated = bool(card['pdf_generated'])
         
         # Mark as PDF generated
-        cursor.execute("UPDATE TBL_CARD_ASSETS SET pdf_generated = 1 WHERE card_id = %s", (card_id,))
-        conn.commit()
-        
-        cursor.close()
-        conn.close()
+        if not already_generated:
+            db.execute("UPDATE TBL_CARD_ASSETS SET pdf_generated = 1 WHERE card_id = %s", (card_id,))
+            if cached is not None:
+                card_catalog.mark_pdf_generated(card_id)
+                publish_catalog_change()
         
         return jsonify({
             "status": "success",
@@ -2771,121 +3763,232 @@ def generate_card_pdf(card_id):
         print(f"❌ PDF generation error: {e}")
         return jsonify({"status": "error", "message": str(e)})
 
+PROFICIENCY_KEYSET = Keyset(
+    'student_proficiency',
+    [
+        ("COALESCE(ROUND((correct_scans * 100.0) / NULLIF(total_scans, 0), 1), -1)", 'DESC'),
+        ('correct_scans', 'DESC'),
+        ('total_scans', 'DESC'),
+        ('student_nickname', 'ASC'),
+    ],
+    ['score_key', 'total_correct', 'total_scans', 'student_nickname'],
+)
+
 @app.route('/admin/student-proficiency', methods=['GET'])
 def get_student_proficiency():
     """
     Comparative Performance Dashboard - Ranks student proficiency
     based on assessment scores using pseudonyms (nicknames)
+
+    Optional: ?q=<nickname prefix>, ?limit=N and ?cursor=<next_cursor> for keyset pages.
     """
     try:
-        conn = connect_db()
-        cursor = conn.cursor(dictionary=True)
-        
-        cursor.execute("""
-            SELECT 
-                student_nickname,
-                COUNT(*) as total_sessions,
-                COALESCE(SUM(total_scans), 0) as total_scans,
-                COALESCE(SUM(correct_scans), 0) as total_correct,
-                ROUND((COALESCE(SUM(correct_scans), 0) * 100.0) / NULLIF(COALESCE(SUM(total_scans), 0), 0), 1) as proficiency_score,
-                MAX(accuracy_percentage) as best_accuracy,
-                MAX(end_time) as last_session
-            FROM TBL_SESSIONS
-            WHERE session_status = 'completed'
-            AND student_nickname != 'Guest'
-            AND session_mode = 'assessment'
-            GROUP BY student_nickname
-            ORDER BY proficiency_score DESC, total_correct DESC, total_scans DESC
-        """)
-        
-        students = cursor.fetchall()
-        
-        # Add rank
-        leaderboard = []
-        for idx, student in enumerate(students, 1):
-            leaderboard.append({
-                "rank": idx,
-                "nickname": student['student_nickname'],
-                "sessions": student['total_sessions'],
-                "total_scans": student['total_scans'] or 0,
-                "correct": student['total_correct'] or 0,
-                "proficiency_score": student['proficiency_score'] or 0,
-                "avg_accuracy": student['proficiency_score'] or 0,
-                "best_accuracy": student['best_accuracy'] or 0,
-                "last_session": student['last_session'].strftime("%Y-%m-%d") if student['last_session'] else "N/A"
-            })
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify({
+        filters = {'q': request.args.get('q', '').strip()}
+        paginated, limit, key, position = listing_page_request(PROFICIENCY_KEYSET, filters)
+        seek_sql, params = PROFICIENCY_KEYSET.seek(key)
+        filter_sql = ''
+        if filters['q']:
+            filter_sql = "AND student_nickname LIKE %s ESCAPE '!'"
+            params = [_like_prefix(filters['q'])] + params
+
+        with db.cursor(dictionary=True) as cursor:
+
+            cursor.execute(f"""
+                SELECT 
+                    student_nickname,
+                    completed_sessions as total_sessions,
+                    total_scans,
+                    correct_scans as total_correct,
+                    ROUND((correct_scans * 100.0) / NULLIF(total_scans, 0), 1) as proficiency_score,
+                    {PROFICIENCY_KEYSET.order[0][0]} as score_key,
+                    best_accuracy,
+                    last_end_time as last_session
+                FROM TBL_STUDENT_ROLLUP
+                WHERE session_mode = 'assessment'
+                AND student_nickname != 'Guest'
+                {filter_sql}
+                AND {seek_sql}
+                ORDER BY {PROFICIENCY_KEYSET.order_by()}
+                {'LIMIT %s' if paginated else ''}
+            """, tuple(params + ([limit + 1] if paginated else [])))
+
+            if paginated:
+                students, next_cursor = PROFICIENCY_KEYSET.page(cursor, limit, filters, position)
+            else:
+                students, next_cursor = iter_rows(cursor), None
+
+            # Add rank (continues across pages)
+            leaderboard = []
+            for idx, student in enumerate(students, position + 1):
+                leaderboard.append({
+                    "rank": idx,
+                    "nickname": student['student_nickname'],
+                    "sessions": student['total_sessions'],
+                    "total_scans": student['total_scans'] or 0,
+                    "correct": student['total_correct'] or 0,
+                    "proficiency_score": student['proficiency_score'] or 0,
+                    "avg_accuracy": student['proficiency_score'] or 0,
+                    "best_accuracy": student['best_accuracy'] or 0,
+                    "last_session": student['last_session'].strftime("%Y-%m-%d") if student['last_session'] else "N/A"
+                })
+        
+        response = {
             "status": "success",
             "leaderboard": leaderboard
-        })
+        }
+        if paginated:
+            response["next_cursor"] = next_cursor
+        return jsonify(response)
         
+    except CursorError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
     except Exception as e:
         print(f"❌ Proficiency error: {e}")
         return jsonify({"status": "error", "message": str(e)})
 
 
+PROFICIENCY_REPORTS_KEYSET = Keyset(
+    'proficiency_reports',
+    [('COALESCE(avg_accuracy, 0)', 'DESC'), ('total_scans', 'DESC'), ('nickname', 'ASC')],
+    ['accuracy_key', 'total_scans', 'nickname'],
+)
+
+def _proficiency_report_source(nickname_prefix: str = ''):
+    """Per-student report rows as a derived table: completed sessions from TBL_STUDENT_ROLLUP
+    plus the few active ones read live, merged by GROUP BY. Returns (sql, params)."""
+    prefix_sql, params = '', []
+    if nickname_prefix:
+        prefix_sql = "AND student_nickname LIKE %s ESCAPE '!'"
+        params = [_like_prefix(nickname_prefix)] * 2
+    sql = f"""
+        SELECT
+            nickname,
+            SUM(sessions) AS sessions,
+            SUM(total_scans) AS total_scans,
+            SUM(correct) AS correct,
+            ROUND(SUM(accuracy_sum) / NULLIF(SUM(sessions), 0), 1) AS avg_accuracy,
+            COALESCE(ROUND(SUM(accuracy_sum) / NULLIF(SUM(sessions), 0), 1), 0) AS accuracy_key,
+            MAX(best_accuracy) AS best_accuracy,
+            COALESCE(MAX(last_end), MAX(last_start)) AS last_session,
+            SUM(in_progress) AS in_progress_sessions
+        FROM (
+            SELECT student_nickname AS nickname, completed_sessions AS sessions, total_scans,
+                   correct_scans AS correct, accuracy_sum, COALESCE(best_accuracy, 0) AS best_accuracy,
+                   last_end_time AS last_end, last_start_time AS last_start, 0 AS in_progress
+            FROM TBL_STUDENT_ROLLUP
+            WHERE session_mode = 'assessment'
+              AND student_nickname NOT IN ('', 'Guest')
+              {prefix_sql}
+            UNION ALL
+            SELECT student_nickname, 1, total_scans, correct_scans,
+                   COALESCE(accuracy_percentage, 0), COALESCE(accuracy_percentage, 0),
+                   NULL, start_time, 1
+            FROM TBL_SESSIONS
+            WHERE session_status = 'active'
+              AND session_mode = 'assessment'
+              AND student_nickname IS NOT NULL
+              AND student_nickname NOT IN ('', 'Guest')
+              {prefix_sql}
+        ) merged
+        GROUP BY nickname
+    """
+    return sql, params
+
+
+def _proficiency_report_row(row, rank: int) -> dict:
+    last_session = row['last_session']
+    return {
+        "rank": rank,
+        "nickname": row['nickname'],
+        "sessions": int(row['sessions'] or 0),
+        "total_scans": int(row['total_scans'] or 0),
+        "correct": int(row['correct'] or 0),
+        "avg_accuracy": float(row['avg_accuracy'] or 0),
+        "best_accuracy": float(row['best_accuracy'] or 0),
+        "last_session": last_session.strftime("%Y-%m-%d") if hasattr(last_session, 'strftime') else "N/A",
+        "in_progress_sessions": int(row['in_progress_sessions'] or 0),
+    }
+
+
+def _proficiency_summary(cursor, nickname_prefix: str = '') -> dict:
+    source_sql, params = _proficiency_report_source(nickname_prefix)
+    cursor.execute(f"""
+        SELECT COUNT(*) AS students, SUM(sessions) AS sessions, SUM(total_scans) AS scans,
+               AVG(accuracy_key) AS accuracy
+        FROM ({source_sql}) reports
+    """, tuple(params))
+    row = cursor.fetchone()
+    return {
+        "total_students": int(row['students'] or 0),
+        "total_sessions": int(row['sessions'] or 0),
+        "total_scans": int(row['scans'] or 0),
+        "average_accuracy": round(float(row['accuracy'] or 0), 2),
+    }
+
+
 @app.route('/admin/proficiency-reports', methods=['GET'])
 def get_proficiency_reports():
-    """Student proficiency reports endpoint for Objective 1e Admin page."""
+    """Student proficiency reports endpoint for Objective 1e Admin page.
+
+    Optional: ?q=<nickname prefix>, ?limit=N and ?cursor=<next_cursor> for keyset pages;
+    the summary always covers every matching student.
+    """
     try:
-        reports, summary = _collect_proficiency_reports()
+        filters = {'q': request.args.get('q', '').strip()}
+        paginated, limit, key, position = listing_page_request(PROFICIENCY_REPORTS_KEYSET, filters)
+        if not paginated:
+            reports, summary = _collect_proficiency_reports(filters['q'])
+            return jsonify({
+                "status": "success",
+                "reports": reports,
+                "summary": summary,
+            })
 
+        reports, summary, next_cursor = _proficiency_reports_page(filters, limit, key, position)
         return jsonify({
             "status": "success",
             "reports": reports,
             "summary": summary,
+            "next_cursor": next_cursor,
         })
+    except CursorError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
     except Exception as e:
         print(f"❌ Proficiency reports error: {e}")
         return jsonify({"status": "error", "message": str(e)})
 
 
-def _collect_proficiency_reports():
-    conn = connect_db()
-    cursor = conn.cursor(dictionary=True)
+def _proficiency_reports_page(filters: dict, limit: int, key, position: int):
+    source_sql, params = _proficiency_report_source(filters['q'])
+    seek_sql, seek_params = PROFICIENCY_REPORTS_KEYSET.seek(key)
+    with db.cursor(dictionary=True) as cursor:
+        cursor.execute(f"""
+            SELECT * FROM ({source_sql}) reports
+            WHERE {seek_sql}
+            ORDER BY {PROFICIENCY_REPORTS_KEYSET.order_by()}
+            LIMIT %s
+        """, tuple(params + seek_params + [limit + 1]))
+        rows, next_cursor = PROFICIENCY_REPORTS_KEYSET.page(cursor, limit, filters, position)
+        summary = _proficiency_summary(cursor, filters['q'])
+    reports = [_proficiency_report_row(row, rank) for rank, row in enumerate(rows, position + 1)]
+    return reports, summary, next_cursor
 
-    cursor.execute(
-        """
-        SELECT
-            student_nickname,
-            COUNT(*) AS total_sessions,
-            SUM(total_scans) AS total_scans,
-            SUM(correct_scans) AS total_correct,
-            ROUND(AVG(accuracy_percentage), 1) AS avg_accuracy,
-            MAX(accuracy_percentage) AS best_accuracy,
-            COALESCE(MAX(end_time), MAX(start_time)) AS last_session,
-            SUM(CASE WHEN session_status = 'active' THEN 1 ELSE 0 END) AS in_progress_sessions
-        FROM TBL_SESSIONS
-        WHERE session_status IN ('completed', 'active')
-          AND session_mode = 'assessment'
-          AND student_nickname IS NOT NULL
-          AND student_nickname NOT IN ('', 'Guest')
-        GROUP BY student_nickname
-        ORDER BY avg_accuracy DESC, total_scans DESC
-        """
-    )
 
-    rows = cursor.fetchall()
-    cursor.close()
-    conn.close()
-
-    reports = []
-    for idx, row in enumerate(rows, 1):
-        reports.append({
-            "rank": idx,
-            "nickname": row['student_nickname'],
-            "sessions": int(row['total_sessions'] or 0),
-            "total_scans": int(row['total_scans'] or 0),
-            "correct": int(row['total_correct'] or 0),
-            "avg_accuracy": float(row['avg_accuracy'] or 0),
-            "best_accuracy": float(row['best_accuracy'] or 0),
-            "last_session": row['last_session'].strftime("%Y-%m-%d") if row['last_session'] else "N/A",
-            "in_progress_sessions": int(row['in_progress_sessions'] or 0),
-        })
+def _collect_proficiency_reports(nickname_prefix: str = '', cursor=None):
+    """Every matching student, ranked (PDF export and the unpaginated listing).
+
+    Pass a db.snapshot_cursor() to read inside an existing consistent snapshot.
+    """
+    if cursor is None:
+        with db.cursor(dictionary=True) as own_cursor:
+            return _collect_proficiency_reports(nickname_prefix, own_cursor)
+
+    source_sql, params = _proficiency_report_source(nickname_prefix)
+    cursor.execute(f"""
+        SELECT * FROM ({source_sql}) reports
+        ORDER BY {PROFICIENCY_REPORTS_KEYSET.order_by()}
+    """, tuple(params))
+    reports = [_proficiency_report_row(row, rank) for rank, row in enumerate(iter_rows(cursor), 1)]
 
     total_students = len(reports)
     summary = {
@@ -2901,44 +4004,58 @@ def _pdf_escape_text(text: str) -> str:
     return str(text).replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
 
 
+MINIMAL_PDF_ROWS_PER_PAGE = 30
+
+
 def _build_minimal_proficiency_pdf(reports, summary):
-    # Minimal single-page PDF fallback (A4 landscape-ish content area)
-    lines = []
-    lines.append('BT /F1 16 Tf 40 560 Td (EcoLearn Student Proficiency Report) Tj ET')
-    lines.append(f"BT /F1 10 Tf 40 542 Td ({_pdf_escape_text('Generated: ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'))}) Tj ET")
-    summary_text = (
-        f"Students: {summary['total_students']}   Sessions: {summary['total_sessions']}   "
-        f"Total Scans: {summary['total_scans']}   Avg Accuracy: {summary['average_accuracy']}%"
-    )
-    lines.append(f"BT /F1 10 Tf 40 526 Td ({_pdf_escape_text(summary_text)}) Tj ET")
-
-    header = '#   Nickname                  Sessions  Scans  Correct  Avg%  Best%  Last Session'
-    lines.append(f"BT /F1 9 Tf 40 505 Td ({_pdf_escape_text(header)}) Tj ET")
-
-    y = 490
-    for row in reports[:28]:
-        row_text = (
-            f"{str(row['rank']).ljust(3)} {str(row['nickname'])[:24].ljust(24)} "
-            f"{str(row['sessions']).rjust(8)} {str(row['total_scans']).rjust(6)} "
-            f"{str(row['correct']).rjust(8)} {str(row['avg_accuracy']).rjust(5)}% "
-            f"{str(row['best_accuracy']).rjust(5)}% {str(row['last_session'])}"
+    # Minimal multi-page PDF fallback (A4 landscape-ish content area), used without reportlab
+    def page_stream(page_rows, page_number, page_count):
+        lines = []
+        lines.append('BT /F1 16 Tf 40 560 Td (EcoLearn Student Proficiency Report) Tj ET')
+        generated = f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}   Page {page_number} of {page_count}"
+        lines.append(f"BT /F1 10 Tf 40 542 Td ({_pdf_escape_text(generated)}) Tj ET")
+        summary_text = (
+            f"Students: {summary['total_students']}   Sessions: {summary['total_sessions']}   "
+            f"Total Scans: {summary['total_scans']}   Avg Accuracy: {summary['average_accuracy']}%"
         )
-        lines.append(f"BT /F1 9 Tf 40 {y} Td ({_pdf_escape_text(row_text)}) Tj ET")
-        y -= 14
+        lines.append(f"BT /F1 10 Tf 40 526 Td ({_pdf_escape_text(summary_text)}) Tj ET")
+
+        header = '#     Nickname                  Sessions  Scans  Correct  Avg%  Best%  Last Session'
+        lines.append(f"BT /F1 9 Tf 40 505 Td ({_pdf_escape_text(header)}) Tj ET")
+
+        y = 490
+        for row in page_rows:
+            row_text = (
+                f"{str(row['rank']).ljust(5)} {str(row['nickname'])[:24].ljust(24)} "
+                f"{str(row['sessions']).rjust(8)} {str(row['total_scans']).rjust(6)} "
+                f"{str(row['correct']).rjust(8)} {str(row['avg_accuracy']).rjust(5)}% "
+                f"{str(row['best_accuracy']).rjust(5)}% {str(row['last_session'])}"
+            )
+            lines.append(f"BT /F1 9 Tf 40 {y} Td ({_pdf_escape_text(row_text)}) Tj ET")
+            y -= 14
 
-    if not reports:
-        lines.append('BT /F1 10 Tf 40 470 Td (No proficiency data available yet.) Tj ET')
+        if not reports:
+            lines.append('BT /F1 10 Tf 40 470 Td (No proficiency data available yet.) Tj ET')
+        return '\n'.join(lines).encode('latin-1', 'replace')
 
-    stream = '\n'.join(lines).encode('latin-1', 'replace')
+    pages = [reports[i:i + MINIMAL_PDF_ROWS_PER_PAGE] for i in range(0, len(reports), MINIMAL_PDF_ROWS_PER_PAGE)] or [[]]
 
+    # Objects: 1 catalog, 2 pages, 3 font, then a page + content stream pair per page.
+    page_ids = [4 + 2 * i for i in range(len(pages))]
     objects = []
     objects.append(b"1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n")
-    objects.append(b"2 0 obj << /Type /Pages /Kids [3 0 R] /Count 1 >> endobj\n")
-    objects.append(b"3 0 obj << /Type /Page /Parent 2 0 R /MediaBox [0 0 842 595] /Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >> endobj\n")
-    objects.append(b"4 0 obj << /Type /Font /Subtype /Type1 /BaseFont /Helvetica >> endobj\n")
-    objects.append(
-        b"5 0 obj << /Length " + str(len(stream)).encode('ascii') + b" >> stream\n" + stream + b"\nendstream endobj\n"
-    )
+    kids = ' '.join(f"{page_id} 0 R" for page_id in page_ids)
+    objects.append(f"2 0 obj << /Type /Pages /Kids [{kids}] /Count {len(pages)} >> endobj\n".encode('ascii'))
+    objects.append(b"3 0 obj << /Type /Font /Subtype /Type1 /BaseFont /Helvetica >> endobj\n")
+    for index, (page_id, page_rows) in enumerate(zip(page_ids, pages), 1):
+        stream = page_stream(page_rows, index, len(pages))
+        objects.append(
+            f"{page_id} 0 obj << /Type /Page /Parent 2 0 R /MediaBox [0 0 842 595] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >> endobj\n".encode('ascii')
+        )
+        objects.append(
+            f"{page_id + 1} 0 obj << /Length {len(stream)} >> stream\n".encode('ascii') + stream + b"\nendstream endobj\n"
+        )
 
     pdf = bytearray(b"%PDF-1.4\n")
     offsets = [0]
@@ -2958,108 +4075,235 @@ def _build_minimal_proficiency_pdf(reports, summary):
     return bytes(pdf)
 
 
-@app.route('/admin/proficiency-reports/pdf', methods=['GET'])
-def export_proficiency_reports_pdf():
-    """Generate printable student proficiency report as PDF."""
+def write_proficiency_pdf(path: str, reports, summary):
+    """Render the proficiency report to `path` (reportlab, else the minimal built-in writer)."""
     try:
-        reports, summary = _collect_proficiency_reports()
-
-        pdf_bytes = None
-        try:
-            import importlib
-            pagesizes = importlib.import_module('reportlab.lib.pagesizes')
-            canvas_module = importlib.import_module('reportlab.pdfgen.canvas')
-            A4 = pagesizes.A4
-            landscape = pagesizes.landscape
-            rl_canvas = canvas_module
-
-            buffer = io.BytesIO()
-            pdf = rl_canvas.Canvas(buffer, pagesize=landscape(A4))
-            page_width, page_height = landscape(A4)
-
-            def draw_header(y):
-                pdf.setFont("Helvetica-Bold", 14)
-                pdf.drawString(36, y, "EcoLearn Student Proficiency Report")
-                pdf.setFont("Helvetica", 10)
-                pdf.drawString(36, y - 14, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                pdf.drawString(36, y - 28, f"Students: {summary['total_students']}   Sessions: {summary['total_sessions']}   Total Scans: {summary['total_scans']}   Avg Accuracy: {summary['average_accuracy']}%")
-
-            columns = [
-                ("#", 24),
-                ("Nickname", 170),
-                ("Sessions", 60),
-                ("Scans", 55),
-                ("Correct", 55),
-                ("Avg%", 55),
-                ("Best%", 55),
-                ("Last Session", 80),
-                ("In Progress", 75),
-            ]
+        import importlib
+        pagesizes = importlib.import_module('reportlab.lib.pagesizes')
+        canvas_module = importlib.import_module('reportlab.pdfgen.canvas')
+    except ImportError:
+        with open(path, 'wb') as f:
+            f.write(_build_minimal_proficiency_pdf(reports, summary))
+        return
+
+    A4 = pagesizes.A4
+    landscape = pagesizes.landscape
+
+    # Canvas writes straight to the file; the document is never held in memory twice.
+    pdf = canvas_module.Canvas(path, pagesize=landscape(A4))
+    page_width, page_height = landscape(A4)
+
+    def draw_header(y):
+        pdf.setFont("Helvetica-Bold", 14)
+        pdf.drawString(36, y, "EcoLearn Student Proficiency Report")
+        pdf.setFont("Helvetica", 10)
+        pdf.drawString(36, y - 14, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        pdf.drawString(36, y - 28, f"Students: {summary['total_students']}   Sessions: {summary['total_sessions']}   Total Scans: {summary['total_scans']}   Avg Accuracy: {summary['average_accuracy']}%")
+
+    columns = [
+        ("#", 24),
+        ("Nickname", 170),
+        ("Sessions", 60),
+        ("Scans", 55),
+        ("Correct", 55),
+        ("Avg%", 55),
+        ("Best%", 55),
+        ("Last Session", 80),
+        ("In Progress", 75),
+    ]
 
-            x0 = 36
+    x0 = 36
+    y = page_height - 48
+    draw_header(y)
+    y -= 52
+
+    def draw_table_header(y_pos):
+        pdf.setFont("Helvetica-Bold", 9)
+        x = x0
+        for name, width in columns:
+            pdf.drawString(x, y_pos, name)
+            x += width
+        pdf.line(x0, y_pos - 3, x0 + sum(w for _, w in columns), y_pos - 3)
+
+    draw_table_header(y)
+    y -= 16
+
+    pdf.setFont("Helvetica", 9)
+    for row in reports:
+        if y < 44:
+            pdf.showPage()
             y = page_height - 48
             draw_header(y)
             y -= 52
-
-            def draw_table_header(y_pos):
-                pdf.setFont("Helvetica-Bold", 9)
-                x = x0
-                for name, width in columns:
-                    pdf.drawString(x, y_pos, name)
-                    x += width
-                pdf.line(x0, y_pos - 3, x0 + sum(w for _, w in columns), y_pos - 3)
-
             draw_table_header(y)
             y -= 16
-
             pdf.setFont("Helvetica", 9)
-            for row in reports:
-                if y < 44:
-                    pdf.showPage()
-                    y = page_height - 48
-                    draw_header(y)
-                    y -= 52
-                    draw_table_header(y)
-                    y -= 16
-                    pdf.setFont("Helvetica", 9)
-
-                values = [
-                    str(row['rank']),
-                    str(row['nickname'])[:35],
-                    str(row['sessions']),
-                    str(row['total_scans']),
-                    str(row['correct']),
-                    f"{row['avg_accuracy']}%",
-                    f"{row['best_accuracy']}%",
-                    str(row['last_session']),
-                    str(row['in_progress_sessions']),
-                ]
-
-                x = x0
-                for (value, (_, width)) in zip(values, columns):
-                    pdf.drawString(x, y, value)
-                    x += width
-                y -= 14
-
-            if not reports:
-                pdf.setFont("Helvetica", 10)
-                pdf.drawString(x0, y, "No proficiency data available yet.")
-
-            pdf.save()
-            pdf_bytes = buffer.getvalue()
-            buffer.close()
-        except Exception:
-            pdf_bytes = _build_minimal_proficiency_pdf(reports, summary)
 
-        filename = f"EcoLearn_Student_Proficiency_Report_{datetime.now().strftime('%Y-%m-%d')}.pdf"
-        return Response(
-            pdf_bytes,
-            mimetype='application/pdf',
-            headers={
-                'Content-Disposition': f'attachment; filename={filename}',
-                'Content-Length': str(len(pdf_bytes)),
-            },
-        )
+        values = [
+            str(row['rank']),
+            str(row['nickname'])[:35],
+            str(row['sessions']),
+            str(row['total_scans']),
+            str(row['correct']),
+            f"{row['avg_accuracy']}%",
+            f"{row['best_accuracy']}%",
+            str(row['last_session']),
+            str(row['in_progress_sessions']),
+        ]
+
+        x = x0
+        for (value, (_, width)) in zip(values, columns):
+            pdf.drawString(x, y, value)
+            x += width
+        y -= 14
+
+    if not reports:
+        pdf.setFont("Helvetica", 10)
+        pdf.drawString(x0, y, "No proficiency data available yet.")
+
+    pdf.save()
+
+
+def proficiency_data_version(cursor, nickname_prefix: str = '') -> str:
+    """Cheap digest of everything the proficiency report reads (rollup + live assessment sessions).
+
+    Aggregates alone miss a renamed student (same counts, different name on the PDF), so
+    the sorted roster of nicknames is folded in too; it comes from the rollup's primary
+    key, one short row per student.
+    """
+    cursor.execute("""
+        SELECT COUNT(*) AS students, COALESCE(SUM(completed_sessions), 0) AS sessions,
+               COALESCE(SUM(total_scans), 0) AS scans, COALESCE(SUM(correct_scans), 0) AS correct,
+               COALESCE(SUM(accuracy_sum), 0) AS accuracy, MAX(last_end_time) AS last_end
+        FROM TBL_STUDENT_ROLLUP
+        WHERE session_mode = 'assessment'
+    """)
+    completed = cursor.fetchone()
+    cursor.execute("""
+        SELECT COUNT(*) AS active, COALESCE(SUM(total_scans), 0) AS scans,
+               COALESCE(SUM(correct_scans), 0) AS correct, MAX(session_id) AS last_id
+        FROM TBL_SESSIONS
+        WHERE session_status = 'active' AND session_mode = 'assessment'
+    """)
+    active = cursor.fetchone()
+    cursor.execute("""
+        SELECT student_nickname FROM TBL_STUDENT_ROLLUP WHERE session_mode = 'assessment'
+        UNION
+        SELECT student_nickname FROM TBL_SESSIONS
+        WHERE session_status = 'active' AND session_mode = 'assessment' AND student_nickname IS NOT NULL
+        ORDER BY 1
+    """)
+    roster = hashlib.sha1()
+    for row in iter_rows(cursor):
+        roster.update(str(row['student_nickname']).encode('utf-8') + b'\0')
+    parts = [PROFICIENCY_REPORT_FORMAT, nickname_prefix, roster.hexdigest()]
+    parts.extend(str(v) for v in completed.values())
+    parts.extend(str(v) for v in active.values())
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def proficiency_report_id(version: str) -> str:
+    return f"proficiency-{version}.pdf"
+
+
+def _build_proficiency_report(job) -> str:
+    """Report job: aggregate from one consistent snapshot, render once per data version."""
+    prefix = job.params.get('q', '')
+    with db.snapshot_cursor(dictionary=True) as cursor:
+        report_id = proficiency_report_id(proficiency_data_version(cursor, prefix))
+        if report_jobs.has_report(report_id):
+            return report_id
+        reports, summary = _collect_proficiency_reports(prefix, cursor)
+    report_jobs.publish(report_id, lambda path: write_proficiency_pdf(path, reports, summary))
+    print(f"📄 Proficiency report rendered: {report_id} ({summary['total_students']} students)")
+    return report_id
+
+
+def _report_job_response(job, status_code: int | None = None):
+    payload = {"status": "success", "job": job.as_dict()}
+    if job.state == 'ready':
+        payload["download_url"] = f"/admin/reports/download/{job.report_id}"
+    elif job.state == 'failed':
+        payload["status"] = "error"
+        payload["message"] = job.error
+    else:
+        payload["poll_url"] = f"/admin/reports/jobs/{job.job_id}"
+    return jsonify(payload), status_code or (202 if job.state in ('queued', 'running') else 200)
+
+
+def _send_report(report_id: str):
+    """Stream a cached report from disk (chunked, Content-Length, Range/If-Range, ETag)."""
+    filename = f"EcoLearn_Student_Proficiency_Report_{datetime.now().strftime('%Y-%m-%d')}.pdf"
+    response = send_from_directory(
+        REPORTS_DIR, report_id,
+        mimetype='application/pdf',
+        as_attachment=True,
+        download_name=filename,
+        conditional=True,
+        max_age=0,
+    )
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _current_proficiency_report(prefix: str):
+    """Cached report id for the current data, or None."""
+    with db.cursor(dictionary=True) as cursor:
+        report_id = proficiency_report_id(proficiency_data_version(cursor, prefix))
+    return report_id if report_jobs.has_report(report_id) else None
+
+
+@app.route('/admin/reports/proficiency', methods=['POST'])
+def start_proficiency_report():
+    """Start (or reuse) a background proficiency PDF job. Optional ?q=<nickname prefix>."""
+    try:
+        prefix = request.args.get('q', '').strip()
+        job = report_jobs.submit('proficiency', {'q': prefix}, _build_proficiency_report)
+        return _report_job_response(job)
+    except Exception as e:
+        print(f"❌ Report job start error: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@app.route('/admin/reports/jobs/<job_id>', methods=['GET'])
+def get_report_job(job_id):
+    job = report_jobs.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Unknown report job"}), 404
+    return _report_job_response(job)
+
+
+@app.route('/admin/reports/download/<report_id>', methods=['GET'])
+def download_report(report_id):
+    try:
+        if not report_jobs.has_report(report_id):
+            return jsonify({"status": "error", "message": "Report not found (expired or not generated yet)"}), 404
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return _send_report(report_id)
+
+
+@app.route('/admin/proficiency-reports/pdf', methods=['GET'])
+def export_proficiency_reports_pdf():
+    """Download the printable student proficiency report as PDF.
+
+    Served from the report cache when the data has not changed; otherwise a background
+    job renders it. Small reports finish within REPORT_INLINE_WAIT_SECONDS and are sent
+    directly, larger ones answer 202 with a job to poll.
+    """
+    try:
+        prefix = request.args.get('q', '').strip()
+        report_id = _current_proficiency_report(prefix)
+        if report_id is not None:
+            return _send_report(report_id)
+
+        job = report_jobs.submit('proficiency', {'q': prefix}, _build_proficiency_report)
+        report_jobs.wait(job, REPORT_INLINE_WAIT_SECONDS)
+        if job.state == 'ready':
+            return _send_report(job.report_id)
+        if job.state == 'failed':
+            return jsonify({"status": "error", "message": job.error}), 500
+        return _report_job_response(job, 202)
     except Exception as e:
         print(f"❌ Proficiency PDF export error: {e}")
         return jsonify({"status": "error", "message": str(e)}), 500
@@ -3070,6 +4314,10 @@ def one_shot_learning():
     """
     One-Shot Learning - Allows admin to register a new Eco-Card
     or update an existing card by scanning it once, without extensive retraining
+
+    The request only decodes, checks the card, extracts ORB features and writes the
+    DB row; the PNG/WebP files, thumbnails and the incremental retrain follow in the
+    background (progress in GET /admin/orb-training-status).
     """
     try:
         if 'image' not in request.files:
@@ -3092,13 +4340,20 @@ def one_shot_learning():
         
         category_folder = CATEGORY_FOLDERS.get(str(category_id), 'Compostable')
         
-        # Decode once: keep alpha for saved card assets, convert separately for ML features.
+        # Decode once: the display copy keeps alpha for saved card assets, the ML copy
+        # is flattened and already bounded for ORB features.
         file = request.files['image']
-        img_saved = decode_uploaded_image_keep_alpha(file)
-        img = to_bgr_for_ml(img_saved)
-        
-        if img is None or img_saved is None:
+        ingested = ingest_image_bytes(
+            file.read(),
+            ml_max_side=ONE_SHOT_ORB_MAX_SIDE,
+            display_max_side=ONE_SHOT_ASSET_MAX_SIDE,
+            keep_alpha=True,
+        )
+        if ingested is None:
             return jsonify({"status": "error", "message": "Invalid image"})
+
+        img_saved = ingested.display
+        img = ingested.ml
         
         # --- NEW: CHECK FOR CARD PRESENCE ---
         if not is_eco_card_present(img):
@@ -3109,9 +4364,9 @@ def one_shot_learning():
         # ------------------------------------
         
         # Extract ORB features from a bounded-size image.
-        img_for_orb = downscale_max_dim(img, 1024)
+        img_for_orb = img
         preprocessed = preprocess_image(img_for_orb)
-        kp, des = orb.detectAndCompute(preprocessed, None)
+        kp, des = get_orb_extractor().detectAndCompute(preprocessed, None)
         
         if des is None or len(kp) < 15:
             return jsonify({
@@ -3119,9 +4374,6 @@ def one_shot_learning():
                 "message": "Insufficient features detected. Please use a clearer image."
             })
         
-        conn = connect_db()
-        cursor = conn.cursor()
-        
         is_replacement = replace_card_id and replace_card_id.strip()
         
         # Generate sanitized filename from card name
@@ -3153,51 +4405,44 @@ def one_shot_learning():
             # Update existing card
             card_id = int(replace_card_id)
             
-            # Get old image paths to clean up
-            cursor.execute("SELECT image_path, card_code FROM TBL_CARD_ASSETS WHERE card_id = %s", (card_id,))
-            old_result = cursor.fetchone()
-            old_image_path = old_result[0] if old_result else None
-            card_code = old_result[1] if old_result else f"{safe_name[:3].upper()}{datetime.now().strftime('%H%M%S')}"
-            
-            # Save PNG (high quality for training)
-            cv2.imwrite(png_full_path, img_saved, [cv2.IMWRITE_PNG_COMPRESSION, 1])
-            print(f"📸 Saved training PNG: {png_full_path}")
-            
-            # Convert and save WebP (optimized for display)
-            cv2.imwrite(webp_full_path, img_saved, [cv2.IMWRITE_WEBP_QUALITY, 85])
-            print(f"🌐 Saved display WebP: {webp_full_path}")
-            
-            # Update card metadata with WebP path for display
-            cursor.execute("""
-                UPDATE TBL_CARD_ASSETS 
-                SET card_name = %s, 
-                    category_id = %s,
-                    image_filename = %s,
-                    image_path = %s,
-                    description = %s,
-                    updated_at = NOW()
-                WHERE card_id = %s
-            """, (
-                card_name, 
-                category_id,
-                webp_filename,
-                webp_db_path,
-                f"Updated via One-Shot Learning: {card_name} (PNG training source: {png_db_path})",
-                card_id
-            ))
-            
             # Update feature vector (trained from high-quality PNG)
             feature_blob = pickle.dumps(des)
             image_hash = hashlib.sha256(img_for_orb.tobytes()).hexdigest()
             
-            cursor.execute("""
-                UPDATE TBL_GOLDEN_DATASET 
-                SET feature_vector = %s,
-                    feature_count = %s,
-                    image_hash = %s,
-                    last_update = NOW()
-                WHERE card_id = %s
-            """, (feature_blob, len(kp), image_hash, card_id))
+            with db.cursor(commit=True) as cursor:
+                # Get old image paths to clean up
+                cursor.execute("SELECT image_path, card_code FROM TBL_CARD_ASSETS WHERE card_id = %s", (card_id,))
+                old_result = cursor.fetchone()
+                old_image_path = old_result[0] if old_result else None
+                card_code = old_result[1] if old_result else f"{safe_name[:3].upper()}{datetime.now().strftime('%H%M%S')}"
+                
+                # Update card metadata with WebP path for display
+                cursor.execute("""
+                    UPDATE TBL_CARD_ASSETS 
+                    SET card_name = %s, 
+                        category_id = %s,
+                        image_filename = %s,
+                        image_path = %s,
+                        description = %s,
+                        updated_at = NOW()
+                    WHERE card_id = %s
+                """, (
+                    card_name, 
+                    category_id,
+                    webp_filename,
+                    webp_db_path,
+                    f"Updated via One-Shot Learning: {card_name} (PNG training source: {png_db_path})",
+                    card_id
+                ))
+                
+                cursor.execute("""
+                    UPDATE TBL_GOLDEN_DATASET 
+                    SET feature_vector = %s,
+                        feature_count = %s,
+                        image_hash = %s,
+                        last_update = NOW()
+                    WHERE card_id = %s
+                """, (feature_blob, len(kp), image_hash, card_id))
             
             # Update in-memory dataset
             for idx, item in enumerate(golden_dataset):
@@ -3209,22 +4454,28 @@ def one_shot_learning():
                 card_metadata[card_id]['name'] = card_name
                 card_metadata[card_id]['category_id'] = int(category_id)
                 card_metadata[card_id]['image_path'] = webp_db_path
+            bump_recognizer_version()
             
-            conn.commit()
-            cursor.close()
-            conn.close()
+            with db.cursor() as cursor:
+                card_catalog.refresh_card(cursor, card_id)
+            publish_catalog_change()
+            admin_response_cache.invalidate('cards')
+            prerender_card_tts(card_id)
             
             print(f"✅ Card updated: {card_name} | Features: {len(kp)} | PNG: {png_db_path} | WebP: {webp_db_path}")
+            notify_recognizer_reload('cards')
 
             variants_generated = None
             retrain_started = False
             retrain_msg = 'ORB retraining was not started'
             pipeline_warning = None
             try:
-                retrain_started, retrain_msg = maybe_start_orb_retrain(
-                    trigger='card_replace',
-                    card_id=card_id,
-                    card_name=card_name,
+                retrain_started, retrain_msg = reserve_orb_retrain('card_replace', card_id, card_name)
+                if retrain_started:
+                    retrain_msg = 'ORB retraining starts once the card images are saved'
+                queue_card_assets(
+                    card_id, card_name, img_saved, png_full_path, webp_full_path, webp_db_path,
+                    old_image_path, 'card_replace' if retrain_started else None,
                 )
             except Exception as pipeline_err:
                 pipeline_warning = f"Card updated, but pipeline failed: {pipeline_err}"
@@ -3243,6 +4494,7 @@ def one_shot_learning():
                 "orb_retrain_started": retrain_started,
                 "orb_retrain_message": retrain_msg,
                 "orb_retrain_status_url": "/admin/orb-training-status",
+                "assets_status": "queued",
                 "pipeline_warning": pipeline_warning,
             })
             
@@ -3250,41 +4502,38 @@ def one_shot_learning():
             # Create new card
             card_code = f"{safe_name[:3].upper()}{datetime.now().strftime('%H%M%S')}"
             
-            # Save PNG (high quality for training)
-            cv2.imwrite(png_full_path, img_saved, [cv2.IMWRITE_PNG_COMPRESSION, 1])
-            print(f"📸 Saved training PNG: {png_full_path}")
-            
-            # Convert and save WebP (optimized for display)
-            cv2.imwrite(webp_full_path, img_saved, [cv2.IMWRITE_WEBP_QUALITY, 85])
-            print(f"🌐 Saved display WebP: {webp_full_path}")
-            
-            # Insert card asset with WebP path for display
-            cursor.execute("""
-                INSERT INTO TBL_CARD_ASSETS 
-                (category_id, card_name, card_code, image_filename, image_path, description)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (
-                category_id, 
-                card_name, 
-                card_code,
-                webp_filename,
-                webp_db_path,
-                f"One-shot learned card: {card_name} (PNG training source: {png_db_path})"
-            ))
-            
-            new_card_id = cursor.lastrowid
-            
             # Store feature vector (trained from high-quality PNG)
             feature_blob = pickle.dumps(des)
             image_hash = hashlib.sha256(img_for_orb.tobytes()).hexdigest()
             
-            cursor.execute("""
-                INSERT INTO TBL_GOLDEN_DATASET 
-                (card_id, feature_vector, feature_count, image_hash, algorithm_version)
-                VALUES (%s, %s, %s, %s, 'ORB-KNN-v1.0')
-            """, (new_card_id, feature_blob, len(kp), image_hash))
+            with db.cursor(commit=True) as cursor:
+                # Insert card asset with WebP path for display
+                cursor.execute("""
+                    INSERT INTO TBL_CARD_ASSETS 
+                    (category_id, card_name, card_code, image_filename, image_path, description)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                """, (
+                    category_id, 
+                    card_name, 
+                    card_code,
+                    webp_filename,
+                    webp_db_path,
+                    f"One-shot learned card: {card_name} (PNG training source: {png_db_path})"
+                ))
+                
+                new_card_id = cursor.lastrowid
+                
+                cursor.execute("""
+                    INSERT INTO TBL_GOLDEN_DATASET 
+                    (card_id, feature_vector, feature_count, image_hash, algorithm_version)
+                    VALUES (%s, %s, %s, %s, 'ORB-KNN-v1.0')
+                """, (new_card_id, feature_blob, len(kp), image_hash))
             
-            conn.commit()
+            with db.cursor() as cursor:
+                card_catalog.refresh_card(cursor, new_card_id)
+            publish_catalog_change()
+            admin_response_cache.invalidate('cards')
+            prerender_card_tts(new_card_id)
             
             # Update in-memory dataset
             golden_dataset.append({
@@ -3296,22 +4545,22 @@ def one_shot_learning():
                 'category_id': int(category_id),
                 'image_path': webp_db_path
             }
-            
-            cursor.close()
-            conn.close()
+            bump_recognizer_version()
             
             print(f"✅ New card registered: {card_name} | Features: {len(kp)} | PNG: {png_db_path} | WebP: {webp_db_path}")
+            notify_recognizer_reload('cards')
 
             variants_generated = None
             retrain_started = False
             retrain_msg = 'ORB retraining was not started'
             pipeline_warning = None
             try:
-                variants_generated = None
-                retrain_started, retrain_msg = maybe_start_orb_retrain(
-                    trigger='card_add',
-                    card_id=new_card_id,
-                    card_name=card_name,
+                retrain_started, retrain_msg = reserve_orb_retrain('card_add', new_card_id, card_name)
+                if retrain_started:
+                    retrain_msg = 'ORB retraining starts once the card images are saved'
+                queue_card_assets(
+                    new_card_id, card_name, img_saved, png_full_path, webp_full_path, webp_db_path,
+                    None, 'card_add' if retrain_started else None,
                 )
             except Exception as pipeline_err:
                 pipeline_warning = f"Card added, but pipeline failed: {pipeline_err}"
@@ -3330,6 +4579,7 @@ def one_shot_learning():
                 "orb_retrain_started": retrain_started,
                 "orb_retrain_message": retrain_msg,
                 "orb_retrain_status_url": "/admin/orb-training-status",
+                "assets_status": "queued",
                 "pipeline_warning": pipeline_warning,
             })
         
@@ -3345,9 +4595,53 @@ def orb_training_status():
     return jsonify({
         "status": "success",
         "training": get_training_status_snapshot(),
+        "assets": get_card_asset_status_snapshot(),
+        "startup": get_startup_status_snapshot(),
     })
 
 
+@app.route('/admin/orb-training-events', methods=['GET'])
+def orb_training_events():
+    """Server-Sent Events stream of the current retrain run (training_progress.py).
+
+    Replays the run's events (queued, assets, phase, step/epoch with loss, accuracy
+    and ETA, variants, trainer_exit, reload, finished) and then pushes new ones as
+    they are written, from any worker. Resumes after the Last-Event-ID header.
+    """
+    global training_event_streams
+    with training_event_streams_lock:
+        if training_event_streams >= TRAINING_EVENTS_MAX_STREAMS:
+            response = jsonify({"status": "busy", "message": "Too many open progress streams; poll /admin/orb-training-status"})
+            response.headers['Retry-After'] = '10'
+            return response, 503
+        training_event_streams += 1
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    snapshot = {"training": get_training_status_snapshot(), "assets": get_card_asset_status_snapshot()}
+
+    def generate():
+        yield training_progress.format_sse(snapshot, name='status')
+        yield from training_progress.stream(
+            TRAINING_PROGRESS_PATH,
+            last_event_id,
+            poll_seconds=TRAINING_EVENTS_POLL_SECONDS,
+            max_seconds=TRAINING_EVENTS_MAX_SECONDS,
+        )
+
+    def release_stream():
+        global training_event_streams
+        with training_event_streams_lock:
+            training_event_streams -= 1
+
+    response = Response(
+        generate(),
+        mimetype='text/event-stream',
+        headers={'X-Accel-Buffering': 'no'},  # No proxy buffering of pushed events
+    )
+    response.call_on_close(release_stream)  # Also runs when the client goes away mid-stream
+    return response
+
+
 @app.route('/admin/orb-retrain', methods=['POST'])
 def admin_trigger_orb_retrain():
     """Manual retrain trigger for Admin tools."""
@@ -3367,39 +4661,41 @@ def delete_card(card_id):
     """Soft-delete a card: deactivate it and remove from the recognition dataset.
     Soft-delete preserves foreign-key integrity with TBL_SCAN_TRANSACTIONS."""
     try:
-        conn = connect_db()
-        cursor = conn.cursor()
-
-        # Fetch card info
-        cursor.execute("""
-            SELECT ca.card_name, ca.image_path, ca.image_filename
-            FROM TBL_CARD_ASSETS ca
-            WHERE ca.card_id = %s AND ca.is_active = 1
-        """, (card_id,))
-        card = cursor.fetchone()
+        with db.cursor(commit=True) as cursor:
+            # Fetch card info
+            cursor.execute("""
+                SELECT ca.card_name, ca.image_path, ca.image_filename
+                FROM TBL_CARD_ASSETS ca
+                WHERE ca.card_id = %s AND ca.is_active = 1
+            """, (card_id,))
+            card = cursor.fetchone()
 
-        if not card:
-            cursor.close()
-            conn.close()
-            return jsonify({"status": "error", "message": "Card not found or already deleted"})
+            if not card:
+                return jsonify({"status": "error", "message": "Card not found or already deleted"})
 
-        card_name, image_path, image_filename = card
+            card_name, image_path, image_filename = card
 
-        # Soft-delete: deactivate in TBL_CARD_ASSETS
-        cursor.execute("UPDATE TBL_CARD_ASSETS SET is_active = 0 WHERE card_id = %s", (card_id,))
+            # Soft-delete: deactivate in TBL_CARD_ASSETS
+            cursor.execute("UPDATE TBL_CARD_ASSETS SET is_active = 0 WHERE card_id = %s", (card_id,))
 
-        # Hard-delete from TBL_GOLDEN_DATASET (no FK restriction here)
-        cursor.execute("DELETE FROM TBL_GOLDEN_DATASET WHERE card_id = %s", (card_id,))
+            # Hard-delete from TBL_GOLDEN_DATASET (no FK restriction here)
+            cursor.execute("DELETE FROM TBL_GOLDEN_DATASET WHERE card_id = %s", (card_id,))
 
-        conn.commit()
-        cursor.close()
-        conn.close()
+        card_catalog.remove_card(card_id)
+        publish_catalog_change()
+        admin_response_cache.invalidate('cards')
+        rel = asset_relative_path(image_path)
+        if rel:
+            thumbnail_store.forget(rel)
+            asset_cache.invalidate(rel)
 
         # Remove from in-memory recognition dataset
         global golden_dataset, card_metadata
         golden_dataset = [item for item in golden_dataset if item['card_id'] != card_id]
         if card_id in card_metadata:
             del card_metadata[card_id]
+        bump_recognizer_version()
+        notify_recognizer_reload('cards')
 
         # Delete image files
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -3455,65 +4751,175 @@ def delete_card(card_id):
         print(f"❌ Card delete error: {e}")
         return jsonify({"status": "error", "message": str(e)})
 
+CARD_PERFORMANCE_KEYSET = Keyset(
+    'card_performance',
+    [('accuracy_key', 'ASC'), ('total_scans', 'DESC'), ('card_id', 'ASC')],
+    ['accuracy_key', 'total_scans', 'card_id'],
+)
+
 @app.route('/admin/card-performance', methods=['GET'])
 def get_card_performance():
     """
     Card Performance Analytics - Identifies which Eco-Cards 
     have low recognition accuracy for targeted retraining
+
+    Optional: ?category=<name>, ?needs_retraining=1, ?limit=N and ?cursor=<next_cursor>.
     """
     try:
-        conn = connect_db()
-        cursor = conn.cursor(dictionary=True)
-        
-        cursor.execute("""
-            SELECT 
-                c.card_id,
-                c.card_name,
-                cat.category_name,
-                COUNT(t.transaction_id) as total_scans,
-                SUM(CASE WHEN t.is_correct = 1 THEN 1 ELSE 0 END) as correct_scans,
-                ROUND(AVG(t.confidence_score) * 100, 1) as avg_confidence,
-                ROUND(AVG(t.response_time), 0) as avg_response_time
-            FROM TBL_CARD_ASSETS c
-            JOIN TBL_CATEGORIES cat ON c.category_id = cat.category_id
-            LEFT JOIN TBL_SCAN_TRANSACTIONS t ON c.card_id = t.card_id
-            WHERE c.is_active = 1
-            GROUP BY c.card_id, c.card_name, cat.category_name
-            ORDER BY (correct_scans / NULLIF(total_scans, 0)) ASC, total_scans DESC
-        """)
-        
-        cards = cursor.fetchall()
-        
-        performance = []
-        for card in cards:
-            total = card['total_scans'] or 0
-            correct = card['correct_scans'] or 0
-            accuracy = round((correct / total * 100), 1) if total > 0 else 0
-            
-            performance.append({
-                "card_id": card['card_id'],
-                "card_name": card['card_name'],
-                "category": card['category_name'],
-                "total_scans": total,
-                "correct_scans": correct,
-                "accuracy": accuracy,
-                "avg_confidence": card['avg_confidence'] or 0,
-                "avg_response_time": card['avg_response_time'] or 0,
-                "needs_retraining": accuracy < 80 and total >= 5
-            })
-        
-        cursor.close()
-        conn.close()
-        
-        return jsonify({
+        filters = {
+            'category': request.args.get('category', '').strip(),
+            'needs_retraining': _to_bool(request.args.get('needs_retraining', '')),
+        }
+        paginated, limit, key, position = listing_page_request(CARD_PERFORMANCE_KEYSET, filters)
+        seek_sql, seek_params = CARD_PERFORMANCE_KEYSET.seek(key)
+        inner_filter_sql, params = '', []
+        if filters['category']:
+            inner_filter_sql = "AND cat.category_name = %s"
+            params.append(filters['category'])
+        outer_filter_sql = ''
+        if filters['needs_retraining']:
+            # Same rule as needs_retraining below (accuracy rounded to 0.1 before comparing)
+            outer_filter_sql = "AND total_scans >= 5 AND ROUND(correct_scans * 100.0 / total_scans, 1) < 80"
+        params.extend(seek_params)
+        if paginated:
+            params.append(limit + 1)
+
+        with db.cursor(dictionary=True) as cursor:
+
+            # Unscanned cards sort first (accuracy_key -1), as NULL accuracy did before.
+            cursor.execute(f"""
+                SELECT * FROM (
+                    SELECT 
+                        c.card_id,
+                        c.card_name,
+                        cat.category_name,
+                        COALESCE(r.total_scans, 0) as total_scans,
+                        COALESCE(r.correct_scans, 0) as correct_scans,
+                        COALESCE(r.correct_scans * 1.0 / NULLIF(r.total_scans, 0), -1) as accuracy_key,
+                        ROUND(r.confidence_sum * 100.0 / NULLIF(r.confidence_count, 0), 1) as avg_confidence,
+                        ROUND(r.response_time_sum * 1.0 / NULLIF(r.response_time_count, 0), 0) as avg_response_time
+                    FROM TBL_CARD_ASSETS c
+                    JOIN TBL_CATEGORIES cat ON c.category_id = cat.category_id
+                    LEFT JOIN (
+                        SELECT card_id,
+                               SUM(scan_count) as total_scans,
+                               SUM(correct_count) as correct_scans,
+                               SUM(confidence_sum) as confidence_sum,
+                               SUM(confidence_count) as confidence_count,
+                               SUM(response_time_sum) as response_time_sum,
+                               SUM(response_time_count) as response_time_count
+                        FROM TBL_SCAN_DAILY_ROLLUP
+                        GROUP BY card_id
+                    ) r ON c.card_id = r.card_id
+                    WHERE c.is_active = 1
+                    {inner_filter_sql}
+                ) perf
+                WHERE {seek_sql}
+                {outer_filter_sql}
+                ORDER BY {CARD_PERFORMANCE_KEYSET.order_by()}
+                {'LIMIT %s' if paginated else ''}
+            """, tuple(params))
+
+            if paginated:
+                cards, next_cursor = CARD_PERFORMANCE_KEYSET.page(cursor, limit, filters, position)
+            else:
+                cards, next_cursor = iter_rows(cursor), None
+
+            performance = []
+            for card in cards:
+                total = int(card['total_scans'] or 0)
+                correct = int(card['correct_scans'] or 0)
+                accuracy = round((correct / total * 100), 1) if total > 0 else 0
+
+                performance.append({
+                    "card_id": card['card_id'],
+                    "card_name": card['card_name'],
+                    "category": card['category_name'],
+                    "total_scans": total,
+                    "correct_scans": correct,
+                    "accuracy": accuracy,
+                    "avg_confidence": card['avg_confidence'] or 0,
+                    "avg_response_time": card['avg_response_time'] or 0,
+                    "needs_retraining": accuracy < 80 and total >= 5
+                })
+        
+        response = {
             "status": "success",
             "cards": performance
-        })
+        }
+        if paginated:
+            response["next_cursor"] = next_cursor
+        return jsonify(response)
         
+    except CursorError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
     except Exception as e:
         print(f"❌ Card performance error: {e}")
         return jsonify({"status": "error", "message": str(e)})
 
+@app.route('/admin/export/scans', methods=['GET'])
+def export_scan_transactions():
+    """
+    Raw scan history for offline analysis (scan_export.py)
+    ?format=csv (streamed) | parquet, filters: start, end (YYYY-MM-DD, inclusive), session_id, nickname
+    """
+    try:
+        export_format = request.args.get('format', 'csv').strip().lower()
+        if export_format not in scan_export.FORMATS:
+            raise scan_export.ExportError(f"format must be one of {', '.join(scan_export.FORMATS)}")
+        filters = scan_export.parse_filters(
+            request.args.get('start'),
+            request.args.get('end'),
+            request.args.get('session_id'),
+            request.args.get('nickname'),
+        )
+    except scan_export.ExportError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    filename = f"EcoLearn_Scans_{datetime.now().strftime('%Y-%m-%d')}.{export_format}"
+    try:
+        # Own connection: a long download must not hold one of the kiosks' pool slots.
+        conn = open_connection(DB_CONFIG)
+    except Exception as e:
+        print(f"❌ Scan export error: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+    chunks = scan_export.iter_chunks(conn, filters, SCAN_EXPORT_CHUNK_ROWS, SCAN_EXPORT_PAUSE_SECONDS)
+
+    if export_format == 'csv':
+        def generate():
+            try:
+                yield from scan_export.iter_csv(chunks)
+            except Exception as e:
+                print(f"❌ Scan export stream error: {e}")
+                raise
+            finally:
+                chunks.close()
+                conn.close()
+
+        return Response(
+            generate(),
+            mimetype='text/csv',
+            headers={'Content-Disposition': f'attachment; filename={filename}'},
+        )
+
+    # Parquet needs its footer written last, so build the file (one row group per chunk) first.
+    fd, path = tempfile.mkstemp(prefix='ecolearn-scans-', suffix='.parquet')
+    os.close(fd)
+    try:
+        rows = scan_export.write_parquet(chunks, path)
+    except Exception as e:
+        os.remove(path)
+        print(f"❌ Scan export error: {e}")
+        status = 400 if isinstance(e, scan_export.ExportError) else 500
+        return jsonify({"status": "error", "message": str(e)}), status
+    finally:
+        chunks.close()
+        conn.close()
+    print(f"📤 Exported {rows} scans to Parquet")
+    response = send_file(path, mimetype='application/vnd.apache.parquet', as_attachment=True, download_name=filename)
+    response.call_on_close(lambda: os.remove(path))
+    return response
+
 # ============================================================
 # STATIC FILE SERVING WITH AGGRESSIVE CACHING
 # Serves images with 1-year cache + WebP support
@@ -3526,90 +4932,105 @@ def serve_assets(filename):
     Serve static assets with aggressive caching.
     Browser will cache for 1 year - no more repeat downloads!
     Auto-serves WebP when browser supports it.
+    Small files are served from memory (asset_cache.py) with a strong ETag and
+    a precompressed gzip variant for text types.
     """
-    # Assets are in ../assets relative to backend/
-    assets_dir = os.path.join(os.path.dirname(__file__), '..', 'assets')
-    
-    # Check if browser accepts WebP and WebP version exists
-    if 'image/webp' in request.headers.get('Accept', ''):
-        webp_filename = os.path.splitext(filename)[0] + '.webp'
-        webp_path = os.path.join(assets_dir, webp_filename)
-        if os.path.exists(webp_path):
-            response = send_from_directory(assets_dir, webp_filename)
-            response.headers['Content-Type'] = 'image/webp'
-            response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
-            response.headers['Vary'] = 'Accept'
-            return response
-    
-    # Serve original file with caching
-    response = send_from_directory(assets_dir, filename)
+    accept_webp = 'image/webp' in request.headers.get('Accept', '')
+    asset = asset_cache.get(filename, accept_webp)
+    if asset is None:
+        # Missing (404) or too large to keep in memory: stream from disk
+        response = send_from_directory(ASSETS_DIR, filename)
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
+
+    use_gzip = asset.gzip_body is not None and 'gzip' in request.headers.get('Accept-Encoding', '')
+    etag = f"{asset.etag}-gz" if use_gzip else asset.etag
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        asset_cache.record_not_modified()
+        response = Response(status=304)
+    else:
+        response = Response(asset.gzip_body if use_gzip else asset.body, mimetype=asset.mimetype)
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+    response.set_etag(etag)
     response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    vary = []
+    if asset.rel_path != filename.replace('\\', '/') or asset.webp_sibling:
+        vary.append('Accept')
+    if asset.gzip_body is not None:
+        vary.append('Accept-Encoding')
+    if vary:
+        response.headers['Vary'] = ', '.join(vary)
     return response
 
 @app.route('/assets/thumb/<path:filename>')
 def serve_thumbnail(filename):
     """
-    Serve optimized thumbnails for gallery (120x150, WebP).
-    Much smaller than full images = faster gallery loading!
-    Falls back to full image if thumbnail doesn't exist.
+    Gallery thumbnail as WebP, ?w=120|240|480 for srcset (other widths round up).
+    Rendered from the card image on first request (or when the card is saved) and
+    kept on disk (thumbnails.py); falls back to the full image if it cannot be rendered.
     """
-    assets_dir = os.path.join(os.path.dirname(__file__), '..', 'assets')
-    
-    # Extract category folder and filename
-    parts = filename.split('/')
-    if len(parts) >= 2:
-        category = parts[0]
-        img_name = parts[1]
-        thumb_name = os.path.splitext(img_name)[0] + '_thumb.webp'
-        thumb_path = os.path.join(assets_dir, category, 'thumbs', thumb_name)
-        
-        if os.path.exists(thumb_path):
-            response = send_from_directory(
-                os.path.join(assets_dir, category, 'thumbs'), 
-                thumb_name
-            )
-            response.headers['Content-Type'] = 'image/webp'
-            response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
-            return response
-    
-    # Fallback to regular asset serving
-    return serve_assets(filename)
+    found = thumbnail_store.get(filename, request.args.get('w', THUMB_WIDTHS[0]))
+    if found is None:
+        return serve_assets(filename)
+    path, etag = found
+    return send_file(
+        path, mimetype='image/webp', conditional=True, etag=etag, max_age=THUMB_BROWSER_CACHE_SECONDS
+    )
 
 # ============================================
-# TEXT-TO-SPEECH (Tagalog) via gTTS
+# TEXT-TO-SPEECH (Tagalog), cached on disk (tts_cache.py)
 # ============================================
 
-@app.route('/tts', methods=['POST'])
+def _tts_audio_response(audio: bytes, cache_state: str):
+    etag = make_etag(audio)
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        response = Response(status=304)
+    else:
+        response = Response(audio, mimetype='audio/mpeg')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'public, max-age={TTS_BROWSER_CACHE_SECONDS}'
+    response.headers['X-Cache'] = cache_state
+    return response
+
+
+@app.route('/tts', methods=['GET', 'POST'])
 def text_to_speech():
     """
-    Generate Tagalog speech audio from text using Google TTS.
-    Returns MP3 audio stream.
+    Tagalog speech audio for a feedback phrase.
+    GET /tts?text=...&lang=tl returns raw audio/mpeg with a strong ETag (browser-cacheable);
+    POST {text, lang} keeps the older base64-in-JSON answer.
+    Both are served from the on-disk cache and only synthesize phrases not heard before.
     """
     try:
         if not ENABLE_AUDIO_FEEDBACK:
             return jsonify({"status": "disabled", "message": "Audio feedback is disabled"}), 403
 
-        data = request.get_json()
-        text = data.get('text', '')
-        lang = data.get('lang', 'tl')  # Default to Tagalog
-        
-        if not text:
-            return jsonify({"error": "No text provided"}), 400
-        
-        # Generate speech
-        tts = gTTS(text=text, lang=lang, slow=False)
-        
-        # Write to memory buffer
-        audio_buffer = io.BytesIO()
-        tts.write_to_fp(audio_buffer)
-        audio_buffer.seek(0)
-        
-        # Return as base64 JSON to prevent IDM from intercepting
-        audio_b64 = base64.b64encode(audio_buffer.read()).decode('utf-8')
-        return jsonify({
+        if request.method == 'GET':
+            params = request.args
+        else:
+            params = request.get_json(silent=True) or {}
+        try:
+            text, lang = validate_request(params.get('text', ''), params.get('lang', 'tl'))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        audio, hit = tts_cache.get(text, lang)
+        cache_state = 'HIT' if hit else 'MISS'
+        if request.method == 'GET':
+            return _tts_audio_response(audio, cache_state)
+
+        # Legacy clients: base64 JSON (kept so download managers do not intercept the audio)
+        response = jsonify({
             'status': 'success',
-            'audio': audio_b64
+            'audio': base64.b64encode(audio).decode('utf-8')
         })
+        response.headers['X-Cache'] = cache_state
+        return response
+    except TTSError as e:
+        # Offline and not cached yet: the kiosk falls back to browser speech synthesis.
+        print(f"⚠️ TTS unavailable: {e}")
+        return jsonify({"error": str(e)}), 503
     except Exception as e:
         print(f"❌ TTS Error: {e}")
         return jsonify({"error": str(e)}), 500
@@ -3617,9 +5038,15 @@ def text_to_speech():
 @app.after_request
 def add_cache_headers(response):
     """Add cache headers to all responses"""
+    # Cached admin endpoints set their own ETag revalidation headers.
+    if 'ETag' in response.headers and request.path.startswith('/admin/'):
+        pass
     # Don't cache API responses that change frequently
-    if request.path.startswith('/admin/') or request.path == '/scan':
+    elif request.path.startswith('/admin/') or request.path == '/scan':
         response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
+    # Thumbnails set their own revalidating headers (same URL across card replacements).
+    elif request.path.startswith('/assets/thumb/'):
+        pass
     # Don't aggressively cache admin dashboard scripts; they change often.
     elif request.path.startswith('/js/admin'):
         response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
@@ -3628,17 +5055,137 @@ def add_cache_headers(response):
         response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
     return response
 
-if __name__ == '__main__':
+@app.before_request
+def per_worker_housekeeping():
+    init_worker_process()
+    maybe_reload_models_from_disk()
+
+
+def init_worker_process(multi_process: bool = False, background_jobs: bool = False):
+    """Per-process setup; runs once in every serving process (after fork under gunicorn).
+
+    Threads do not survive fork() and pooled MySQL sockets must not be shared between
+    processes, so both are recreated in each worker. With background_jobs, the one process
+    that claims the lock file also runs the startup jobs.
+    """
+    global worker_pid, MULTI_PROCESS_SERVING
+
+    if multi_process:
+        MULTI_PROCESS_SERVING = True
+    if worker_pid == os.getpid():
+        return
+    with worker_init_lock:
+        if worker_pid == os.getpid():
+            return
+        if os.getpid() != runtime_init_pid:
+            create_db_pool()
+        start_reaper(kiosk_sessions, mark_sessions_abandoned, SESSION_REAPER_INTERVAL_SECONDS)
+        if MULTI_PROCESS_SERVING:
+            scan_log_writer.sync_dir = SCAN_LOG_SYNC_DIR
+        scan_log_writer.start()
+        if background_jobs and claim_background_jobs():
+            start_startup_jobs(recognizer_stages=inference_client is None)
+        worker_pid = os.getpid()
+
+
+class StartupTimer:
+    """Wall-clock timings of startup phases, printed as one report and shown in /health."""
+
+    def __init__(self, origin: float):
+        self.origin = origin
+        self.phases = []
+
+    def record(self, name: str, seconds: float):
+        self.phases.append((name, seconds))
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def as_dict(self) -> dict:
+        timings = {name: round(seconds * 1000, 1) for name, seconds in self.phases}
+        timings['total'] = round((time.perf_counter() - self.origin) * 1000, 1)
+        return timings
+
+    def report(self):
+        timings = self.as_dict()
+        total = timings.pop('total')
+        print("⏱️ Startup timing:")
+        for name, ms in timings.items():
+            print(f"   {name:<16} {ms:>8.1f} ms")
+        print(f"   {'total':<16} {total:>8.1f} ms")
+
+
+startup_timer = StartupTimer(_import_started)
+startup_timing_ms = {}
+
+
+def create_app(start_background_jobs: bool = True):
+    """Application factory: load card data, runtime config and ONNX models once.
+
+    Under gunicorn with preload_app this runs in the master before workers fork, so the
+    descriptors and nets are shared copy-on-write instead of loaded once per worker.
+    Whatever recognizers exist are attached immediately; first-boot training and model
+    import run as background startup jobs (see /admin/orb-training-status). The master
+    must not start them (start_background_jobs=False): threads do not survive fork() and
+    locks they hold would be inherited mid-use, so a worker claims them instead
+    (init_worker_process(background_jobs=True)).
+    """
+    global runtime_initialized, runtime_init_pid, startup_timing_ms, analytics_backfill_needed
+
+    if runtime_initialized:
+        return app
+
+    startup_timer.record('import', time.perf_counter() - _import_started)
     print("🚀 Starting EcoLearn Recognition Engine...")
     print("📦 Gzip compression: ENABLED")
     print("🖼️  Image caching: 1 YEAR")
-    if load_model():
+    with startup_timer.phase('db_pool'):
+        create_db_pool()
+    with startup_timer.phase('card_data'):
+        loaded = load_model()
+    if not loaded:
+        raise RuntimeError("Failed to start - Model loading error")
+
+    with startup_timer.phase('runtime_config'):
         load_runtime_config_from_db()
-        maybe_auto_run_training_if_needed()
-        ensure_default_orb_model_assets()
-        load_orb_model()
-        load_incremental_orb_model()
-        print("✅ System Ready!")
-        app.run(host='0.0.0.0', port=5000, debug=True)
+    with startup_timer.phase('rollups'):
+        analytics_backfill_needed = ensure_analytics_rollups()
+    if inference_client is not None:
+        # Nets live in the sidecar; this process keeps card data for the admin/session routes.
+        print(f"🔌 Recognition served by inference sidecar at {INFERENCE_SIDECAR_ADDRESS}")
+        if start_background_jobs:
+            start_startup_jobs(recognizer_stages=False)
+    else:
+        with startup_timer.phase('recognizers'):
+            if os.path.exists(ORB_MODEL_PATH) and os.path.exists(ORB_LABELS_PATH):
+                ensure_default_orb_model_assets()  # Existing export: only records the import marker
+            load_orb_model()
+            load_incremental_orb_model()
+        if start_background_jobs:
+            start_startup_jobs()
+    if not start_background_jobs:
+        _update_startup_status(state='pending')  # Replaces the previous boot's status file
+    runtime_initialized = True
+    runtime_init_pid = os.getpid()
+    startup_timing_ms = startup_timer.as_dict()
+    startup_timer.report()
+    print("✅ System Ready!")
+    return app
+
+
+if __name__ == '__main__':
+    # Development server (single process, auto-reload). See wsgi.py for production serving.
+    # With debug=True the reloader re-runs this module in a child process; only that
+    # child (WERKZEUG_RUN_MAIN=true) serves requests, so only it runs startup jobs.
+    try:
+        create_app(start_background_jobs=os.environ.get('WERKZEUG_RUN_MAIN') == 'true')
+    except RuntimeError as e:
+        print(f"❌ {e}")
     else:
-        print("❌ Failed to start - Model loading error")
\ No newline at end of file
+        init_worker_process()
+        app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
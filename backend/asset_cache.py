@@ -0,0 +1,212 @@
+"""
+asset_cache.py
+--------------
+Bounded in-memory cache for /assets (card images, mascot art, frames).
+
+Every kiosk reads the same few hundred small files over and over; serving them
+from disk meant an exists() probe for a WebP sibling plus a send_from_directory
+per request. Each cached entry holds:
+
+- the bytes, content type and a strong content ETag (304 on If-None-Match),
+- the source mtime/size it was read at (entries are re-checked against the
+  file at most every `revalidate_seconds`, not per request),
+- a gzip variant for compressible types (SVG, CSS, JS, JSON, text), and
+- the resolved WebP sibling of a PNG/JPEG, so content negotiation is a lookup.
+
+The one-shot and delete flows call invalidate(); other worker processes follow
+through a stamp file (checked at most every `stamp_check_seconds`). Files larger
+than `max_file_bytes` are not cached; least recently used entries are dropped
+once the cache holds more than `max_bytes`.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+COMPRESSIBLE_TYPES = ('image/svg+xml', 'text/css', 'text/javascript', 'application/javascript',
+                      'application/json', 'text/plain')
+WEBP_SOURCE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+
+@dataclass
+class CachedAsset:
+    rel_path: str
+    mtime_ns: int
+    size: int
+    body: bytes
+    mimetype: str
+    etag: str
+    gzip_body: bytes | None
+    webp_sibling: str | None  # rel path of 'name.webp' next to a PNG/JPEG, if present
+    checked_at: float
+
+
+class AssetCache:
+    def __init__(self, root: str, max_bytes: int = 64 * 1024 * 1024, max_file_bytes: int = 4 * 1024 * 1024,
+                 revalidate_seconds: float = 30.0, stamp_path: str | None = None, stamp_check_seconds: float = 1.0):
+        self.root = os.path.realpath(root)
+        self.max_bytes = int(max_bytes)
+        self.max_file_bytes = int(max_file_bytes)
+        self.revalidate_seconds = float(revalidate_seconds)
+        self.stamp_path = stamp_path
+        self.stamp_check_seconds = float(stamp_check_seconds)
+        self._entries: OrderedDict[str, CachedAsset] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._seen_stamp = self._read_stamp()
+        self._stamp_checked_at = time.monotonic()
+        self._stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'uncacheable': 0, 'invalidations': 0}
+
+    # --- cross-worker invalidation ---
+    def _read_stamp(self):
+        if not self.stamp_path:
+            return None
+        try:
+            return os.stat(self.stamp_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _sync_with_other_workers(self, now: float) -> None:
+        if not self.stamp_path or now - self._stamp_checked_at < self.stamp_check_seconds:
+            return
+        self._stamp_checked_at = now
+        stamp = self._read_stamp()
+        if stamp != self._seen_stamp:
+            self._seen_stamp = stamp
+            self._entries.clear()
+            self._bytes = 0
+
+    # --- lookups ---
+    def _resolve(self, rel: str) -> str | None:
+        path = os.path.realpath(os.path.join(self.root, rel))
+        if not path.startswith(self.root + os.sep):
+            return None
+        return path
+
+    def _read(self, rel: str, now: float) -> CachedAsset | None:
+        path = self._resolve(rel)
+        if path is None:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isfile(path) or st.st_size > self.max_file_bytes:
+            with self._lock:
+                self._stats['uncacheable'] += 1
+            return None
+        with open(path, 'rb') as f:
+            body = f.read()
+        mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        gzip_body = None
+        if mimetype in COMPRESSIBLE_TYPES and len(body) > 500:
+            packed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(packed) < len(body) * 0.9:
+                gzip_body = packed
+        webp_sibling = None
+        stem, ext = os.path.splitext(rel)
+        if ext.lower() in WEBP_SOURCE_EXTENSIONS and os.path.isfile(os.path.join(self.root, stem + '.webp')):
+            webp_sibling = stem + '.webp'
+        return CachedAsset(
+            rel_path=rel,
+            mtime_ns=st.st_mtime_ns,
+            size=st.st_size,
+            body=body,
+            mimetype=mimetype,
+            etag=hashlib.sha1(body).hexdigest()[:20],
+            gzip_body=gzip_body,
+            webp_sibling=webp_sibling,
+            checked_at=now,
+        )
+
+    def _still_current(self, entry: CachedAsset, now: float) -> bool:
+        if now - entry.checked_at < self.revalidate_seconds:
+            return True
+        try:
+            st = os.stat(os.path.join(self.root, entry.rel_path))
+        except OSError:
+            return False
+        if (st.st_mtime_ns, st.st_size) != (entry.mtime_ns, entry.size):
+            return False
+        entry.checked_at = now
+        return True
+
+    def _load(self, rel: str) -> CachedAsset | None:
+        rel = os.path.normpath(rel).replace(os.sep, '/')
+        now = time.monotonic()
+        with self._lock:
+            self._sync_with_other_workers(now)
+            entry = self._entries.get(rel)
+            if entry is not None and self._still_current(entry, now):
+                self._entries.move_to_end(rel)
+                self._stats['hits'] += 1
+                return entry
+            if entry is not None:
+                self._drop(rel)
+            self._stats['misses'] += 1
+        entry = self._read(rel, now)
+        if entry is None:
+            return None
+        with self._lock:
+            if rel in self._entries:
+                self._drop(rel)
+            self._entries[rel] = entry
+            self._bytes += len(entry.body) + len(entry.gzip_body or b'')
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                self._drop(next(iter(self._entries)))
+        return entry
+
+    def _drop(self, rel: str) -> None:
+        entry = self._entries.pop(rel, None)
+        if entry is not None:
+            self._bytes -= len(entry.body) + len(entry.gzip_body or b'')
+
+    def get(self, rel: str, accept_webp: bool = False) -> CachedAsset | None:
+        """The asset to send for `rel` (its WebP sibling when the client accepts WebP), or None
+        when it does not exist or is too large to cache."""
+        entry = self._load(rel)
+        if entry is not None and accept_webp and entry.webp_sibling:
+            return self._load(entry.webp_sibling) or entry
+        return entry
+
+    def record_not_modified(self) -> None:
+        with self._lock:
+            self._stats['not_modified'] += 1
+
+    def invalidate(self, *rels: str) -> None:
+        """Forget the given asset paths (and entries pointing at them as WebP sibling); all when none given."""
+        wanted = {os.path.normpath(r).replace(os.sep, '/') for r in rels if r}
+        with self._lock:
+            if wanted:
+                stale = [k for k, e in self._entries.items() if k in wanted or e.webp_sibling in wanted]
+                for key in stale:
+                    self._drop(key)
+                # A new file may become some PNG's WebP sibling.
+                stems = {os.path.splitext(r)[0] for r in wanted}
+                for key in [k for k in self._entries if os.path.splitext(k)[0] in stems]:
+                    self._drop(key)
+            else:
+                self._entries.clear()
+                self._bytes = 0
+            self._stats['invalidations'] += 1
+            if self.stamp_path:
+                try:
+                    Path(self.stamp_path).touch()
+                    self._seen_stamp = self._read_stamp()
+                except OSError:
+                    pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['entries'] = len(self._entries)
+            snapshot['bytes'] = self._bytes
+        return snapshot
@@ -0,0 +1,230 @@
+"""
+catalog.py
+----------
+Versioned in-memory snapshot of the card catalog (TBL_CATEGORIES + active
+TBL_CARD_ASSETS rows).
+
+The admin gallery, asset repository, asset counts and PDF endpoints used to JOIN
+both tables on every call although the catalog only changes on one-shot learn,
+card delete and PDF generation. The snapshot is loaded with the recognizer data,
+replaced copy-on-write by those edits (each edit bumps `version`), and renders each
+endpoint payload to JSON bytes once per version, so requests are served without a
+database round trip and revalidated with a version ETag.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass, field, replace
+
+CATEGORY_COLUMNS = "category_id, category_name, bin_color, display_order, is_active"
+CARD_COLUMNS = (
+    "card_id, category_id, card_name, card_code, image_filename, image_path, "
+    "description, pdf_generated"
+)
+SELECT_CATEGORIES_SQL = f"SELECT {CATEGORY_COLUMNS} FROM TBL_CATEGORIES"
+SELECT_CARDS_SQL = f"SELECT {CARD_COLUMNS} FROM TBL_CARD_ASSETS WHERE is_active = 1"
+
+
+def png_path_for(image_path: str) -> str:
+    """Training PNG that one-shot learn saves next to each display WebP."""
+    if not image_path or not image_path.startswith('assets/'):
+        return ''
+    stem = image_path[len('assets/'):].rsplit('.', 1)[0]
+    return f"assets_png/{stem}.png"
+
+
+@dataclass(frozen=True)
+class CatalogCategory:
+    category_id: int
+    name: str
+    bin_color: str
+    display_order: int
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class CatalogCard:
+    card_id: int
+    category_id: int
+    name: str
+    card_code: str
+    image_filename: str
+    image_path: str  # WebP for display
+    png_path: str  # Training source
+    description: str
+    pdf_generated: bool
+
+
+def _row_dict(row, columns: str) -> dict:
+    if isinstance(row, dict):
+        return row
+    return dict(zip([c.strip() for c in columns.split(',')], row))
+
+
+def _category_from_row(row) -> CatalogCategory:
+    row = _row_dict(row, CATEGORY_COLUMNS)
+    return CatalogCategory(
+        category_id=int(row['category_id']),
+        name=row['category_name'],
+        bin_color=row.get('bin_color') or '',
+        display_order=int(row.get('display_order') or 0),
+        is_active=bool(row.get('is_active', 1)),
+    )
+
+
+def _card_from_row(row) -> CatalogCard:
+    row = _row_dict(row, CARD_COLUMNS)
+    image_path = row.get('image_path') or ''
+    return CatalogCard(
+        card_id=int(row['card_id']),
+        category_id=int(row['category_id']),
+        name=row['card_name'],
+        card_code=row.get('card_code') or '',
+        image_filename=row.get('image_filename') or '',
+        image_path=image_path,
+        png_path=png_path_for(image_path),
+        description=row.get('description') or '',
+        pdf_generated=bool(row.get('pdf_generated')),
+    )
+
+
+def _encode(payload) -> bytes:
+    # Same shape as Flask's jsonify in production (sorted keys, compact).
+    return json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    version: int
+    categories: dict  # category_id -> CatalogCategory
+    cards: dict  # card_id -> CatalogCard (active cards only)
+    _rendered: dict = field(default_factory=dict, compare=False, repr=False)
+    _render_lock: threading.Lock = field(default_factory=threading.Lock, compare=False, repr=False)
+
+    def ordered_cards(self) -> list[CatalogCard]:
+        """Cards in gallery order: category display order, then card name."""
+        def sort_key(card):
+            category = self.categories.get(card.category_id)
+            return (category.display_order if category else 0, card.name.casefold(), card.card_id)
+        return sorted(self.cards.values(), key=sort_key)
+
+    def rendered(self, name: str, build) -> tuple[bytes, str]:
+        """JSON bytes and ETag for payload `name`, built once per snapshot version."""
+        with self._render_lock:
+            cached = self._rendered.get(name)
+            if cached is None:
+                body = _encode(build(self))
+                # Content digest keeps ETags distinct across worker processes, whose versions diverge.
+                digest = hashlib.sha1(body).hexdigest()[:12]
+                cached = (body, f"catalog-v{self.version}-{digest}")
+                self._rendered[name] = cached
+            return cached
+
+
+class Catalog:
+    """Holder of the current CatalogSnapshot; edits publish a new snapshot."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = CatalogSnapshot(version=0, categories={}, cards={})
+
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        return self._snapshot
+
+    def _publish(self, categories: dict, cards: dict) -> CatalogSnapshot:
+        self._snapshot = CatalogSnapshot(
+            version=self._snapshot.version + 1, categories=categories, cards=cards
+        )
+        return self._snapshot
+
+    def load(self, cursor) -> CatalogSnapshot:
+        """Replace the snapshot from the database."""
+        cursor.execute(SELECT_CATEGORIES_SQL)
+        categories = {c.category_id: c for c in map(_category_from_row, cursor.fetchall())}
+        cursor.execute(SELECT_CARDS_SQL)
+        cards = {c.card_id: c for c in map(_card_from_row, cursor.fetchall())}
+        with self._lock:
+            return self._publish(categories, cards)
+
+    def refresh_card(self, cursor, card_id: int) -> CatalogSnapshot:
+        """Re-read one card after an insert/update (dropped if it is no longer active)."""
+        cursor.execute(f"{SELECT_CARDS_SQL} AND card_id = %s", (card_id,))
+        row = cursor.fetchone()
+        with self._lock:
+            cards = dict(self._snapshot.cards)
+            if row is None:
+                cards.pop(card_id, None)
+            else:
+                cards[card_id] = _card_from_row(row)
+            return self._publish(self._snapshot.categories, cards)
+
+    def remove_card(self, card_id: int) -> CatalogSnapshot:
+        with self._lock:
+            cards = dict(self._snapshot.cards)
+            cards.pop(card_id, None)
+            return self._publish(self._snapshot.categories, cards)
+
+    def mark_pdf_generated(self, card_id: int) -> CatalogSnapshot:
+        with self._lock:
+            card = self._snapshot.cards.get(card_id)
+            if card is None or card.pdf_generated:
+                return self._snapshot
+            cards = dict(self._snapshot.cards)
+            cards[card_id] = replace(card, pdf_generated=True)
+            return self._publish(self._snapshot.categories, cards)
+
+
+# --- endpoint payloads (rendered once per snapshot) ---
+
+def cards_minimal_payload(snapshot: CatalogSnapshot) -> dict:
+    cards = []
+    for card in snapshot.ordered_cards():
+        category = snapshot.categories.get(card.category_id)
+        if category is None:
+            continue
+        cards.append({
+            "card_id": card.card_id,
+            "card_name": card.name,
+            "image_path": card.image_path,
+            "category_name": category.name,
+            "bin_color": category.bin_color,
+        })
+    return {"status": "success", "cards": cards}
+
+
+def asset_repository_payload(snapshot: CatalogSnapshot) -> dict:
+    by_category = {}
+    total = 0
+    for card in snapshot.ordered_cards():
+        category = snapshot.categories.get(card.category_id)
+        if category is None:
+            continue
+        total += 1
+        group = by_category.setdefault(category.name, {"bin_color": category.bin_color, "cards": []})
+        group["cards"].append({
+            "card_id": card.card_id,
+            "card_name": card.name,
+            "card_code": card.card_code,
+            "image_path": card.image_path,
+            "pdf_generated": card.pdf_generated,
+        })
+    return {"status": "success", "total_cards": total, "categories": by_category}
+
+
+def asset_counts_payload(snapshot: CatalogSnapshot) -> dict:
+    counts = {}
+    active = sorted(
+        (c for c in snapshot.categories.values() if c.is_active),
+        key=lambda c: (c.display_order, c.category_id),
+    )
+    for category in active:
+        counts[category.name] = 0
+    for card in snapshot.cards.values():
+        category = snapshot.categories.get(card.category_id)
+        if category is not None and category.is_active:
+            counts[category.name] += 1
+    return {"status": "success", "total_cards": sum(counts.values()), "counts": counts}
@@ -0,0 +1,410 @@
+"""
+db.py
+-----
+Data-access layer for the EcoLearn backend.
+
+Storage backend is chosen by ECOLEARN_DB_BACKEND: 'mysql' (default, multi-kiosk
+installs) or 'sqlite' (single-file embedded database for laptop-only installs, see
+db_sqlite.py). Both expose the same Database interface and mysql.connector-style
+connections/cursors, so route code is backend-agnostic.
+
+MySQL backend:
+
+- Bounded checkout: callers wait (up to checkout_timeout) for a pooled connection
+  instead of silently opening fresh ones when the pool is exhausted; wait time is
+  recorded for /admin/db-pool-stats.
+- Guaranteed return: connections go back to the pool on close(), on leaving a
+  `with` block, or - as a safety net - when the handle is garbage collected.
+  Returned connections are rolled back so no open snapshot leaks to the next user.
+- The driver is imported on first use, so SQLite-only installs do not need it.
+- Prepared statements: query()/execute() reuse a per-connection cache of prepared
+  cursors (C extension when available), so hot statements are parsed once. Statement
+  ids die with the server session, so a connection's cache is dropped when the pool
+  reconnects it (new server connection id) and after any driver error on it.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+
+MAX_POOL_SIZE = 32  # mysql.connector's hard limit per pool
+STATEMENT_CACHE_SIZE = 64  # Prepared statements kept per connection
+BACKENDS = ('mysql', 'sqlite')
+DEFAULT_SQLITE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'ecolearn.sqlite3')
+
+
+class PoolExhaustedError(RuntimeError):
+    """No pooled connection became free within the checkout timeout."""
+
+
+def default_pool_size() -> int:
+    """ECOLEARN_DB_POOL_SIZE, else sized to this process's request threads plus
+    background threads (scan writer, session reaper, training/startup jobs)."""
+    configured = os.environ.get('ECOLEARN_DB_POOL_SIZE')
+    if configured:
+        return max(1, min(MAX_POOL_SIZE, int(configured)))
+    threads = os.environ.get('ECOLEARN_THREADS')
+    base = int(threads) + 3 if threads else (os.cpu_count() or 2) * 2 + 4
+    return max(5, min(MAX_POOL_SIZE, base))
+
+
+class _Lease:
+    __slots__ = ('pooled', 'from_pool', 'released', 'checked_out_at')
+
+    def __init__(self, pooled, from_pool: bool):
+        self.pooled = pooled
+        self.from_pool = from_pool
+        self.released = False
+        self.checked_out_at = time.monotonic()
+
+
+class CheckedOutConnection:
+    """Connection handle returned by Database.connect(); close() returns it to the pool."""
+
+    def __init__(self, database: 'Database', lease: _Lease):
+        self._database = database
+        self._lease = lease
+        self._finalizer = weakref.finalize(self, database._release, lease, True)
+
+    def __getattr__(self, name):
+        return getattr(self._lease.pooled, name)
+
+    @property
+    def raw(self):
+        """Underlying driver connection (unwrapped from the pool proxy)."""
+        return getattr(self._lease.pooled, '_cnx', self._lease.pooled)
+
+    def close(self):
+        self._finalizer.detach()
+        self._database._release(self._lease, False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class BaseDatabase:
+    """Helpers shared by every backend; subclasses provide open(), connect() and stats()."""
+
+    backend = None
+
+    @contextmanager
+    def connection(self):
+        conn = self.connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def cursor(self, dictionary: bool = False, commit: bool = False):
+        """Cursor on a checked-out connection; commits on success when commit=True,
+        rolls back on error, and always returns the connection."""
+        with self.connection() as conn:
+            cursor = conn.cursor(dictionary=dictionary)
+            try:
+                yield cursor
+                if commit:
+                    conn.commit()
+            except Exception:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                raise
+            finally:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+
+    @contextmanager
+    def snapshot_cursor(self, dictionary: bool = True):
+        """Cursor inside a read-only transaction: every statement sees the same
+        consistent snapshot (long reports that must not mix before/after rows)."""
+        with self.connection() as conn:
+            conn.start_transaction(consistent_snapshot=True, isolation_level='REPEATABLE READ', readonly=True)
+            cursor = conn.cursor(dictionary=dictionary)
+            try:
+                yield cursor
+            finally:
+                try:
+                    cursor.close()
+                finally:
+                    conn.rollback()
+
+    def _statement_cursor(self, conn, sql: str):
+        """Cursor for a single statement; returns (cursor, reusable)."""
+        return conn.cursor(), False
+
+    def _statement_failed(self, conn, error: Exception) -> None:
+        """Hook for backends that cache per-connection statement state."""
+
+    def query(self, sql: str, params=(), dictionary: bool = True) -> list:
+        """Run a read statement and fetch all rows (prepared/cached where the backend supports it)."""
+        with self.connection() as conn:
+            cursor, reusable = self._statement_cursor(conn, sql)
+            try:
+                cursor.execute(sql, tuple(params))
+                rows = cursor.fetchall()
+                if not dictionary:
+                    return rows
+                columns = cursor.column_names
+                return [dict(zip(columns, row)) for row in rows]
+            except Exception as e:
+                self._statement_failed(conn, e)
+                raise
+            finally:
+                if not reusable:
+                    cursor.close()
+
+    def query_one(self, sql: str, params=(), dictionary: bool = True):
+        rows = self.query(sql, params, dictionary=dictionary)
+        return rows[0] if rows else None
+
+    def execute(self, sql: str, params=(), commit: bool = True) -> int:
+        """Run a write statement. Returns rowcount."""
+        with self.connection() as conn:
+            cursor, reusable = self._statement_cursor(conn, sql)
+            try:
+                cursor.execute(sql, tuple(params))
+                rowcount = cursor.rowcount
+                if commit:
+                    conn.commit()
+                return rowcount
+            except Exception as e:
+                self._statement_failed(conn, e)
+                raise
+            finally:
+                if not reusable:
+                    cursor.close()
+
+
+class Database(BaseDatabase):
+    backend = 'mysql'
+
+    def __init__(self, config: dict, pool_name: str = 'ecolearn_pool',
+                 pool_size: int | None = None, checkout_timeout: float = 10.0):
+        self.config = dict(config)
+        self.pool_name = pool_name
+        self.pool_size = pool_size
+        self.checkout_timeout = float(checkout_timeout)
+        self.pool = None
+        self._slots = None
+        self._stats_lock = threading.Lock()
+        # raw connection -> (server connection id, OrderedDict(sql -> prepared cursor))
+        self._statements = weakref.WeakKeyDictionary()
+        self._reset_stats()
+
+    def _reset_stats(self):
+        with self._stats_lock:
+            self._stats = {
+                'checkouts': 0,
+                'waited_checkouts': 0,  # Had to wait for a free connection
+                'wait_ms_total': 0.0,
+                'wait_ms_max': 0.0,
+                'timeouts': 0,
+                'in_use': 0,
+                'peak_in_use': 0,
+                'leaked_returns': 0,  # Returned by GC because the caller never closed them
+                'direct_connections': 0,  # Pool unavailable
+                'prepared_hits': 0,
+                'prepared_misses': 0,
+                'prepared_invalidations': 0,  # Caches dropped after a reconnect or driver error
+            }
+
+    def open(self):
+        """(Re)create the pool. Call again after fork: pooled sockets must not be shared."""
+        import mysql.connector
+        from mysql.connector import pooling
+
+        size = self.pool_size or default_pool_size()
+        config = dict(self.config)
+        if getattr(mysql.connector, 'HAVE_CEXT', False):
+            config.setdefault('use_pure', False)
+        try:
+            # reset_session is off so prepared statements survive checkouts; _release rolls back instead.
+            self.pool = pooling.MySQLConnectionPool(
+                pool_name=self.pool_name,
+                pool_size=size,
+                pool_reset_session=False,
+                **config
+            )
+            self._slots = threading.BoundedSemaphore(size)
+            self.pool_size = size
+            print(f"✅ Database connection pool created ({size} connections)")
+        except Exception as e:
+            print(f"⚠️ Connection pool failed, using direct connections: {e}")
+            self.pool = None
+            self._slots = None
+        self._statements = weakref.WeakKeyDictionary()
+        self._reset_stats()
+        return self.pool is not None
+
+    # --- checkout / release ---
+    def connect(self) -> CheckedOutConnection:
+        pool, slots = self.pool, self._slots
+        if pool is None:
+            import mysql.connector
+            with self._stats_lock:
+                self._stats['direct_connections'] += 1
+            return CheckedOutConnection(self, _Lease(mysql.connector.connect(**self.config), False))
+
+        started = time.monotonic()
+        if not slots.acquire(blocking=False):
+            if not slots.acquire(timeout=self.checkout_timeout):
+                with self._stats_lock:
+                    self._stats['timeouts'] += 1
+                raise PoolExhaustedError(
+                    f"No database connection free after {self.checkout_timeout:.0f}s (pool size {self.pool_size})"
+                )
+            waited_ms = (time.monotonic() - started) * 1000
+            with self._stats_lock:
+                self._stats['waited_checkouts'] += 1
+                self._stats['wait_ms_total'] += waited_ms
+                self._stats['wait_ms_max'] = max(self._stats['wait_ms_max'], waited_ms)
+
+        try:
+            pooled = pool.get_connection()
+        except Exception:
+            slots.release()
+            raise
+
+        with self._stats_lock:
+            self._stats['checkouts'] += 1
+            self._stats['in_use'] += 1
+            self._stats['peak_in_use'] = max(self._stats['peak_in_use'], self._stats['in_use'])
+        return CheckedOutConnection(self, _Lease(pooled, True))
+
+    def _release(self, lease: _Lease, leaked: bool):
+        if lease.released:
+            return
+        lease.released = True
+        raw = getattr(lease.pooled, '_cnx', lease.pooled)
+        try:
+            if lease.from_pool and getattr(raw, 'in_transaction', False):
+                raw.rollback()
+        except Exception:
+            pass
+        try:
+            lease.pooled.close()
+        except Exception:
+            pass
+        if lease.from_pool:
+            with self._stats_lock:
+                self._stats['in_use'] -= 1
+                if leaked:
+                    self._stats['leaked_returns'] += 1
+            if self._slots is not None:
+                try:
+                    self._slots.release()
+                except ValueError:
+                    pass  # Pool was recreated (open()) while this lease was out
+
+    # --- prepared statements ---
+    def _discard_statements(self, raw) -> None:
+        """Forget (and best-effort close) every prepared cursor cached for raw."""
+        try:
+            entry = self._statements.pop(raw, None)
+        except TypeError:
+            return
+        if entry is None:
+            return
+        with self._stats_lock:
+            self._stats['prepared_invalidations'] += 1
+        for cursor in entry[1].values():
+            try:
+                cursor.close()
+            except Exception:
+                pass  # Statement ids may already be gone with the old server session
+
+    def _statement_failed(self, conn: CheckedOutConnection, error: Exception) -> None:
+        import mysql.connector
+        if isinstance(error, mysql.connector.Error):
+            # Lost connection, unknown statement handler, ...: re-prepare on next use.
+            self._discard_statements(conn.raw)
+
+    def _statement_cursor(self, conn: CheckedOutConnection, sql: str):
+        raw = conn.raw
+        server_id = getattr(raw, 'connection_id', None)
+        try:
+            entry = self._statements.get(raw)
+            if entry is not None and entry[0] != server_id:
+                # The pool reconnected this connection: its prepared statements are gone.
+                self._discard_statements(raw)
+                entry = None
+            if entry is None:
+                entry = (server_id, OrderedDict())
+                self._statements[raw] = entry
+            cache = entry[1]
+        except TypeError:
+            cache = None  # Connection type not weak-referenceable: no caching
+
+        cursor = cache.get(sql) if cache is not None else None
+        if cursor is not None:
+            cache.move_to_end(sql)
+            with self._stats_lock:
+                self._stats['prepared_hits'] += 1
+            return cursor, True
+
+        cursor = raw.cursor(prepared=True)
+        with self._stats_lock:
+            self._stats['prepared_misses'] += 1
+        if cache is not None:
+            cache[sql] = cursor
+            while len(cache) > STATEMENT_CACHE_SIZE:
+                _, evicted = cache.popitem(last=False)
+                try:
+                    evicted.close()
+                except Exception:
+                    pass
+        return cursor, cache is not None
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            snapshot = dict(self._stats)
+        checkouts = snapshot['checkouts']
+        snapshot['wait_ms_total'] = round(snapshot['wait_ms_total'], 2)
+        snapshot['wait_ms_max'] = round(snapshot['wait_ms_max'], 2)
+        snapshot['wait_ms_avg'] = round(snapshot['wait_ms_total'] / checkouts, 3) if checkouts else 0.0
+        snapshot['pool_size'] = self.pool_size if self.pool is not None else 0
+        snapshot['pooled'] = self.pool is not None
+        snapshot['checkout_timeout_s'] = self.checkout_timeout
+        snapshot['backend'] = self.backend
+        return snapshot
+
+
+def configured_backend() -> str:
+    backend = os.environ.get('ECOLEARN_DB_BACKEND', 'mysql').strip().lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"ECOLEARN_DB_BACKEND must be one of {', '.join(BACKENDS)} (got {backend!r})")
+    return backend
+
+
+def sqlite_path() -> str:
+    return os.environ.get('ECOLEARN_SQLITE_PATH') or DEFAULT_SQLITE_PATH
+
+
+def create_database(mysql_config: dict, **mysql_options) -> BaseDatabase:
+    """Database for the configured backend (ECOLEARN_DB_BACKEND)."""
+    if configured_backend() == 'sqlite':
+        from db_sqlite import SQLiteDatabase
+        return SQLiteDatabase(sqlite_path())
+    return Database(mysql_config, **mysql_options)
+
+
+def open_connection(mysql_config: dict):
+    """One unpooled connection on the configured backend, for CLI/training scripts."""
+    if configured_backend() == 'sqlite':
+        from db_sqlite import connect_sqlite
+        return connect_sqlite(sqlite_path())
+    import mysql.connector
+    return mysql.connector.connect(**mysql_config)
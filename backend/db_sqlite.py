@@ -0,0 +1,310 @@
+"""
+db_sqlite.py
+------------
+Embedded single-file storage backend (ECOLEARN_DB_BACKEND=sqlite).
+
+For single-laptop installs that only ran MySQL so app.py had somewhere to keep
+sessions, config and the golden dataset. The schema (database/ecolearn_sqlite.sql)
+mirrors the MySQL one, including the is_correct generated column and the
+incremental session-counter trigger, and is created on first start.
+
+Connections and cursors imitate the mysql.connector API the routes already use
+(cursor(dictionary=True), %s placeholders, lastrowid, column_names), and a small
+translator rewrites the few MySQL-only constructs the backend issues:
+
+    %s                              -> ?
+    NOW()                           -> datetime('now', 'localtime')
+    TRUNCATE TABLE t                -> DELETE FROM t
+    SET FOREIGN_KEY_CHECKS = n      -> PRAGMA foreign_keys = ON/OFF
+    SET @name = value               -> per-connection variable (read by the trigger)
+    ON DUPLICATE KEY UPDATE c = c + VALUES(c)
+                                    -> ON CONFLICT DO UPDATE SET c = c + excluded.c
+    GREATEST(a, b)                  -> MAX(a, b)
+
+Connections are kept on a small free list (WAL journal, so readers never block the
+writer); close() rolls back anything uncommitted and puts the connection back.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from functools import lru_cache
+
+from db import BaseDatabase
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'database', 'ecolearn_sqlite.sql')
+BUSY_TIMEOUT_SECONDS = 10.0
+STATEMENT_CACHE_SIZE = 256
+MAX_IDLE_CONNECTIONS = 8
+
+_SESSION_VAR_RE = re.compile(r"^\s*SET\s+@(\w+)\s*=\s*(-?\d+)\s*;?\s*$", re.IGNORECASE)
+_FK_CHECKS_RE = re.compile(r"^\s*SET\s+FOREIGN_KEY_CHECKS\s*=\s*([01])\s*;?\s*$", re.IGNORECASE)
+_TRUNCATE_RE = re.compile(r"^\s*TRUNCATE\s+TABLE\s+(\w+)\s*;?\s*$", re.IGNORECASE)
+_NOW_RE = re.compile(r"\bNOW\(\)", re.IGNORECASE)
+_GREATEST_RE = re.compile(r"\bGREATEST\(", re.IGNORECASE)
+_UPSERT_RE = re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.IGNORECASE)
+_UPSERT_VALUES_RE = re.compile(r"\bVALUES\((\w+)\)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=512)
+def translate_sql(sql: str, has_params: bool) -> str:
+    """Rewrite one MySQL-dialect statement for SQLite."""
+    match = _TRUNCATE_RE.match(sql)
+    if match:
+        return f"DELETE FROM {match.group(1)}"
+    match = _FK_CHECKS_RE.match(sql)
+    if match:
+        return f"PRAGMA foreign_keys = {'ON' if match.group(1) == '1' else 'OFF'}"
+    sql = _NOW_RE.sub("datetime('now', 'localtime')", sql)
+    sql = _GREATEST_RE.sub("MAX(", sql)
+    match = _UPSERT_RE.search(sql)
+    if match:
+        update = _UPSERT_VALUES_RE.sub(r"excluded.\1", sql[match.end():])
+        sql = f"{sql[:match.start()]}ON CONFLICT DO UPDATE SET{update}"
+    if has_params:
+        # mysql.connector format style: %s is a parameter, %% a literal percent sign.
+        sql = re.sub(r"%(s|%)", lambda m: '?' if m.group(1) == 's' else '%', sql)
+    return sql
+
+
+def _adapt_datetime(value: datetime) -> str:
+    return value.isoformat(sep=' ', timespec='seconds' if not value.microsecond else 'microseconds')
+
+
+sqlite3.register_adapter(datetime, _adapt_datetime)
+sqlite3.register_adapter(date, date.isoformat)
+
+
+def _restore_value(value):
+    """Timestamps come back as text; return them as datetime like mysql.connector does."""
+    if isinstance(value, str) and len(value) in (19, 26) and value[4] == '-' and value[10] == ' ':
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+
+class SQLiteCursor:
+    """mysql.connector-style cursor over a sqlite3 cursor."""
+
+    def __init__(self, connection: 'SQLiteConnection', dictionary: bool = False):
+        self._connection = connection
+        self._cursor = connection.raw.cursor()
+        self._dictionary = dictionary
+        self._pending = None  # Result of a statement handled without SQLite (SET @var)
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def column_names(self):
+        return tuple(col[0] for col in (self._cursor.description or ()))
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def execute(self, sql, params=None):
+        self._pending = None
+        match = _SESSION_VAR_RE.match(sql)
+        if match:
+            self._connection.session_vars[match.group(1).lower()] = int(match.group(2))
+            self._pending = []
+            return
+        self._cursor.execute(translate_sql(sql, bool(params)), tuple(params or ()))
+
+    def executemany(self, sql, seq_of_params):
+        self._pending = None
+        self._cursor.executemany(translate_sql(sql, True), [tuple(p) for p in seq_of_params])
+
+    def _convert(self, row):
+        if row is None:
+            return None
+        values = tuple(_restore_value(v) for v in row)
+        if self._dictionary:
+            return dict(zip(self.column_names, values))
+        return values
+
+    def fetchone(self):
+        if self._pending is not None:
+            return None
+        return self._convert(self._cursor.fetchone())
+
+    def fetchall(self):
+        if self._pending is not None:
+            return []
+        return [self._convert(row) for row in self._cursor.fetchall()]
+
+    def fetchmany(self, size=1):
+        if self._pending is not None:
+            return []
+        return [self._convert(row) for row in self._cursor.fetchmany(size)]
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        try:
+            self._cursor.close()
+        except sqlite3.ProgrammingError:
+            pass
+
+
+class SQLiteConnection:
+    """mysql.connector-style connection; close() returns it to its SQLiteDatabase, if any."""
+
+    def __init__(self, raw: sqlite3.Connection, database: 'SQLiteDatabase | None' = None):
+        self.raw = raw
+        self.database = database  # None for standalone connections: close() really closes
+        self.session_vars = {}
+        raw.create_function(
+            'ecolearn_deferred_counters', 0,
+            lambda: self.session_vars.get('ecolearn_deferred_counters', 0),
+            deterministic=False,
+        )
+
+    def cursor(self, dictionary: bool = False, prepared: bool = False, buffered: bool = True):
+        # sqlite3 caches compiled statements per connection, so prepared=True needs nothing extra.
+        return SQLiteCursor(self, dictionary=dictionary)
+
+    @property
+    def in_transaction(self):
+        return self.raw.in_transaction
+
+    def is_connected(self):
+        return True
+
+    def start_transaction(self, consistent_snapshot: bool = False, isolation_level=None, readonly: bool = False):
+        # A WAL reader sees one snapshot from its first read until the transaction ends.
+        if not self.raw.in_transaction:
+            self.raw.execute("BEGIN")
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    def close(self):
+        if self.raw.in_transaction:
+            self.raw.rollback()
+        self.session_vars.clear()
+        if self.database is None:
+            self.raw.close()
+        else:
+            self.database._release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def _open_raw(path: str) -> sqlite3.Connection:
+    raw = sqlite3.connect(
+        path,
+        timeout=BUSY_TIMEOUT_SECONDS,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        check_same_thread=False,  # Pooled connections move between request threads
+    )
+    raw.execute("PRAGMA journal_mode = WAL")
+    raw.execute("PRAGMA synchronous = NORMAL")
+    raw.execute("PRAGMA foreign_keys = ON")
+    return raw
+
+
+def ensure_schema(path: str) -> bool:
+    """Create the database file from ecolearn_sqlite.sql when it is missing. Returns True if created."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    raw = _open_raw(path)
+    try:
+        exists = raw.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'TBL_SESSIONS'"
+        ).fetchone()
+        if exists:
+            return False
+        SQLiteConnection(raw)  # Registers the trigger function before the script runs
+        with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
+            raw.executescript(f.read())
+        raw.commit()
+        return True
+    finally:
+        raw.close()
+
+
+def connect_sqlite(path: str) -> SQLiteConnection:
+    """Standalone connection (training scripts, CLI tools)."""
+    ensure_schema(path)
+    return SQLiteConnection(_open_raw(path))
+
+
+class SQLiteDatabase(BaseDatabase):
+    backend = 'sqlite'
+
+    def __init__(self, path: str):
+        self.path = path
+        self._idle: list[SQLiteConnection] = []
+        self._idle_pid = os.getpid()
+        self._orphaned = []  # Parent's handles after fork: kept referenced, never used or closed
+        self._lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self):
+        with self._lock:
+            self._stats = {'checkouts': 0, 'connections_opened': 0, 'in_use': 0, 'peak_in_use': 0}
+
+    def open(self):
+        try:
+            created = ensure_schema(self.path)
+            print(f"✅ SQLite database {'created' if created else 'opened'}: {self.path}")
+        except Exception as e:
+            print(f"❌ SQLite database unavailable ({self.path}): {e}")
+            return False
+        self._reset_stats()
+        return True
+
+    def connect(self) -> SQLiteConnection:
+        with self._lock:
+            if self._idle_pid != os.getpid():
+                # Forked child: never touch the parent's SQLite handles.
+                self._orphaned = self._idle
+                self._idle, self._idle_pid = [], os.getpid()
+            conn = self._idle.pop() if self._idle else None
+            self._stats['checkouts'] += 1
+            self._stats['in_use'] += 1
+            self._stats['peak_in_use'] = max(self._stats['peak_in_use'], self._stats['in_use'])
+            if conn is None:
+                self._stats['connections_opened'] += 1
+        if conn is None:
+            conn = SQLiteConnection(_open_raw(self.path), database=self)
+        return conn
+
+    def _release(self, conn: SQLiteConnection):
+        with self._lock:
+            self._stats['in_use'] -= 1
+            if len(self._idle) < MAX_IDLE_CONNECTIONS and self._idle_pid == os.getpid():
+                self._idle.append(conn)
+                return
+        conn.raw.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['idle'] = len(self._idle)
+        snapshot['backend'] = self.backend
+        snapshot['path'] = self.path
+        snapshot['pooled'] = True
+        return snapshot
@@ -0,0 +1,44 @@
+"""
+gunicorn.conf.py
+----------------
+Multi-process serving for the recognition backend:  gunicorn -c gunicorn.conf.py wsgi:app
+
+Worker-count formula (recognition is CPU-bound, DB/TTS calls are I/O-bound):
+    workers            = ECOLEARN_WORKERS            or  cpu_count // ECOLEARN_CV_THREADS
+    threads per worker = ECOLEARN_THREADS            or  4   (overlaps DB/TTS waits)
+    OpenCV threads     = ECOLEARN_CV_THREADS         or  1   (per worker)
+so workers x OpenCV threads ~= cores and no core is oversubscribed by OpenCV's own
+thread pool. Each worker holds ~1 copy of the nets' working buffers; on small machines
+(<= 2 GB RAM) cap ECOLEARN_WORKERS at 2.
+
+preload_app loads card descriptors and ONNX models in the master once; workers inherit
+them copy-on-write instead of each re-reading the database and model files. The master
+starts no threads; the first worker to take models/.background_jobs.lock runs the startup
+jobs.
+"""
+
+import multiprocessing
+import os
+
+cv_threads = max(1, int(os.environ.get('ECOLEARN_CV_THREADS', '1')))
+
+bind = os.environ.get('ECOLEARN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('ECOLEARN_WORKERS', '0')) or max(1, multiprocessing.cpu_count() // cv_threads)
+worker_class = 'gthread'
+threads = int(os.environ.get('ECOLEARN_THREADS', '4'))
+os.environ.setdefault('ECOLEARN_THREADS', str(threads))  # db.py sizes each worker's pool from it
+preload_app = True
+timeout = 120  # One-shot card uploads and PDF generation can take a while
+graceful_timeout = 30
+keepalive = 5
+accesslog = '-'
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    import cv2
+    import app as ecolearn_app
+
+    cv2.setNumThreads(cv_threads)
+    ecolearn_app.init_worker_process(multi_process=workers > 1, background_jobs=True)
+    server.log.info("Worker %s ready (OpenCV threads=%s)", worker.pid, cv_threads)
@@ -0,0 +1,230 @@
+"""
+image_ingest.py
+---------------
+Single-decode ingest for uploaded images (scans, one-shot card photos).
+
+One call decodes the upload once and returns:
+- a display copy (orientation applied, alpha kept, bounded to the asset size), and
+- an ML copy (BGR, alpha flattened onto white, bounded to the working size).
+
+When the working size is known up front, JPEGs are decoded with
+cv2.IMREAD_REDUCED_COLOR_2/4/8 so a 12MP phone photo never materializes
+at full resolution. EXIF orientation is applied explicitly (OpenCV only
+applies it for some flags), and alpha flattening uses integer math at the
+working size instead of float32 at full resolution.
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+JPEG_SOI = b"\xff\xd8"
+# SOF markers that carry frame dimensions (excludes DHT=C4, JPG=C8, DAC=CC).
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+EXIF_ORIENTATION_TAG = 0x0112
+
+REDUCED_COLOR_FLAGS = {
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+
+@dataclass
+class IngestedImage:
+    display: np.ndarray  # BGR or BGRA, orientation applied
+    ml: np.ndarray       # BGR, alpha flattened onto white
+    source_size: tuple[int, int] | None  # (width, height) as encoded, when known
+    reduction: int       # JPEG decode reduction factor actually used (1 = full)
+
+
+def is_jpeg(raw: bytes) -> bool:
+    return raw[:2] == JPEG_SOI
+
+
+def _iter_jpeg_segments(raw: bytes):
+    """Yield (marker, payload_offset, payload_length) for JPEG header segments."""
+    pos = 2
+    size = len(raw)
+    while pos + 4 <= size:
+        if raw[pos] != 0xFF:
+            return
+        marker = raw[pos + 1]
+        # Fill bytes / standalone markers carry no length.
+        if marker == 0xFF:
+            pos += 1
+            continue
+        if marker in (0x01,) or 0xD0 <= marker <= 0xD7:
+            pos += 2
+            continue
+        if marker in (0xD9, 0xDA):  # EOI / start of scan: header is over
+            return
+        seg_len = struct.unpack('>H', raw[pos + 2:pos + 4])[0]
+        if seg_len < 2:
+            return
+        yield marker, pos + 4, seg_len - 2
+        pos += 2 + seg_len
+
+
+def probe_jpeg_size(raw: bytes) -> tuple[int, int] | None:
+    """Read (width, height) from the JPEG SOF header without decoding pixels."""
+    if not is_jpeg(raw):
+        return None
+    try:
+        for marker, offset, length in _iter_jpeg_segments(raw):
+            if marker in JPEG_SOF_MARKERS and length >= 5:
+                height, width = struct.unpack('>HH', raw[offset + 1:offset + 5])
+                if width > 0 and height > 0:
+                    return int(width), int(height)
+    except (struct.error, IndexError):
+        return None
+    return None
+
+
+def read_exif_orientation(raw: bytes) -> int:
+    """Return the EXIF orientation (1-8) of a JPEG, or 1 when absent/unreadable."""
+    if not is_jpeg(raw):
+        return 1
+    try:
+        for marker, offset, length in _iter_jpeg_segments(raw):
+            if marker != 0xE1 or length < 14 or raw[offset:offset + 6] != b"Exif\x00\x00":
+                continue
+
+            tiff = offset + 6
+            byte_order = raw[tiff:tiff + 2]
+            if byte_order == b"II":
+                endian = '<'
+            elif byte_order == b"MM":
+                endian = '>'
+            else:
+                return 1
+
+            ifd0 = tiff + struct.unpack(endian + 'I', raw[tiff + 4:tiff + 8])[0]
+            entry_count = struct.unpack(endian + 'H', raw[ifd0:ifd0 + 2])[0]
+            for idx in range(entry_count):
+                entry = ifd0 + 2 + idx * 12
+                tag = struct.unpack(endian + 'H', raw[entry:entry + 2])[0]
+                if tag == EXIF_ORIENTATION_TAG:
+                    value = struct.unpack(endian + 'H', raw[entry + 8:entry + 10])[0]
+                    return int(value) if 1 <= value <= 8 else 1
+            return 1
+    except (struct.error, IndexError):
+        return 1
+    return 1
+
+
+def apply_exif_orientation(img: np.ndarray, orientation: int) -> np.ndarray:
+    """Rotate/flip a decoded image so it displays upright."""
+    if orientation == 2:
+        return cv2.flip(img, 1)
+    if orientation == 3:
+        return cv2.rotate(img, cv2.ROTATE_180)
+    if orientation == 4:
+        return cv2.flip(img, 0)
+    if orientation == 5:
+        return cv2.flip(cv2.rotate(img, cv2.ROTATE_90_CLOCKWISE), 1)
+    if orientation == 6:
+        return cv2.rotate(img, cv2.ROTATE_90_CLOCKWISE)
+    if orientation == 7:
+        return cv2.flip(cv2.rotate(img, cv2.ROTATE_90_COUNTERCLOCKWISE), 1)
+    if orientation == 8:
+        return cv2.rotate(img, cv2.ROTATE_90_COUNTERCLOCKWISE)
+    return img
+
+
+def choose_reduction(source_size: tuple[int, int] | None, target_max_side: int | None) -> int:
+    """Largest JPEG reduction factor that still leaves at least target_max_side pixels."""
+    if not source_size or not target_max_side or target_max_side <= 0:
+        return 1
+    longest = max(source_size)
+    for factor in (8, 4, 2):
+        if longest // factor >= target_max_side:
+            return factor
+    return 1
+
+
+def bound_max_side(img: np.ndarray, max_side: int | None) -> np.ndarray:
+    """Downscale so max(width, height) <= max_side (keeps aspect ratio)."""
+    if img is None or not max_side or max_side <= 0:
+        return img
+    h, w = img.shape[:2]
+    longest = max(h, w)
+    if longest <= max_side:
+        return img
+    scale = float(max_side) / float(longest)
+    new_size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+    return cv2.resize(img, new_size, interpolation=cv2.INTER_AREA)
+
+
+def flatten_alpha_on_white(img: np.ndarray) -> np.ndarray:
+    """Composite BGRA onto white with integer math; pass BGR/gray through as BGR."""
+    if img is None:
+        return None
+    if img.ndim == 2:
+        return cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+    if img.shape[2] != 4:
+        return img[:, :, :3]
+
+    alpha = img[:, :, 3:4].astype(np.uint16)
+    if int(alpha.min()) == 255:
+        return np.ascontiguousarray(img[:, :, :3])
+
+    bgr = img[:, :, :3].astype(np.uint16)
+    # out = (bgr * a + 255 * (255 - a)) / 255, rounded
+    flat = bgr * alpha
+    flat += 255 * (255 - alpha)
+    flat += 127
+    flat //= 255
+    return flat.astype(np.uint8)
+
+
+def ingest_image_bytes(
+    raw: bytes,
+    ml_max_side: int | None = None,
+    display_max_side: int | None = None,
+    keep_alpha: bool = False,
+) -> IngestedImage | None:
+    """Decode an uploaded image once and derive the display and ML copies.
+
+    ml_max_side / display_max_side bound each copy; None keeps the decoded size.
+    keep_alpha preserves transparency in the display copy (PNG/WebP card assets).
+    """
+    if not raw:
+        return None
+
+    buf = np.frombuffer(raw, dtype=np.uint8)
+    source_size = probe_jpeg_size(raw)
+    orientation = read_exif_orientation(raw)
+
+    reduction = 1
+    if source_size is not None:
+        # JPEG has no alpha: a reduced colour decode serves both copies.
+        needed = ml_max_side if display_max_side is None else max(display_max_side, ml_max_side or 0)
+        reduction = choose_reduction(source_size, needed)
+        flags = REDUCED_COLOR_FLAGS.get(reduction, cv2.IMREAD_COLOR) | cv2.IMREAD_IGNORE_ORIENTATION
+        img = cv2.imdecode(buf, flags)
+    else:
+        flags = cv2.IMREAD_UNCHANGED if keep_alpha else cv2.IMREAD_COLOR
+        img = cv2.imdecode(buf, flags | cv2.IMREAD_IGNORE_ORIENTATION)
+        if img is None and keep_alpha:
+            img = cv2.imdecode(buf, cv2.IMREAD_UNCHANGED)
+
+    if img is None:
+        return None
+
+    if img.dtype != np.uint8:
+        # 16-bit PNGs: scale down to 8-bit once.
+        img = cv2.convertScaleAbs(img, alpha=255.0 / 65535.0)
+
+    img = apply_exif_orientation(img, orientation)
+    display = bound_max_side(img, display_max_side)
+    if display.ndim == 3 and display.shape[2] == 4 and not keep_alpha:
+        display = flatten_alpha_on_white(display)
+
+    ml_source = bound_max_side(display, ml_max_side)
+    ml = flatten_alpha_on_white(ml_source)
+    return IngestedImage(display=display, ml=ml, source_size=source_size, reduction=reduction)
@@ -3,7 +3,7 @@ import difflib
 import re
 from pathlib import Path
 
-import mysql.connector
+from db import open_connection
 
 
 DB_CONFIG = {
@@ -43,7 +43,7 @@ def read_teachable_labels(path: Path):
 
 
 def load_card_rows_from_db():
-    conn = mysql.connector.connect(**DB_CONFIG)
+    conn = open_connection(DB_CONFIG)
     cursor = conn.cursor(dictionary=True)
     cursor.execute(
         """
@@ -0,0 +1,112 @@
+"""
+inference_cache.py
+------------------
+Short-lived recognition result cache and in-flight request coalescing.
+
+Kiosks re-upload near-identical frozen frames (double taps, retries) within a
+second or two. Frames are keyed by a perceptual difference hash of the
+downscaled frame plus the active recognizer version, so:
+- a repeat frame inside the TTL is answered from memory, and
+- identical frames arriving concurrently share a single inference (singleflight).
+
+Only the recognition result is cached; callers still apply per-request session
+side effects (logging, already-scanned checks) themselves.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+DHASH_SIZE = 16  # 16x16 gradient bits = 256-bit hash per frame
+
+
+def perceptual_hash(image_bgr: np.ndarray, hash_size: int = DHASH_SIZE) -> str:
+    """Difference hash (dHash) of a frame as hex; robust to JPEG noise and tiny shifts."""
+    gray = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2GRAY) if image_bgr.ndim == 3 else image_bgr
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return np.packbits(bits).tobytes().hex()
+
+
+class ResultCache:
+    """Thread-safe LRU cache with a per-entry TTL."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entries = int(max_entries)
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(value)
+
+    def put(self, key: str, value: dict) -> None:
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, dict(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class _Call:
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one execution."""
+
+    def __init__(self):
+        self._calls: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn):
+        """Run fn() once per key at a time. Returns (value, shared)."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.value, False
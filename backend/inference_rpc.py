@@ -0,0 +1,205 @@
+"""
+inference_rpc.py
+----------------
+Wire protocol and client for the recognition sidecar (inference_server.py).
+
+Every message is a fixed 8-byte header followed by a payload:
+
+    magic  b'EI'   2 bytes
+    version        1 byte
+    op / status    1 byte
+    payload length 4 bytes, big-endian
+
+Requests carry decoded frames as raw uint8 pixels so the sidecar never decodes
+an image twice:
+
+    count          1 byte
+    per frame:     height (2) | width (2) | channels (1) | height*width*channels bytes
+
+Responses carry a UTF-8 JSON body; status is RESP_OK or RESP_ERROR.
+Addresses are 'unix:/path/to.sock' (POSIX) or 'host:port' (TCP, e.g. on Windows).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import struct
+import threading
+
+import numpy as np
+
+MAGIC = b'EI'
+PROTOCOL_VERSION = 1
+HEADER = struct.Struct('>2sBBI')
+FRAME_HEADER = struct.Struct('>HHB')
+MAX_PAYLOAD_BYTES = 64 * 1024 * 1024
+
+OP_PING = 1
+OP_CLASSIFY = 2
+OP_TOP3 = 3
+OP_RELOAD = 4
+OP_CLASSIFY_BURST = 5
+OP_PREVIEW = 6
+
+RESP_OK = 0
+RESP_ERROR = 1
+
+DEFAULT_UNIX_ADDRESS = 'unix:/tmp/ecolearn-inference.sock'
+DEFAULT_TCP_ADDRESS = '127.0.0.1:5055'
+
+
+class InferenceError(RuntimeError):
+    """The sidecar answered with an error, or could not be reached."""
+
+
+def default_address() -> str:
+    return DEFAULT_UNIX_ADDRESS if hasattr(socket, 'AF_UNIX') and os.name != 'nt' else DEFAULT_TCP_ADDRESS
+
+
+def parse_address(address: str):
+    """Return (socket family, bind/connect target) for an address string."""
+    address = str(address or '').strip()
+    if address.startswith('unix:'):
+        if not hasattr(socket, 'AF_UNIX'):
+            raise ValueError('Unix sockets are not supported on this platform; use host:port')
+        return socket.AF_UNIX, address[len('unix:'):]
+    host, _, port = address.rpartition(':')
+    if not host or not port.isdigit():
+        raise ValueError(f"Invalid inference address: {address!r}")
+    return socket.AF_INET, (host, int(port))
+
+
+def pack_frames(frames) -> bytes:
+    if not frames or len(frames) > 255:
+        raise ValueError('Expected 1-255 frames')
+    parts = [struct.pack('>B', len(frames))]
+    for frame in frames:
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        if frame.ndim == 2:
+            frame = frame[:, :, None]
+        h, w, c = frame.shape
+        parts.append(FRAME_HEADER.pack(h, w, c))
+        parts.append(frame.tobytes())
+    return b''.join(parts)
+
+
+def unpack_frames(payload: bytes) -> list[np.ndarray]:
+    view = memoryview(payload)
+    count = view[0]
+    pos = 1
+    frames = []
+    for _ in range(count):
+        h, w, c = FRAME_HEADER.unpack_from(view, pos)
+        pos += FRAME_HEADER.size
+        size = h * w * c
+        if pos + size > len(view):
+            raise ValueError('Truncated frame payload')
+        frame = np.frombuffer(view[pos:pos + size], dtype=np.uint8).reshape(h, w, c)
+        frames.append(frame[:, :, 0] if c == 1 else frame)
+        pos += size
+    return frames
+
+
+def _recv_exact(sock, size: int) -> bytes | None:
+    buf = bytearray(size)
+    view = memoryview(buf)
+    got = 0
+    while got < size:
+        n = sock.recv_into(view[got:], size - got)
+        if n == 0:
+            if got == 0:
+                return None
+            raise ConnectionError('Connection closed mid-message')
+        got += n
+    return bytes(buf)
+
+
+def send_message(sock, op: int, payload: bytes = b'') -> None:
+    sock.sendall(HEADER.pack(MAGIC, PROTOCOL_VERSION, op, len(payload)) + payload)
+
+
+def recv_message(sock):
+    """Read one message. Returns (op, payload) or None on a clean disconnect."""
+    header = _recv_exact(sock, HEADER.size)
+    if header is None:
+        return None
+    magic, version, op, length = HEADER.unpack(header)
+    if magic != MAGIC or version != PROTOCOL_VERSION:
+        raise ConnectionError('Protocol mismatch')
+    if length > MAX_PAYLOAD_BYTES:
+        raise ConnectionError('Payload too large')
+    payload = _recv_exact(sock, length) if length else b''
+    if payload is None:
+        raise ConnectionError('Connection closed mid-message')
+    return op, payload
+
+
+class InferenceClient:
+    """Thread-safe sidecar client; keeps one persistent connection per calling thread."""
+
+    def __init__(self, address: str, timeout: float = 15.0):
+        self.address = address
+        self.timeout = float(timeout)
+        self._family, self._target = parse_address(address)
+        self._local = threading.local()
+
+    def _connect(self):
+        sock = socket.socket(self._family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self._target)
+        return sock
+
+    def _drop_connection(self):
+        sock = getattr(self._local, 'sock', None)
+        self._local.sock = None
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def _call(self, op: int, payload: bytes = b'') -> dict:
+        # One retry covers a pooled connection the sidecar closed (e.g. it restarted).
+        for attempt in range(2):
+            try:
+                sock = getattr(self._local, 'sock', None)
+                if sock is None:
+                    sock = self._connect()
+                    self._local.sock = sock
+                send_message(sock, op, payload)
+                message = recv_message(sock)
+                if message is None:
+                    raise ConnectionError('Inference server closed the connection')
+                break
+            except (OSError, ConnectionError) as e:
+                self._drop_connection()
+                if attempt:
+                    raise InferenceError(f"Inference server unavailable at {self.address}: {e}") from e
+
+        status, body = message
+        data = json.loads(body.decode('utf-8')) if body else {}
+        if status != RESP_OK:
+            raise InferenceError(data.get('message', 'Inference server error'))
+        return data
+
+    def ping(self) -> dict:
+        return self._call(OP_PING)
+
+    def classify(self, frames) -> dict:
+        return self._call(OP_CLASSIFY, pack_frames(frames))
+
+    def classify_burst(self, frames) -> dict:
+        """Fuse a streaming burst of card-bearing frames (never the single-frame ensemble)."""
+        return self._call(OP_CLASSIFY_BURST, pack_frames(frames))
+
+    def preview(self, image_bgr) -> dict:
+        """One-pass live preview of one frame (never the brightness ensemble)."""
+        return self._call(OP_PREVIEW, pack_frames([image_bgr]))
+
+    def top3(self, image_bgr) -> dict:
+        return self._call(OP_TOP3, pack_frames([image_bgr]))
+
+    def reload(self, parts) -> dict:
+        return self._call(OP_RELOAD, json.dumps(list(parts)).encode('utf-8'))
@@ -0,0 +1,143 @@
+"""
+inference_server.py
+-------------------
+Recognition sidecar: one long-lived process holds the golden dataset and ONNX
+models and serves every web worker over a local socket (see inference_rpc.py).
+
+Model memory is held once, concurrent identical frames from different workers
+share one inference (result cache + singleflight live here), and retrains or
+config changes are reloaded in one place.
+
+Usage:
+    python inference_server.py [--address unix:/tmp/ecolearn-inference.sock]
+
+Then start the web tier pointing at it:
+    ECOLEARN_INFERENCE_ADDR=unix:/tmp/ecolearn-inference.sock gunicorn -c gunicorn.conf.py wsgi:app
+(Windows: use a TCP address such as 127.0.0.1:5055.)
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+
+# The sidecar *is* the engine: never forward to another sidecar.
+os.environ.pop('ECOLEARN_INFERENCE_ADDR', None)
+
+import app as engine  # noqa: E402
+from inference_rpc import (  # noqa: E402
+    OP_CLASSIFY,
+    OP_CLASSIFY_BURST,
+    OP_PING,
+    OP_PREVIEW,
+    OP_RELOAD,
+    OP_TOP3,
+    RESP_ERROR,
+    RESP_OK,
+    default_address,
+    parse_address,
+    recv_message,
+    send_message,
+    unpack_frames,
+)
+
+
+def dispatch(op: int, payload: bytes) -> dict:
+    engine.maybe_reload_models_from_disk()
+
+    if op == OP_PING:
+        return {
+            "status": "ok",
+            "pid": os.getpid(),
+            "recognizer_version": engine.recognizer_version,
+            "cards_loaded": len(engine.card_metadata),
+            "orb_fallback_loaded": engine.orb_fallback_net is not None,
+            "incremental_loaded": engine.incremental_orb_net is not None,
+        }
+    if op == OP_CLASSIFY:
+        result, cache_state = engine.classify_frames_local(unpack_frames(payload))
+        result['result_cache'] = cache_state
+        return result
+    if op == OP_CLASSIFY_BURST:
+        result, cache_state = engine.classify_burst_local(unpack_frames(payload))
+        result['result_cache'] = cache_state
+        return result
+    if op == OP_PREVIEW:
+        result, cache_state = engine.classify_preview_local(unpack_frames(payload)[0])
+        result['result_cache'] = cache_state
+        return result
+    if op == OP_TOP3:
+        return engine.rank_top3_candidates(unpack_frames(payload)[0])
+    if op == OP_RELOAD:
+        parts = json.loads(payload.decode('utf-8')) if payload else []
+        return engine.reload_recognizer(parts)
+    raise ValueError(f"Unknown op {op}")
+
+
+class InferenceRequestHandler(socketserver.BaseRequestHandler):
+    """Serve one persistent worker connection until it disconnects."""
+
+    def handle(self):
+        sock = self.request
+        while True:
+            try:
+                message = recv_message(sock)
+            except (OSError, ConnectionError):
+                return
+            if message is None:
+                return
+
+            op, payload = message
+            try:
+                body, status = dispatch(op, payload), RESP_OK
+            except Exception as e:
+                print(f"❌ Inference request error (op={op}): {e}")
+                body, status = {"message": str(e)}, RESP_ERROR
+
+            try:
+                send_message(sock, status, json.dumps(body).encode('utf-8'))
+            except OSError:
+                return
+
+
+def build_server(address: str):
+    family, target = parse_address(address)
+    if family == getattr(socket, 'AF_UNIX', None):
+        if os.path.exists(target):
+            os.unlink(target)  # Stale socket from a previous run
+        server = socketserver.ThreadingUnixStreamServer(target, InferenceRequestHandler)
+        os.chmod(target, 0o660)
+    else:
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        server = socketserver.ThreadingTCPServer(target, InferenceRequestHandler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='EcoLearn recognition sidecar')
+    parser.add_argument('--address', default=os.environ.get('ECOLEARN_INFERENCE_BIND', default_address()),
+                        help="unix:/path.sock or host:port (default: %(default)s)")
+    args = parser.parse_args()
+
+    try:
+        engine.create_app()
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+
+    server = build_server(args.address)
+    print(f"🧠 Inference sidecar listening on {args.address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+pagination.py
+-------------
+Keyset (seek) pagination for the admin listings.
+
+A page is requested with `?limit=N` and continued with `?cursor=<token>`; the
+token is the previous page's last sort key, so page N costs the same as page 1
+(no OFFSET scan) and rows inserted meanwhile do not shift later pages. Every
+ordering ends in a unique column, which keeps the order stable and total.
+
+Tokens are opaque URL-safe base64 JSON, bound to the listing and its filters,
+so a token cannot be replayed against a different query.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+FETCH_BATCH_ROWS = 200  # Rows pulled per fetchmany() while streaming a result
+
+
+class CursorError(ValueError):
+    """Malformed, tampered or mismatched cursor token."""
+
+
+def page_size(value, default: int = DEFAULT_PAGE_SIZE) -> int:
+    if value in (None, ''):
+        return default
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        raise CursorError(f"limit must be an integer (got {value!r})")
+    return max(1, min(MAX_PAGE_SIZE, size))
+
+
+def _fingerprint(listing: str, filters: dict) -> str:
+    raw = json.dumps([listing, filters], sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+
+
+def encode_cursor(listing: str, filters: dict, key: list, position: int) -> str:
+    payload = {'f': _fingerprint(listing, filters), 'k': key, 'p': position}
+    raw = json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str | None, listing: str, filters: dict):
+    """Returns (key, position) for a token, or (None, 0) for the first page."""
+    if not token:
+        return None, 0
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        key, position = payload['k'], int(payload['p'])
+    except Exception:
+        raise CursorError("Invalid cursor")
+    if payload.get('f') != _fingerprint(listing, filters):
+        raise CursorError("Cursor does not belong to this listing or filter set")
+    return key, position
+
+
+def iter_rows(cursor, batch: int = FETCH_BATCH_ROWS):
+    """Stream a result set in fetchmany() batches instead of one fetchall()."""
+    while True:
+        rows = cursor.fetchmany(batch)
+        if not rows:
+            return
+        yield from rows
+
+
+class Keyset:
+    """ORDER BY / seek predicate for a list of (sql_expression, 'ASC'|'DESC') sort keys.
+
+    Expressions must be non-NULL (wrap nullable ones in COALESCE) and the last one
+    unique. `columns` are the result-row names the key values are read from.
+    """
+
+    def __init__(self, listing: str, order: list[tuple[str, str]], columns: list[str]):
+        if len(order) != len(columns):
+            raise ValueError("order and columns must have the same length")
+        self.listing = listing
+        self.order = [(expr, direction.upper()) for expr, direction in order]
+        self.columns = list(columns)
+
+    def order_by(self) -> str:
+        return ', '.join(f"{expr} {direction}" for expr, direction in self.order)
+
+    def seek(self, key) -> tuple[str, list]:
+        """Predicate selecting rows strictly after `key` ("1 = 1" for the first page)."""
+        if key is None:
+            return "1 = 1", []
+        if len(key) != len(self.order):
+            raise CursorError("Cursor does not match this listing")
+        clauses, params = [], []
+        for i, (expr, direction) in enumerate(self.order):
+            parts = [f"{prev} = %s" for prev, _ in self.order[:i]]
+            parts.append(f"{expr} {'<' if direction == 'DESC' else '>'} %s")
+            clauses.append('(' + ' AND '.join(parts) + ')')
+            params.extend(key[:i + 1])
+        return '(' + ' OR '.join(clauses) + ')', params
+
+    def page(self, cursor, limit: int, filters: dict, position: int):
+        """Read up to `limit` rows from an executed `LIMIT limit + 1` query.
+
+        Returns (rows, next_cursor); next_cursor is None on the last page.
+        """
+        rows = []
+        has_more = False
+        for row in iter_rows(cursor, batch=min(limit + 1, FETCH_BATCH_ROWS)):
+            if len(rows) == limit:
+                has_more = True
+                continue  # Drain the unbuffered result before the cursor is reused
+            rows.append(row)
+        if not has_more or not rows:
+            return rows, None
+        last = rows[-1]
+        key = [_json_value(last[c]) for c in self.columns]
+        return rows, encode_cursor(self.listing, filters, key, position + len(rows))
+
+
+def _json_value(value):
+    """Key values round-trip through JSON; DECIMAL becomes float, dates become text."""
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return str(value)
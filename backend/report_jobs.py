@@ -0,0 +1,172 @@
+"""
+report_jobs.py
+--------------
+Background generation and on-disk cache for downloadable reports.
+
+Rendering a whole school's proficiency PDF takes seconds and used to run inside
+the request. Reports are now built by a small background pool:
+
+- each job reads its data from one consistent snapshot and names the output by
+  a data version (a digest of the snapshot it rendered), so identical data is
+  rendered once and every later request for it is a file lookup;
+- identical requests while a job is queued or running share that job;
+- files are written to a temp name and renamed into place, so a download never
+  sees a half-written report, and only the newest `keep_reports` are kept.
+
+Downloads are plain files, so the web layer streams them in chunks with
+Content-Length and Range support (send_from_directory(conditional=True)).
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+MAX_TRACKED_JOBS = 100
+_REPORT_ID_RE = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+@dataclass
+class ReportJob:
+    job_id: str
+    kind: str
+    params: dict
+    state: str = 'queued'  # queued | running | ready | failed
+    report_id: str | None = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def as_dict(self) -> dict:
+        return {
+            'job_id': self.job_id,
+            'kind': self.kind,
+            'params': self.params,
+            'state': self.state,
+            'report_id': self.report_id,
+            'error': self.error,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class ReportJobs:
+    """Runs report builders in the background and keeps their output on disk."""
+
+    def __init__(self, directory: str, max_workers: int = 1, keep_reports: int = 20):
+        self.directory = directory
+        self.max_workers = int(max_workers)
+        self.keep_reports = int(keep_reports)
+        self._lock = threading.Lock()
+        self._jobs: dict[str, ReportJob] = {}
+        self._pending: dict[tuple, ReportJob] = {}  # (kind, params) -> queued/running job
+        self._executor = None
+        self._executor_pid = None
+        self._stats = {'submitted': 0, 'coalesced': 0, 'rendered': 0, 'cache_hits': 0, 'failed': 0}
+
+    # --- files ---
+    def report_path(self, report_id: str) -> str:
+        if not _REPORT_ID_RE.match(report_id or ''):
+            raise ValueError(f"Invalid report id: {report_id!r}")
+        return os.path.join(self.directory, report_id)
+
+    def has_report(self, report_id: str) -> bool:
+        return os.path.isfile(self.report_path(report_id))
+
+    def publish(self, report_id: str, write) -> bool:
+        """Write a report through `write(tmp_path)` unless it already exists. Returns True if rendered."""
+        path = self.report_path(report_id)
+        if os.path.isfile(path):
+            with self._lock:
+                self._stats['cache_hits'] += 1
+            return False
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        with self._lock:
+            self._stats['rendered'] += 1
+        self._prune()
+        return True
+
+    def _prune(self) -> None:
+        try:
+            entries = [
+                os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                if not name.endswith('.tmp')
+            ]
+            entries.sort(key=os.path.getmtime, reverse=True)
+            for stale in entries[self.keep_reports:]:
+                os.remove(stale)
+        except OSError as e:
+            print(f"⚠️ Report cache cleanup failed: {e}")
+
+    # --- jobs ---
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Threads do not survive fork(); each worker process gets its own pool.
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='report-job')
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def submit(self, kind: str, params: dict, build) -> ReportJob:
+        """Queue `build(job) -> report_id`, or return the identical job already in flight."""
+        key = (kind, tuple(sorted(params.items())))
+        with self._lock:
+            existing = self._pending.get(key)
+            if existing is not None:
+                self._stats['coalesced'] += 1
+                return existing
+            job = ReportJob(job_id=uuid.uuid4().hex, kind=kind, params=dict(params))
+            self._jobs[job.job_id] = job
+            self._pending[key] = job
+            self._stats['submitted'] += 1
+            while len(self._jobs) > MAX_TRACKED_JOBS:
+                oldest = next(iter(self._jobs))
+                if not self._jobs[oldest].done.is_set():
+                    break
+                del self._jobs[oldest]
+            executor = self._get_executor()
+        executor.submit(self._run, key, job, build)
+        return job
+
+    def _run(self, key: tuple, job: ReportJob, build) -> None:
+        job.state = 'running'
+        try:
+            job.report_id = build(job)
+            job.state = 'ready'
+        except Exception as e:
+            job.error = str(e)
+            job.state = 'failed'
+            with self._lock:
+                self._stats['failed'] += 1
+            print(f"❌ Report job {job.kind} failed: {e}")
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                if self._pending.get(key) is job:
+                    del self._pending[key]
+            job.done.set()
+
+    def get(self, job_id: str) -> ReportJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job: ReportJob, timeout: float) -> bool:
+        return job.done.wait(timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['in_flight'] = len(self._pending)
+        return snapshot
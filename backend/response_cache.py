@@ -0,0 +1,139 @@
+"""
+response_cache.py
+-----------------
+In-memory cache of rendered responses for the read-heavy admin endpoints.
+
+The admin UI polls stats, asset counts, the card gallery and the nickname list
+every few seconds; between edits those answers do not change. Each entry holds
+the encoded body plus a content ETag and expires after its endpoint's TTL, so:
+- repeated polls inside the TTL are a dictionary lookup (no database round trip),
+- a browser revalidating with If-None-Match gets 304 Not Modified, and
+- mutating routes drop the affected entries by tag (e.g. 'cards', 'sessions').
+
+Under multi-process serving each worker has its own cache; invalidate() also
+touches a stamp file that every worker checks on lookup, so an edit made through
+one worker is not served stale by another.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    mimetype: str
+    etag: str
+    tags: frozenset
+    expires_at: float
+
+
+def make_etag(body: bytes) -> str:
+    return hashlib.sha1(body).hexdigest()[:20]
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """True when an If-None-Match header names `etag`.
+
+    Tolerates weak validators and suffixes added by compression middleware
+    (flask-compress sends "<etag>:gzip" back to the browser).
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate.strip('"').split(':', 1)[0] == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """Thread-safe TTL cache of response bodies with tag-based invalidation."""
+
+    def __init__(self, max_entries: int = 256, stamp_path: str | None = None):
+        self.max_entries = int(max_entries)
+        self.stamp_path = stamp_path
+        self._entries: dict[str, CachedResponse] = {}
+        self._lock = threading.Lock()
+        self._seen_stamp = self._read_stamp()
+        self._stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'invalidations': 0}
+
+    def _read_stamp(self):
+        if not self.stamp_path:
+            return None
+        try:
+            return os.stat(self.stamp_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _sync_with_other_workers(self) -> None:
+        stamp = self._read_stamp()
+        if stamp != self._seen_stamp:
+            self._seen_stamp = stamp
+            self._entries.clear()
+
+    def get(self, key: str) -> CachedResponse | None:
+        now = time.monotonic()
+        with self._lock:
+            self._sync_with_other_workers()
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= now:
+                del self._entries[key]
+                entry = None
+            self._stats['hits' if entry is not None else 'misses'] += 1
+            return entry
+
+    def put(self, key: str, body: bytes, mimetype: str, ttl_seconds: float, tags=()) -> CachedResponse:
+        entry = CachedResponse(
+            body=body,
+            mimetype=mimetype,
+            etag=make_etag(body),
+            tags=frozenset(tags),
+            expires_at=time.monotonic() + float(ttl_seconds),
+        )
+        if ttl_seconds <= 0 or self.max_entries <= 0:
+            return entry
+        with self._lock:
+            self._entries[key] = entry
+            if len(self._entries) > self.max_entries:
+                # Evict the entry closest to expiry.
+                oldest = min(self._entries, key=lambda k: self._entries[k].expires_at)
+                del self._entries[oldest]
+        return entry
+
+    def record_not_modified(self) -> None:
+        with self._lock:
+            self._stats['not_modified'] += 1
+
+    def invalidate(self, *tags: str) -> None:
+        """Drop entries carrying any of `tags` (every entry when no tag is given)."""
+        wanted = set(tags)
+        with self._lock:
+            if wanted:
+                for key in [k for k, e in self._entries.items() if e.tags & wanted]:
+                    del self._entries[key]
+            else:
+                self._entries.clear()
+            self._stats['invalidations'] += 1
+            if self.stamp_path:
+                try:
+                    Path(self.stamp_path).touch()
+                    self._seen_stamp = self._read_stamp()
+                except OSError:
+                    pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['entries'] = len(self._entries)
+        return snapshot
@@ -0,0 +1,264 @@
+"""
+scan_archive.py
+---------------
+Moves scan history of closed terms out of TBL_SCAN_TRANSACTIONS.
+
+The live table keeps its foreign keys (which MySQL partitioning does not
+allow), so it is rotated instead: scans older than the archive cutoff whose
+session is no longer active are moved, in short id-range batches, into
+TBL_SCAN_ARCHIVE. On MySQL the archive is InnoDB ROW_FORMAT=COMPRESSED and
+RANGE-partitioned by month (a partition per archived month is added as the
+cutoff advances); on SQLite it is a plain table.
+
+Readers that need the full history use the vw_scan_history view (live UNION ALL
+archive); the dashboard reads the rollups (analytics_rollup.py), which already
+cover archived days. The kiosks' inserts, the session lookups and the recent-log
+query only touch the small live table.
+
+    python scan_archive.py                 # archive everything before the default cutoff
+    python scan_archive.py --months 3      # keep 3 full months live
+    python scan_archive.py --before 2026-04-01 --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import date, datetime
+
+DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '',
+    'database': 'ecolearn_db'
+}
+
+DEFAULT_KEEP_MONTHS = 6  # Roughly one school term stays live
+BATCH_ROWS = 5000
+
+ARCHIVE_COLUMNS = (
+    "transaction_id, session_id, card_id, predicted_category_id, actual_category_id, "
+    "is_correct, confidence_score, response_time, scan_timestamp, feedback_given"
+)
+
+MYSQL_ARCHIVE_DDL = """
+    CREATE TABLE IF NOT EXISTS TBL_SCAN_ARCHIVE (
+        transaction_id INT NOT NULL,
+        session_id INT NOT NULL,
+        card_id INT NOT NULL,
+        predicted_category_id INT NOT NULL,
+        actual_category_id INT NOT NULL,
+        is_correct TINYINT(1) NOT NULL,
+        confidence_score DECIMAL(5,4),
+        response_time INT,
+        scan_timestamp DATETIME NOT NULL,
+        feedback_given TINYINT(1) DEFAULT 0,
+        PRIMARY KEY (transaction_id, scan_timestamp),
+        INDEX idx_archive_session (session_id),
+        INDEX idx_archive_timestamp (scan_timestamp)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 ROW_FORMAT=COMPRESSED KEY_BLOCK_SIZE=8
+    COMMENT='Scan transactions of closed terms (moved by scan_archive.py)'
+    PARTITION BY RANGE COLUMNS (scan_timestamp) (
+        PARTITION p_future VALUES LESS THAN (MAXVALUE)
+    )
+"""
+
+SQLITE_ARCHIVE_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS TBL_SCAN_ARCHIVE (
+        transaction_id INTEGER PRIMARY KEY,
+        session_id INTEGER NOT NULL,
+        card_id INTEGER NOT NULL,
+        predicted_category_id INTEGER NOT NULL,
+        actual_category_id INTEGER NOT NULL,
+        is_correct INTEGER NOT NULL,
+        confidence_score REAL,
+        response_time INTEGER,
+        scan_timestamp TEXT NOT NULL,
+        feedback_given INTEGER DEFAULT 0
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_archive_session ON TBL_SCAN_ARCHIVE (session_id)",
+    "CREATE INDEX IF NOT EXISTS idx_archive_timestamp ON TBL_SCAN_ARCHIVE (scan_timestamp)",
+)
+
+HISTORY_VIEW_SQL = f"""
+    SELECT {ARCHIVE_COLUMNS} FROM TBL_SCAN_TRANSACTIONS
+    UNION ALL
+    SELECT {ARCHIVE_COLUMNS} FROM TBL_SCAN_ARCHIVE
+"""
+
+# Scans that may be archived: before the cutoff and not part of a running session.
+_ARCHIVABLE_SQL = """
+    transaction_id BETWEEN %s AND %s
+    AND scan_timestamp < %s
+    AND session_id NOT IN (SELECT session_id FROM TBL_SESSIONS WHERE session_status = 'active')
+"""
+
+
+def default_cutoff(keep_months: int = DEFAULT_KEEP_MONTHS, today: date | None = None) -> date:
+    """First day of the month `keep_months` full months before the current one."""
+    today = today or date.today()
+    months = today.year * 12 + (today.month - 1) - int(keep_months)
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def _next_month(day: date) -> date:
+    return date(day.year + (day.month == 12), day.month % 12 + 1, 1)
+
+
+def ensure_archive(cursor, backend: str) -> None:
+    """Create TBL_SCAN_ARCHIVE and vw_scan_history when missing."""
+    if backend == 'sqlite':
+        for ddl in SQLITE_ARCHIVE_DDL:
+            cursor.execute(ddl)
+        cursor.execute(f"CREATE VIEW IF NOT EXISTS vw_scan_history AS {HISTORY_VIEW_SQL}")
+    else:
+        cursor.execute(MYSQL_ARCHIVE_DDL)
+        cursor.execute(f"CREATE OR REPLACE VIEW vw_scan_history AS {HISTORY_VIEW_SQL}")
+
+
+def _ensure_month_partitions(cursor, first_month: date, cutoff: date) -> int:
+    """Split p_future so every month in [first_month, cutoff) has its own partition (MySQL)."""
+    cursor.execute("""
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION
+        FROM INFORMATION_SCHEMA.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'TBL_SCAN_ARCHIVE'
+    """)
+    partitions = cursor.fetchall()
+    names = {row[0] for row in partitions}
+    if 'p_future' not in names:
+        return 0  # Not partitioned (created by hand): nothing to manage
+    bounds = [
+        date.fromisoformat(str(row[1]).strip("'")[:10])
+        for row in partitions if row[0] != 'p_future' and row[1] and row[1] != 'MAXVALUE'
+    ]
+    month = max(bounds) if bounds else date(first_month.year, first_month.month, 1)
+    new_parts = []
+    while month < cutoff:
+        upper = _next_month(month)
+        new_parts.append(f"PARTITION p{month:%Y%m} VALUES LESS THAN ('{upper.isoformat()}')")
+        month = upper
+    if new_parts:
+        cursor.execute(
+            "ALTER TABLE TBL_SCAN_ARCHIVE REORGANIZE PARTITION p_future INTO ("
+            + ', '.join(new_parts)
+            + ", PARTITION p_future VALUES LESS THAN (MAXVALUE))"
+        )
+    return len(new_parts)
+
+
+def pending_range(cursor, cutoff: date):
+    """(min_id, max_id, oldest_timestamp) of live scans older than the cutoff, or None."""
+    cursor.execute(
+        "SELECT MIN(transaction_id), MAX(transaction_id), MIN(scan_timestamp) "
+        "FROM TBL_SCAN_TRANSACTIONS WHERE scan_timestamp < %s",
+        (datetime.combine(cutoff, datetime.min.time()),),
+    )
+    row = cursor.fetchone()
+    if row is None or row[0] is None:
+        return None
+    oldest = row[2]
+    if not isinstance(oldest, datetime):
+        oldest = datetime.fromisoformat(str(oldest))
+    return int(row[0]), int(row[1]), oldest
+
+
+def archive_before(conn, backend: str, cutoff: date, batch_rows: int = BATCH_ROWS,
+                   pause_seconds: float = 0.0, dry_run: bool = False) -> int:
+    """Move archivable scans older than `cutoff` in id-range batches. Returns rows moved."""
+    cursor = conn.cursor()
+    try:
+        ensure_archive(cursor, backend)
+        conn.commit()
+        found = pending_range(cursor, cutoff)
+        if found is None:
+            return 0
+        low, high, oldest = found
+        cutoff_ts = datetime.combine(cutoff, datetime.min.time())
+        if dry_run:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM TBL_SCAN_TRANSACTIONS WHERE {_ARCHIVABLE_SQL}",
+                (low, high, cutoff_ts),
+            )
+            return int(cursor.fetchone()[0])
+
+        if backend == 'mysql':
+            added = _ensure_month_partitions(cursor, oldest.date(), cutoff)
+            if added:
+                print(f"🗂️ Added {added} monthly archive partition(s)")
+
+        moved = 0
+        start = low
+        while start <= high:
+            end = min(high, start + batch_rows - 1)
+            params = (start, end, cutoff_ts)
+            cursor.execute(
+                f"INSERT INTO TBL_SCAN_ARCHIVE ({ARCHIVE_COLUMNS}) "
+                f"SELECT {ARCHIVE_COLUMNS} FROM TBL_SCAN_TRANSACTIONS WHERE {_ARCHIVABLE_SQL}",
+                params,
+            )
+            cursor.execute(f"DELETE FROM TBL_SCAN_TRANSACTIONS WHERE {_ARCHIVABLE_SQL}", params)
+            moved += max(cursor.rowcount, 0)
+            conn.commit()
+            start = end + 1
+            if pause_seconds > 0:
+                time.sleep(pause_seconds)
+        return moved
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        cursor.close()
+
+
+def forget_sessions(cursor, nickname: str) -> None:
+    """Archived scans have no foreign key to TBL_SESSIONS; delete them with the student."""
+    cursor.execute("""
+        DELETE FROM TBL_SCAN_ARCHIVE
+        WHERE session_id IN (SELECT session_id FROM TBL_SESSIONS WHERE student_nickname = %s)
+    """, (nickname,))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Archive scan history of closed terms')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--months', type=int, default=DEFAULT_KEEP_MONTHS,
+                       help=f'Full months to keep live (default {DEFAULT_KEEP_MONTHS})')
+    group.add_argument('--before', help='Archive scans before this date (YYYY-MM-01)')
+    parser.add_argument('--batch-rows', type=int, default=BATCH_ROWS)
+    parser.add_argument('--dry-run', action='store_true', help='Only count what would be moved')
+    args = parser.parse_args()
+
+    if args.before:
+        try:
+            cutoff = date.fromisoformat(args.before)
+        except ValueError:
+            parser.error(f"--before must be a date, got {args.before!r}")
+        if cutoff.day != 1:
+            parser.error("--before must be the first day of a month (archive partitions are monthly)")
+    else:
+        cutoff = default_cutoff(args.months)
+
+    from db import configured_backend, open_connection
+
+    conn = open_connection(DB_CONFIG)
+    started = time.monotonic()
+    try:
+        moved = archive_before(conn, configured_backend(), cutoff, args.batch_rows, dry_run=args.dry_run)
+    except Exception as e:
+        print(f"❌ Scan archive failed: {e}")
+        return 1
+    finally:
+        conn.close()
+    verb = 'would move' if args.dry_run else 'moved'
+    print(f"✅ Scans before {cutoff}: {verb} {moved} rows ({time.monotonic() - started:.1f}s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""
+scan_export.py
+--------------
+Export raw scan history (joined with card, category and session nickname) for
+offline analysis, as streaming CSV or columnar Parquet. Both the live
+TBL_SCAN_TRANSACTIONS and TBL_SCAN_ARCHIVE (scan_archive.py) are read, and their
+rows merged in transaction_id order.
+
+Rows are read in fixed-size chunks keyed on transaction_id (each chunk is one
+short indexed query on an unbuffered cursor, never a table-wide dump), so:
+- memory stays at one chunk whatever the date range,
+- no long-running statement or snapshot holds up the kiosks' writes, and
+- an optional pause between chunks leaves the database to live traffic.
+
+Filters: scan date range (inclusive dates), session id, nickname.
+
+    python scan_export.py --start 2025-06-01 --end 2026-05-31 --out scans.csv
+    python scan_export.py --format parquet --nickname Sam --out sam.parquet
+
+Parquet needs pyarrow (optional dependency: pip install pyarrow).
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import heapq
+import io
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '',
+    'database': 'ecolearn_db'
+}
+
+DEFAULT_CHUNK_ROWS = 5000
+MAX_CHUNK_ROWS = 50000
+FORMATS = ('csv', 'parquet')
+
+EXPORT_COLUMNS = [
+    'transaction_id', 'scan_timestamp', 'session_id', 'student_nickname', 'session_mode',
+    'card_id', 'card_name', 'card_code', 'actual_category', 'predicted_category',
+    'is_correct', 'confidence_score', 'response_time',
+]
+
+EXPORT_SELECT_SQL = """
+    SELECT
+        t.transaction_id, t.scan_timestamp, t.session_id, s.student_nickname, s.session_mode,
+        t.card_id, c.card_name, c.card_code,
+        ac.category_name AS actual_category, pc.category_name AS predicted_category,
+        t.is_correct, t.confidence_score, t.response_time
+    FROM {source} t
+    JOIN TBL_CARD_ASSETS c ON t.card_id = c.card_id
+    LEFT JOIN TBL_CATEGORIES ac ON t.actual_category_id = ac.category_id
+    LEFT JOIN TBL_CATEGORIES pc ON t.predicted_category_id = pc.category_id
+    LEFT JOIN TBL_SESSIONS s ON t.session_id = s.session_id
+"""
+EXPORT_SOURCES = ('TBL_SCAN_ARCHIVE', 'TBL_SCAN_TRANSACTIONS')
+
+
+class ExportError(ValueError):
+    """Invalid export filters or format."""
+
+
+def parse_filters(start=None, end=None, session_id=None, nickname=None) -> dict:
+    """Validate raw (string) filters into {'start': date, 'end': date, 'session_id': int, 'nickname': str}."""
+    filters = {}
+    for name, value in (('start', start), ('end', end)):
+        if value:
+            try:
+                filters[name] = date.fromisoformat(str(value))
+            except ValueError:
+                raise ExportError(f"{name} must be a date (YYYY-MM-DD), got {value!r}")
+    if filters.get('start') and filters.get('end') and filters['end'] < filters['start']:
+        raise ExportError("end is before start")
+    if session_id not in (None, ''):
+        try:
+            filters['session_id'] = int(session_id)
+        except (TypeError, ValueError):
+            raise ExportError(f"session_id must be an integer, got {session_id!r}")
+    if nickname:
+        filters['nickname'] = str(nickname).strip()
+    return filters
+
+
+def _where(filters: dict) -> tuple[list[str], list]:
+    clauses, params = [], []
+    if 'start' in filters:
+        clauses.append("t.scan_timestamp >= %s")
+        params.append(datetime.combine(filters['start'], datetime.min.time()))
+    if 'end' in filters:
+        clauses.append("t.scan_timestamp < %s")
+        params.append(datetime.combine(filters['end'] + timedelta(days=1), datetime.min.time()))
+    if 'session_id' in filters:
+        clauses.append("t.session_id = %s")
+        params.append(filters['session_id'])
+    if 'nickname' in filters:
+        clauses.append("s.student_nickname = %s")
+        params.append(filters['nickname'])
+    return clauses, params
+
+
+def _id_bounds(cursor, source: str, filters: dict):
+    """transaction_id range covering the date filter (found through idx_timestamp),
+    so chunk queries walk the primary key instead of the whole table."""
+    low, high = 0, None
+    if 'start' in filters:
+        cursor.execute(
+            f"SELECT MIN(transaction_id) FROM {source} WHERE scan_timestamp >= %s",
+            (datetime.combine(filters['start'], datetime.min.time()),),
+        )
+        row = cursor.fetchone()
+        if row[0] is None:
+            return None
+        low = int(row[0]) - 1
+    if 'end' in filters:
+        cursor.execute(
+            f"SELECT MAX(transaction_id) FROM {source} WHERE scan_timestamp < %s",
+            (datetime.combine(filters['end'] + timedelta(days=1), datetime.min.time()),),
+        )
+        row = cursor.fetchone()
+        if row[0] is None:
+            return None
+        high = int(row[0])
+    return low, high
+
+
+def _source_rows(conn, source: str, filters: dict, chunk_rows: int, pause_seconds: float):
+    """Rows of one table in transaction_id order, read `chunk_rows` at a time."""
+    cursor = conn.cursor()
+    try:
+        bounds = _id_bounds(cursor, source, filters)
+        if bounds is None:
+            return
+        last_id, high = bounds
+        clauses, params = _where(filters)
+        if high is not None:
+            clauses.append("t.transaction_id <= %s")
+            params.append(high)
+        extra = ''.join(f" AND {clause}" for clause in clauses)
+        select = EXPORT_SELECT_SQL.format(source=source)
+        sql = f"{select} WHERE t.transaction_id > %s{extra} ORDER BY t.transaction_id LIMIT %s"
+
+        while True:
+            cursor.execute(sql, (last_id, *params, chunk_rows))
+            chunk = []
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                chunk.extend(rows)
+            if not chunk:
+                return
+            # Each chunk is its own short read; do not keep a snapshot open between chunks.
+            if getattr(conn, 'in_transaction', False):
+                conn.rollback()
+            last_id = chunk[-1][0]
+            yield from chunk
+            if len(chunk) < chunk_rows:
+                return
+            if pause_seconds > 0:
+                time.sleep(pause_seconds)
+    finally:
+        cursor.close()
+
+
+def iter_chunks(conn, filters: dict, chunk_rows: int = DEFAULT_CHUNK_ROWS, pause_seconds: float = 0.0):
+    """Yield lists of export rows (tuples in EXPORT_COLUMNS order), at most `chunk_rows` each.
+
+    Archived and live rows overlap in id (scans of long-running sessions stay live),
+    so the two id-ordered streams are merged rather than concatenated.
+    """
+    chunk_rows = max(1, min(MAX_CHUNK_ROWS, int(chunk_rows)))
+    streams = [_source_rows(conn, source, filters, chunk_rows, pause_seconds) for source in EXPORT_SOURCES]
+    chunk = []
+    for row in heapq.merge(*streams, key=lambda r: r[0]):
+        chunk.append(row)
+        if len(chunk) == chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if value is None:
+        return ''
+    return value
+
+
+def iter_csv(chunks):
+    """CSV text blocks (header first, then one block per chunk) for a streaming response."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue()
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(v) for v in row] for row in chunk)
+        yield buffer.getvalue()
+
+
+def _parquet_schema(pa):
+    return pa.schema([
+        ('transaction_id', pa.int64()),
+        ('scan_timestamp', pa.timestamp('s')),
+        ('session_id', pa.int64()),
+        ('student_nickname', pa.string()),
+        ('session_mode', pa.string()),
+        ('card_id', pa.int64()),
+        ('card_name', pa.string()),
+        ('card_code', pa.string()),
+        ('actual_category', pa.string()),
+        ('predicted_category', pa.string()),
+        ('is_correct', pa.bool_()),
+        ('confidence_score', pa.float64()),
+        ('response_time', pa.int64()),
+    ])
+
+
+def _parquet_value(name, value):
+    if value is None:
+        return None
+    if name == 'is_correct':
+        return bool(value)
+    if name == 'confidence_score':
+        return float(value)
+    if name == 'scan_timestamp' and not isinstance(value, datetime):
+        return datetime.fromisoformat(str(value))
+    return value
+
+
+def write_parquet(chunks, path: str) -> int:
+    """Write chunks to a Parquet file, one row group per chunk. Returns the row count."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportError("Parquet export needs pyarrow (pip install pyarrow); use format=csv")
+
+    schema = _parquet_schema(pa)
+    rows = 0
+    with pq.ParquetWriter(path, schema, compression='snappy') as writer:
+        for chunk in chunks:
+            columns = list(zip(*chunk))
+            arrays = [
+                pa.array([_parquet_value(name, v) for v in values], type=schema.field(name).type)
+                for name, values in zip(EXPORT_COLUMNS, columns)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            rows += len(chunk)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export EcoLearn scan transactions')
+    parser.add_argument('--format', choices=FORMATS, default='csv')
+    parser.add_argument('--out', help='Output file (CSV defaults to stdout; required for Parquet)')
+    parser.add_argument('--start', help='First scan date, YYYY-MM-DD (inclusive)')
+    parser.add_argument('--end', help='Last scan date, YYYY-MM-DD (inclusive)')
+    parser.add_argument('--session', dest='session_id', help='Only this session id')
+    parser.add_argument('--nickname', help='Only sessions of this nickname')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument('--pause', type=float, default=0.0, help='Seconds to sleep between chunks')
+    args = parser.parse_args()
+
+    try:
+        filters = parse_filters(args.start, args.end, args.session_id, args.nickname)
+    except ExportError as e:
+        parser.error(str(e))
+    if args.format == 'parquet' and not args.out:
+        parser.error('--out is required for Parquet')
+
+    from db import open_connection
+
+    conn = open_connection(DB_CONFIG)
+    started = time.monotonic()
+    rows = 0
+    try:
+        chunks = iter_chunks(conn, filters, args.chunk_rows, args.pause)
+        if args.format == 'parquet':
+            rows = write_parquet(chunks, args.out)
+        else:
+            def counted(source):
+                nonlocal rows
+                for chunk in source:
+                    rows += len(chunk)
+                    yield chunk
+
+            out = open(args.out, 'w', newline='', encoding='utf-8') if args.out else sys.stdout
+            try:
+                for block in iter_csv(counted(chunks)):
+                    out.write(block)
+            finally:
+                if args.out:
+                    out.close()
+    except ExportError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+    print(f"✅ Exported {rows} scans in {time.monotonic() - started:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
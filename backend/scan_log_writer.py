@@ -0,0 +1,350 @@
+"""
+scan_log_writer.py
+------------------
+Write-behind queue for TBL_SCAN_TRANSACTIONS.
+
+Scan and assessment requests enqueue a row and return immediately. A background
+thread flushes the queue every `flush_interval` seconds (or as soon as
+`max_batch` rows are waiting, or at shutdown):
+
+1. one `executemany` INSERT for all queued transaction rows,
+2. one UPDATE of TBL_SESSIONS applying every touched session's counter deltas, and
+3. one upsert per day x card x category group into the dashboard rollup, plus
+   the student rollup deltas of sessions that already completed
+   (analytics_rollup.py).
+
+All run in one transaction with @ecolearn_deferred_counters = 1 so the
+incremental trg_after_scan_insert trigger leaves the counters to step 2.
+
+Under pre-fork serving the rows of one session can sit in several workers'
+queues. flush_all_workers() is the barrier for readers that need exact
+counters (/session/end, deleting a student): it writes a flush request into
+`sync_dir`, every worker's thread sees it within `sync_check_seconds`, flushes
+and acknowledges, and the caller waits for the acknowledgements of all live
+workers.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+
+from analytics_rollup import SCAN_ROLLUP_UPSERT_SQL, build_scan_rollup_upsert, fold_late_scans
+
+INSERT_SCAN_SQL = """
+    INSERT INTO TBL_SCAN_TRANSACTIONS
+    (session_id, card_id, predicted_category_id, actual_category_id,
+     confidence_score, response_time, scan_timestamp)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+# Driver errors caused by the rows themselves rather than by the connection.
+DATA_ERROR_NAMES = {'IntegrityError', 'DataError'}
+
+
+@dataclass
+class ScanRow:
+    session_id: int
+    card_id: int
+    predicted_category_id: int
+    actual_category_id: int
+    confidence_score: float | None
+    response_time: int | None
+    scan_timestamp: datetime
+
+    def as_params(self):
+        return (
+            self.session_id, self.card_id, self.predicted_category_id, self.actual_category_id,
+            self.confidence_score, self.response_time, self.scan_timestamp,
+        )
+
+
+def build_session_delta_update(rows: list[ScanRow]):
+    """One UPDATE applying per-session counter deltas for a batch of scan rows.
+
+    MySQL evaluates single-table SET assignments left to right, so the average and
+    accuracy are computed from the old counters before the counters themselves move
+    (SQLite reads the old row in every assignment, which gives the same result).
+    Returns (sql, params), or (None, None) for an empty batch.
+    """
+    deltas: dict[int, list] = {}
+    for row in rows:
+        d = deltas.setdefault(row.session_id, [0, 0, 0, 0])  # scans, correct, resp_sum, resp_count
+        d[0] += 1
+        d[1] += 1 if row.predicted_category_id == row.actual_category_id else 0
+        if row.response_time is not None:
+            d[2] += int(row.response_time)
+            d[3] += 1
+    if not deltas:
+        return None, None
+
+    avg_cases, acc_cases, correct_cases, total_cases = [], [], [], []
+    avg_params, acc_params, correct_params, total_params = [], [], [], []
+    for session_id, (scans, correct, resp_sum, resp_count) in deltas.items():
+        if resp_count:
+            avg_cases.append(
+                "WHEN %s THEN ROUND((COALESCE(average_response_time, 0) * total_scans + %s) * 1.0 / (total_scans + %s), 2)"
+            )
+            avg_params.extend([session_id, resp_sum, resp_count])
+        acc_cases.append("WHEN %s THEN ROUND((correct_scans + %s) * 100.0 / (total_scans + %s), 2)")
+        acc_params.extend([session_id, correct, scans])
+        correct_cases.append("WHEN %s THEN correct_scans + %s")
+        correct_params.extend([session_id, correct])
+        total_cases.append("WHEN %s THEN total_scans + %s")
+        total_params.extend([session_id, scans])
+
+    assignments = []
+    params = []
+    if avg_cases:
+        assignments.append(
+            f"average_response_time = CASE session_id {' '.join(avg_cases)} ELSE average_response_time END"
+        )
+        params.extend(avg_params)
+    assignments.append(f"accuracy_percentage = CASE session_id {' '.join(acc_cases)} ELSE accuracy_percentage END")
+    params.extend(acc_params)
+    assignments.append(f"correct_scans = CASE session_id {' '.join(correct_cases)} ELSE correct_scans END")
+    params.extend(correct_params)
+    assignments.append(f"total_scans = CASE session_id {' '.join(total_cases)} ELSE total_scans END")
+    params.extend(total_params)
+
+    session_ids = list(deltas.keys())
+    placeholders = ','.join(['%s'] * len(session_ids))
+    sql = f"UPDATE TBL_SESSIONS SET {', '.join(assignments)} WHERE session_id IN ({placeholders})"
+    params.extend(session_ids)
+    return sql, tuple(params)
+
+
+class ScanLogWriter:
+    """Batches scan rows and writes them from a background thread."""
+
+    def __init__(self, connect, flush_interval: float = 1.0, max_batch: int = 200, max_pending: int = 20000,
+                 sync_dir: str | None = None, sync_check_seconds: float = 0.05):
+        self._connect = connect
+        self.flush_interval = float(flush_interval)
+        self.max_batch = int(max_batch)
+        self.max_pending = int(max_pending)
+        self.sync_dir = sync_dir  # Set for multi-process serving; see flush_all_workers()
+        self.sync_check_seconds = float(sync_check_seconds)
+        self._queue: deque[ScanRow] = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()  # One flush at a time (thread, end_session, atexit)
+        self._thread = None
+        self._stopping = False
+        self._atexit_registered = False
+        self._acked_request = 0
+        self.rows_written = 0
+        self.flushes = 0
+        self.last_error = None
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def submit(self, row: ScanRow) -> None:
+        with self._cond:
+            if len(self._queue) >= self.max_pending:
+                self._queue.popleft()  # DB down for a long time: keep the newest rows
+                print("⚠️ Scan log queue full; dropping oldest row")
+            self._queue.append(row)
+            if len(self._queue) >= self.max_batch:
+                self._cond.notify()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping = False
+        if self.sync_dir:
+            os.makedirs(self.sync_dir, exist_ok=True)
+            self._acknowledge(self._read_token(self._request_path()))  # Nothing queued yet
+        self._thread = threading.Thread(target=self._run, name='scan-log-writer', daemon=True)
+        self._thread.start()
+        if not self._atexit_registered:
+            atexit.register(self.stop)
+            self._atexit_registered = True
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self.flush()
+        if self.sync_dir:
+            try:
+                os.remove(self._ack_path())
+            except OSError:
+                pass
+
+    def _run(self) -> None:
+        wait = min(self.flush_interval, self.sync_check_seconds) if self.sync_dir else self.flush_interval
+        last_flush = time.monotonic()
+        while True:
+            with self._cond:
+                if len(self._queue) < self.max_batch and not self._stopping:
+                    self._cond.wait(wait)
+                if self._stopping:
+                    return
+                due = len(self._queue) >= self.max_batch
+            request = self._read_token(self._request_path()) if self.sync_dir else 0
+            if due or request > self._acked_request or time.monotonic() - last_flush >= self.flush_interval:
+                self.flush()
+                last_flush = time.monotonic()
+                if request > self._acked_request and self.last_error is None:
+                    self._acknowledge(request)  # Rows queued after the request may still wait
+
+    # -- cross-worker flush barrier -------------------------------------------------
+
+    def _request_path(self) -> str:
+        return os.path.join(self.sync_dir, 'flush.request')
+
+    def _ack_path(self) -> str:
+        return os.path.join(self.sync_dir, f'ack.{os.getpid()}.{id(self):x}')
+
+    @staticmethod
+    def _read_token(path: str) -> int:
+        try:
+            with open(path, 'r', encoding='ascii') as f:
+                return int(f.read() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    @staticmethod
+    def _write_token(path: str, token: int) -> None:
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='ascii') as f:
+            f.write(str(token))
+        os.replace(tmp_path, path)
+
+    def _acknowledge(self, token: int) -> None:
+        try:
+            self._write_token(self._ack_path(), token)
+            self._acked_request = token
+        except OSError as e:
+            print(f"⚠️ Scan log flush acknowledgement failed: {e}")
+
+    def _lagging_workers(self, token: int) -> list[str]:
+        """Ack files of live workers that have not flushed up to `token` yet."""
+        lagging = []
+        for name in os.listdir(self.sync_dir):
+            if not name.startswith('ack.'):
+                continue
+            path = os.path.join(self.sync_dir, name)
+            try:
+                os.kill(int(name.split('.')[1]), 0)
+            except ProcessLookupError:  # Worker exited; its queue was flushed at shutdown or lost
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            except (OSError, ValueError):
+                pass
+            if self._read_token(path) < token:
+                lagging.append(name)
+        return lagging
+
+    def flush_all_workers(self, timeout: float = 2.0) -> bool:
+        """Flush this queue and wait until every worker has flushed what it had queued.
+
+        Returns False when some worker did not acknowledge within `timeout` (e.g. its
+        flush keeps failing); the caller then reads counters without those rows.
+        """
+        if not self.sync_dir:
+            self.flush()
+            return self.last_error is None
+        token = time.time_ns()
+        try:
+            if self._read_token(self._request_path()) < token:
+                self._write_token(self._request_path(), token)
+        except OSError as e:
+            print(f"⚠️ Scan log flush request failed: {e}")
+            self.flush()
+            return False
+        self.flush()
+        if self.last_error is None:
+            self._acknowledge(max(token, self._acked_request))
+        deadline = time.monotonic() + timeout
+        while True:
+            lagging = self._lagging_workers(token)
+            if not lagging:
+                return True
+            if time.monotonic() >= deadline:
+                print(f"⚠️ Scan log flush not acknowledged by {len(lagging)} worker(s)")
+                return False
+            time.sleep(self.sync_check_seconds)
+
+    def flush(self) -> int:
+        """Write everything queued so far. Returns the number of rows written."""
+        with self._flush_lock:
+            with self._cond:
+                batch = list(self._queue)
+                self._queue.clear()
+            if not batch:
+                return 0
+
+            try:
+                self._write(batch)
+            except Exception as e:
+                self.last_error = str(e)
+                if type(e).__name__ in DATA_ERROR_NAMES:
+                    # A bad row (e.g. its session was deleted) must not block the rest forever.
+                    batch = self._write_individually(batch)
+                else:
+                    print(f"❌ Scan log flush failed ({len(batch)} rows re-queued): {e}")
+                    with self._cond:
+                        self._queue.extendleft(reversed(batch))
+                    return 0
+
+            self.rows_written += len(batch)
+            self.flushes += 1
+            self.last_error = None
+            return len(batch)
+
+    def _write_individually(self, batch: list[ScanRow]) -> list[ScanRow]:
+        written = []
+        for row in batch:
+            try:
+                self._write([row])
+                written.append(row)
+            except Exception as e:
+                print(f"⚠️ Dropping unwritable scan row (session {row.session_id}, card {row.card_id}): {e}")
+        return written
+
+    def _write(self, batch: list[ScanRow]) -> None:
+        conn = self._connect()
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SET @ecolearn_deferred_counters = 1")
+            cursor.executemany(INSERT_SCAN_SQL, [row.as_params() for row in batch])
+            sql, params = build_session_delta_update(batch)
+            if sql:
+                cursor.execute(sql, params)
+            fold_late_scans(cursor, batch)
+            cursor.executemany(SCAN_ROLLUP_UPSERT_SQL, build_scan_rollup_upsert(batch))
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            # Pooled sessions are not reset on return, so never hand back the flag set.
+            if cursor is not None:
+                try:
+                    cursor.execute("SET @ecolearn_deferred_counters = 0")
+                    cursor.close()
+                except Exception:
+                    pass
+            conn.close()
+
+    def stats(self) -> dict:
+        return {
+            'pending': self.pending(),
+            'rows_written': self.rows_written,
+            'flushes': self.flushes,
+            'last_error': self.last_error,
+        }
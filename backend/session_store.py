@@ -0,0 +1,117 @@
+"""
+session_store.py
+----------------
+Per-kiosk session state for serving many classroom kiosks from one backend.
+
+Each kiosk identifies itself with a client token (sent as a request header).
+The store maps token -> KioskSession and is:
+- bounded: past max_sessions the least recently active session is evicted, and
+- expiring: sessions idle longer than timeout_seconds are reaped.
+
+Evicted and reaped sessions are handed back to the caller so it can mark them
+abandoned in the database; the store itself never touches the DB. Callers that
+rebuild a session from the DB apply the same rule through is_idle_expired().
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+DEFAULT_CLIENT_TOKEN = 'default'
+MAX_CLIENT_TOKEN_LENGTH = 64
+
+
+@dataclass
+class KioskSession:
+    session_id: int
+    mode: str
+    nickname: str = 'Guest'
+    scanned_card_ids: set[int] = field(default_factory=set)
+    subset_card_ids: set[int] = field(default_factory=set)
+    last_seen: float = field(default_factory=time.monotonic)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+def normalize_client_token(raw: str | None) -> str:
+    """Clamp a client-supplied token to a safe printable key; empty -> default kiosk."""
+    token = ''.join(ch for ch in str(raw or '').strip() if ch.isalnum() or ch in '-_')
+    return token[:MAX_CLIENT_TOKEN_LENGTH] or DEFAULT_CLIENT_TOKEN
+
+
+class SessionStore:
+    """Thread-safe token -> KioskSession map with LRU bound and idle expiry."""
+
+    def __init__(self, timeout_seconds: float, max_sessions: int = 256):
+        self.timeout_seconds = float(timeout_seconds)
+        self.max_sessions = int(max_sessions)
+        self._sessions: OrderedDict[str, KioskSession] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def is_idle_expired(self, idle_seconds: float) -> bool:
+        """Expiry rule shared by get(), the reaper and DB rehydration (timeout 0 = never)."""
+        return self.timeout_seconds > 0 and idle_seconds > self.timeout_seconds
+
+    def _expired(self, session: KioskSession, now: float) -> bool:
+        return self.is_idle_expired(now - session.last_seen)
+
+    def get(self, token: str) -> KioskSession | None:
+        """Return the live session for token (refreshing its idle timer), or None."""
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is None or self._expired(session, now):
+                return None
+            session.last_seen = now
+            self._sessions.move_to_end(token)
+            return session
+
+    def put(self, token: str, session: KioskSession) -> list[KioskSession]:
+        """Bind session to token. Returns sessions displaced by this call
+        (the token's previous session and any LRU evictions)."""
+        displaced = []
+        session.last_seen = time.monotonic()
+        with self._lock:
+            previous = self._sessions.pop(token, None)
+            if previous is not None and previous.session_id != session.session_id:
+                displaced.append(previous)
+            self._sessions[token] = session
+            while len(self._sessions) > self.max_sessions > 0:
+                _, evicted = self._sessions.popitem(last=False)
+                displaced.append(evicted)
+        return displaced
+
+    def pop(self, token: str) -> KioskSession | None:
+        with self._lock:
+            return self._sessions.pop(token, None)
+
+    def reap_expired(self) -> list[KioskSession]:
+        """Remove and return sessions idle longer than the timeout."""
+        now = time.monotonic()
+        with self._lock:
+            stale = [token for token, session in self._sessions.items() if self._expired(session, now)]
+            return [self._sessions.pop(token) for token in stale]
+
+
+def start_reaper(store: SessionStore, on_expired, interval_seconds: float = 60.0) -> threading.Thread:
+    """Periodically reap idle sessions and pass them to on_expired(list)."""
+
+    def loop():
+        while True:
+            time.sleep(interval_seconds)
+            try:
+                expired = store.reap_expired()
+                if expired:
+                    on_expired(expired)
+            except Exception as e:
+                print(f"⚠️ Session reaper error: {e}")
+
+    thread = threading.Thread(target=loop, name='session-reaper', daemon=True)
+    thread.start()
+    return thread
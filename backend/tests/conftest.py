@@ -0,0 +1,39 @@
+"""
+Shared fixtures for the backend tests.
+
+Tests import backend modules directly (the backend is not a package) and run the
+Flask app on the embedded SQLite backend, so no MySQL server is needed:
+
+    cd backend && python -m pytest -q
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# Must be set before app.py (or db.py's create_database) is imported.
+_TEST_DATA_DIR = tempfile.mkdtemp(prefix='ecolearn-tests-')
+os.environ['ECOLEARN_DB_BACKEND'] = 'sqlite'
+os.environ['ECOLEARN_SQLITE_PATH'] = os.path.join(_TEST_DATA_DIR, 'ecolearn.sqlite3')
+os.environ.pop('ECOLEARN_INFERENCE_ADDR', None)
+
+
+@pytest.fixture(scope='session')
+def engine():
+    """app.py on a fresh SQLite database with the card catalog loaded (no startup jobs)."""
+    import app as engine_module
+    engine_module.create_db_pool()
+    engine_module.load_model()
+    return engine_module
+
+
+@pytest.fixture
+def client(engine):
+    engine.app.config['TESTING'] = True
+    return engine.app.test_client()
@@ -0,0 +1,95 @@
+from datetime import datetime
+
+import analytics_rollup
+from scan_log_writer import ScanLogWriter, ScanRow
+
+
+def _scan(session_id, card_id=1, correct=True, at=None, confidence=0.8, response_time=250):
+    return ScanRow(
+        session_id=session_id,
+        card_id=card_id,
+        predicted_category_id=1,
+        actual_category_id=1 if correct else 2,
+        confidence_score=confidence,
+        response_time=response_time,
+        scan_timestamp=at or datetime.now(),
+    )
+
+
+def test_scan_upsert_groups_by_day_card_and_categories():
+    day = datetime(2026, 3, 2, 9, 30)
+    rows = analytics_rollup.build_scan_rollup_upsert([
+        _scan(1, at=day), _scan(2, at=day.replace(hour=14), confidence=None),
+        _scan(1, correct=False, at=day), _scan(1, card_id=5, at=day),
+    ])
+    by_key = {row[:4]: row[4:] for row in rows}
+
+    assert by_key[(day.date(), 1, 1, 1)] == (2, 2, 0.8, 1, 500, 2)
+    assert by_key[(day.date(), 1, 2, 1)] == (1, 0, 0.8, 1, 250, 1)
+    assert by_key[(day.date(), 5, 1, 1)] == (1, 1, 0.8, 1, 250, 1)
+
+
+def _student_rollup(engine, nickname):
+    return engine.db.query_one("""
+        SELECT completed_sessions, total_scans, correct_scans, accuracy_sum, best_accuracy
+        FROM TBL_STUDENT_ROLLUP WHERE student_nickname = %s
+    """, (nickname,))
+
+
+def _complete_session(engine, nickname, scans):
+    writer = ScanLogWriter(engine.db.connect)
+    with engine.db.cursor(commit=True) as cursor:
+        cursor.execute("""
+            INSERT INTO TBL_SESSIONS (student_nickname, session_mode, start_time, session_status)
+            VALUES (%s, 'assessment', NOW(), 'active')
+        """, (nickname,))
+        session_id = cursor.lastrowid
+    for correct in scans:
+        writer.submit(_scan(session_id, correct=correct))
+    writer.flush()
+    with engine.db.cursor(commit=True) as cursor:
+        cursor.execute("""
+            UPDATE TBL_SESSIONS SET end_time = NOW(), session_status = 'completed'
+            WHERE session_id = %s
+        """, (session_id,))
+        analytics_rollup.add_completed_session(cursor, session_id)
+    return session_id, writer
+
+
+def test_completed_sessions_fold_into_student_rollup(engine):
+    _complete_session(engine, 'Fold', [True, False])
+    _complete_session(engine, 'Fold', [True])
+
+    row = _student_rollup(engine, 'Fold')
+    assert (row['completed_sessions'], row['total_scans'], row['correct_scans']) == (2, 3, 2)
+
+
+def test_scans_flushed_after_session_end_fold_into_student_rollup(engine):
+    session_id, writer = _complete_session(engine, 'Late', [True])
+    writer.submit(_scan(session_id, correct=False))  # Landed after the end-time snapshot
+    writer.submit(_scan(session_id, correct=True))
+    writer.flush()
+
+    row = _student_rollup(engine, 'Late')
+    assert (row['completed_sessions'], row['total_scans'], row['correct_scans']) == (1, 3, 2)
+    assert float(row['accuracy_sum']) == 66.67
+
+    with engine.db.cursor(commit=True) as cursor:
+        analytics_rollup.reconcile_student_rollup(cursor)  # The maintenance rebuild agrees
+    assert _student_rollup(engine, 'Late') == row
+
+
+def test_rebuild_matches_incremental_scan_rollup(engine):
+    with engine.db.cursor(commit=True) as cursor:
+        analytics_rollup.rebuild_all(cursor)  # Start from history written by other tests
+    _complete_session(engine, 'Rebuild', [True, False, True])
+    query = """
+        SELECT rollup_date, card_id, actual_category_id, predicted_category_id, scan_count, correct_count
+        FROM TBL_SCAN_DAILY_ROLLUP ORDER BY 1, 2, 3, 4
+    """
+    incremental = engine.db.query(query)
+
+    with engine.db.cursor(commit=True) as cursor:
+        analytics_rollup.rebuild_all(cursor)
+
+    assert engine.db.query(query) == incremental
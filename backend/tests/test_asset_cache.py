@@ -0,0 +1,105 @@
+import gzip
+import os
+
+import pytest
+
+import asset_cache
+from asset_cache import AssetCache
+
+SVG = ('<svg xmlns="http://www.w3.org/2000/svg">'
+       + '<circle cx="10" cy="10" r="5" fill="green"/>' * 40 + '</svg>').encode('utf-8')
+
+
+@pytest.fixture
+def assets(tmp_path):
+    root = tmp_path / 'assets'
+    (root / 'Compostable').mkdir(parents=True)
+    (root / 'mascot.svg').write_bytes(SVG)
+    (root / 'Compostable' / 'banana.png').write_bytes(b'png-bytes')
+    (root / 'Compostable' / 'banana.webp').write_bytes(b'webp-bytes')
+    (root / 'big.png').write_bytes(b'x' * 2048)
+    return root
+
+
+def test_entries_carry_etag_gzip_and_webp_sibling(assets):
+    cache = AssetCache(str(assets))
+    svg = cache.get('mascot.svg')
+    assert svg.mimetype == 'image/svg+xml'
+    assert gzip.decompress(svg.gzip_body) == SVG and len(svg.gzip_body) < len(SVG)
+    assert cache.get('mascot.svg') is svg
+
+    png = cache.get('Compostable/banana.png')
+    assert png.webp_sibling == 'Compostable/banana.webp' and png.gzip_body is None
+    assert cache.get('Compostable/banana.png', accept_webp=True).body == b'webp-bytes'
+    assert cache.stats()['hits'] == 2  # mascot.svg, then the PNG entry that names its sibling
+
+
+def test_missing_escaping_and_oversized_files_are_not_cached(assets, tmp_path):
+    (tmp_path / 'secret.txt').write_text('secret')
+    cache = AssetCache(str(assets), max_file_bytes=1024)
+    assert cache.get('nope.png') is None
+    assert cache.get('../secret.txt') is None
+    assert cache.get('big.png') is None
+    assert cache.stats()['uncacheable'] == 1 and cache.stats()['entries'] == 0
+
+
+def test_changed_file_is_reread_after_the_revalidate_window(assets, monkeypatch):
+    now = [10.0]
+    monkeypatch.setattr(asset_cache.time, 'monotonic', lambda: now[0])
+    cache = AssetCache(str(assets), revalidate_seconds=30)
+    first = cache.get('Compostable/banana.webp')
+    path = assets / 'Compostable' / 'banana.webp'
+    path.write_bytes(b'new-webp-bytes')
+
+    assert cache.get('Compostable/banana.webp') is first  # inside the window: no stat
+    now[0] += 30
+    fresh = cache.get('Compostable/banana.webp')
+    assert fresh.body == b'new-webp-bytes' and fresh.etag != first.etag
+
+
+def test_lru_eviction_keeps_the_byte_budget(assets):
+    cache = AssetCache(str(assets), max_bytes=2060)
+    cache.get('Compostable/banana.png')   # 9 bytes
+    cache.get('big.png')                  # 2048 bytes
+    cache.get('big.png')
+    cache.get('Compostable/banana.webp')  # 10 bytes: over budget, the PNG is least recent
+    assert cache.stats()['bytes'] == 2058 and cache.stats()['entries'] == 2
+
+    cache.get('Compostable/banana.png')
+    assert cache.stats()['misses'] == 4
+
+
+def test_invalidate_drops_entries_and_notifies_other_workers(assets, tmp_path):
+    stamp = str(tmp_path / 'asset_cache.stamp')
+    worker_a = AssetCache(str(assets), stamp_path=stamp, stamp_check_seconds=0)
+    worker_b = AssetCache(str(assets), stamp_path=stamp, stamp_check_seconds=0)
+    (assets / 'Compostable' / 'banana.webp').unlink()
+    png = worker_a.get('Compostable/banana.png')
+    assert png.webp_sibling is None
+    worker_b.get('Compostable/banana.png')
+
+    # One-shot learn writes a WebP next to the PNG: the PNG entry must see its new sibling.
+    (assets / 'Compostable' / 'banana.webp').write_bytes(b'webp-bytes')
+    worker_a.invalidate('Compostable/banana.webp')
+    assert worker_a.get('Compostable/banana.png').webp_sibling == 'Compostable/banana.webp'
+    assert os.path.exists(stamp)
+    assert worker_b.get('Compostable/banana.png').webp_sibling == 'Compostable/banana.webp'
+
+
+def test_assets_route_serves_gzip_and_304(client, engine, monkeypatch, assets):
+    monkeypatch.setattr(engine, 'asset_cache', AssetCache(str(assets)))
+    response = client.get('/assets/mascot.svg', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == SVG
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+    again = client.get('/assets/mascot.svg', headers={
+        'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag'],
+    })
+    assert again.status_code == 304
+    plain = client.get('/assets/mascot.svg')
+    assert plain.data == SVG and plain.headers['ETag'] != response.headers['ETag']
+
+    webp = client.get('/assets/Compostable/banana.png', headers={'Accept': 'image/webp,*/*'})
+    assert webp.data == b'webp-bytes' and webp.mimetype == 'image/webp'
+    assert 'Accept' in [v.strip() for v in webp.headers['Vary'].split(',')]
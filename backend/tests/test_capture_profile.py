@@ -0,0 +1,56 @@
+import io
+
+import cv2
+import numpy as np
+
+
+def _jpeg(width, height, value=0):
+    ok, encoded = cv2.imencode('.jpg', np.full((height, width, 3), value, dtype=np.uint8))
+    assert ok
+    return encoded.tobytes()
+
+
+def test_working_side_covers_focus_crop(engine):
+    side = engine.scan_working_side()
+    assert side >= max(engine.ORB_INPUT_SIZE)
+    assert side * engine.ORB_FOCUS_ROI_SCALE >= max(engine.ORB_INPUT_SIZE)
+    assert side <= engine.CAPTURE_MAX_SIDE
+
+
+def test_profile_advertises_the_working_side(engine, monkeypatch):
+    profile = engine.get_capture_profile()
+    assert profile['max_side'] == profile['version'] == engine.scan_working_side() == 280
+
+    monkeypatch.setattr(engine, 'ORB_FOCUS_ROI_SCALE', 0.5)  # A tighter crop needs bigger frames
+    assert engine.get_capture_profile()['max_side'] == engine.scan_working_side() == 448
+    assert engine.capture_profile_stale('280')
+
+
+def test_decode_scan_frame_downscales_once_to_working_side(engine):
+    frame = engine.decode_scan_frame(_jpeg(1280, 960))
+    assert max(frame.shape[:2]) == engine.scan_working_side()
+
+    small = engine.decode_scan_frame(_jpeg(200, 150))
+    assert small.shape[:2] == (150, 200)
+
+
+def test_only_advertised_profile_is_accepted(engine):
+    advertised = str(engine.get_capture_profile()['version'])
+    assert not engine.capture_profile_stale(advertised)
+    assert not engine.capture_profile_stale(None)
+    assert engine.capture_profile_stale('9999')
+    assert engine.capture_profile_stale('webp-hd')
+
+
+def test_classify_flags_stale_profile(client, engine):
+    headers = {engine.CAPTURE_PROFILE_HEADER: 'old-profile'}
+    response = client.post('/classify', headers=headers,
+                           data={'image': (io.BytesIO(_jpeg(320, 240)), 'scan.jpg')})
+    body = response.get_json()
+    assert body['reason'] == 'no_card_detected'
+    assert body['capture_profile_stale'] is True
+
+    headers[engine.CAPTURE_PROFILE_HEADER] = str(engine.get_capture_profile()['version'])
+    response = client.post('/classify', headers=headers,
+                           data={'image': (io.BytesIO(_jpeg(320, 240)), 'scan.jpg')})
+    assert 'capture_profile_stale' not in response.get_json()
@@ -0,0 +1,88 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def statuses(engine, tmp_path, monkeypatch):
+    """Restore the process-wide training and card-asset status after each test."""
+    monkeypatch.setattr(engine, 'TRAINING_PROGRESS_PATH', str(tmp_path / 'progress.jsonl'))
+    saved = dict(engine.training_status), dict(engine.card_asset_status)
+    engine.training_status.update(state='idle')
+    engine.card_asset_status.update(state='idle', pending=0, last_error=None)
+    yield engine
+    engine.training_status.clear()
+    engine.training_status.update(saved[0])
+    engine.card_asset_status.clear()
+    engine.card_asset_status.update(saved[1])
+
+
+def _card_image():
+    img = np.full((50, 40, 3), 255, dtype=np.uint8)
+    img[10:40, 10:30] = (0, 128, 0)
+    return img
+
+
+def test_only_one_retrain_can_be_reserved(statuses):
+    engine = statuses
+    assert engine.reserve_orb_retrain('card_add', 7, 'Banana')[0]
+    snap = engine.get_training_status_snapshot()
+    assert snap['state'] == 'queued' and snap['last_card_id'] == 7
+    assert not engine.reserve_orb_retrain('card_add', 8, 'Bottle')[0]
+    engine.training_status['state'] = 'running'
+    assert not engine.reserve_orb_retrain('card_add', 8, 'Bottle')[0]
+    engine.training_status['state'] = 'completed'
+    assert engine.reserve_orb_retrain('card_add', 8, 'Bottle')[0]
+
+
+def test_encoded_image_write_is_atomic(engine, tmp_path, monkeypatch):
+    path = str(tmp_path / 'Compostable' / 'banana.png')
+    engine._write_encoded_image(path, _card_image(), '.png', [])
+    assert cv2.imread(path).shape == (50, 40, 3)
+
+    monkeypatch.setattr(engine.cv2, 'imencode', lambda *a: (False, None))
+    with pytest.raises(ValueError):
+        engine._write_encoded_image(str(tmp_path / 'other.png'), _card_image(), '.png', [])
+    assert sorted(os.listdir(tmp_path / 'Compostable')) == ['banana.png']
+
+
+def test_asset_job_saves_images_then_starts_the_reserved_retrain(statuses, tmp_path, monkeypatch):
+    engine = statuses
+    started, thumbs, invalidated = [], [], []
+    monkeypatch.setattr(engine, 'start_orb_retrain_thread', lambda *args: started.append(args))
+    monkeypatch.setattr(engine, 'generate_card_thumbnails', thumbs.append)
+    monkeypatch.setattr(engine.asset_cache, 'invalidate', lambda *rels: invalidated.extend(rels))
+
+    png = str(tmp_path / 'assets_png' / 'Compostable' / 'banana.png')
+    webp = str(tmp_path / 'assets' / 'Compostable' / 'banana.webp')
+    engine.card_asset_status['pending'] = 1
+    engine._run_card_asset_job(7, 'Banana', _card_image(), png, webp,
+                               'assets/Compostable/banana.webp', None, 'card_add')
+
+    assert os.path.isfile(png) and os.path.isfile(webp)
+    assert started == [('card_add', 7, 'Banana')]
+    assert thumbs == ['assets/Compostable/banana.webp']
+    assert invalidated == ['Compostable/banana.webp']
+    status = engine.get_card_asset_status_snapshot()
+    assert status['state'] == 'completed' and status['pending'] == 0
+
+
+def test_failed_asset_job_fails_the_reserved_retrain(statuses, tmp_path, monkeypatch):
+    engine = statuses
+    started = []
+    monkeypatch.setattr(engine, 'start_orb_retrain_thread', lambda *args: started.append(args))
+    monkeypatch.setattr(engine.cv2, 'imencode', lambda *a: (False, None))
+
+    assert engine.reserve_orb_retrain('card_replace', 7, 'Banana')[0]
+    engine.card_asset_status['pending'] = 1
+    engine._run_card_asset_job(7, 'Banana', _card_image(), str(tmp_path / 'a.png'), str(tmp_path / 'a.webp'),
+                               'assets/Compostable/a.webp', None, 'card_replace')
+
+    assert started == []
+    assert engine.get_card_asset_status_snapshot()['state'] == 'failed'
+    training = engine.get_training_status_snapshot()
+    assert training['state'] == 'failed' and 'Saving card images failed' in training['last_error']
+    # The failed reservation no longer blocks the next retrain.
+    assert engine.reserve_orb_retrain('card_replace', 7, 'Banana')[0]
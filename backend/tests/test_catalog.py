@@ -0,0 +1,90 @@
+from catalog import (
+    Catalog,
+    asset_counts_payload,
+    cards_minimal_payload,
+    png_path_for,
+)
+
+
+def _loaded_catalog(engine):
+    catalog = Catalog()
+    with engine.db.cursor(dictionary=True) as cursor:
+        catalog.load(cursor)
+    return catalog
+
+
+def test_png_path_for_display_assets():
+    assert png_path_for('assets/Compostable/banana.webp') == 'assets_png/Compostable/banana.png'
+    assert png_path_for('uploads/x.webp') == ''
+    assert png_path_for('') == ''
+
+
+def test_load_matches_the_database(engine):
+    snapshot = _loaded_catalog(engine).snapshot
+    with engine.db.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM TBL_CARD_ASSETS WHERE is_active = 1")
+        active_cards = cursor.fetchone()[0]
+    assert snapshot.version == 1
+    assert len(snapshot.cards) == active_cards
+    counts = asset_counts_payload(snapshot)
+    assert counts['total_cards'] == active_cards
+    assert list(counts['counts']) == ['Compostable', 'Recyclable', 'Non-Recyclable', 'Special Waste']
+
+    ordered = snapshot.ordered_cards()
+    orders = [snapshot.categories[c.category_id].display_order for c in ordered]
+    assert orders == sorted(orders)
+
+
+def test_payloads_render_once_per_version(engine):
+    catalog = _loaded_catalog(engine)
+    snapshot = catalog.snapshot
+    builds = []
+
+    def build(snap):
+        builds.append(snap.version)
+        return cards_minimal_payload(snap)
+
+    body, etag = snapshot.rendered('cards', build)
+    assert snapshot.rendered('cards', build) == (body, etag)
+    assert builds == [1]
+    assert etag.startswith('catalog-v1-')
+
+    card_id = next(iter(snapshot.cards))
+    removed = catalog.remove_card(card_id)
+    assert removed.version == 2 and card_id not in removed.cards
+    assert card_id in snapshot.cards  # earlier snapshots are never mutated
+    new_body, new_etag = removed.rendered('cards', build)
+    assert new_etag != etag and len(new_body) < len(body)
+
+
+def test_card_edits_publish_new_snapshots(engine):
+    catalog = _loaded_catalog(engine)
+    card_id = min(catalog.snapshot.cards)
+    original = catalog.snapshot.cards[card_id].pdf_generated
+    engine.db.execute("UPDATE TBL_CARD_ASSETS SET pdf_generated = 0 WHERE card_id = %s", (card_id,))
+
+    with engine.db.cursor(dictionary=True) as cursor:
+        refreshed = catalog.refresh_card(cursor, card_id)
+    assert not refreshed.cards[card_id].pdf_generated
+
+    marked = catalog.mark_pdf_generated(card_id)
+    assert marked.cards[card_id].pdf_generated and marked.version == refreshed.version + 1
+    assert catalog.mark_pdf_generated(card_id) is marked  # no-op keeps the version
+
+    engine.db.execute("UPDATE TBL_CARD_ASSETS SET is_active = 0 WHERE card_id = %s", (card_id,))
+    try:
+        with engine.db.cursor(dictionary=True) as cursor:
+            assert card_id not in catalog.refresh_card(cursor, card_id).cards
+    finally:
+        engine.db.execute(
+            "UPDATE TBL_CARD_ASSETS SET is_active = 1, pdf_generated = %s WHERE card_id = %s",
+            (int(original), card_id),
+        )
+
+
+def test_catalog_endpoint_revalidates_with_version_etag(client):
+    first = client.get('/admin/asset-counts')
+    assert first.status_code == 200
+    etag = first.headers.get('ETag')
+    assert etag
+    assert client.get('/admin/asset-counts', headers={'If-None-Match': etag}).status_code == 304
@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_the_app_skips_optional_modules_and_resources(tmp_path):
+    """Import app.py in a clean interpreter: no TTS/augmentation imports, no pool, no ORB extractor."""
+    probe = (
+        "import json, sys\n"
+        "import app\n"
+        "print(json.dumps({\n"
+        "    'gtts': 'gtts' in sys.modules,\n"
+        "    'generate_variants': 'generate_variants' in sys.modules,\n"
+        "    'reportlab': 'reportlab' in sys.modules,\n"
+        "    'orb': app.orb is not None,\n"
+        "}))\n"
+    )
+    env = dict(os.environ, ECOLEARN_SQLITE_PATH=str(tmp_path / 'cold.sqlite3'))
+    done = subprocess.run(
+        [sys.executable, '-c', probe], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, timeout=120,
+    )
+    assert done.returncode == 0, done.stderr
+    loaded = done.stdout.strip().splitlines()[-1]
+    assert loaded == '{"gtts": false, "generate_variants": false, "reportlab": false, "orb": false}'
+    assert not (tmp_path / 'cold.sqlite3').exists()  # the database is opened by create_app()
+
+
+def test_orb_extractor_is_built_once_and_rebuilt_after_a_settings_change(engine):
+    extractor = engine.get_orb_extractor()
+    assert engine.get_orb_extractor() is extractor
+    engine.rebuild_orb_extractor()
+    assert engine.get_orb_extractor() is not extractor
+
+
+def test_startup_timer_reports_phases(engine, capsys):
+    timer = engine.StartupTimer(origin=0.0)
+    with timer.phase('card_data'):
+        pass
+    timings = timer.as_dict()
+    assert list(timings) == ['card_data', 'total'] and timings['card_data'] >= 0
+    timer.report()
+    assert 'card_data' in capsys.readouterr().out
+
+
+def test_importing_wsgi_starts_no_threads(tmp_path):
+    """gunicorn imports wsgi in the master before fork(); threads started there would be lost."""
+    probe = (
+        "import threading\n"
+        "import wsgi\n"
+        "print(sorted(t.name for t in threading.enumerate()))\n"
+    )
+    env = dict(os.environ, ECOLEARN_SQLITE_PATH=str(tmp_path / 'wsgi.sqlite3'))
+    done = subprocess.run(
+        [sys.executable, '-c', probe], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, timeout=120,
+    )
+    assert done.returncode == 0, done.stderr
+    assert done.stdout.strip().splitlines()[-1] == "['MainThread']"
@@ -0,0 +1,99 @@
+import mysql.connector
+import pytest
+
+from db import CheckedOutConnection, Database, _Lease
+
+
+class FakeServerConnection:
+    """Raw driver connection whose prepared statements live only as long as its server session."""
+
+    def __init__(self):
+        self.connection_id = 1
+        self.live_statements = set()
+        self.prepared = 0
+
+    def reconnect(self):
+        self.connection_id += 1
+        self.live_statements.clear()
+
+    def drop_statements(self):
+        self.live_statements.clear()  # e.g. server-side cleanup without a visible reconnect
+
+    def cursor(self, prepared=False):
+        return FakePreparedCursor(self)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakePreparedCursor:
+    def __init__(self, raw):
+        self.raw = raw
+        self.statement_id = None
+        self.column_names = ('value',)
+        self.rowcount = 1
+        self.closed = False
+
+    def execute(self, sql, params):
+        if self.statement_id is None:
+            self.raw.prepared += 1
+            self.statement_id = (self.raw.connection_id, self.raw.prepared)
+            self.raw.live_statements.add(self.statement_id)
+        elif self.statement_id not in self.raw.live_statements:
+            raise mysql.connector.errors.DatabaseError(msg='Unknown prepared statement handler')
+
+    def fetchall(self):
+        return [(1,)]
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def database(monkeypatch):
+    raw = FakeServerConnection()
+    database = Database({})
+    monkeypatch.setattr(database, 'connect', lambda: CheckedOutConnection(database, _Lease(raw, False)))
+    return database, raw
+
+
+def test_hot_statement_is_prepared_once(database):
+    db, raw = database
+    for _ in range(3):
+        assert db.query("SELECT 1 AS value") == [{'value': 1}]
+    assert raw.prepared == 1
+    assert db.stats()['prepared_hits'] == 2
+
+
+def test_reconnect_invalidates_cached_statements(database):
+    db, raw = database
+    db.query("SELECT 1 AS value")
+    raw.reconnect()
+
+    assert db.query("SELECT 1 AS value") == [{'value': 1}]
+    assert raw.prepared == 2
+    assert db.stats()['prepared_invalidations'] == 1
+
+
+def test_driver_error_drops_cache_so_next_call_reprepares(database):
+    db, raw = database
+    db.execute("UPDATE t SET x = 1")
+    raw.drop_statements()
+
+    with pytest.raises(mysql.connector.Error):
+        db.execute("UPDATE t SET x = 1")
+    assert db.execute("UPDATE t SET x = 1") == 1
+    assert raw.prepared == 2
+
+
+def test_non_driver_error_keeps_cache(database, monkeypatch):
+    db, raw = database
+    db.query("SELECT 1 AS value")
+    monkeypatch.setattr(FakePreparedCursor, 'fetchall', lambda self: (_ for _ in ()).throw(ValueError('bad row')))
+
+    with pytest.raises(ValueError):
+        db.query("SELECT 1 AS value")
+    assert db.stats()['prepared_invalidations'] == 0
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+import pytest
+
+from db_sqlite import SQLiteDatabase, translate_sql
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = SQLiteDatabase(str(tmp_path / 'ecolearn.sqlite3'))
+    assert database.open()
+    return database
+
+
+def test_translate_mysql_constructs():
+    assert translate_sql("TRUNCATE TABLE TBL_SCAN_DAILY_ROLLUP;", False) == "DELETE FROM TBL_SCAN_DAILY_ROLLUP"
+    assert translate_sql("SET FOREIGN_KEY_CHECKS = 0", False) == "PRAGMA foreign_keys = OFF"
+    assert translate_sql("SELECT NOW(), GREATEST(a, b)", False) == (
+        "SELECT datetime('now', 'localtime'), MAX(a, b)"
+    )
+    assert translate_sql("SELECT * FROM t WHERE a = %s AND b LIKE 'x%%'", True) == (
+        "SELECT * FROM t WHERE a = ? AND b LIKE 'x%'"
+    )
+    assert translate_sql("SELECT 'x%s'", False) == "SELECT 'x%s'"  # no params: left alone
+    upsert = translate_sql(
+        "INSERT INTO r (k, n) VALUES (%s, %s) ON DUPLICATE KEY UPDATE n = n + VALUES(n)", True
+    )
+    assert upsert == "INSERT INTO r (k, n) VALUES (?, ?) ON CONFLICT DO UPDATE SET n = n + excluded.n"
+
+
+def test_cursor_imitates_mysql_connector(database):
+    conn = database.connect()
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+            INSERT INTO TBL_SESSIONS (student_nickname, session_mode, start_time, session_status)
+            VALUES (%s, 'instructional', %s, 'active')
+        """, ('Lite', datetime(2026, 1, 2, 3, 4, 5)))
+        session_id = cursor.lastrowid
+        cursor.execute("SELECT session_id, start_time FROM TBL_SESSIONS WHERE session_id = %s", (session_id,))
+        row = cursor.fetchone()
+        assert row == {'session_id': session_id, 'start_time': datetime(2026, 1, 2, 3, 4, 5)}
+        assert cursor.column_names == ('session_id', 'start_time')
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_deferred_counter_variable_gates_the_trigger(database):
+    conn = database.connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO TBL_SESSIONS (student_nickname, session_mode, start_time, session_status)
+            VALUES ('Lite', 'instructional', NOW(), 'active')
+        """)
+        session_id = cursor.lastrowid
+        insert_scan = """
+            INSERT INTO TBL_SCAN_TRANSACTIONS (session_id, card_id, predicted_category_id, actual_category_id)
+            VALUES (%s, 1, 1, 1)
+        """
+        cursor.execute(insert_scan, (session_id,))
+        cursor.execute("SET @ecolearn_deferred_counters = 1")
+        assert cursor.fetchall() == []
+        cursor.execute(insert_scan, (session_id,))
+        cursor.execute("SELECT total_scans, correct_scans FROM TBL_SESSIONS WHERE session_id = %s", (session_id,))
+        assert cursor.fetchone() == (1, 1)
+        conn.commit()
+    finally:
+        conn.close()
+    # Session variables do not leak to the next borrower of the pooled connection.
+    reused = database.connect()
+    assert reused is conn and reused.session_vars == {}
+    reused.close()
+
+
+def test_pool_reuses_connections_and_rolls_back_on_close(database):
+    conn = database.connect()
+    conn.cursor().execute("INSERT INTO TBL_SESSIONS (student_nickname, session_mode, start_time) "
+                          "VALUES ('Uncommitted', 'instructional', NOW())")
+    conn.close()
+    again = database.connect()
+    assert again is conn
+    cursor = again.cursor()
+    cursor.execute("SELECT COUNT(*) FROM TBL_SESSIONS WHERE student_nickname = 'Uncommitted'")
+    assert cursor.fetchone() == (0,)
+    again.close()
+    stats = database.stats()
+    assert stats['connections_opened'] == 1 and stats['checkouts'] == 2 and stats['in_use'] == 0
@@ -0,0 +1,81 @@
+import struct
+
+import cv2
+import numpy as np
+
+from image_ingest import (
+    choose_reduction,
+    flatten_alpha_on_white,
+    ingest_image_bytes,
+    probe_jpeg_size,
+    read_exif_orientation,
+)
+
+
+def _jpeg(width, height):
+    img = np.zeros((height, width, 3), dtype=np.uint8)
+    img[:, : width // 2] = (0, 0, 255)  # left half red
+    ok, buf = cv2.imencode('.jpg', img)
+    assert ok
+    return buf.tobytes()
+
+
+def _with_orientation(jpeg, orientation):
+    """Insert a little-endian EXIF APP1 segment carrying only the orientation tag."""
+    tiff = b'II' + struct.pack('<HI', 42, 8)
+    ifd = struct.pack('<H', 1) + struct.pack('<HHIHH', 0x0112, 3, 1, orientation, 0) + struct.pack('<I', 0)
+    payload = b'Exif\x00\x00' + tiff + ifd
+    segment = b'\xff\xe1' + struct.pack('>H', len(payload) + 2) + payload
+    return jpeg[:2] + segment + jpeg[2:]
+
+
+def test_probe_reads_dimensions_without_decoding():
+    assert probe_jpeg_size(_jpeg(640, 480)) == (640, 480)
+    ok, png = cv2.imencode('.png', np.zeros((4, 4, 3), dtype=np.uint8))
+    assert probe_jpeg_size(png.tobytes()) is None
+    assert probe_jpeg_size(b'\xff\xd8\xff') is None
+
+
+def test_exif_orientation_is_read_and_applied():
+    raw = _with_orientation(_jpeg(64, 32), 6)
+    assert read_exif_orientation(raw) == 6
+    assert read_exif_orientation(_jpeg(64, 32)) == 1
+    assert read_exif_orientation(_with_orientation(_jpeg(64, 32), 42)) == 1
+
+    image = ingest_image_bytes(raw)
+    assert image.display.shape[:2] == (64, 32)  # rotated 90 degrees clockwise
+    # The red left half now sits on top.
+    assert image.display[4, 16, 2] > 200 and image.display[60, 16, 2] < 50
+
+
+def test_large_jpeg_is_decoded_reduced():
+    assert choose_reduction((4000, 3000), 280) == 8
+    assert choose_reduction((1000, 750), 280) == 2
+    assert choose_reduction((400, 300), 280) == 1
+    assert choose_reduction((4000, 3000), None) == 1
+
+    image = ingest_image_bytes(_jpeg(2400, 1600), ml_max_side=280, display_max_side=600)
+    assert image.reduction == 4  # 2400 // 4 still covers the 600px display copy
+    assert image.source_size == (2400, 1600)
+    assert max(image.display.shape[:2]) == 600
+    assert max(image.ml.shape[:2]) == 280
+
+
+def test_alpha_is_flattened_for_ml_and_kept_for_display():
+    bgra = np.zeros((8, 8, 4), dtype=np.uint8)
+    bgra[:, :4] = (0, 0, 0, 255)  # opaque black
+    bgra[:, 4:] = (0, 0, 0, 0)    # transparent
+    flat = flatten_alpha_on_white(bgra)
+    assert flat.shape == (8, 8, 3)
+    assert flat[0, 0].tolist() == [0, 0, 0] and flat[0, 7].tolist() == [255, 255, 255]
+
+    ok, png = cv2.imencode('.png', bgra)
+    image = ingest_image_bytes(png.tobytes(), keep_alpha=True)
+    assert image.display.shape[2] == 4
+    assert image.ml.shape[2] == 3 and image.ml[0, 7].tolist() == [255, 255, 255]
+    assert ingest_image_bytes(png.tobytes()).display.shape[2] == 3
+
+
+def test_undecodable_upload_returns_none():
+    assert ingest_image_bytes(b'') is None
+    assert ingest_image_bytes(b'not an image') is None
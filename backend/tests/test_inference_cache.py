@@ -0,0 +1,93 @@
+import threading
+
+import numpy as np
+import pytest
+
+import inference_cache
+from inference_cache import ResultCache, SingleFlight, perceptual_hash
+
+
+def _frame(seed=0):
+    # Coarse blocks whose horizontal neighbours always differ by a wide margin.
+    rng = np.random.default_rng(seed)
+    levels = rng.permutation(np.arange(17) * 15).astype(np.uint8)
+    base = np.stack([np.roll(levels, row) for row in range(16)])
+    return np.kron(base, np.ones((20, 20), dtype=np.uint8))[:, :, None].repeat(3, axis=2)
+
+
+def test_perceptual_hash_ignores_noise_but_not_content():
+    frame = _frame()
+    noisy = np.clip(frame.astype(np.int16) + np.random.default_rng(1).integers(-2, 3, frame.shape), 0, 255)
+    assert perceptual_hash(frame) == perceptual_hash(noisy.astype(np.uint8))
+    assert perceptual_hash(frame) != perceptual_hash(_frame(seed=2))
+    assert len(perceptual_hash(frame)) == 64  # 256 bits as hex
+    assert perceptual_hash(frame[:, :, 0]) == perceptual_hash(frame)  # grayscale input
+
+
+def test_result_cache_returns_copies_and_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(inference_cache.time, 'monotonic', lambda: now[0])
+    cache = ResultCache(ttl_seconds=2, max_entries=4)
+    cache.put('k', {'card': 'Bottle'})
+
+    hit = cache.get('k')
+    hit['card'] = 'mutated'
+    assert cache.get('k') == {'card': 'Bottle'}
+
+    now[0] += 2
+    assert cache.get('k') is None
+
+
+def test_result_cache_evicts_least_recently_used():
+    cache = ResultCache(ttl_seconds=60, max_entries=2)
+    cache.put('a', {'n': 1})
+    cache.put('b', {'n': 2})
+    cache.get('a')
+    cache.put('c', {'n': 3})
+    assert cache.get('b') is None
+    assert cache.get('a') == {'n': 1} and cache.get('c') == {'n': 3}
+
+    disabled = ResultCache(ttl_seconds=0, max_entries=2)
+    disabled.put('a', {'n': 1})
+    assert disabled.get('a') is None
+
+
+def test_single_flight_runs_concurrent_calls_once():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {'card': 'Bottle'}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do('k', work)))
+    leader.start()
+    assert started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(flight.do('k', work)))
+    follower.start()
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True]
+    assert all(value == {'card': 'Bottle'} for value, _ in results)
+
+    # The key is released afterwards, so a later call runs again.
+    assert flight.do('k', lambda: 'again') == ('again', False)
+
+
+def test_single_flight_propagates_errors_and_releases_key():
+    flight = SingleFlight()
+
+    def fail():
+        raise RuntimeError('model unavailable')
+
+    with pytest.raises(RuntimeError):
+        flight.do('k', fail)
+    assert flight.do('k', lambda: 1) == (1, False)
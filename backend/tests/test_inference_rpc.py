@@ -0,0 +1,87 @@
+import socket
+import threading
+
+import numpy as np
+import pytest
+
+from inference_rpc import (
+    InferenceClient,
+    InferenceError,
+    pack_frames,
+    parse_address,
+    unpack_frames,
+)
+
+
+@pytest.fixture
+def sidecar(engine, tmp_path):
+    import inference_server
+
+    address = f"unix:{tmp_path / 'inference.sock'}"
+    server = inference_server.build_server(address)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield address, inference_server
+    server.shutdown()
+    server.server_close()
+
+
+def test_frames_round_trip():
+    color = np.arange(2 * 3 * 3, dtype=np.uint8).reshape(2, 3, 3)
+    gray = np.arange(6, dtype=np.uint8).reshape(3, 2)
+    frames = unpack_frames(pack_frames([color, gray]))
+    assert np.array_equal(frames[0], color) and np.array_equal(frames[1], gray)
+    with pytest.raises(ValueError):
+        pack_frames([])
+    with pytest.raises(ValueError):
+        unpack_frames(pack_frames([color])[:-1])
+
+
+def test_parse_address():
+    assert parse_address('unix:/tmp/x.sock') == (socket.AF_UNIX, '/tmp/x.sock')
+    assert parse_address('127.0.0.1:5055') == (socket.AF_INET, ('127.0.0.1', 5055))
+    for bad in ('', 'localhost', 'host:port'):
+        with pytest.raises(ValueError):
+            parse_address(bad)
+
+
+def test_client_calls_the_sidecar(sidecar, monkeypatch):
+    address, inference_server = sidecar
+    client = InferenceClient(address, timeout=5)
+    pong = client.ping()
+    assert pong['status'] == 'ok' and pong['cards_loaded'] > 0
+
+    seen = []
+
+    def fake_burst(frames):
+        seen.append([f.shape for f in frames])
+        return {'status': 'success', 'card_name': 'Banana'}, 'MISS'
+
+    monkeypatch.setattr(inference_server.engine, 'classify_burst_local', fake_burst)
+    frame = np.zeros((4, 5, 3), dtype=np.uint8)
+    result = client.classify_burst([frame, frame])
+    assert result == {'status': 'success', 'card_name': 'Banana', 'result_cache': 'MISS'}
+    assert seen == [[(4, 5, 3), (4, 5, 3)]]
+
+    monkeypatch.setattr(inference_server.engine, 'classify_preview_local',
+                        lambda f: ({'status': 'unknown', 'shape': list(f.shape)}, 'HIT'))
+    assert client.preview(frame) == {'status': 'unknown', 'shape': [4, 5, 3], 'result_cache': 'HIT'}
+
+
+def test_sidecar_errors_become_inference_errors(sidecar, monkeypatch):
+    address, inference_server = sidecar
+
+    def broken(frames):
+        raise RuntimeError('model not loaded')
+
+    monkeypatch.setattr(inference_server.engine, 'classify_frames_local', broken)
+    client = InferenceClient(address, timeout=5)
+    with pytest.raises(InferenceError, match='model not loaded'):
+        client.classify([np.zeros((2, 2, 3), dtype=np.uint8)])
+    assert client.ping()['status'] == 'ok'  # the connection survives an error reply
+
+
+def test_unreachable_sidecar_raises(tmp_path):
+    client = InferenceClient(f"unix:{tmp_path / 'missing.sock'}", timeout=1)
+    with pytest.raises(InferenceError, match='unavailable'):
+        client.ping()
@@ -0,0 +1,64 @@
+import json
+import queue
+import threading
+
+import numpy as np
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.incoming = queue.Queue()
+        self.sent = []
+        self.closing = threading.Event()  # every earlier message has been handled by then
+
+    def receive(self):
+        message = self.incoming.get(timeout=5)
+        if message == 'close':
+            self.closing.set()
+        return message
+
+    def send(self, text):
+        self.sent.append(json.loads(text))
+
+
+def test_slow_recognizer_only_sees_the_newest_frame(engine, monkeypatch):
+    first_started, release = threading.Event(), threading.Event()
+    recognized = []
+
+    def fake_preview(frame):
+        recognized.append(int(frame[0, 0, 0]))
+        first_started.set()
+        release.wait(5)
+        return {'status': 'success', 'card_name': 'Banana'}, 'MISS'
+
+    monkeypatch.setattr(engine, 'decode_scan_frame', lambda raw: np.full((2, 2, 3), raw[0], dtype=np.uint8))
+    monkeypatch.setattr(engine, 'recognize_preview', fake_preview)
+
+    ws = FakeWebSocket()
+    channel = threading.Thread(target=engine._live_classify_channel, args=(ws,))
+    channel.start()
+    ws.incoming.put(bytes([1]))
+    assert first_started.wait(5)
+    for value in (2, 3, 4):  # arrive while frame 1 is still being recognized
+        ws.incoming.put(bytes([value]))
+    ws.incoming.put(b'x' * (engine.LIVE_CHANNEL_MAX_FRAME_BYTES + 1))
+    ws.incoming.put('close')
+    assert ws.closing.wait(5)
+    release.set()
+    channel.join(5)
+
+    assert not channel.is_alive()
+    assert recognized == [1]  # frames 2-4 were superseded by the oversized one
+    assert [r['frame_seq'] for r in ws.sent] == [1, 5]
+    assert ws.sent[0]['result_cache'] == 'MISS'
+    assert ws.sent[1] == {**ws.sent[1], 'status': 'error', 'message': 'Frame too large', 'frames_dropped': 3}
+
+
+def test_undecodable_frames_get_an_error_reply(engine, monkeypatch):
+    monkeypatch.setattr(engine, 'decode_scan_frame', lambda raw: None)
+    ws = FakeWebSocket()
+    ws.incoming.put(b'not an image')
+    ws.incoming.put(None)  # client went away
+    engine._live_classify_channel(ws)
+    assert len(ws.sent) == 1
+    assert ws.sent[0]['message'] == 'Invalid image' and ws.sent[0]['frames_dropped'] == 0
@@ -0,0 +1,98 @@
+import sqlite3
+
+import pytest
+
+from pagination import CursorError, Keyset, decode_cursor, encode_cursor, page_size
+
+SCORES = Keyset('scores', [('score', 'DESC'), ('id', 'ASC')], ['score', 'id'])
+
+
+@pytest.fixture
+def scores_db():
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE scores (id INTEGER PRIMARY KEY, score INTEGER NOT NULL)")
+    # Many ties on the leading key, so pages must break them by id.
+    conn.executemany("INSERT INTO scores (id, score) VALUES (?, ?)", [(i, i % 3) for i in range(1, 11)])
+    yield conn
+    conn.close()
+
+
+def _fetch_page(conn, keyset, limit, token, filters=None):
+    filters = filters or {}
+    key, position = decode_cursor(token, keyset.listing, filters)
+    seek_sql, params = keyset.seek(key)
+    sql = f"SELECT id, score FROM scores WHERE {seek_sql} ORDER BY {keyset.order_by()} LIMIT ?"
+    cursor = conn.execute(sql.replace('%s', '?'), params + [limit + 1])
+    rows, next_cursor = keyset.page(cursor, limit, filters, position)
+    return [row['id'] for row in rows], next_cursor
+
+
+def _walk(conn, limit):
+    ids, token, pages = [], None, 0
+    while True:
+        page, token = _fetch_page(conn, SCORES, limit, token)
+        ids.extend(page)
+        pages += 1
+        if token is None:
+            return ids, pages
+
+
+def test_pages_cover_every_row_once_in_order(scores_db):
+    expected = [row['id'] for row in scores_db.execute("SELECT id FROM scores ORDER BY score DESC, id ASC")]
+    for limit in (1, 3, 4, 9):
+        ids, _ = _walk(scores_db, limit)
+        assert ids == expected
+
+
+def test_exact_multiple_has_no_trailing_empty_page(scores_db):
+    ids, pages = _walk(scores_db, 5)
+    assert len(ids) == 10 and pages == 2
+    ids, pages = _walk(scores_db, 10)
+    assert len(ids) == 10 and pages == 1
+    assert _fetch_page(scores_db, SCORES, 50, None)[1] is None
+
+
+def test_inserts_before_the_cursor_do_not_shift_later_pages(scores_db):
+    first, token = _fetch_page(scores_db, SCORES, 4, None)
+    scores_db.execute("INSERT INTO scores (id, score) VALUES (100, 2)")  # sorts before the cursor
+    second, _ = _fetch_page(scores_db, SCORES, 4, token)
+    assert 100 not in second and not set(first) & set(second)
+    assert first == [2, 5, 8, 1] and second == [4, 7, 10, 3]
+
+
+def test_cursor_tokens_are_bound_to_listing_and_filters():
+    token = encode_cursor('nicknames', {'q': 'a'}, ['Ann'], 50)
+    assert decode_cursor(token, 'nicknames', {'q': 'a'}) == (['Ann'], 50)
+    assert decode_cursor(None, 'nicknames', {}) == (None, 0)
+    with pytest.raises(CursorError):
+        decode_cursor(token, 'nicknames', {'q': 'b'})
+    with pytest.raises(CursorError):
+        decode_cursor(token, 'scans', {'q': 'a'})
+    with pytest.raises(CursorError):
+        decode_cursor('not-a-token', 'nicknames', {'q': 'a'})
+    with pytest.raises(CursorError):
+        SCORES.seek(['only-one-key'])
+
+
+def test_page_size_is_clamped():
+    assert page_size(None) == 50
+    assert page_size('0') == 1
+    assert page_size('100000') == 500
+    with pytest.raises(CursorError):
+        page_size('ten')
+
+
+def test_nicknames_listing_pages_with_cursor(client, engine):
+    for name in ('Page Alpha', 'Page Bravo', 'Page Charlie'):
+        assert client.post('/admin/nicknames', json={'nickname': name}).get_json()['status'] == 'success'
+
+    first = client.get('/admin/nicknames?q=Page&limit=2').get_json()
+    assert [n['nickname'] for n in first['nicknames']] == ['Page Alpha', 'Page Bravo']
+    token = first['next_cursor']
+    second = client.get(f'/admin/nicknames?q=Page&limit=2&cursor={token}').get_json()
+    assert [n['nickname'] for n in second['nicknames']] == ['Page Charlie']
+    assert second['next_cursor'] is None
+
+    mismatched = client.get(f'/admin/nicknames?q=Other&limit=2&cursor={token}')
+    assert mismatched.status_code == 400
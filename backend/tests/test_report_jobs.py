@@ -0,0 +1,112 @@
+import os
+import threading
+
+import pytest
+
+import analytics_rollup
+from report_jobs import ReportJobs
+
+
+def _write_text(text):
+    def write(tmp_path):
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+    return write
+
+
+def test_identical_jobs_share_one_build(tmp_path):
+    jobs = ReportJobs(str(tmp_path))
+    release = threading.Event()
+    builds = []
+
+    def build(job):
+        builds.append(job.job_id)
+        release.wait(5)
+        jobs.publish('report-a.pdf', _write_text('pdf'))
+        return 'report-a.pdf'
+
+    first = jobs.submit('proficiency', {'nickname': ''}, build)
+    second = jobs.submit('proficiency', {'nickname': ''}, build)
+    other = jobs.submit('proficiency', {'nickname': 'A'}, build)
+    assert second is first and other is not first
+
+    release.set()
+    assert jobs.wait(first, 5) and jobs.wait(other, 5)
+    assert first.state == 'ready' and first.report_id == 'report-a.pdf'
+    assert len(builds) == 2
+    stats = jobs.stats()
+    assert stats['submitted'] == 2 and stats['coalesced'] == 1
+    assert stats['rendered'] == 1 and stats['cache_hits'] == 1
+    assert stats['in_flight'] == 0
+
+    # A finished job is no longer pending, so the next request starts a new one.
+    assert jobs.submit('proficiency', {'nickname': ''}, build) is not first
+
+
+def test_failed_build_is_reported(tmp_path):
+    jobs = ReportJobs(str(tmp_path))
+
+    def build(job):
+        raise RuntimeError('boom')
+
+    job = jobs.submit('proficiency', {}, build)
+    assert jobs.wait(job, 5)
+    assert job.state == 'failed' and job.error == 'boom'
+    assert jobs.get(job.job_id) is job
+    assert jobs.stats()['failed'] == 1
+
+
+def test_publish_is_atomic_and_prunes_old_reports(tmp_path):
+    jobs = ReportJobs(str(tmp_path), keep_reports=2)
+
+    def failing_write(tmp):
+        with open(tmp, 'w') as f:
+            f.write('partial')
+        raise OSError('disk full')
+
+    with pytest.raises(OSError):
+        jobs.publish('broken.pdf', failing_write)
+    assert not jobs.has_report('broken.pdf')
+    assert not any(name.endswith('.tmp') for name in os.listdir(tmp_path))
+
+    for name in ('a.pdf', 'b.pdf', 'c.pdf'):
+        assert jobs.publish(name, _write_text(name))
+    assert not jobs.publish('c.pdf', _write_text('again'))
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_report_ids_are_validated(tmp_path):
+    jobs = ReportJobs(str(tmp_path))
+    for bad in ('', '../etc/passwd', 'a/b.pdf'):
+        with pytest.raises(ValueError):
+            jobs.report_path(bad)
+
+
+def _reconcile(engine):
+    with engine.db.cursor(commit=True) as cursor:
+        analytics_rollup.reconcile_student_rollup(cursor)
+
+
+def _data_version(engine):
+    with engine.db.cursor(dictionary=True) as cursor:
+        return engine.proficiency_data_version(cursor)
+
+
+def test_data_version_tracks_nickname_edits(engine):
+    with engine.db.cursor(commit=True) as cursor:
+        cursor.execute("""
+            INSERT INTO TBL_SESSIONS
+                (student_nickname, session_mode, start_time, end_time, total_scans,
+                 correct_scans, session_status)
+            VALUES ('Ana', 'assessment', NOW(), NOW(), 4, 3, 'completed')
+        """)
+    _reconcile(engine)
+    before = _data_version(engine)
+    assert _data_version(engine) == before
+
+    # Same counts and totals, different name on the PDF.
+    engine.db.execute(
+        "UPDATE TBL_SESSIONS SET student_nickname = 'Ann' WHERE student_nickname = 'Ana'", ()
+    )
+    _reconcile(engine)
+    assert _data_version(engine) != before
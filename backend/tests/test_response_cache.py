@@ -0,0 +1,61 @@
+import os
+
+import response_cache
+from response_cache import ResponseCache, etag_matches, make_etag
+
+
+def test_etag_matching_tolerates_weak_and_compressed_validators():
+    etag = make_etag(b'{"status": "success"}')
+    assert etag_matches(f'"{etag}"', etag)
+    assert etag_matches(f'W/"{etag}"', etag)
+    assert etag_matches(f'"other", "{etag}:gzip"', etag)
+    assert etag_matches('*', etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_entries_expire_and_are_dropped_by_tag(monkeypatch):
+    now = [50.0]
+    monkeypatch.setattr(response_cache.time, 'monotonic', lambda: now[0])
+    cache = ResponseCache()
+    cache.put('/admin/stats?', b'stats', 'application/json', 5, ('scans', 'sessions'))
+    cache.put('/admin/cards?', b'cards', 'application/json', 5, ('cards',))
+
+    assert cache.get('/admin/stats?').body == b'stats'
+    cache.invalidate('sessions')
+    assert cache.get('/admin/stats?') is None
+    assert cache.get('/admin/cards?').body == b'cards'
+
+    now[0] += 5
+    assert cache.get('/admin/cards?') is None
+    stats = cache.stats()
+    assert stats['hits'] == 2 and stats['misses'] == 2 and stats['invalidations'] == 1
+
+
+def test_invalidation_in_one_worker_clears_the_others(tmp_path):
+    stamp = str(tmp_path / 'admin_cache.stamp')
+    worker_a = ResponseCache(stamp_path=stamp)
+    worker_b = ResponseCache(stamp_path=stamp)
+    worker_b.put('/admin/nicknames?', b'old', 'application/json', 60, ('sessions',))
+
+    worker_a.invalidate('sessions')
+    assert os.path.exists(stamp)
+    assert worker_b.get('/admin/nicknames?') is None
+
+
+def test_admin_endpoint_revalidates_and_invalidates(client, engine):
+    engine.admin_response_cache.invalidate()
+    first = client.get('/admin/nicknames')
+    assert first.status_code == 200 and first.headers['X-Cache'] == 'MISS'
+    etag = first.headers['ETag']
+
+    again = client.get('/admin/nicknames', headers={'If-None-Match': etag})
+    assert again.status_code == 304 and again.headers['X-Cache'] == 'HIT'
+
+    added = client.post('/admin/nicknames', json={'nickname': 'Cache Tester'})
+    assert added.get_json()['status'] == 'success'
+
+    fresh = client.get('/admin/nicknames', headers={'If-None-Match': etag})
+    assert fresh.status_code == 200 and fresh.headers['X-Cache'] == 'MISS'
+    assert fresh.headers['ETag'] != etag
+    assert b'Cache Tester' in fresh.data
@@ -0,0 +1,64 @@
+from datetime import date
+
+import scan_archive
+from db import open_connection
+from scan_archive import archive_before, default_cutoff, forget_sessions
+
+CUTOFF = date(2018, 6, 1)
+
+
+def _add_session(cursor, nickname, status, scan_days):
+    cursor.execute("""
+        INSERT INTO TBL_SESSIONS (student_nickname, session_mode, start_time, session_status)
+        VALUES (%s, 'instructional', '2018-01-01 08:00:00', %s)
+    """, (nickname, status))
+    session_id = cursor.lastrowid
+    for day in scan_days:
+        cursor.execute("""
+            INSERT INTO TBL_SCAN_TRANSACTIONS
+                (session_id, card_id, predicted_category_id, actual_category_id, scan_timestamp)
+            VALUES (%s, 1, 1, 1, %s)
+        """, (session_id, day))
+    return session_id
+
+
+def _count(cursor, table, session_id):
+    cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE session_id = %s", (session_id,))
+    return cursor.fetchone()[0]
+
+
+def test_default_cutoff_keeps_whole_months():
+    assert default_cutoff(6, today=date(2026, 10, 19)) == date(2026, 4, 1)
+    assert default_cutoff(3, today=date(2026, 2, 1)) == date(2025, 11, 1)
+    assert default_cutoff(0, today=date(2026, 2, 28)) == date(2026, 2, 1)
+
+
+def test_archive_moves_closed_sessions_before_the_cutoff(engine):
+    with engine.db.cursor(commit=True) as cursor:
+        closed = _add_session(cursor, 'Archive Closed', 'completed',
+                              ['2018-01-02 09:00:00', '2018-02-03 09:00:00', '2018-05-31 23:59:59'])
+        running = _add_session(cursor, 'Archive Running', 'active', ['2018-01-05 09:00:00'])
+        recent = _add_session(cursor, 'Archive Recent', 'completed', ['2018-06-01 00:00:00'])
+
+    conn = open_connection(scan_archive.DB_CONFIG)
+    try:
+        assert archive_before(conn, 'sqlite', CUTOFF, dry_run=True) == 3
+        assert archive_before(conn, 'sqlite', CUTOFF, batch_rows=2) == 3
+        assert archive_before(conn, 'sqlite', CUTOFF, batch_rows=2) == 0
+    finally:
+        conn.close()
+
+    with engine.db.cursor() as cursor:
+        assert _count(cursor, 'TBL_SCAN_TRANSACTIONS', closed) == 0
+        assert _count(cursor, 'TBL_SCAN_ARCHIVE', closed) == 3
+        assert _count(cursor, 'TBL_SCAN_TRANSACTIONS', running) == 1  # session still open
+        assert _count(cursor, 'TBL_SCAN_TRANSACTIONS', recent) == 1   # on the cutoff: stays live
+        assert _count(cursor, 'vw_scan_history', closed) == 3
+        cursor.execute(
+            "SELECT is_correct FROM TBL_SCAN_ARCHIVE WHERE session_id = %s", (closed,)
+        )
+        assert all(row[0] == 1 for row in cursor.fetchall())
+
+    with engine.db.cursor(commit=True) as cursor:
+        forget_sessions(cursor, 'Archive Closed')
+        assert _count(cursor, 'TBL_SCAN_ARCHIVE', closed) == 0
@@ -0,0 +1,106 @@
+import csv
+import io
+from datetime import date, datetime
+
+import pytest
+
+import scan_export
+from db import open_connection
+from scan_export import ExportError, iter_chunks, iter_csv, parse_filters
+
+
+@pytest.fixture(scope='module')
+def exported_session(engine):
+    """A 2019 session with five scans, the 2nd and 4th of them already archived."""
+    with engine.db.cursor(commit=True) as cursor:
+        cursor.execute("""
+            INSERT INTO TBL_SESSIONS (student_nickname, session_mode, start_time, session_status)
+            VALUES ('Export Tester', 'assessment', '2019-03-01 08:00:00', 'completed')
+        """)
+        session_id = cursor.lastrowid
+        ids = []
+        for day in range(1, 6):
+            cursor.execute("""
+                INSERT INTO TBL_SCAN_TRANSACTIONS
+                    (session_id, card_id, predicted_category_id, actual_category_id,
+                     confidence_score, response_time, scan_timestamp)
+                VALUES (%s, 1, 1, %s, 0.9, 1200, %s)
+            """, (session_id, 1 if day % 2 else 2, f'2019-03-0{day} 09:00:00'))
+            ids.append(cursor.lastrowid)
+        for archived in (ids[1], ids[3]):
+            cursor.execute("""
+                INSERT INTO TBL_SCAN_ARCHIVE
+                    (transaction_id, session_id, card_id, predicted_category_id, actual_category_id,
+                     is_correct, confidence_score, response_time, scan_timestamp)
+                SELECT transaction_id, session_id, card_id, predicted_category_id, actual_category_id,
+                       is_correct, confidence_score, response_time, scan_timestamp
+                FROM TBL_SCAN_TRANSACTIONS WHERE transaction_id = %s
+            """, (archived,))
+            cursor.execute("DELETE FROM TBL_SCAN_TRANSACTIONS WHERE transaction_id = %s", (archived,))
+    return session_id, ids
+
+
+def _export(filters, chunk_rows=2):
+    conn = open_connection(scan_export.DB_CONFIG)
+    try:
+        return list(iter_chunks(conn, filters, chunk_rows))
+    finally:
+        conn.close()
+
+
+def test_parse_filters_validates_input():
+    assert parse_filters('2019-03-01', '2019-03-05', '7', ' Sam ') == {
+        'start': date(2019, 3, 1), 'end': date(2019, 3, 5), 'session_id': 7, 'nickname': 'Sam',
+    }
+    assert parse_filters() == {}
+    for bad in (dict(start='03/01/2019'), dict(start='2019-03-05', end='2019-03-01'), dict(session_id='x')):
+        with pytest.raises(ExportError):
+            parse_filters(**bad)
+
+
+def test_live_and_archived_rows_merge_in_id_order(exported_session):
+    session_id, ids = exported_session
+    chunks = _export({'session_id': session_id})
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    rows = [row for chunk in chunks for row in chunk]
+    assert [row[0] for row in rows] == ids
+    correct = rows[0][scan_export.EXPORT_COLUMNS.index('is_correct')]
+    assert bool(correct) and not bool(rows[1][scan_export.EXPORT_COLUMNS.index('is_correct')])
+
+
+def test_date_range_is_inclusive_and_combines_with_nickname(exported_session):
+    _, ids = exported_session
+    filters = parse_filters('2019-03-02', '2019-03-04', nickname='Export Tester')
+    rows = [row for chunk in _export(filters) for row in chunk]
+    assert [row[0] for row in rows] == ids[1:4]
+    assert _export(parse_filters('2019-03-02', '2019-03-04', nickname='Nobody')) == []
+    assert _export(parse_filters('1999-01-01', '1999-01-02')) == []
+
+
+def test_csv_blocks_have_one_header(exported_session):
+    session_id, ids = exported_session
+    text = ''.join(iter_csv(_export({'session_id': session_id})))
+    rows = list(csv.reader(io.StringIO(text)))
+    assert rows[0] == scan_export.EXPORT_COLUMNS
+    assert [int(row[0]) for row in rows[1:]] == ids
+    assert rows[1][1] == datetime(2019, 3, 1, 9).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def test_export_route_streams_csv_and_rejects_bad_filters(client, exported_session):
+    session_id, ids = exported_session
+    response = client.get(f'/admin/export/scans?session_id={session_id}')
+    assert response.status_code == 200 and response.mimetype == 'text/csv'
+    assert len(response.data.decode('utf-8').strip().splitlines()) == len(ids) + 1
+
+    assert client.get('/admin/export/scans?format=xlsx').status_code == 400
+    assert client.get('/admin/export/scans?start=yesterday').status_code == 400
+
+
+def test_parquet_writes_one_row_group_per_chunk(tmp_path, exported_session):
+    pq = pytest.importorskip('pyarrow.parquet')
+    session_id, ids = exported_session
+    path = str(tmp_path / 'scans.parquet')
+    assert scan_export.write_parquet(_export({'session_id': session_id}), path) == len(ids)
+    parquet = pq.ParquetFile(path)
+    assert parquet.num_row_groups == 3
+    assert parquet.read().column('transaction_id').to_pylist() == ids
@@ -0,0 +1,164 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from scan_log_writer import ScanLogWriter, ScanRow, build_session_delta_update
+
+
+def _row(session_id, correct=True, response_time=100, card_id=1):
+    return ScanRow(
+        session_id=session_id,
+        card_id=card_id,
+        predicted_category_id=1,
+        actual_category_id=1 if correct else 2,
+        confidence_score=0.9,
+        response_time=response_time,
+        scan_timestamp=datetime.now(),
+    )
+
+
+@pytest.fixture
+def session_id(engine):
+    with engine.db.cursor(commit=True) as cursor:
+        cursor.execute("""
+            INSERT INTO TBL_SESSIONS (student_nickname, session_mode, start_time, session_status)
+            VALUES ('Writer', 'instructional', NOW(), 'active')
+        """)
+        return cursor.lastrowid
+
+
+def _counters(engine, session_id):
+    return engine.db.query_one("""
+        SELECT total_scans, correct_scans, accuracy_percentage, average_response_time
+        FROM TBL_SESSIONS WHERE session_id = %s
+    """, (session_id,))
+
+
+def _logged(engine, session_id):
+    return engine.db.query_one(
+        "SELECT COUNT(*) AS n FROM TBL_SCAN_TRANSACTIONS WHERE session_id = %s", (session_id,)
+    )['n']
+
+
+def test_delta_update_folds_batch_per_session():
+    sql, params = build_session_delta_update([_row(7), _row(7, correct=False, response_time=300), _row(9)])
+    assert sql.count('WHEN %s THEN total_scans + %s') == 2
+    assert sql.rstrip().endswith('WHERE session_id IN (%s,%s)')
+    assert params[-2:] == (7, 9)
+    assert build_session_delta_update([]) == (None, None)
+
+
+def test_counters_move_with_the_batch(engine, session_id):
+    writer = ScanLogWriter(engine.db.connect)
+    writer.submit(_row(session_id, response_time=100))
+    writer.submit(_row(session_id, correct=False, response_time=300))
+    assert _counters(engine, session_id)['total_scans'] == 0  # Nothing on the request path
+    assert writer.pending() == 2
+
+    assert writer.flush() == 2
+    assert _logged(engine, session_id) == 2
+    counters = _counters(engine, session_id)
+    assert (counters['total_scans'], counters['correct_scans']) == (2, 1)  # Not counted twice by the trigger
+    assert float(counters['accuracy_percentage']) == 50.0
+    assert float(counters['average_response_time']) == 200.0
+
+
+def test_flush_all_workers_waits_for_every_worker_queue(engine, session_id, tmp_path):
+    sync_dir = str(tmp_path / 'sync')
+    ending = ScanLogWriter(engine.db.connect, flush_interval=60, sync_dir=sync_dir)
+    other = ScanLogWriter(engine.db.connect, flush_interval=60, sync_dir=sync_dir)
+    ending.start()
+    other.start()
+    try:
+        other.submit(_row(session_id))
+        other.submit(_row(session_id, correct=False))
+        ending.submit(_row(session_id))
+        assert ending.flush_all_workers(timeout=5)
+        assert _counters(engine, session_id)['total_scans'] == 3
+        assert other.pending() == 0
+    finally:
+        ending.stop()
+        other.stop()
+    assert os.listdir(sync_dir) == ['flush.request']  # Stopped workers are no longer waited for
+
+
+def test_flush_all_workers_gives_up_on_a_failing_worker(engine, session_id, tmp_path):
+    sync_dir = str(tmp_path / 'sync')
+
+    def broken():
+        raise ConnectionError('database down')
+
+    ending = ScanLogWriter(engine.db.connect, flush_interval=60, sync_dir=sync_dir)
+    stuck = ScanLogWriter(broken, flush_interval=60, sync_dir=sync_dir)
+    stuck.start()
+    try:
+        stuck.submit(_row(session_id))
+        assert not ending.flush_all_workers(timeout=0.3)
+        assert stuck.pending() == 1
+    finally:
+        stuck._connect = engine.db.connect  # Database back: stop() writes the re-queued row
+        stuck.stop()
+    assert _logged(engine, session_id) == 1
+
+
+def test_flush_writes_one_batch(engine, session_id):
+    writer = ScanLogWriter(engine.db.connect, max_batch=50)
+    for card_id in (1, 2, 3):
+        writer.submit(_row(session_id, card_id=card_id))
+
+    assert writer.flush() == 3
+    assert writer.flush() == 0
+    assert writer.stats() == {'pending': 0, 'rows_written': 3, 'flushes': 1, 'last_error': None}
+    assert _counters(engine, session_id)['total_scans'] == 3  # Queued-only rows counted at flush
+
+
+def test_counters_deferred_to_flush_when_db_unavailable(engine, session_id):
+    available = {'db': False}
+
+    def connect():
+        if not available['db']:
+            raise ConnectionError('database down')
+        return engine.db.connect()
+
+    writer = ScanLogWriter(connect)
+    writer.submit(_row(session_id))
+    assert _counters(engine, session_id)['total_scans'] == 0
+
+    assert writer.flush() == 0  # Still down: the row is re-queued
+    assert writer.pending() == 1
+    assert 'database down' in writer.stats()['last_error']
+
+    available['db'] = True
+    assert writer.flush() == 1
+    assert _counters(engine, session_id)['total_scans'] == 1
+    assert _logged(engine, session_id) == 1
+
+
+def test_full_queue_drops_oldest_row():
+    writer = ScanLogWriter(lambda: None, max_pending=2)
+    for card_id in (1, 2, 3):
+        writer.submit(_row(1, card_id=card_id))
+    assert [row.card_id for row in writer._queue] == [2, 3]
+
+
+def test_session_end_totals_include_rows_still_queued(client, engine):
+    headers = {engine.KIOSK_TOKEN_HEADER: 'writer-end-kiosk'}
+    started = client.post('/session/start', json={'nickname': 'Queued', 'mode': 'assessment'},
+                          headers=headers).get_json()
+    headers[engine.KIOSK_SESSION_HEADER] = str(started['session_id'])
+
+    for selected in ('Recyclable', 'Recyclable', 'Compostable'):
+        body = client.post('/assessment/submit', headers=headers, json={
+            'selected_category': selected, 'correct_category': 'Recyclable',
+            'card_id': 1, 'response_time': 500,
+        }).get_json()
+        assert body['status'] == 'success'
+
+    assert _logged(engine, started['session_id']) == 0  # Rows still write-behind
+    ended = client.post('/session/end', headers=headers).get_json()
+    assert ended['stats']['total_scans'] == 3
+    assert ended['stats']['correct_scans'] == 2
+
+    engine.scan_log_writer.flush()
+    assert _logged(engine, started['session_id']) == 3
@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta
+
+from session_store import KioskSession, SessionStore, normalize_client_token
+
+
+def _session(session_id, mode='instructional'):
+    return KioskSession(session_id=session_id, mode=mode)
+
+
+def test_normalize_client_token():
+    assert normalize_client_token(None) == 'default'
+    assert normalize_client_token('  kiosk-7_a ') == 'kiosk-7_a'
+    assert normalize_client_token('a/b;c') == 'abc'
+    assert len(normalize_client_token('x' * 200)) == 64
+
+
+def test_put_returns_replaced_and_evicted_sessions():
+    store = SessionStore(timeout_seconds=60, max_sessions=2)
+    assert store.put('a', _session(1)) == []
+    assert store.put('b', _session(2)) == []
+    store.get('a')  # 'b' is now least recently active
+
+    displaced = store.put('c', _session(3))
+    assert [s.session_id for s in displaced] == [2]
+
+    displaced = store.put('a', _session(4))
+    assert [s.session_id for s in displaced] == [1]
+    assert store.get('a').session_id == 4
+
+
+def test_idle_sessions_expire_and_are_reaped():
+    store = SessionStore(timeout_seconds=60)
+    store.put('a', _session(1))
+    store.put('b', _session(2))
+    store._sessions['a'].last_seen -= 61
+
+    assert store.get('a') is None
+    assert [s.session_id for s in store.reap_expired()] == [1]
+    assert store.get('b').session_id == 2
+    assert store.is_idle_expired(61) and not store.is_idle_expired(59)
+    assert not SessionStore(timeout_seconds=0).is_idle_expired(10 ** 9)
+
+
+def _insert_session(engine, started_at, status='active', mode='instructional'):
+    with engine.db.cursor(commit=True) as cursor:
+        cursor.execute("""
+            INSERT INTO TBL_SESSIONS (student_nickname, session_mode, start_time, session_status)
+            VALUES (%s, %s, %s, %s)
+        """, ('Tester', mode, started_at, status))
+        return cursor.lastrowid
+
+
+def _insert_scan(engine, session_id, card_id, scanned_at):
+    engine.db.execute("""
+        INSERT INTO TBL_SCAN_TRANSACTIONS
+            (session_id, card_id, predicted_category_id, actual_category_id, scan_timestamp)
+        VALUES (%s, %s, 1, 1, %s)
+    """, (session_id, card_id, scanned_at))
+
+
+def _status(engine, session_id):
+    return engine.db.query_one("SELECT session_status FROM TBL_SESSIONS WHERE session_id = %s",
+                               (session_id,))['session_status']
+
+
+def _rehydrate(engine, token, session_id):
+    headers = {engine.KIOSK_TOKEN_HEADER: token, engine.KIOSK_SESSION_HEADER: str(session_id)}
+    with engine.app.test_request_context(headers=headers):
+        return engine.rehydrate_kiosk_session(token)
+
+
+def test_rehydrate_restores_active_session_with_scanned_cards(engine):
+    session_id = _insert_session(engine, datetime.now() - timedelta(minutes=2))
+    _insert_scan(engine, session_id, 1, datetime.now() - timedelta(minutes=1))
+
+    session = _rehydrate(engine, 'rehydrate-fresh', session_id)
+    assert session.session_id == session_id
+    assert session.scanned_card_ids == {1}
+    assert engine.kiosk_sessions.get('rehydrate-fresh') is session
+
+
+def test_rehydrate_abandons_session_idle_past_timeout(engine):
+    timeout = engine.kiosk_sessions.timeout_seconds
+    session_id = _insert_session(engine, datetime.now() - timedelta(seconds=timeout + 120))
+
+    assert _rehydrate(engine, 'rehydrate-idle', session_id) is None
+    assert _status(engine, session_id) == 'abandoned'
+    assert engine.kiosk_sessions.get('rehydrate-idle') is None
+
+
+def test_recent_scan_keeps_old_session_alive(engine):
+    timeout = engine.kiosk_sessions.timeout_seconds
+    session_id = _insert_session(engine, datetime.now() - timedelta(seconds=timeout * 3))
+    _insert_scan(engine, session_id, 2, datetime.now() - timedelta(seconds=30))
+
+    assert _rehydrate(engine, 'rehydrate-busy', session_id).session_id == session_id
+    assert _status(engine, session_id) == 'active'
+
+
+def test_rehydrate_ignores_closed_sessions(engine):
+    session_id = _insert_session(engine, datetime.now(), status='completed')
+    assert _rehydrate(engine, 'rehydrate-closed', session_id) is None
+
+
+def _kiosk_headers(engine, token, session_id):
+    return {engine.KIOSK_TOKEN_HEADER: token, engine.KIOSK_SESSION_HEADER: str(session_id)}
+
+
+def test_cached_session_is_replaced_when_kiosk_names_a_newer_one(engine):
+    token = 'prefork-switch'
+    old_id = _insert_session(engine, datetime.now())
+    new_id = _insert_session(engine, datetime.now())
+    engine.kiosk_sessions.put(token, KioskSession(session_id=old_id, mode='instructional'))
+
+    with engine.app.test_request_context(headers=_kiosk_headers(engine, token, new_id)):
+        session = engine.get_kiosk_session()
+
+    assert session.session_id == new_id
+    assert engine.kiosk_sessions.get(token).session_id == new_id
+    assert _status(engine, old_id) == 'abandoned'  # Displaced copy closed like a replaced session
+
+
+def test_request_without_matching_session_is_rejected(engine):
+    token = 'prefork-ended'
+    cached_id = _insert_session(engine, datetime.now())
+    ended_id = _insert_session(engine, datetime.now(), status='completed')
+    engine.kiosk_sessions.put(token, KioskSession(session_id=cached_id, mode='instructional'))
+
+    with engine.app.test_request_context(headers=_kiosk_headers(engine, token, ended_id)):
+        assert engine.get_kiosk_session() is None
+
+
+def test_end_session_closes_the_session_the_kiosk_names(client, engine):
+    token = 'prefork-end'
+    stale_id = _insert_session(engine, datetime.now())
+    current_id = _insert_session(engine, datetime.now())
+    engine.kiosk_sessions.put(token, KioskSession(session_id=stale_id, mode='instructional'))
+
+    body = client.post('/session/end', headers=_kiosk_headers(engine, token, current_id)).get_json()
+
+    assert body['status'] == 'success'
+    assert body['session_id'] == current_id
+    assert _status(engine, current_id) == 'completed'
+    assert _status(engine, stale_id) == 'abandoned'
+
+
+def test_cached_session_serves_kiosks_without_a_session_header(engine):
+    token = 'legacy-kiosk'
+    session_id = _insert_session(engine, datetime.now())
+    engine.kiosk_sessions.put(token, KioskSession(session_id=session_id, mode='instructional'))
+
+    with engine.app.test_request_context(headers={engine.KIOSK_TOKEN_HEADER: token}):
+        assert engine.get_kiosk_session().session_id == session_id
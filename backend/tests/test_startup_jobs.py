@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def startup(engine, tmp_path, monkeypatch):
+    """Fresh startup status written to a temp status file."""
+    path = tmp_path / 'startup_status.json'
+    monkeypatch.setattr(engine, 'STARTUP_STATUS_PATH', str(path))
+    monkeypatch.setitem(engine.startup_status, 'state', 'idle')
+    monkeypatch.setitem(engine.startup_status, 'stages', {})
+    monkeypatch.setitem(engine.startup_status, 'pid', None)
+    return engine, path
+
+
+def test_stage_outcomes_are_recorded(startup):
+    engine, path = startup
+
+    def broken():
+        raise RuntimeError('disk full')
+
+    engine._run_startup_stage('skip_me', False, lambda: True)
+    engine._run_startup_stage('works', True, lambda: True)
+    engine._run_startup_stage('returns_false', True, lambda: False)
+    engine._run_startup_stage('raises', True, broken)
+
+    stages = engine.get_startup_status_snapshot()['stages']
+    assert {name: s['state'] for name, s in stages.items()} == {
+        'skip_me': 'skipped', 'works': 'completed', 'returns_false': 'failed', 'raises': 'failed',
+    }
+    assert stages['raises']['message'] == 'disk full'
+    assert stages['works']['started_at'] and stages['works']['ended_at']
+    assert json.loads(path.read_text())['stages'] == stages
+
+
+def test_workers_read_the_status_file_of_the_master(startup):
+    engine, path = startup
+    engine._update_startup_stage('auto_train', state='running')
+    engine.startup_status['pid'] = -1  # status owned by another process (the preloading master)
+    path.write_text(json.dumps({'state': 'ready', 'stages': {}}))
+    assert engine.get_startup_status_snapshot() == {'state': 'ready', 'stages': {}}
+
+    path.unlink()
+    assert engine.get_startup_status_snapshot() == {'state': 'unknown', 'stages': {}}
+
+
+def test_jobs_run_in_order_and_finish_ready(startup, monkeypatch):
+    engine, _ = startup
+    calls = []
+    monkeypatch.setattr(engine, 'analytics_backfill_needed', True)
+    monkeypatch.setattr(engine, 'SCAN_ARCHIVE_KEEP_MONTHS', 0)
+    monkeypatch.setattr(engine, 'ENABLE_AUDIO_FEEDBACK', True)
+    monkeypatch.setattr(engine, 'backfill_analytics_rollups', lambda: calls.append('backfill') or True)
+    monkeypatch.setattr(engine, 'prerender_tts_phrases', lambda: calls.append('tts') or False)
+
+    engine._run_startup_jobs(recognizer_stages=False)
+
+    assert calls == ['backfill', 'tts']
+    snapshot = engine.get_startup_status_snapshot()
+    assert snapshot['state'] == 'ready'
+    assert {name: s['state'] for name, s in snapshot['stages'].items()} == {
+        'analytics_backfill': 'completed',
+        'scan_archive': 'skipped',
+        'tts_prerender': 'failed',
+    }
+
+
+def test_only_one_process_claims_the_background_jobs(engine, tmp_path, monkeypatch):
+    pytest.importorskip('fcntl')
+    monkeypatch.setattr(engine, 'BACKGROUND_JOBS_LOCK_PATH', str(tmp_path / 'jobs.lock'))
+    monkeypatch.setattr(engine, 'background_jobs_lock', None)
+    assert engine.claim_background_jobs()
+    holder = engine.background_jobs_lock
+    assert engine.claim_background_jobs()  # already ours
+
+    engine.background_jobs_lock = None  # another worker: its own open file description
+    assert not engine.claim_background_jobs()
+    holder.close()  # the claiming worker exited
+    assert engine.claim_background_jobs()
+    engine.background_jobs_lock.close()
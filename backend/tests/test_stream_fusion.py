@@ -0,0 +1,166 @@
+import io
+
+import cv2
+import numpy as np
+import pytest
+
+BASE_CLASSES = {0: 101, 1: 102, 2: 103}
+
+
+def _frame(value):
+    return np.full((64, 64, 3), value, dtype=np.uint8)
+
+
+def _encoded(value):
+    ok, encoded = cv2.imencode('.png', _frame(value))
+    assert ok
+    return encoded.tobytes()
+
+
+class FakeNet:
+    """Stands in for an ONNX net: the probabilities depend on the frame's pixel value."""
+
+    def __init__(self, probs_by_value):
+        self.probs_by_value = probs_by_value
+        self.passes = 0
+
+
+@pytest.fixture
+def recognizer(engine, monkeypatch):
+    """Base model with three cards, no incremental model, every frame card-bearing."""
+    net = FakeNet({
+        10: np.array([0.96, 0.02, 0.02]),  # Confident card 101
+        20: np.array([0.40, 0.35, 0.25]),  # Ambiguous
+        30: np.array([0.05, 0.90, 0.05]),  # Confident card 102
+    })
+
+    def infer(fake, frame):
+        fake.passes += 1
+        return fake.probs_by_value[int(frame[0, 0, 0])]
+
+    decoded = []
+
+    def decode(raw):
+        frame = cv2.imdecode(np.frombuffer(raw, dtype=np.uint8), cv2.IMREAD_COLOR)
+        decoded.append(int(frame[0, 0, 0]))
+        return frame
+
+    monkeypatch.setattr(engine, '_infer_best_probs_from_net', infer)
+    monkeypatch.setattr(engine, 'decode_scan_frame', decode)
+    monkeypatch.setattr(engine, 'is_eco_card_present', lambda frame: int(frame[0, 0, 0]) != 0)
+    monkeypatch.setattr(engine, 'orb_fallback_net', net)
+    monkeypatch.setattr(engine, 'orb_fallback_class_to_card_id', dict(BASE_CLASSES))
+    monkeypatch.setattr(engine, 'incremental_orb_net', None)
+    monkeypatch.setattr(engine, 'incremental_orb_class_to_card_id', {})
+    monkeypatch.setattr(engine, 'ORB_CONFIDENCE_THRESHOLD', 0.7)
+    monkeypatch.setattr(engine, 'CNN_ENSEMBLE_MARGIN_THRESHOLD', 0.2)
+    for card_id in BASE_CLASSES.values():
+        monkeypatch.setitem(engine.card_metadata, card_id,
+                            {'name': f'Card {card_id}', 'category_id': 1, 'image_path': ''})
+    monkeypatch.setitem(engine.category_metadata, 1, 'Recyclable')
+    engine.scan_result_cache.clear()
+    return net, decoded
+
+
+def test_confident_first_frame_stops_before_decoding_the_rest(engine, recognizer):
+    net, decoded = recognizer
+    result, cache_state = engine.recognize_burst([_encoded(10), _encoded(20), _encoded(20), _encoded(20)])
+
+    assert cache_state == 'miss'
+    assert result['status'] == 'success'
+    assert result['card_id'] == 101
+    assert result['frames_usable'] == 1
+    assert decoded == [10]
+    assert net.passes == 1
+
+
+def test_ambiguous_frames_keep_fusing_until_settled(engine, recognizer):
+    net, decoded = recognizer
+    result, _ = engine.recognize_burst([_encoded(20), _encoded(30), _encoded(30), _encoded(10)])
+
+    assert result['card_id'] == 102
+    assert result['frames_usable'] == 3
+    assert decoded == [20, 30, 30]
+    assert net.passes == 3
+
+
+def test_single_usable_frame_reuses_its_burst_pass(engine, recognizer, monkeypatch):
+    net, decoded = recognizer
+
+    def no_ensemble(*args, **kwargs):
+        raise AssertionError('brightness ensemble must not run for a burst')
+
+    monkeypatch.setattr(engine, 'run_cnn_ensemble', no_ensemble)
+    result, _ = engine.recognize_burst([_encoded(0), _encoded(0), _encoded(10)])
+
+    assert result['card_id'] == 101
+    assert result['ensemble_runs'] == 1
+    assert result['frames_usable'] == 1
+    assert net.passes == 1
+
+
+def test_burst_without_a_card_is_a_pre_check_miss(engine, recognizer):
+    net, _ = recognizer
+    result, _ = engine.recognize_burst([_encoded(0), _encoded(0)])
+
+    assert result['reason'] == 'no_card_detected'
+    assert result['classifier'] == 'pre_check'
+    assert net.passes == 0
+
+
+def test_repeated_burst_is_answered_from_cache(engine, recognizer):
+    net, _ = recognizer
+    frames = [_encoded(10), _encoded(30)]
+    engine.recognize_burst(frames)
+    result, cache_state = engine.recognize_burst(frames)
+
+    assert cache_state == 'hit'
+    assert result['card_id'] == 101
+    assert net.passes == 1
+
+
+def test_unsettled_model_that_agrees_does_not_extend_the_burst(engine, monkeypatch):
+    monkeypatch.setattr(engine, 'CNN_ENSEMBLE_MARGIN_THRESHOLD', 0.1)
+    outputs = {
+        'base': np.array([0.9, 0.05, 0.05]),
+        'incremental': np.array([0.5, 0.3, 0.2]),  # Below its threshold, same top card
+    }
+    monkeypatch.setattr(engine, '_infer_best_probs_from_net', lambda net, frame: outputs[net])
+    fusion = engine.BurstFusion({
+        'base': ('base', dict(BASE_CLASSES), 0.7),
+        'incremental': ('incremental', dict(BASE_CLASSES), 0.8),
+    })
+    fusion.add(_frame(10))
+
+    assert fusion.settled()
+    probs, used, _ = fusion.fused('incremental')
+    assert used == 1
+    assert int(np.argmax(probs)) == 0
+
+
+def test_stream_route_reports_burst_usage(client, recognizer):
+    response = client.post('/classify/stream', data={
+        'frames': [(io.BytesIO(_encoded(10)), 'frame_0.png'), (io.BytesIO(_encoded(30)), 'frame_1.png')],
+    })
+    body = response.get_json()
+
+    assert body['status'] == 'success'
+    assert body['frames_received'] == 2
+    assert body['frames_usable'] == 1
+
+
+def test_live_preview_takes_one_pass_of_one_model(engine, recognizer, monkeypatch):
+    net, _ = recognizer
+    incremental = FakeNet({10: np.array([0.1, 0.9])})
+    monkeypatch.setattr(engine, 'incremental_orb_net', incremental)
+    monkeypatch.setattr(engine, 'incremental_orb_class_to_card_id', {0: 101, 1: 102})
+    monkeypatch.setattr(engine, 'CNN_ENSEMBLE_ENABLED', True)
+    monkeypatch.setattr(engine, 'CNN_ENSEMBLE_RUNS', 3)
+
+    result, cache_state = engine.recognize_preview(_frame(10))
+    assert (result['status'], result['card_id'], cache_state) == ('success', 101, 'miss')
+    assert (net.passes, incremental.passes) == (1, 0)
+    assert engine.recognize_preview(_frame(10))[1] == 'hit'
+    engine.scan_result_cache.clear()  # flat frames share one perceptual hash
+    assert engine.recognize_preview(_frame(0))[0]['reason'] == 'no_card_detected'
+    assert net.passes == 1
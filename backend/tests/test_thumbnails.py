@@ -0,0 +1,82 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from thumbnails import ThumbnailStore, resize_to_box, snap_width
+
+
+def _write_card(path, width=400, height=500, color=(0, 128, 0)):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    img = np.full((height, width, 3), color, dtype=np.uint8)
+    assert cv2.imwrite(path, img)
+
+
+@pytest.fixture
+def store(tmp_path):
+    assets = tmp_path / 'assets'
+    _write_card(str(assets / 'Compostable' / 'banana.webp'))
+    return ThumbnailStore(str(assets), str(tmp_path / 'thumbs'))
+
+
+def test_snap_width_rounds_up_to_supported_sizes():
+    assert [snap_width(w) for w in (1, 120, 121, 240, 300, 4000)] == [120, 120, 240, 240, 480, 480]
+    assert snap_width('bogus') == 120 and snap_width(None) == 120
+
+
+def test_resize_to_box_fits_and_never_enlarges():
+    assert resize_to_box(np.zeros((500, 400, 3), np.uint8), 120).shape[:2] == (150, 120)
+    assert resize_to_box(np.zeros((100, 400, 3), np.uint8), 120).shape[:2] == (30, 120)
+    small = np.zeros((50, 40, 3), np.uint8)
+    assert resize_to_box(small, 120) is small
+
+
+def test_derivative_is_rendered_once_and_reused(store):
+    path, etag = store.get('Compostable/banana.webp', 100)
+    assert etag.endswith('-w120')
+    assert cv2.imread(path).shape[:2] == (150, 120)
+    assert store.get('Compostable/banana.webp', 120) == (path, etag)
+    assert store.stats() == {'hits': 1, 'rendered': 1, 'errors': 0}
+
+
+def test_replaced_source_gets_a_new_derivative(store):
+    rel = 'Compostable/banana.webp'
+    old_path, old_etag = store.get(rel, 120)
+    source = store.source_path(rel)
+    _write_card(source, width=200, height=500, color=(0, 0, 255))
+    os.utime(source, ns=(os.stat(source).st_atime_ns, os.stat(source).st_mtime_ns + 10 ** 9))
+
+    new_path, new_etag = store.get(rel, 120)
+    assert new_etag != old_etag
+    assert not os.path.exists(old_path)  # stale derivative removed
+    assert cv2.imread(new_path).shape[:2] == (150, 60)
+
+
+def test_missing_or_escaping_paths_are_refused(store, tmp_path):
+    (tmp_path / 'secret.webp').write_bytes(b'x')
+    assert store.get('Compostable/missing.webp', 120) is None
+    assert store.get('../secret.webp', 120) is None
+
+    (tmp_path / 'assets' / 'Recyclable').mkdir()
+    (tmp_path / 'assets' / 'Recyclable' / 'broken.webp').write_bytes(b'not an image')
+    assert store.get('Recyclable/broken.webp', 120) is None
+    assert store.stats()['errors'] == 1
+
+
+def test_generate_and_forget_cover_every_width(store):
+    rel = 'Compostable/banana.webp'
+    assert store.generate([rel, 'Compostable/missing.webp']) == 1
+    paths = [store.get(rel, w)[0] for w in (120, 240, 480)]
+    assert all(os.path.isfile(p) for p in paths)
+    store.forget(rel)
+    assert not any(os.path.exists(p) for p in paths)
+
+
+def test_thumbnail_route_revalidates(client, engine, monkeypatch, store):
+    monkeypatch.setattr(engine, 'thumbnail_store', store)
+    first = client.get('/assets/thumb/Compostable/banana.webp?w=240')
+    assert first.status_code == 200 and first.mimetype == 'image/webp'
+    again = client.get('/assets/thumb/Compostable/banana.webp?w=240',
+                       headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
@@ -0,0 +1,85 @@
+import json
+
+from training_progress import (
+    ProgressWriter,
+    current_run_id,
+    format_sse,
+    parse_event_id,
+    read_events,
+    stream,
+)
+
+
+def _sse_events(chunks):
+    """(id, event) pairs from SSE chunks, skipping retry/keepalive lines."""
+    events = []
+    for chunk in chunks:
+        lines = [line for line in chunk.strip().splitlines() if not line.startswith(('retry', ':'))]
+        fields = dict(line.split(': ', 1) for line in lines)
+        if 'data' in fields:
+            events.append((fields.get('id'), json.loads(fields['data'])))
+    return events
+
+
+def test_run_file_starts_with_queued_and_appends(tmp_path):
+    path = str(tmp_path / 'models' / 'progress.jsonl')
+    writer = ProgressWriter.start_run(path, trigger='card_add')
+    writer.emit('assets', ok=True)
+    ProgressWriter.resume(path).emit('epoch', epoch=1, epochs=6)
+
+    offset, events = read_events(path, 0)
+    assert [e['event'] for _, e in events] == ['queued', 'assets', 'epoch']
+    assert {e['run_id'] for _, e in events} == {writer.run_id} == {current_run_id(path)}
+    assert events[0][1]['trigger'] == 'card_add'
+    assert read_events(path, offset) == (offset, [])
+
+    # A new run replaces the file.
+    assert ProgressWriter.start_run(path).run_id != writer.run_id
+    assert len(read_events(path, 0)[1]) == 1
+
+
+def test_partial_and_corrupt_lines(tmp_path):
+    path = tmp_path / 'progress.jsonl'
+    path.write_bytes(b'{"event": "queued"}\nnot json\n{"event": "ep')
+    offset, events = read_events(str(path), 0)
+    assert [e['event'] for _, e in events] == ['queued']
+    assert offset == len(b'{"event": "queued"}\nnot json\n')  # partial line is re-read later
+    assert read_events(None, 5) == (5, [])
+    ProgressWriter(None).emit('ignored')
+
+
+def test_event_ids_and_sse_format():
+    assert parse_event_id('abc:120') == ('abc', 120)
+    assert parse_event_id('abc:-4') == ('abc', 0)
+    assert parse_event_id('abc:x') == (None, 0)
+    assert parse_event_id(None) == (None, 0)
+    assert format_sse({'event': 'epoch', 'loss': 0.5}, 'abc:10') == (
+        'id: abc:10\nevent: epoch\ndata: {"event": "epoch", "loss": 0.5}\n\n'
+    )
+
+
+def test_stream_replays_the_run_and_ends_after_finished(tmp_path):
+    path = str(tmp_path / 'progress.jsonl')
+    writer = ProgressWriter.start_run(path)
+    writer.emit('assets', ok=True)
+    writer.emit('finished', state='completed')
+
+    chunks = list(stream(path, poll_seconds=0))
+    assert chunks[0].startswith('retry: ')
+    events = _sse_events(chunks)
+    assert [e['event'] for _, e in events] == ['queued', 'assets', 'finished']
+
+    # Resuming after the second event only sends the rest.
+    resumed = _sse_events(stream(path, last_event_id=events[1][0], poll_seconds=0))
+    assert [e['event'] for _, e in resumed] == ['finished']
+    # Reconnecting after the end sends nothing and returns at once.
+    assert _sse_events(stream(path, last_event_id=events[2][0], poll_seconds=0)) == []
+
+
+def test_stream_of_an_unfinished_run_times_out(tmp_path):
+    path = str(tmp_path / 'progress.jsonl')
+    ProgressWriter.start_run(path)
+    chunks = list(stream(path, poll_seconds=0, max_seconds=0.05, keepalive_seconds=0))
+    assert [e['event'] for _, e in _sse_events(chunks)] == ['queued']
+    assert ': keepalive\n\n' in chunks
+    assert list(stream(str(tmp_path / 'missing.jsonl'))) == ['retry: 5000\n\n']
@@ -0,0 +1,125 @@
+import os
+import sys
+import threading
+
+import pytest
+
+from tts_cache import CommandEngine, TTSCache, TTSError, card_phrases, validate_request
+
+
+class FakeEngine:
+    name = 'fake'
+
+    def __init__(self, fail=False, delay=None):
+        self.calls = []
+        self.fail = fail
+        self.delay = delay
+
+    def synthesize(self, text, lang):
+        self.calls.append((text, lang))
+        if self.delay is not None:
+            self.delay.wait(5)
+        if self.fail:
+            raise TTSError('offline')
+        return f'{lang}:{text}'.encode('utf-8') * 10
+
+
+def test_validate_request_normalizes_and_rejects():
+    assert validate_request('  Tama!\n Very   good ', None) == ('Tama! Very good', 'tl')
+    assert validate_request('Hi', 'en-US') == ('Hi', 'en-US')
+    for text, lang in (('', 'tl'), ('x' * 501, 'tl'), ('Hi', '../etc')):
+        with pytest.raises(ValueError):
+            validate_request(text, lang)
+
+
+def test_card_phrases_use_the_category_reason():
+    phrases = card_phrases('Banana_Peel', 'Compostable')
+    assert len(phrases) == 3
+    assert all('Ang Banana Peel ay kabilang sa Compostable dahil nabubulok ito.' in p for p in phrases)
+
+
+def test_miss_then_hit_with_normalized_key(tmp_path):
+    engine = FakeEngine()
+    cache = TTSCache(str(tmp_path), engine)
+    audio, hit = cache.get('Very  good', 'tl')
+    assert not hit and audio.startswith(b'tl:Very good')
+    assert cache.get(' Very good ', 'tl') == (audio, True)
+    assert len(engine.calls) == 1
+    assert os.path.isfile(cache.path_for(cache.key('Very good', 'tl')))
+    assert cache.key('Very good', 'en') != cache.key('Very good', 'tl')
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1 and stats['engine'] == 'fake'
+
+
+def test_concurrent_misses_synthesize_once(tmp_path):
+    release = threading.Event()
+    engine = FakeEngine(delay=release)
+    cache = TTSCache(str(tmp_path), engine)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('Tama!', 'tl'))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(results) == 4 and len(engine.calls) == 1
+
+
+def test_engine_failure_is_not_cached(tmp_path):
+    cache = TTSCache(str(tmp_path), FakeEngine(fail=True))
+    with pytest.raises(TTSError):
+        cache.get('Tama!', 'tl')
+    assert cache.stats()['errors'] == 1
+    cache.engine = FakeEngine()
+    assert cache.get('Tama!', 'tl')[1] is False
+
+
+def test_eviction_drops_least_recently_used_files(tmp_path):
+    cache = TTSCache(str(tmp_path), FakeEngine(), max_bytes=10 ** 6)
+    for i in range(4):
+        cache.get(f'phrase {i}', 'tl')
+    paths = [cache.path_for(cache.key(f'phrase {i}', 'tl')) for i in range(4)]
+    for age, path in enumerate(reversed(paths)):
+        os.utime(path, (1000 + age, 1000 + age))  # phrase 3 oldest ... phrase 0 newest
+    cache.get('phrase 3', 'tl')  # a hit makes it the newest again
+
+    size = os.path.getsize(paths[0])
+    cache.max_bytes = size * 3
+    assert cache.evict() == 2
+    assert [os.path.exists(p) for p in paths] == [True, False, False, True]
+
+
+def test_prerender_skips_cached_phrases_and_stops_when_offline(tmp_path):
+    engine = FakeEngine()
+    cache = TTSCache(str(tmp_path), engine)
+    assert cache.prerender(['Tama!', 'Tama! ', 'Subukan ulit!']) == 2
+    assert cache.prerender(['Tama!', 'Subukan ulit!']) == 0
+
+    cache.engine = FakeEngine(fail=True)
+    with pytest.raises(TTSError):
+        cache.prerender(['New phrase', 'Another'])
+    assert len(cache.engine.calls) == 1
+
+
+def test_command_engine_reads_stdout():
+    engine = CommandEngine(f'{sys.executable} -c "import sys; sys.stdout.write(sys.argv[1])" {{lang}}:{{text}}')
+    assert engine.synthesize('Tama', 'tl') == b'tl:Tama'
+    assert engine.name.startswith('cmd-')
+    with pytest.raises(TTSError):
+        CommandEngine(f'{sys.executable} -c "pass"').synthesize('Tama', 'tl')
+
+
+def test_tts_route_serves_cached_mp3_with_etag(client, engine, monkeypatch, tmp_path):
+    monkeypatch.setattr(engine, 'ENABLE_AUDIO_FEEDBACK', True)
+    monkeypatch.setattr(engine, 'tts_cache', TTSCache(str(tmp_path), FakeEngine()))
+
+    first = client.get('/tts?text=Tama!&lang=tl')
+    assert first.status_code == 200 and first.mimetype == 'audio/mpeg'
+    assert first.headers['X-Cache'] == 'MISS'
+    again = client.get('/tts?text=Tama!&lang=tl', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304 and again.headers['X-Cache'] == 'HIT'
+    assert client.post('/tts', json={'text': 'Tama!'}).get_json()['status'] == 'success'
+    assert client.get('/tts?text=').status_code == 400
+
+    monkeypatch.setattr(engine, 'tts_cache', TTSCache(str(tmp_path / 'offline'), FakeEngine(fail=True)))
+    assert client.get('/tts?text=Bago').status_code == 503
@@ -0,0 +1,173 @@
+"""
+thumbnails.py
+-------------
+Resized WebP derivatives of the card images for the admin gallery.
+
+Gallery tiles are 120x150 but the display assets are up to 2048 px on a side;
+derivatives are rendered once per (image, width) and kept on disk:
+
+    <cache_dir>/w<width>/<category>/<stem>.<fingerprint>.webp
+
+The fingerprint is the source file's mtime and size, so replacing a card image
+(one-shot learn writes the same path) yields a new derivative and a new ETag,
+and the stale one is removed when the new one is written. Files are written to
+a temp name and renamed into place; concurrent requests for the same missing
+derivative render it once (SingleFlight).
+
+Only the widths in THUMB_WIDTHS are rendered (1x/2x/4x of the gallery tile, for
+srcset); a requested width is rounded up to the nearest of them.
+"""
+
+from __future__ import annotations
+
+import glob
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from inference_cache import SingleFlight
+
+THUMB_WIDTHS = (120, 240, 480)
+THUMB_ASPECT = 5 / 4  # Eco-Cards are 4x5 inch
+THUMB_QUALITY = 80
+
+
+def snap_width(value) -> int:
+    """Nearest supported width at or above the requested one (largest if above all)."""
+    try:
+        width = int(value)
+    except (TypeError, ValueError):
+        return THUMB_WIDTHS[0]
+    for candidate in THUMB_WIDTHS:
+        if width <= candidate:
+            return candidate
+    return THUMB_WIDTHS[-1]
+
+
+def resize_to_box(img, width: int):
+    """Fit `img` inside width x width*THUMB_ASPECT, never enlarging."""
+    height = int(round(width * THUMB_ASPECT))
+    h, w = img.shape[:2]
+    scale = min(width / w, height / h, 1.0)
+    if scale >= 1.0:
+        return img
+    size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+    return cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+
+
+class ThumbnailStore:
+    def __init__(self, assets_dir: str, cache_dir: str):
+        self.assets_dir = os.path.realpath(assets_dir)
+        self.cache_dir = cache_dir
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+        self._stats = {'hits': 0, 'rendered': 0, 'errors': 0}
+
+    def source_path(self, rel: str) -> str | None:
+        """Absolute path of an asset under assets_dir ('Category/name.webp'), or None."""
+        path = os.path.realpath(os.path.join(self.assets_dir, rel))
+        if not path.startswith(self.assets_dir + os.sep) or not os.path.isfile(path):
+            return None
+        return path
+
+    @staticmethod
+    def _fingerprint(source: str) -> str:
+        st = os.stat(source)
+        return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+    def _derivative_stem(self, rel: str, width: int) -> str:
+        return os.path.join(self.cache_dir, f"w{width}", os.path.splitext(os.path.normpath(rel))[0])
+
+    def get(self, rel: str, width: int):
+        """(path, etag) of the derivative, rendering it if needed; None when the source is missing/unreadable."""
+        source = self.source_path(rel)
+        if source is None:
+            return None
+        width = snap_width(width)
+        fingerprint = self._fingerprint(source)
+        stem = self._derivative_stem(rel, width)
+        path = f"{stem}.{fingerprint}.webp"
+        etag = f"{fingerprint}-w{width}"
+        if os.path.isfile(path):
+            with self._lock:
+                self._stats['hits'] += 1
+            return path, etag
+        ok, _ = self._flight.do(path, lambda: self._render(source, stem, path, width))
+        return (path, etag) if ok else None
+
+    def _render(self, source: str, stem: str, path: str, width: int) -> bool:
+        if os.path.isfile(path):
+            return True
+        img = cv2.imread(source, cv2.IMREAD_UNCHANGED)
+        if img is None:
+            with self._lock:
+                self._stats['errors'] += 1
+            return False
+        ok, encoded = cv2.imencode('.webp', resize_to_box(img, width), [cv2.IMWRITE_WEBP_QUALITY, THUMB_QUALITY])
+        if not ok:
+            with self._lock:
+                self._stats['errors'] += 1
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(encoded.tobytes())
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        for stale in glob.glob(f"{glob.escape(stem)}.*.webp"):
+            if stale != path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+        with self._lock:
+            self._stats['rendered'] += 1
+        return True
+
+    def forget(self, rel: str) -> None:
+        """Drop every derivative of a deleted image."""
+        for width in THUMB_WIDTHS:
+            stem = self._derivative_stem(rel, width)
+            for stale in glob.glob(f"{glob.escape(stem)}.*.webp"):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+    # --- background generation ---
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Threads do not survive fork(); each worker process gets its own.
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='thumbnails')
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def generate(self, rels) -> int:
+        """Render every width for each image now. Returns the number of images done."""
+        done = 0
+        for rel in rels:
+            if all(self.get(rel, width) is not None for width in THUMB_WIDTHS):
+                done += 1
+        return done
+
+    def generate_async(self, rels) -> None:
+        rels = list(rels)
+
+        def run():
+            try:
+                self.generate(rels)
+            except Exception as e:
+                print(f"⚠️ Thumbnail generation failed: {e}")
+
+        self._get_executor().submit(run)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
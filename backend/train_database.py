@@ -6,6 +6,8 @@ import os
 import hashlib
 from datetime import datetime
 
+from db import open_connection
+
 # --- CONFIGURATION ---
 DB_CONFIG = {
     'host': 'localhost',
@@ -22,7 +24,7 @@ ORB_FEATURES = 1000
 AUGMENT_COUNT = 8  # More variations for better accuracy
 
 def connect_db():
-    return mysql.connector.connect(**DB_CONFIG)
+    return open_connection(DB_CONFIG)
 
 # ============================================
 # ENHANCED AUGMENTATION PIPELINE
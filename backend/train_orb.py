@@ -12,6 +12,9 @@ Workflow:
    b) Full fine-tune     (backbone unfrozen, BN layers frozen)
 4) Export updated .h5, .onnx, and models/waste_labels.txt mapping.
 
+With --progress-file, phase/step/epoch events (loss, accuracy, ETA) are also
+appended as JSON lines for the admin UI's live stream (training_progress.py).
+
 Key changes vs. previous version:
 - Uses tf.keras.applications.MobileNetV2 directly (ImageNet weights guaranteed).
 - Preprocessing uses the official mobilenet_v2.preprocess_input (→ [-1, 1]).
@@ -27,18 +30,21 @@ import json
 import random
 import os
 import sys
+import time
 from datetime import datetime
 from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable
 
-import mysql.connector
 import numpy as np
 import tensorflow as tf
 import tf2onnx
 import cv2
 
+from db import open_connection
+from training_progress import ProgressWriter
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
@@ -104,7 +110,7 @@ class DatasetBundle:
 # ---------------------------------------------------------------------------
 
 def connect_db():
-    return mysql.connector.connect(**DB_CONFIG)
+    return open_connection(DB_CONFIG)
 
 
 def load_active_cards(include_card_ids: set[int] | None = None) -> list[CardRow]:
@@ -547,6 +553,60 @@ def compile_model(model: tf.keras.Model, lr: float) -> None:
     )
 
 
+def _metric(logs: dict | None, key: str) -> float | None:
+    value = (logs or {}).get(key)
+    return round(float(value), 4) if value is not None else None
+
+
+class ProgressCallback(tf.keras.callbacks.Callback):
+    """Reports step/epoch progress of one fit() phase to the progress file."""
+
+    def __init__(self, progress: ProgressWriter, phase: str, step_interval_seconds: float = 1.0):
+        super().__init__()
+        self.progress = progress
+        self.phase = phase
+        self.step_interval_seconds = step_interval_seconds
+
+    def on_train_begin(self, logs=None):
+        self._started = self._last_step_event = time.monotonic()
+        self._steps_done = 0
+        self._epoch = 0
+        self._epochs = self.params.get("epochs") or 0
+        self._steps = self.params.get("steps") or 0
+
+    def _eta_seconds(self) -> int | None:
+        total = self._epochs * self._steps
+        if not total or not self._steps_done:
+            return None
+        elapsed = time.monotonic() - self._started
+        return int(round(elapsed / self._steps_done * max(0, total - self._steps_done)))
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._epoch = epoch + 1
+
+    def on_train_batch_end(self, batch, logs=None):
+        self._steps_done += 1
+        now = time.monotonic()
+        if now - self._last_step_event < self.step_interval_seconds:
+            return
+        self._last_step_event = now
+        self.progress.emit(
+            "step", phase=self.phase, epoch=self._epoch, epochs=self._epochs,
+            step=batch + 1, steps=self._steps or None,
+            loss=_metric(logs, "loss"), accuracy=_metric(logs, "accuracy"),
+            eta_seconds=self._eta_seconds(),
+        )
+
+    def on_epoch_end(self, epoch, logs=None):
+        self._steps_done = max(self._steps_done, (epoch + 1) * self._steps)
+        self.progress.emit(
+            "epoch", phase=self.phase, epoch=epoch + 1, epochs=self._epochs,
+            loss=_metric(logs, "loss"), accuracy=_metric(logs, "accuracy"),
+            val_loss=_metric(logs, "val_loss"), val_accuracy=_metric(logs, "val_accuracy"),
+            eta_seconds=self._eta_seconds(),
+        )
+
+
 # ---------------------------------------------------------------------------
 # Export helpers
 # ---------------------------------------------------------------------------
@@ -634,6 +694,8 @@ def main() -> None:
                         help="Comma-separated card IDs to train on (incremental model mode).")
     parser.add_argument("--log-file", default=str(Path("models") / "orb_retrain_last.log"),
                         help="Optional run log file path. Use empty string to disable.")
+    parser.add_argument("--progress-file", default="",
+                        help="Append JSON-lines progress events to this file (set by the backend).")
     args = parser.parse_args()
 
     # Reproducibility
@@ -662,6 +724,9 @@ def main() -> None:
             sys.stdout = TeeStream(sys.__stdout__, log_handle)
             sys.stderr = TeeStream(sys.__stderr__, log_handle)
 
+    progress = ProgressWriter.resume(str((root / args.progress_file).resolve()) if args.progress_file else None)
+    progress.emit("phase", phase="dataset")
+
     if not variants_dir.exists():
         raise FileNotFoundError(f"Variants directory not found: {variants_dir}")
 
@@ -700,6 +765,10 @@ def main() -> None:
     print(f"Num classes       : {len(bundle.class_names)}")
     print(f"Image size        : {args.img_size}x{args.img_size}")
     print("=" * 72)
+    progress.emit(
+        "dataset", cards=len(cards), train_samples=len(bundle.train_paths),
+        val_samples=len(bundle.val_paths), classes=len(bundle.class_names),
+    )
 
     train_ds = build_tf_dataset(
         bundle.train_paths, bundle.train_labels,
@@ -746,6 +815,7 @@ def main() -> None:
     # Phase 1: train head only (backbone frozen)
     if args.head_epochs > 0:
         print("\n[phase 1/2] Head-only warm-up (backbone frozen)")
+        progress.emit("phase", phase="head", epochs=args.head_epochs)
         set_trainable_phase(model, "head_only")
         compile_model(model, lr=args.head_lr)
         model.fit(
@@ -753,13 +823,14 @@ def main() -> None:
             validation_data=fit_val_data,
             epochs=args.head_epochs,
             class_weight=class_weights,
-            callbacks=callbacks,
+            callbacks=callbacks + [ProgressCallback(progress, "head")],
             verbose=1,
         )
 
     # Phase 2: fine-tune full model (BN layers remain frozen)
     if args.finetune_epochs > 0:
         print("\n[phase 2/2] Full fine-tune (backbone unfrozen, BN frozen)")
+        progress.emit("phase", phase="finetune", epochs=args.finetune_epochs)
         set_trainable_phase(model, "fine_tune")
         compile_model(model, lr=args.finetune_lr)
         model.fit(
@@ -767,7 +838,7 @@ def main() -> None:
             validation_data=fit_val_data,
             epochs=args.finetune_epochs,
             class_weight=class_weights,
-            callbacks=callbacks,
+            callbacks=callbacks + [ProgressCallback(progress, "finetune")],
             verbose=1,
         )
 
@@ -776,11 +847,13 @@ def main() -> None:
         eval_loss, eval_acc = model.evaluate(val_ds, verbose=0)
         print(f"\nValidation loss : {eval_loss:.4f}")
         print(f"Validation acc  : {eval_acc:.4f}")
+        progress.emit("evaluated", val_loss=round(float(eval_loss), 4), val_accuracy=round(float(eval_acc), 4))
     else:
         print("\n[warning] No validation samples available — skipping final evaluation.")
         print("          Add more images per class (≥2) to enable validation.")
 
     # Save outputs
+    progress.emit("phase", phase="export")
     out_keras.parent.mkdir(parents=True, exist_ok=True)
     model.save(str(out_keras))
     print(f"Saved Keras model : {out_keras}")
@@ -806,6 +879,7 @@ def main() -> None:
         backbone_weights_source=backbone_weights_source,
     )
     print(f"Saved manifest    : {out_manifest}")
+    progress.emit("exported", onnx=str(out_onnx), labels=str(out_labels))
 
     print("\nTraining pipeline complete.")
 
@@ -0,0 +1,175 @@
+"""
+training_progress.py
+--------------------
+Machine-readable progress channel for ORB retraining, streamed to the admin UI
+over Server-Sent Events (GET /admin/orb-training-events).
+
+Each run is one JSON-lines file (models/orb_retrain_progress.jsonl), written
+next to the human-readable orb_retrain_last.log:
+
+    {"event": "queued", "run_id": "...", "at": "...", "trigger": "card_add", ...}
+    {"event": "assets", "run_id": "...", "at": "...", "ok": true}
+    {"event": "epoch", ..., "phase": "head", "epoch": 1, "epochs": 6, "loss": 0.41, "eta_seconds": 38}
+
+The backend starts a run when a retrain is queued and appends its own events
+(assets, variants, trainer_exit, reload, finished); train_orb.py appends the
+trainer's (dataset, phase, step, epoch, evaluated, exported) through
+--progress-file. Every line is a single O_APPEND write, so the file is safe to
+tail from any worker process: a stream only needs the byte offset it has sent
+up to, which doubles as the SSE event id ("<run_id>:<offset>").
+
+A run ends with a "finished" event (state completed or failed).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+TERMINAL_EVENT = 'finished'
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec='seconds')
+
+
+class ProgressWriter:
+    """Appends events of one run to the progress file (no-op when path is empty)."""
+
+    def __init__(self, path: str | None, run_id: str | None = None):
+        self.path = path or None
+        self.run_id = run_id
+        self._lock = threading.Lock()
+
+    @classmethod
+    def start_run(cls, path: str, **fields) -> 'ProgressWriter':
+        """Replace the file with a new run whose first event is "queued"."""
+        writer = cls(path, uuid.uuid4().hex[:12])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(writer._line('queued', fields))
+        os.replace(tmp_path, path)
+        return writer
+
+    @classmethod
+    def resume(cls, path: str | None) -> 'ProgressWriter':
+        """Writer for the run already in `path` (e.g. in the trainer subprocess)."""
+        return cls(path, current_run_id(path) or uuid.uuid4().hex[:12])
+
+    def _line(self, event: str, fields: dict) -> str:
+        record = {'event': event, 'run_id': self.run_id, 'at': _now()}
+        record.update(fields)
+        return json.dumps(record, default=str) + '\n'
+
+    def emit(self, event: str, **fields) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            data = self._line(event, fields).encode('utf-8')
+            try:
+                fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, data)
+                finally:
+                    os.close(fd)
+            except OSError:
+                pass  # Progress is best-effort; the log file stays authoritative
+
+
+def read_events(path: str | None, offset: int) -> tuple[int, list[tuple[int, dict]]]:
+    """Complete lines after byte `offset`: (new_offset, [(offset_after_line, event), ...])."""
+    if not path:
+        return offset, []
+    try:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+    except OSError:
+        return offset, []
+    events = []
+    pos = 0
+    while True:
+        end = data.find(b'\n', pos)
+        if end < 0:
+            break  # Partial line: picked up on the next read
+        line = data[pos:end]
+        pos = end + 1
+        try:
+            events.append((offset + pos, json.loads(line)))
+        except ValueError:
+            continue
+    return offset + pos, events
+
+
+def current_run_id(path: str | None) -> str | None:
+    """run_id of the run in `path` (from its first line), or None."""
+    if not path:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            first = f.readline()
+        return json.loads(first).get('run_id')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def parse_event_id(value: str | None) -> tuple[str | None, int]:
+    """SSE Last-Event-ID "<run_id>:<offset>" -> (run_id, offset)."""
+    if not value or ':' not in value:
+        return None, 0
+    run_id, _, offset = value.partition(':')
+    try:
+        return run_id, max(0, int(offset))
+    except ValueError:
+        return None, 0
+
+
+def format_sse(event: dict, event_id: str | None = None, name: str | None = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {name or event.get('event', 'message')}")
+    lines.append(f"data: {json.dumps(event, default=str)}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def stream(path: str, last_event_id: str | None = None, poll_seconds: float = 0.5,
+           max_seconds: float = 300.0, keepalive_seconds: float = 15.0, retry_ms: int = 5000):
+    """SSE chunks for the current run, resuming after `last_event_id`.
+
+    Ends after the run's "finished" event, when no run is in progress, or after
+    `max_seconds` (the browser's EventSource reconnects and resumes from its last id).
+    """
+    yield f"retry: {int(retry_ms)}\n\n"
+    run_id, offset = parse_event_id(last_event_id)
+    started = last_sent = time.monotonic()
+    finished = False
+    if run_id is not None and run_id == current_run_id(path):
+        # Reconnect after the run ended: nothing more will come for it.
+        end, events = read_events(path, 0)
+        finished = offset >= end and bool(events) and events[-1][1].get('event') == TERMINAL_EVENT
+    while not finished:
+        live_run = current_run_id(path)
+        if live_run is None:
+            return
+        if live_run != run_id:
+            run_id, offset, finished = live_run, 0, False  # New run: replay it from the start
+        offset, events = read_events(path, offset)
+        for end_offset, event in events:
+            yield format_sse(event, f"{run_id}:{end_offset}")
+            last_sent = time.monotonic()
+            finished = event.get('event') == TERMINAL_EVENT
+        if finished:
+            break
+        now = time.monotonic()
+        if now - started >= max_seconds:
+            return
+        if now - last_sent >= keepalive_seconds:
+            yield ": keepalive\n\n"  # Keeps proxies from closing an idle stream
+            last_sent = now
+        time.sleep(poll_seconds)
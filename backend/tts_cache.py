@@ -0,0 +1,293 @@
+"""
+tts_cache.py
+------------
+Content-addressed on-disk cache for Bin-Bin's spoken feedback.
+
+Every utterance is keyed by (engine, lang, normalized text); the audio lives in
+`<dir>/<key[:2]>/<key>.mp3`, so repeated phrases are a file read instead of a
+network round-trip, and they keep playing when the kiosk is offline. Files are
+written to a temp name and renamed into place (safe across worker processes);
+a cache hit refreshes the file's mtime and the oldest files are evicted once
+the directory grows past `max_bytes` (LRU by mtime).
+
+The synthesis engine is pluggable:
+    GTTSEngine       Google TTS over the network (default, needs gTTS)
+    CommandEngine    any local program that writes MP3 to stdout (offline kiosks), e.g.
+                     ECOLEARN_TTS_COMMAND="/usr/local/bin/say-mp3 {lang} {text}"
+
+The feedback phrases the kiosk speaks for each card (see speak() calls in
+js/script.js) are mirrored here so they can be rendered ahead of time.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import re
+import shlex
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from inference_cache import SingleFlight
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+MAX_TEXT_CHARS = 500
+_LANG_RE = re.compile(r"^[a-z]{2,3}(-[A-Za-z]{2,4})?$")
+
+# Keep in sync with categoryReasonTagalog / the speak() phrases in js/script.js.
+CATEGORY_REASONS_TL = {
+    'Compostable': 'nabubulok ito',
+    'Recyclable': 'puwede pa itong i-recycle',
+    'Non-Recyclable': 'hindi ito puwedeng i-recycle o i-compost',
+    'Special Waste': 'may delikadong sangkap ito',
+}
+DEFAULT_REASON_TL = 'ito ang tamang paraan ng waste segregation para sa kaligtasan ng kapaligiran'
+FIXED_PHRASES_TL = (
+    "Hindi ko makita nang malinaw ang card. Pakihold ito sa loob ng box.",
+    "Walang eco-card na nakita! Pakitapat nang maayos ang card sa camera.",
+    "Nascan mo na ang card na iyan! Pumili ng ibang card.",
+    "Hindi kasama ang card na iyan. Pumili ng ibang eco-card.",
+    "Hmm, hindi ako sigurado dito. Subukan mong ipakita ang mas malinaw na card!",
+    "Magkahawig ang nakita ko. Pakiharap ang card nang mas diretso para mas malinaw.",
+    "Hindi ko nakikilala ang card na ito. Siguraduhing isa ito sa ating eco-cards!",
+)
+
+
+class TTSError(RuntimeError):
+    """Synthesis failed (engine missing, offline, or bad input)."""
+
+
+def normalize_text(text) -> str:
+    return ' '.join(str(text or '').split())
+
+
+def validate_request(text, lang) -> tuple[str, str]:
+    """Normalized (text, lang), or ValueError for input the endpoint should reject."""
+    text = normalize_text(text)
+    lang = (lang or 'tl').strip()
+    if not text:
+        raise ValueError("No text provided")
+    if len(text) > MAX_TEXT_CHARS:
+        raise ValueError(f"Text is longer than {MAX_TEXT_CHARS} characters")
+    if not _LANG_RE.match(lang):
+        raise ValueError(f"Invalid lang: {lang!r}")
+    return text, lang
+
+
+def card_phrases(card_name: str, category_name: str) -> list[str]:
+    """The learn/correct/incorrect feedback lines spoken for one card."""
+    friendly = normalize_text((card_name or 'card').replace('_', ' '))
+    reason = CATEGORY_REASONS_TL.get(category_name, DEFAULT_REASON_TL)
+    body = f"Ang {friendly} ay kabilang sa {category_name} dahil {reason}."
+    return [
+        f"{body} Very good!",
+        f"Tama! {body} Very good!",
+        f"Hindi pa tama. {body} Subukan ulit!",
+    ]
+
+
+class GTTSEngine:
+    name = 'gtts'
+
+    def synthesize(self, text: str, lang: str) -> bytes:
+        try:
+            from gtts import gTTS
+        except ImportError:
+            raise TTSError("gTTS is not installed (pip install gTTS)")
+        buffer = io.BytesIO()
+        try:
+            gTTS(text=text, lang=lang, slow=False).write_to_fp(buffer)
+        except Exception as e:
+            raise TTSError(f"gTTS failed: {e}")
+        return buffer.getvalue()
+
+
+class CommandEngine:
+    """Local synthesizer: runs `command` ({text} / {lang} placeholders) and reads audio from stdout."""
+
+    def __init__(self, command: str, timeout: float = 30.0):
+        self.command = command
+        self.timeout = float(timeout)
+        # Different programs make different audio for the same text.
+        self.name = 'cmd-' + hashlib.sha1(command.encode('utf-8')).hexdigest()[:8]
+
+    def synthesize(self, text: str, lang: str) -> bytes:
+        args = [part.replace('{text}', text).replace('{lang}', lang) for part in shlex.split(self.command)]
+        try:
+            done = subprocess.run(args, capture_output=True, timeout=self.timeout, check=True)
+        except (OSError, subprocess.SubprocessError) as e:
+            raise TTSError(f"TTS command failed: {e}")
+        if not done.stdout:
+            raise TTSError("TTS command produced no audio")
+        return done.stdout
+
+
+def engine_from_env() -> GTTSEngine | CommandEngine:
+    """ECOLEARN_TTS_ENGINE=gtts (default) or command (with ECOLEARN_TTS_COMMAND)."""
+    kind = os.environ.get('ECOLEARN_TTS_ENGINE', 'gtts').strip().lower()
+    if kind == 'command':
+        command = os.environ.get('ECOLEARN_TTS_COMMAND', '').strip()
+        if not command:
+            raise ValueError("ECOLEARN_TTS_ENGINE=command needs ECOLEARN_TTS_COMMAND")
+        return CommandEngine(command)
+    if kind != 'gtts':
+        raise ValueError(f"ECOLEARN_TTS_ENGINE must be gtts or command (got {kind!r})")
+    return GTTSEngine()
+
+
+class TTSCache:
+    def __init__(self, directory: str, engine, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.engine = engine
+        self.max_bytes = int(max_bytes)
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._approx_bytes = None  # Measured lazily; kept current on writes
+        self._executor = None
+        self._executor_pid = None
+        self._stats = {'hits': 0, 'misses': 0, 'errors': 0, 'evicted': 0, 'prerendered': 0}
+
+    def key(self, text: str, lang: str) -> str:
+        raw = f"{self.engine.name}\0{lang}\0{normalize_text(text)}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.mp3")
+
+    def get(self, text: str, lang: str) -> tuple[bytes, bool]:
+        """(audio bytes, cache_hit), synthesizing and storing on a miss."""
+        key = self.key(text, lang)
+        audio = self._read(key)
+        if audio is not None:
+            with self._lock:
+                self._stats['hits'] += 1
+            return audio, True
+        try:
+            audio, _ = self._flight.do(key, lambda: self._render(key, text, lang))
+        except TTSError:
+            with self._lock:
+                self._stats['errors'] += 1
+            raise
+        with self._lock:
+            self._stats['misses'] += 1
+        return audio, False
+
+    def _read(self, key: str) -> bytes | None:
+        path = self.path_for(key)
+        try:
+            with open(path, 'rb') as f:
+                audio = f.read()
+        except OSError:
+            return None
+        try:
+            os.utime(path)  # LRU recency
+        except OSError:
+            pass
+        return audio
+
+    def _render(self, key: str, text: str, lang: str) -> bytes:
+        audio = self._read(key)  # Another worker may have written it meanwhile
+        if audio is not None:
+            return audio
+        audio = self.engine.synthesize(normalize_text(text), lang)
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._account(len(audio))
+        return audio
+
+    # --- eviction ---
+    def _entries(self) -> list[tuple[float, int, str]]:
+        entries = []
+        for root, _dirs, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.mp3'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _account(self, added: int) -> None:
+        with self._lock:
+            if self._approx_bytes is None:
+                self._approx_bytes = sum(size for _, size, _ in self._entries())
+            else:
+                self._approx_bytes += added
+            over = self._approx_bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used files until the cache is under 90% of max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for _mtime, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        with self._lock:
+            self._approx_bytes = total
+            self._stats['evicted'] += removed
+        return removed
+
+    # --- pre-rendering ---
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Threads do not survive fork(); each worker process gets its own.
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='tts-prerender')
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def prerender(self, phrases, lang: str = 'tl') -> int:
+        """Render missing phrases now. Stops at the first engine failure (offline); returns count rendered."""
+        rendered = 0
+        for text in dict.fromkeys(normalize_text(p) for p in phrases if p):
+            key = self.key(text, lang)
+            if os.path.exists(self.path_for(key)):
+                continue
+            self._flight.do(key, lambda: self._render(key, text, lang))
+            rendered += 1
+        with self._lock:
+            self._stats['prerendered'] += rendered
+        return rendered
+
+    def prerender_async(self, phrases, lang: str = 'tl') -> None:
+        phrases = list(phrases)
+
+        def run():
+            try:
+                count = self.prerender(phrases, lang)
+                if count:
+                    print(f"🔊 Pre-rendered {count} TTS phrases")
+            except TTSError as e:
+                print(f"⚠️ TTS pre-render stopped: {e}")
+
+        self._get_executor().submit(run)
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['bytes'] = self._approx_bytes
+        snapshot['engine'] = self.engine.name
+        snapshot['max_bytes'] = self.max_bytes
+        return snapshot
@@ -0,0 +1,37 @@
+"""
+wsgi.py
+-------
+Production entry point for the EcoLearn recognition backend.
+
+Linux/macOS (multi-process, models loaded once before fork):
+    cd backend
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Windows (gunicorn is POSIX-only; single process, thread pool):
+    cd backend
+    python wsgi.py
+
+`python app.py` remains the single-process development server with auto-reload.
+
+The app is built without its background startup jobs: under gunicorn this module is
+imported by the master, and threads started before fork() would not survive into the
+workers. One serving process claims the jobs in init_worker_process(background_jobs=True).
+"""
+
+import os
+
+from app import create_app, init_worker_process
+
+app = create_app(start_background_jobs=False)
+
+
+if __name__ == '__main__':
+    from waitress import serve
+
+    init_worker_process(background_jobs=True)
+    serve(
+        app,
+        host=os.environ.get('ECOLEARN_HOST', '0.0.0.0'),
+        port=int(os.environ.get('ECOLEARN_PORT', '5000')),
+        threads=int(os.environ.get('ECOLEARN_THREADS', '8')),
+    )
@@ -152,6 +152,70 @@ CREATE TABLE TBL_SYSTEM_CONFIG (
     INDEX idx_key (config_key)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Dynamic system configuration parameters';
 
+-- ============================================================
+-- TABLE 8: TBL_SCAN_DAILY_ROLLUP
+-- Dashboard aggregates per day x card x actual/predicted category,
+-- maintained by the backend on every scan batch (analytics_rollup.py)
+-- ============================================================
+CREATE TABLE TBL_SCAN_DAILY_ROLLUP (
+    rollup_date DATE NOT NULL,
+    card_id INT NOT NULL,
+    actual_category_id INT NOT NULL,
+    predicted_category_id INT NOT NULL,
+    scan_count INT NOT NULL DEFAULT 0,
+    correct_count INT NOT NULL DEFAULT 0,
+    confidence_sum DECIMAL(14,4) NOT NULL DEFAULT 0,
+    confidence_count INT NOT NULL DEFAULT 0,
+    response_time_sum BIGINT NOT NULL DEFAULT 0,
+    response_time_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (rollup_date, card_id, actual_category_id, predicted_category_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Per day x card x category scan aggregates for the dashboard';
+
+-- ============================================================
+-- TABLE 9: TBL_STUDENT_ROLLUP
+-- Dashboard aggregates per nickname x mode over completed sessions,
+-- maintained by the backend when a session ends
+-- ============================================================
+CREATE TABLE TBL_STUDENT_ROLLUP (
+    student_nickname VARCHAR(50) NOT NULL,
+    session_mode VARCHAR(20) NOT NULL,
+    completed_sessions INT NOT NULL DEFAULT 0,
+    total_scans INT NOT NULL DEFAULT 0,
+    correct_scans INT NOT NULL DEFAULT 0,
+    accuracy_sum DECIMAL(12,2) NOT NULL DEFAULT 0 COMMENT 'Sum of session accuracy_percentage (for averages)',
+    best_accuracy DECIMAL(5,2) NULL,
+    last_start_time TIMESTAMP NULL,
+    last_end_time TIMESTAMP NULL,
+    PRIMARY KEY (student_nickname, session_mode)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Per nickname x mode aggregates of completed sessions';
+
+-- ============================================================
+-- TABLE 10: TBL_SCAN_ARCHIVE
+-- Scan transactions of closed terms, moved out of TBL_SCAN_TRANSACTIONS
+-- by backend/scan_archive.py. Compressed and partitioned by month (the
+-- job splits p_future as the cutoff advances); no foreign keys, since
+-- partitioned InnoDB tables cannot have them.
+-- ============================================================
+CREATE TABLE TBL_SCAN_ARCHIVE (
+    transaction_id INT NOT NULL,
+    session_id INT NOT NULL,
+    card_id INT NOT NULL,
+    predicted_category_id INT NOT NULL,
+    actual_category_id INT NOT NULL,
+    is_correct TINYINT(1) NOT NULL,
+    confidence_score DECIMAL(5,4),
+    response_time INT,
+    scan_timestamp DATETIME NOT NULL,
+    feedback_given TINYINT(1) DEFAULT 0,
+    PRIMARY KEY (transaction_id, scan_timestamp),
+    INDEX idx_archive_session (session_id),
+    INDEX idx_archive_timestamp (scan_timestamp)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 ROW_FORMAT=COMPRESSED KEY_BLOCK_SIZE=8
+COMMENT='Scan transactions of closed terms (moved by scan_archive.py)'
+PARTITION BY RANGE COLUMNS (scan_timestamp) (
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
 -- ============================================================
 -- INSERT DEFAULT DATA
 -- ============================================================
@@ -194,16 +258,16 @@ CREATE PROCEDURE UpdateSessionAccuracy(IN p_session_id INT)
 BEGIN
     UPDATE TBL_SESSIONS
     SET 
-        total_scans = (SELECT COUNT(*) FROM TBL_SCAN_TRANSACTIONS WHERE session_id = p_session_id),
-        correct_scans = (SELECT COUNT(*) FROM TBL_SCAN_TRANSACTIONS WHERE session_id = p_session_id AND is_correct = 1),
+        total_scans = (SELECT COUNT(*) FROM vw_scan_history WHERE session_id = p_session_id),
+        correct_scans = (SELECT COUNT(*) FROM vw_scan_history WHERE session_id = p_session_id AND is_correct = 1),
         accuracy_percentage = (
             SELECT ROUND((SUM(is_correct) / COUNT(*)) * 100, 2)
-            FROM TBL_SCAN_TRANSACTIONS
+            FROM vw_scan_history
             WHERE session_id = p_session_id
         ),
         average_response_time = (
             SELECT ROUND(AVG(response_time), 2)
-            FROM TBL_SCAN_TRANSACTIONS
+            FROM vw_scan_history
             WHERE session_id = p_session_id
         )
     WHERE session_id = p_session_id;
@@ -260,7 +324,7 @@ BEGIN
         ac.category_name as actual_category,
         pc.category_name as predicted_category,
         COUNT(*) as count
-    FROM TBL_SCAN_TRANSACTIONS st
+    FROM vw_scan_history st
     JOIN TBL_CARD_ASSETS ca ON st.card_id = ca.card_id
     JOIN TBL_CATEGORIES ac ON st.actual_category_id = ac.category_id
     JOIN TBL_CATEGORIES pc ON st.predicted_category_id = pc.category_id
@@ -274,6 +338,16 @@ DELIMITER ;
 -- VIEWS FOR REPORTING AND ANALYTICS
 -- ============================================================
 
+-- View: Scan History (live + archived scans, see backend/scan_archive.py)
+CREATE VIEW vw_scan_history AS
+SELECT transaction_id, session_id, card_id, predicted_category_id, actual_category_id,
+       is_correct, confidence_score, response_time, scan_timestamp, feedback_given
+FROM TBL_SCAN_TRANSACTIONS
+UNION ALL
+SELECT transaction_id, session_id, card_id, predicted_category_id, actual_category_id,
+       is_correct, confidence_score, response_time, scan_timestamp, feedback_given
+FROM TBL_SCAN_ARCHIVE;
+
 -- View: Active Sessions Dashboard
 CREATE VIEW vw_active_sessions AS
 SELECT 
@@ -301,7 +375,7 @@ SELECT
     AVG(st.confidence_score) as avg_confidence,
     AVG(st.response_time) as avg_response_time_ms
 FROM TBL_CARD_ASSETS ca
-LEFT JOIN TBL_SCAN_TRANSACTIONS st ON ca.card_id = st.card_id
+LEFT JOIN vw_scan_history st ON ca.card_id = st.card_id
 LEFT JOIN TBL_CATEGORIES c ON ca.category_id = c.category_id
 GROUP BY ca.card_id, ca.card_name, c.category_name;
 
@@ -342,13 +416,27 @@ GROUP BY s.student_nickname;
 -- TRIGGERS FOR DATA INTEGRITY
 -- ============================================================
 
--- Trigger: Auto-calculate session metrics after scan insert
+-- Trigger: Incrementally update session metrics after scan insert
+-- (O(1) per row instead of recounting the session via UpdateSessionAccuracy).
+-- The backend's batched scan writer sets @ecolearn_deferred_counters = 1 and
+-- applies the same deltas itself in one UPDATE per flush.
+-- SET order matters: average/accuracy read the counters before they are bumped.
 DELIMITER //
 CREATE TRIGGER trg_after_scan_insert
 AFTER INSERT ON TBL_SCAN_TRANSACTIONS
 FOR EACH ROW
 BEGIN
-    CALL UpdateSessionAccuracy(NEW.session_id);
+    IF COALESCE(@ecolearn_deferred_counters, 0) = 0 THEN
+        UPDATE TBL_SESSIONS
+        SET
+            average_response_time = ROUND(
+                (COALESCE(average_response_time, 0) * total_scans
+                    + COALESCE(NEW.response_time, average_response_time, 0)) / (total_scans + 1), 2),
+            accuracy_percentage = ROUND((correct_scans + NEW.is_correct) * 100 / (total_scans + 1), 2),
+            correct_scans = correct_scans + NEW.is_correct,
+            total_scans = total_scans + 1
+        WHERE session_id = NEW.session_id;
+    END IF;
 END //
 DELIMITER ;
 
@@ -0,0 +1,386 @@
+-- ============================================================
+-- ECOLEARN DATABASE SCHEMA - EMBEDDED (SQLite) EDITION
+-- Same tables, generated column and session-counter trigger as
+-- ecolearn_database.sql, for single-laptop installs without MySQL.
+--
+-- Selected with ECOLEARN_DB_BACKEND=sqlite; the backend creates the file
+-- (ECOLEARN_SQLITE_PATH, default backend/data/ecolearn.sqlite3) from this
+-- script on first start. Timestamps are stored as local time text
+-- ('YYYY-MM-DD HH:MM:SS'), like MySQL TIMESTAMP columns read back.
+-- ============================================================
+
+PRAGMA foreign_keys = ON;
+
+-- ============================================================
+-- TABLE 1: TBL_ADMIN
+-- ============================================================
+CREATE TABLE TBL_ADMIN (
+    admin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username VARCHAR(50) NOT NULL UNIQUE,
+    password_hash VARCHAR(255) NOT NULL,
+    full_name VARCHAR(100) NOT NULL,
+    email VARCHAR(100) UNIQUE,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    last_login TIMESTAMP NULL,
+    is_active INTEGER DEFAULT 1
+);
+CREATE INDEX idx_admin_active ON TBL_ADMIN (is_active);
+
+-- ============================================================
+-- TABLE 2: TBL_CATEGORIES
+-- ============================================================
+CREATE TABLE TBL_CATEGORIES (
+    category_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category_name VARCHAR(50) NOT NULL UNIQUE,
+    category_code VARCHAR(20) NOT NULL UNIQUE
+        CHECK (category_code IN ('COMP', 'RECY', 'NREC', 'SPEC')),
+    description TEXT,
+    bin_color VARCHAR(30),
+    display_order INTEGER DEFAULT 0,
+    is_active INTEGER DEFAULT 1,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+CREATE INDEX idx_categories_active ON TBL_CATEGORIES (is_active);
+
+-- ============================================================
+-- TABLE 3: TBL_CARD_ASSETS
+-- ============================================================
+CREATE TABLE TBL_CARD_ASSETS (
+    card_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category_id INTEGER NOT NULL REFERENCES TBL_CATEGORIES(category_id) ON DELETE RESTRICT ON UPDATE CASCADE,
+    card_name VARCHAR(100) NOT NULL,
+    card_code VARCHAR(50) NOT NULL UNIQUE,
+    image_filename VARCHAR(255) NOT NULL,
+    image_path VARCHAR(500) NOT NULL,
+    description TEXT,
+    pdf_generated INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    is_active INTEGER DEFAULT 1
+);
+CREATE INDEX idx_card_category ON TBL_CARD_ASSETS (category_id);
+CREATE INDEX idx_active_category ON TBL_CARD_ASSETS (is_active, category_id);
+CREATE INDEX idx_gallery_cover ON TBL_CARD_ASSETS (is_active, category_id, card_id, card_name, image_path);
+
+-- MySQL: updated_at ... ON UPDATE CURRENT_TIMESTAMP
+CREATE TRIGGER trg_card_assets_updated_at
+AFTER UPDATE ON TBL_CARD_ASSETS
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE TBL_CARD_ASSETS SET updated_at = datetime('now', 'localtime') WHERE card_id = NEW.card_id;
+END;
+
+-- ============================================================
+-- TABLE 4: TBL_GOLDEN_DATASET
+-- ============================================================
+CREATE TABLE TBL_GOLDEN_DATASET (
+    dataset_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    card_id INTEGER NOT NULL REFERENCES TBL_CARD_ASSETS(card_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    feature_vector BLOB NOT NULL,
+    keypoints_data BLOB,
+    feature_count INTEGER,
+    image_hash VARCHAR(64),
+    training_timestamp TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    algorithm_version VARCHAR(20) DEFAULT 'ORB-KNN-v1.0',
+    UNIQUE (card_id, image_hash)
+);
+CREATE INDEX idx_features_cover ON TBL_GOLDEN_DATASET (card_id, dataset_id);
+
+-- ============================================================
+-- TABLE 5: TBL_SESSIONS
+-- Counters are REAL/INTEGER so averages never fall into integer division.
+-- ============================================================
+CREATE TABLE TBL_SESSIONS (
+    session_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    student_nickname VARCHAR(50) NOT NULL,
+    session_mode TEXT DEFAULT 'instructional'
+        CHECK (session_mode IN ('instructional', 'assessment')),
+    start_time TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    end_time TIMESTAMP NULL,
+    total_scans INTEGER DEFAULT 0,
+    correct_scans INTEGER DEFAULT 0,
+    accuracy_percentage REAL DEFAULT 0.00
+        CHECK (accuracy_percentage BETWEEN 0 AND 100),
+    average_response_time REAL,
+    session_status TEXT DEFAULT 'active'
+        CHECK (session_status IN ('active', 'completed', 'abandoned', 'admin_preset')),
+    ip_address VARCHAR(45)
+);
+CREATE INDEX idx_session_status ON TBL_SESSIONS (session_status);
+CREATE INDEX idx_session_start ON TBL_SESSIONS (start_time);
+CREATE INDEX idx_session_analytics ON TBL_SESSIONS (student_nickname, session_mode, session_status);
+CREATE INDEX idx_session_accuracy ON TBL_SESSIONS (accuracy_percentage, correct_scans);
+
+-- ============================================================
+-- TABLE 6: TBL_SCAN_TRANSACTIONS
+-- ============================================================
+CREATE TABLE TBL_SCAN_TRANSACTIONS (
+    transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id INTEGER NOT NULL REFERENCES TBL_SESSIONS(session_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    card_id INTEGER NOT NULL REFERENCES TBL_CARD_ASSETS(card_id) ON DELETE RESTRICT ON UPDATE CASCADE,
+    predicted_category_id INTEGER NOT NULL REFERENCES TBL_CATEGORIES(category_id) ON DELETE RESTRICT ON UPDATE CASCADE,
+    actual_category_id INTEGER NOT NULL REFERENCES TBL_CATEGORIES(category_id) ON DELETE RESTRICT ON UPDATE CASCADE,
+    is_correct INTEGER GENERATED ALWAYS AS (predicted_category_id = actual_category_id) STORED,
+    confidence_score REAL CHECK (confidence_score IS NULL OR (confidence_score BETWEEN 0 AND 1)),
+    response_time INTEGER,
+    scan_timestamp TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    feedback_given INTEGER DEFAULT 0
+);
+CREATE INDEX idx_scan_card ON TBL_SCAN_TRANSACTIONS (card_id);
+CREATE INDEX idx_transaction_analysis ON TBL_SCAN_TRANSACTIONS (session_id, is_correct, scan_timestamp);
+CREATE INDEX idx_logs_time_session ON TBL_SCAN_TRANSACTIONS (scan_timestamp, session_id);
+CREATE INDEX idx_logs_correct ON TBL_SCAN_TRANSACTIONS (is_correct, card_id);
+CREATE INDEX idx_logs_category ON TBL_SCAN_TRANSACTIONS (actual_category_id, predicted_category_id, is_correct);
+
+-- ============================================================
+-- TABLE 7: TBL_SYSTEM_CONFIG
+-- ============================================================
+CREATE TABLE TBL_SYSTEM_CONFIG (
+    config_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    config_key VARCHAR(100) NOT NULL UNIQUE,
+    config_value TEXT NOT NULL,
+    value_type TEXT DEFAULT 'string'
+        CHECK (value_type IN ('string', 'integer', 'float', 'boolean', 'json')),
+    description TEXT,
+    is_editable INTEGER DEFAULT 1,
+    last_modified TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    modified_by INTEGER REFERENCES TBL_ADMIN(admin_id) ON DELETE SET NULL ON UPDATE CASCADE
+);
+CREATE INDEX idx_config_active ON TBL_SYSTEM_CONFIG (is_editable, config_key);
+
+-- ============================================================
+-- DASHBOARD ROLLUPS (maintained by the backend, see analytics_rollup.py)
+-- ============================================================
+CREATE TABLE TBL_SCAN_DAILY_ROLLUP (
+    rollup_date DATE NOT NULL,
+    card_id INTEGER NOT NULL,
+    actual_category_id INTEGER NOT NULL,
+    predicted_category_id INTEGER NOT NULL,
+    scan_count INTEGER NOT NULL DEFAULT 0,
+    correct_count INTEGER NOT NULL DEFAULT 0,
+    confidence_sum REAL NOT NULL DEFAULT 0,
+    confidence_count INTEGER NOT NULL DEFAULT 0,
+    response_time_sum INTEGER NOT NULL DEFAULT 0,
+    response_time_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (rollup_date, card_id, actual_category_id, predicted_category_id)
+);
+
+CREATE TABLE TBL_STUDENT_ROLLUP (
+    student_nickname VARCHAR(50) NOT NULL,
+    session_mode VARCHAR(20) NOT NULL,
+    completed_sessions INTEGER NOT NULL DEFAULT 0,
+    total_scans INTEGER NOT NULL DEFAULT 0,
+    correct_scans INTEGER NOT NULL DEFAULT 0,
+    accuracy_sum REAL NOT NULL DEFAULT 0,
+    best_accuracy REAL NULL,
+    last_start_time TIMESTAMP NULL,
+    last_end_time TIMESTAMP NULL,
+    PRIMARY KEY (student_nickname, session_mode)
+);
+
+-- ============================================================
+-- SCAN ARCHIVE (closed terms, moved by backend/scan_archive.py)
+-- MySQL compresses and month-partitions this table; here it is plain.
+-- ============================================================
+CREATE TABLE TBL_SCAN_ARCHIVE (
+    transaction_id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL,
+    card_id INTEGER NOT NULL,
+    predicted_category_id INTEGER NOT NULL,
+    actual_category_id INTEGER NOT NULL,
+    is_correct INTEGER NOT NULL,
+    confidence_score REAL,
+    response_time INTEGER,
+    scan_timestamp TEXT NOT NULL,
+    feedback_given INTEGER DEFAULT 0
+);
+CREATE INDEX idx_archive_session ON TBL_SCAN_ARCHIVE (session_id);
+CREATE INDEX idx_archive_timestamp ON TBL_SCAN_ARCHIVE (scan_timestamp);
+
+-- ============================================================
+-- TRIGGERS
+-- ============================================================
+
+-- Incremental session metrics after scan insert (same arithmetic as the MySQL
+-- trigger). ecolearn_deferred_counters() is registered by db_sqlite.py on every
+-- connection and mirrors MySQL's @ecolearn_deferred_counters session variable:
+-- the batched scan writer applies the deltas itself. SQLite evaluates every SET
+-- expression against the old row, so assignment order does not matter here.
+CREATE TRIGGER trg_after_scan_insert
+AFTER INSERT ON TBL_SCAN_TRANSACTIONS
+FOR EACH ROW WHEN ecolearn_deferred_counters() = 0
+BEGIN
+    UPDATE TBL_SESSIONS
+    SET
+        average_response_time = ROUND(
+            (COALESCE(average_response_time, 0) * total_scans
+                + COALESCE(NEW.response_time, average_response_time, 0)) * 1.0 / (total_scans + 1), 2),
+        accuracy_percentage = ROUND((correct_scans + NEW.is_correct) * 100.0 / (total_scans + 1), 2),
+        correct_scans = correct_scans + NEW.is_correct,
+        total_scans = total_scans + 1
+    WHERE session_id = NEW.session_id;
+END;
+
+-- MySQL: last_modified ... ON UPDATE CURRENT_TIMESTAMP
+CREATE TRIGGER trg_system_config_modified
+AFTER UPDATE ON TBL_SYSTEM_CONFIG
+FOR EACH ROW WHEN NEW.last_modified IS OLD.last_modified
+BEGIN
+    UPDATE TBL_SYSTEM_CONFIG SET last_modified = datetime('now', 'localtime') WHERE config_id = NEW.config_id;
+END;
+
+-- ============================================================
+-- VIEWS FOR REPORTING AND ANALYTICS
+-- ============================================================
+
+CREATE VIEW vw_scan_history AS
+SELECT transaction_id, session_id, card_id, predicted_category_id, actual_category_id,
+       is_correct, confidence_score, response_time, scan_timestamp, feedback_given
+FROM TBL_SCAN_TRANSACTIONS
+UNION ALL
+SELECT transaction_id, session_id, card_id, predicted_category_id, actual_category_id,
+       is_correct, confidence_score, response_time, scan_timestamp, feedback_given
+FROM TBL_SCAN_ARCHIVE;
+
+CREATE VIEW vw_active_sessions AS
+SELECT
+    s.session_id,
+    s.student_nickname,
+    s.session_mode,
+    s.start_time,
+    s.total_scans,
+    s.correct_scans,
+    s.accuracy_percentage,
+    CAST((julianday('now', 'localtime') - julianday(s.start_time)) * 1440 AS INTEGER) as duration_minutes,
+    s.session_status
+FROM TBL_SESSIONS s
+WHERE s.session_status = 'active';
+
+CREATE VIEW vw_card_performance AS
+SELECT
+    ca.card_id,
+    ca.card_name,
+    c.category_name,
+    COUNT(st.transaction_id) as total_scans,
+    SUM(st.is_correct) as correct_classifications,
+    ROUND((SUM(st.is_correct) * 1.0 / COUNT(*)) * 100, 2) as accuracy_rate,
+    AVG(st.confidence_score) as avg_confidence,
+    AVG(st.response_time) as avg_response_time_ms
+FROM TBL_CARD_ASSETS ca
+LEFT JOIN vw_scan_history st ON ca.card_id = st.card_id
+LEFT JOIN TBL_CATEGORIES c ON ca.category_id = c.category_id
+GROUP BY ca.card_id, ca.card_name, c.category_name;
+
+CREATE VIEW vw_student_proficiency AS
+SELECT
+    s.student_nickname,
+    COUNT(DISTINCT s.session_id) as total_sessions,
+    SUM(s.total_scans) as total_scans,
+    SUM(s.correct_scans) as total_correct,
+    ROUND(AVG(s.accuracy_percentage), 2) as overall_accuracy,
+    ROUND(AVG(s.average_response_time), 2) as avg_response_time,
+    MAX(s.accuracy_percentage) as best_session_accuracy,
+    MIN(s.accuracy_percentage) as worst_session_accuracy
+FROM TBL_SESSIONS s
+WHERE s.session_status = 'completed'
+GROUP BY s.student_nickname;
+
+CREATE VIEW vw_student_proficiency_reports AS
+SELECT
+        s.student_nickname,
+        COUNT(*) AS total_sessions,
+        SUM(s.total_scans) AS total_scans,
+        SUM(s.correct_scans) AS total_correct,
+        ROUND(AVG(s.accuracy_percentage), 1) AS avg_accuracy,
+        MAX(s.accuracy_percentage) AS best_accuracy,
+        COALESCE(MAX(s.end_time), MAX(s.start_time)) AS last_session,
+        SUM(CASE WHEN s.session_status = 'active' THEN 1 ELSE 0 END) AS in_progress_sessions
+FROM TBL_SESSIONS s
+WHERE s.session_status IN ('completed', 'active')
+    AND s.session_mode = 'assessment'
+    AND s.student_nickname IS NOT NULL
+    AND s.student_nickname NOT IN ('', 'Guest')
+GROUP BY s.student_nickname;
+
+-- ============================================================
+-- DEFAULT DATA (same rows as ecolearn_database.sql)
+-- ============================================================
+
+INSERT INTO TBL_ADMIN (username, password_hash, full_name, email, is_active) VALUES
+('admin', '$2y$10$92IXUNpkjO0rOQ5byMi.Ye4oKoEa3Ro9llC/.og/at2.uheWG/igi', 'System Administrator', 'admin@ecolearn.local', 1);
+
+INSERT INTO TBL_CATEGORIES (category_name, category_code, description, bin_color, display_order, is_active) VALUES
+('Compostable', 'COMP', 'Biodegradable organic waste including food scraps, garden waste, and paper products', 'Green', 1, 1),
+('Recyclable', 'RECY', 'Materials that can be processed and reused: plastic bottles, metal cans, glass, clean paper', 'Blue', 2, 1),
+('Non-Recyclable', 'NREC', 'Residual waste that cannot be composted or recycled: contaminated materials, mixed composites', 'Red', 3, 1),
+('Special Waste', 'SPEC', 'Hazardous materials requiring special handling: batteries, electronics, medical waste, chemicals', 'Yellow', 4, 1);
+
+INSERT INTO TBL_SYSTEM_CONFIG (config_key, config_value, value_type, description, is_editable) VALUES
+('orb_feature_count', '1000', 'integer', 'Number of ORB features to extract per image', 1),
+('knn_k_value', '2', 'integer', 'K value for KNN classifier (fixed to 2 for Lowe ratio test)', 0),
+('knn_distance_threshold', '0.65', 'float', 'Lowe ratio test threshold for feature matching', 1),
+('orb_confidence_threshold', '0.65', 'float', 'Minimum confidence for base ORB fallback prediction', 1),
+('orb_incremental_confidence_threshold', '0.85', 'float', 'Minimum confidence for incremental ORB prediction', 1),
+('orb_focus_roi_scale', '0.80', 'float', 'Center crop scale used before ORB inference (0.5 to 1.0)', 1),
+('hybrid_margin', '0.10', 'float', 'Confidence gap required for ORB override in hybrid mode', 1),
+('model_version', 'ORB-KNN-v2.0', 'string', 'Current algorithm version identifier', 0),
+('session_timeout_minutes', '30', 'integer', 'Auto-abandon sessions after N minutes of inactivity', 1),
+('min_confidence_score', '0.60', 'float', 'Minimum confidence to accept a classification', 1),
+('webcam_fps', '30', 'integer', 'Target frames per second for video capture', 1),
+('roi_box_color', '#00FF00', 'string', 'Hex color code for scanning area overlay', 1),
+('enable_audio_feedback', 'true', 'boolean', 'Whether Bin-Bin provides audio responses', 1),
+('pdf_dpi', '300', 'integer', 'Resolution for generating printable Eco-Cards', 0);
+
+INSERT INTO TBL_CARD_ASSETS (category_id, card_name, card_code, image_filename, image_path) VALUES 
+(1, 'Pencil Shavings', 'COMP-001', 'Pencil_Shavings.webp', 'assets/Compostable/Pencil_Shavings.webp'),
+(1, 'Vegetable Scraps', 'COMP-002', 'Vegetable_Scraps.webp', 'assets/Compostable/Vegetable_Scraps.webp'),
+(1, 'Apple Core', 'COMP-003', 'Apple_Core.webp', 'assets/Compostable/Apple_Core.webp'),
+(1, 'Banana Peel', 'COMP-004', 'Banana_Peel.webp', 'assets/Compostable/Banana_Peel.webp'),
+(1, 'Chicken Bone', 'COMP-005', 'Chicken_Bone.webp', 'assets/Compostable/Chicken_Bone.webp'),
+(1, 'Corn Cob', 'COMP-006', 'Corn_Cob.webp', 'assets/Compostable/Corn_Cob.webp'),
+(1, 'Dried Leaves', 'COMP-007', 'Dried_Leaves.webp', 'assets/Compostable/Dried_Leaves.webp'),
+(1, 'Egg Shell', 'COMP-008', 'Egg_Shell.webp', 'assets/Compostable/Egg_Shell.webp'),
+(1, 'Fish Bone', 'COMP-009', 'Fish_Bone.webp', 'assets/Compostable/Fish_Bone.webp'),
+(1, 'Leftover Rice', 'COMP-010', 'Leftover_Rice.webp', 'assets/Compostable/Leftover_Rice.webp'),
+(1, 'Mango Peel', 'COMP-011', 'Mango_Peel.webp', 'assets/Compostable/Mango_Peel.webp'),
+(1, 'Orange Peel', 'COMP-012', 'Orange_Peel.webp', 'assets/Compostable/Orange_Peel.webp');
+
+INSERT INTO TBL_CARD_ASSETS (category_id, card_name, card_code, image_filename, image_path) VALUES 
+(2, 'Glass Bottle', 'RECY-001', 'Glass_Bottle.webp', 'assets/Recyclable/Glass_Bottle.webp'),
+(2, 'Newspaper', 'RECY-002', 'Newspaper.webp', 'assets/Recyclable/Newspaper.webp'),
+(2, 'Plastic Bottle', 'RECY-003', 'Plastic_Bottle.webp', 'assets/Recyclable/Plastic_Bottle.webp'),
+(2, 'Rubbing Alcohol', 'RECY-004', 'Rubbing_Alcohol.webp', 'assets/Recyclable/Rubbing_Alcohol.webp'),
+(2, 'Shampoo Bottle', 'RECY-005', 'Shampoo_Bottle.webp', 'assets/Recyclable/Shampoo_Bottle.webp'),
+(2, 'Tetra Packs', 'RECY-006', 'Tetra_Packs.webp', 'assets/Recyclable/Tetra_Packs.webp'),
+(2, 'Tin Can', 'RECY-007', 'Tin_Can.webp', 'assets/Recyclable/Tin_Can.webp'),
+(2, 'Toilet Paper Roll', 'RECY-008', 'Toilet_Paper_Roll.webp', 'assets/Recyclable/Toilet_Paper_Roll.webp'),
+(2, 'White Paper', 'RECY-009', 'White_Paper.webp', 'assets/Recyclable/White_Paper.webp'),
+(2, 'Aluminum Can', 'RECY-010', 'Aluminum_Can.webp', 'assets/Recyclable/Aluminum_Can.webp'),
+(2, 'Brown Paper Bag', 'RECY-011', 'Brown_Paper_Bag.webp', 'assets/Recyclable/Brown_Paper_Bag.webp'),
+(2, 'Cardboard Box', 'RECY-012', 'Cardboard_Box.webp', 'assets/Recyclable/Cardboard_Box.webp');
+
+INSERT INTO TBL_CARD_ASSETS (category_id, card_name, card_code, image_filename, image_path) VALUES 
+(3, 'Styrofoam Plate', 'NREC-001', 'Styrofoam_Plate.webp', 'assets/Non-Recyclable/Styrofoam_Plate.webp'),
+(3, 'Tissue Paper', 'NREC-002', 'Tissue_Paper.webp', 'assets/Non-Recyclable/Tissue_Paper.webp'),
+(3, '3in1 Coffee Sachet', 'NREC-003', '3in1_Coffee_Sachet.webp', 'assets/Non-Recyclable/3in1_Coffee_Sachet.webp'),
+(3, 'Candy Wrapper', 'NREC-004', 'Candy_Wrapper.webp', 'assets/Non-Recyclable/Candy_Wrapper.webp'),
+(3, 'Chips Wrapper', 'NREC-005', 'Chips_Wrapper.webp', 'assets/Non-Recyclable/Chips_Wrapper.webp'),
+(3, 'Diaper', 'NREC-006', 'Diaper.webp', 'assets/Non-Recyclable/Diaper.webp'),
+(3, 'Plastic Cup', 'NREC-007', 'Plastic_Cup.webp', 'assets/Non-Recyclable/Plastic_Cup.webp'),
+(3, 'Plastic Fork', 'NREC-008', 'Plastic_Fork.webp', 'assets/Non-Recyclable/Plastic_Fork.webp'),
+(3, 'Plastic Labo', 'NREC-009', 'Plastic_Labo.webp', 'assets/Non-Recyclable/Plastic_Labo.webp'),
+(3, 'Plastic Spoon', 'NREC-010', 'Plastic_Spoon.webp', 'assets/Non-Recyclable/Plastic_Spoon.webp'),
+(3, 'Plastic Straw', 'NREC-011', 'Plastic_Straw.webp', 'assets/Non-Recyclable/Plastic_Straw.webp'),
+(3, 'Shampoo Sachet', 'NREC-012', 'Shampoo_Sachet.webp', 'assets/Non-Recyclable/Shampoo_Sachet.webp');
+
+INSERT INTO TBL_CARD_ASSETS (category_id, card_name, card_code, image_filename, image_path) VALUES 
+(4, 'Face Mask', 'SPEC-001', 'Face_Mask.webp', 'assets/Special-Waste/Face_Mask.webp'),
+(4, 'Insecticide Bottle', 'SPEC-002', 'Insecticide_Bottle.webp', 'assets/Special-Waste/Insecticide_Bottle.webp'),
+(4, 'Lightbulb', 'SPEC-003', 'Lightbulb.webp', 'assets/Special-Waste/Lightbulb.webp'),
+(4, 'Medicine Blister Pack', 'SPEC-004', 'Medicine_Blister_Pack.webp', 'assets/Special-Waste/Medicine_Blister_Pack.webp'),
+(4, 'Nail Polish Bottle', 'SPEC-005', 'Nail_Polish_Bottle.webp', 'assets/Special-Waste/Nail_Polish_Bottle.webp'),
+(4, 'Paint Container', 'SPEC-006', 'Paint_Container.webp', 'assets/Special-Waste/Paint_Container.webp'),
+(4, 'Spray Paint Can', 'SPEC-007', 'Spray_Paint_Can.webp', 'assets/Special-Waste/Spray_Paint_Can.webp'),
+(4, 'Battery', 'SPEC-008', 'Battery.webp', 'assets/Special-Waste/Battery.webp'),
+(4, 'Broken Glass', 'SPEC-009', 'Broken_Glass.webp', 'assets/Special-Waste/Broken_Glass.webp'),
+(4, 'Electronic Waste', 'SPEC-010', 'Electronic_Waste.webp', 'assets/Special-Waste/Electronic_Waste.webp');
@@ -0,0 +1,49 @@
+-- ============================================================
+-- MIGRATION 001: Incremental session counters
+-- Replaces the full-recount trg_after_scan_insert with an O(1)
+-- incremental version that the backend's batched scan writer can
+-- defer (@ecolearn_deferred_counters = 1), then recounts existing
+-- sessions once to repair counters double-counted by the old
+-- trigger + application UPDATE.
+-- Usage: mysql -u root ecolearn_db < database/migrations/001_incremental_session_counters.sql
+-- ============================================================
+
+DROP TRIGGER IF EXISTS trg_after_scan_insert;
+
+DELIMITER //
+CREATE TRIGGER trg_after_scan_insert
+AFTER INSERT ON TBL_SCAN_TRANSACTIONS
+FOR EACH ROW
+BEGIN
+    IF COALESCE(@ecolearn_deferred_counters, 0) = 0 THEN
+        UPDATE TBL_SESSIONS
+        SET
+            average_response_time = ROUND(
+                (COALESCE(average_response_time, 0) * total_scans
+                    + COALESCE(NEW.response_time, average_response_time, 0)) / (total_scans + 1), 2),
+            accuracy_percentage = ROUND((correct_scans + NEW.is_correct) * 100 / (total_scans + 1), 2),
+            correct_scans = correct_scans + NEW.is_correct,
+            total_scans = total_scans + 1
+        WHERE session_id = NEW.session_id;
+    END IF;
+END //
+DELIMITER ;
+
+-- One-time recount of every session from its transactions.
+UPDATE TBL_SESSIONS s
+LEFT JOIN (
+    SELECT
+        session_id,
+        COUNT(*) AS total_scans,
+        SUM(is_correct) AS correct_scans,
+        ROUND((SUM(is_correct) / COUNT(*)) * 100, 2) AS accuracy_percentage,
+        ROUND(AVG(response_time), 2) AS average_response_time
+    FROM TBL_SCAN_TRANSACTIONS
+    GROUP BY session_id
+) t ON t.session_id = s.session_id
+SET
+    s.total_scans = COALESCE(t.total_scans, 0),
+    s.correct_scans = COALESCE(t.correct_scans, 0),
+    s.accuracy_percentage = COALESCE(t.accuracy_percentage, 0),
+    s.average_response_time = t.average_response_time
+WHERE s.session_status <> 'admin_preset';
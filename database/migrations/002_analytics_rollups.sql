@@ -0,0 +1,62 @@
+-- ============================================================
+-- MIGRATION 002: Dashboard analytics rollups
+-- Adds TBL_SCAN_DAILY_ROLLUP (day x card x actual/predicted category)
+-- and TBL_STUDENT_ROLLUP (nickname x mode, completed sessions), which
+-- the backend keeps up to date on scan insert and session end, and
+-- backfills both from existing history.
+-- The backend also creates and backfills them on first start, and
+-- `python backend/analytics_rollup.py --rebuild` recomputes them.
+-- Usage: mysql -u root ecolearn_db < database/migrations/002_analytics_rollups.sql
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS TBL_SCAN_DAILY_ROLLUP (
+    rollup_date DATE NOT NULL,
+    card_id INT NOT NULL,
+    actual_category_id INT NOT NULL,
+    predicted_category_id INT NOT NULL,
+    scan_count INT NOT NULL DEFAULT 0,
+    correct_count INT NOT NULL DEFAULT 0,
+    confidence_sum DECIMAL(14,4) NOT NULL DEFAULT 0,
+    confidence_count INT NOT NULL DEFAULT 0,
+    response_time_sum BIGINT NOT NULL DEFAULT 0,
+    response_time_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (rollup_date, card_id, actual_category_id, predicted_category_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Per day x card x category scan aggregates for the dashboard';
+
+CREATE TABLE IF NOT EXISTS TBL_STUDENT_ROLLUP (
+    student_nickname VARCHAR(50) NOT NULL,
+    session_mode VARCHAR(20) NOT NULL,
+    completed_sessions INT NOT NULL DEFAULT 0,
+    total_scans INT NOT NULL DEFAULT 0,
+    correct_scans INT NOT NULL DEFAULT 0,
+    accuracy_sum DECIMAL(12,2) NOT NULL DEFAULT 0 COMMENT 'Sum of session accuracy_percentage (for averages)',
+    best_accuracy DECIMAL(5,2) NULL,
+    last_start_time TIMESTAMP NULL,
+    last_end_time TIMESTAMP NULL,
+    PRIMARY KEY (student_nickname, session_mode)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Per nickname x mode aggregates of completed sessions';
+
+-- Backfill
+DELETE FROM TBL_SCAN_DAILY_ROLLUP;
+INSERT INTO TBL_SCAN_DAILY_ROLLUP
+    (rollup_date, card_id, actual_category_id, predicted_category_id,
+     scan_count, correct_count, confidence_sum, confidence_count,
+     response_time_sum, response_time_count)
+SELECT DATE(scan_timestamp), card_id, actual_category_id, predicted_category_id,
+       COUNT(*), COALESCE(SUM(is_correct), 0),
+       COALESCE(SUM(confidence_score), 0), COUNT(confidence_score),
+       COALESCE(SUM(response_time), 0), COUNT(response_time)
+FROM TBL_SCAN_TRANSACTIONS
+GROUP BY DATE(scan_timestamp), card_id, actual_category_id, predicted_category_id;
+
+DELETE FROM TBL_STUDENT_ROLLUP;
+INSERT INTO TBL_STUDENT_ROLLUP
+    (student_nickname, session_mode, completed_sessions, total_scans, correct_scans,
+     accuracy_sum, best_accuracy, last_start_time, last_end_time)
+SELECT student_nickname, session_mode, COUNT(*),
+       COALESCE(SUM(total_scans), 0), COALESCE(SUM(correct_scans), 0),
+       COALESCE(SUM(accuracy_percentage), 0), MAX(accuracy_percentage),
+       MAX(start_time), MAX(end_time)
+FROM TBL_SESSIONS
+WHERE session_status = 'completed' AND session_mode IS NOT NULL
+GROUP BY student_nickname, session_mode;
@@ -0,0 +1,93 @@
+-- ============================================================
+-- MIGRATION 003: Scan history archive
+-- Adds TBL_SCAN_ARCHIVE (compressed, RANGE-partitioned by month) and
+-- vw_scan_history (live + archived scans), and points the reporting
+-- view and procedures at the full history.
+-- `python backend/scan_archive.py` (also run by the backend at start)
+-- moves scans of closed terms out of TBL_SCAN_TRANSACTIONS; the backend
+-- creates the table and view itself if this migration was not applied.
+-- Usage: mysql -u root ecolearn_db < database/migrations/003_scan_archive.sql
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS TBL_SCAN_ARCHIVE (
+    transaction_id INT NOT NULL,
+    session_id INT NOT NULL,
+    card_id INT NOT NULL,
+    predicted_category_id INT NOT NULL,
+    actual_category_id INT NOT NULL,
+    is_correct TINYINT(1) NOT NULL,
+    confidence_score DECIMAL(5,4),
+    response_time INT,
+    scan_timestamp DATETIME NOT NULL,
+    feedback_given TINYINT(1) DEFAULT 0,
+    PRIMARY KEY (transaction_id, scan_timestamp),
+    INDEX idx_archive_session (session_id),
+    INDEX idx_archive_timestamp (scan_timestamp)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 ROW_FORMAT=COMPRESSED KEY_BLOCK_SIZE=8
+COMMENT='Scan transactions of closed terms (moved by scan_archive.py)'
+PARTITION BY RANGE COLUMNS (scan_timestamp) (
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+CREATE OR REPLACE VIEW vw_scan_history AS
+SELECT transaction_id, session_id, card_id, predicted_category_id, actual_category_id,
+       is_correct, confidence_score, response_time, scan_timestamp, feedback_given
+FROM TBL_SCAN_TRANSACTIONS
+UNION ALL
+SELECT transaction_id, session_id, card_id, predicted_category_id, actual_category_id,
+       is_correct, confidence_score, response_time, scan_timestamp, feedback_given
+FROM TBL_SCAN_ARCHIVE;
+
+CREATE OR REPLACE VIEW vw_card_performance AS
+SELECT 
+    ca.card_id,
+    ca.card_name,
+    c.category_name,
+    COUNT(st.transaction_id) as total_scans,
+    SUM(st.is_correct) as correct_classifications,
+    ROUND((SUM(st.is_correct) / COUNT(*)) * 100, 2) as accuracy_rate,
+    AVG(st.confidence_score) as avg_confidence,
+    AVG(st.response_time) as avg_response_time_ms
+FROM TBL_CARD_ASSETS ca
+LEFT JOIN vw_scan_history st ON ca.card_id = st.card_id
+LEFT JOIN TBL_CATEGORIES c ON ca.category_id = c.category_id
+GROUP BY ca.card_id, ca.card_name, c.category_name;
+
+DROP PROCEDURE IF EXISTS UpdateSessionAccuracy;
+DROP PROCEDURE IF EXISTS GetConfusionMatrix;
+
+DELIMITER //
+CREATE PROCEDURE UpdateSessionAccuracy(IN p_session_id INT)
+BEGIN
+    UPDATE TBL_SESSIONS
+    SET 
+        total_scans = (SELECT COUNT(*) FROM vw_scan_history WHERE session_id = p_session_id),
+        correct_scans = (SELECT COUNT(*) FROM vw_scan_history WHERE session_id = p_session_id AND is_correct = 1),
+        accuracy_percentage = (
+            SELECT ROUND((SUM(is_correct) / COUNT(*)) * 100, 2)
+            FROM vw_scan_history
+            WHERE session_id = p_session_id
+        ),
+        average_response_time = (
+            SELECT ROUND(AVG(response_time), 2)
+            FROM vw_scan_history
+            WHERE session_id = p_session_id
+        )
+    WHERE session_id = p_session_id;
+END //
+
+CREATE PROCEDURE GetConfusionMatrix(IN p_session_id INT)
+BEGIN
+    SELECT 
+        ac.category_name as actual_category,
+        pc.category_name as predicted_category,
+        COUNT(*) as count
+    FROM vw_scan_history st
+    JOIN TBL_CARD_ASSETS ca ON st.card_id = ca.card_id
+    JOIN TBL_CATEGORIES ac ON st.actual_category_id = ac.category_id
+    JOIN TBL_CATEGORIES pc ON st.predicted_category_id = pc.category_id
+    WHERE st.session_id = p_session_id
+    GROUP BY actual_category, predicted_category
+    ORDER BY actual_category, predicted_category;
+END //
+DELIMITER ;
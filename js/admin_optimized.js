@@ -136,7 +136,7 @@ const AppState = {
         
         div.innerHTML = `
             <div class="card-img-container">
-                <img src="/${card.image_path}" alt="${card.card_name}" 
+                <img src="${getCardThumbUrl(card.image_path, 120)}" srcset="${getCardThumbSrcset(card.image_path, 120)}" alt="${card.card_name}" 
                      loading="lazy" decoding="async" fetchpriority="low"
                      width="120" height="100"
                      onerror="this.onerror=null;this.src='/assets/binbin_neutral.png'">
@@ -523,7 +523,7 @@ const OptimizedAdmin = {
                 if (!show) div.style.display = 'none';
                 
                 // Use native lazy loading - browser handles it efficiently
-                div.innerHTML = `<div class="card-img-container"><img src="/${card.image_path}" alt="${card.card_name}" loading="lazy" decoding="async" fetchpriority="low" width="120" height="100" onerror="this.onerror=null;this.src='/assets/binbin_neutral.png'"></div><div class="card-details"><span class="card-title">${card.card_name}</span><span class="card-cat ${getCatClass(card.category_name)}">${getCategoryIcon(card.category_name)} ${card.category_name}</span></div>`;
+                div.innerHTML = `<div class="card-img-container"><img src="${getCardThumbUrl(card.image_path, 120)}" srcset="${getCardThumbSrcset(card.image_path, 120)}" alt="${card.card_name}" loading="lazy" decoding="async" fetchpriority="low" width="120" height="100" onerror="this.onerror=null;this.src='/assets/binbin_neutral.png'"></div><div class="card-details"><span class="card-title">${card.card_name}</span><span class="card-cat ${getCatClass(card.category_name)}">${getCategoryIcon(card.category_name)} ${card.category_name}</span></div>`;
                 
                 fragment.appendChild(div);
             }
@@ -567,7 +567,7 @@ const OptimizedAdmin = {
         cards.forEach(card => {
             const div = document.createElement('div');
             div.className = 'modal-card-item';
-            div.innerHTML = `<img src="/${card.image_path}" alt="${card.card_name}" loading="lazy" decoding="async" onerror="this.onerror=null;this.src='/assets/binbin_neutral.png'"><div class="card-name">${card.card_name}</div><button class="btn-pdf" onclick="event.stopPropagation();generatePDF(${card.card_id},'${card.card_name.replace(/'/g, "\\'")}')">📄 Download</button>`;
+            div.innerHTML = `<img src="${getCardThumbUrl(card.image_path, 120)}" srcset="${getCardThumbSrcset(card.image_path, 120)}" alt="${card.card_name}" loading="lazy" decoding="async" onerror="this.onerror=null;this.src='/assets/binbin_neutral.png'"><div class="card-name">${card.card_name}</div><button class="btn-pdf" onclick="event.stopPropagation();generatePDF(${card.card_id},'${card.card_name.replace(/'/g, "\\'")}')">📄 Download</button>`;
             fragment.appendChild(div);
         });
         
@@ -493,13 +493,14 @@ function renderLogs(logs) {
         else if (conf >= 15) resultBadge = '<span class="badge-worse">Poor</span>';
         else                 resultBadge = '<span class="badge-worst">Very Poor</span>';
         const timeStr = log.time || '—';
-        // Build image thumbnail (image_path is relative to htdocs, e.g. assets/Recyclable/bottle.webp)
+        // Build image thumbnail (image_path is relative to htdocs, e.g. assets/Recyclable/bottle.webp;
+        // the backend serves a 120px derivative, falling back to the full image)
         const imgSrc = log.image_path
-            ? `../${log.image_path}`
+            ? getCardThumbUrl(log.image_path, 120)
             : null;
         const thumbHtml = imgSrc
-            ? `<img src="${imgSrc}" alt="${log.card}" class="log-card-thumb"
-                    onerror="this.style.display='none'">`
+            ? `<img src="${imgSrc}" alt="${log.card}" class="log-card-thumb" loading="lazy"
+                    onerror="this.onerror=null;this.src='../${log.image_path}'">`
             : `<div class="log-card-thumb log-card-thumb--placeholder">📦</div>`;
         return `
         <tr>
@@ -1712,6 +1713,17 @@ function getHighQualityImagePath(imagePath) {
         .replace(/\.webp$/i, '.png');
 }
 
+// Gallery-size card image, resized and cached by the backend (GET /assets/thumb/...?w=).
+// Widths 120/240/480 are rendered; srcset lets HiDPI screens take the 2x size.
+function getCardThumbUrl(imagePath, width) {
+    if (!imagePath || !/^assets\//i.test(imagePath)) return imagePath ? '/' + imagePath : '';
+    return `${API_URL}/assets/thumb/${encodeURI(imagePath.replace(/^assets\//i, ''))}?w=${width}`;
+}
+
+function getCardThumbSrcset(imagePath, width) {
+    return `${getCardThumbUrl(imagePath, width)} 1x, ${getCardThumbUrl(imagePath, width * 2)} 2x`;
+}
+
 // Stub - overridden by admin_optimized.js
 async function loadAssetRepository() {
     // Actual implementation in admin_optimized.js
@@ -2543,7 +2555,142 @@ function sleep(ms) {
     return new Promise(resolve => setTimeout(resolve, ms));
 }
 
+const ORB_RETRAIN_PHASE_LABELS = {
+    dataset: 'Preparing training samples',
+    variants: 'Generating card variants',
+    head: 'Training (warm-up)',
+    finetune: 'Fine-tuning',
+    export: 'Exporting model',
+};
+
+function formatRetrainEta(seconds) {
+    if (typeof seconds !== 'number') return '';
+    if (seconds < 60) return ` · ~${seconds}s left`;
+    return ` · ~${Math.round(seconds / 60)} min left`;
+}
+
+function describeRetrainEvent(name, ev) {
+    const phase = ORB_RETRAIN_PHASE_LABELS[ev.phase] || ev.phase || 'Training';
+    switch (name) {
+        case 'queued':
+            return '⏳ ORB retraining queued...';
+        case 'assets':
+            return ev.ok ? '🖼️ Card images saved. Starting retrain...' : `❌ Saving card images failed: ${ev.error || ''}`;
+        case 'started':
+            return '⏳ ORB retraining started...';
+        case 'phase':
+            return `⏳ ${phase}...`;
+        case 'dataset':
+            return `📦 ${ev.train_samples} training / ${ev.val_samples} validation samples (${ev.classes} classes)`;
+        case 'variants':
+            return `🧪 Variants generated: ${ev.written}`;
+        case 'step':
+        case 'epoch': {
+            const step = (name === 'step' && ev.steps) ? `, step ${ev.step}/${ev.steps}` : '';
+            const loss = (typeof ev.loss === 'number') ? ` · loss ${ev.loss.toFixed(3)}` : '';
+            const acc = (typeof ev.accuracy === 'number') ? ` · acc ${(ev.accuracy * 100).toFixed(1)}%` : '';
+            return `⏳ ${phase} — epoch ${ev.epoch}/${ev.epochs}${step}${loss}${acc}${formatRetrainEta(ev.eta_seconds)}`;
+        }
+        case 'evaluated':
+            return `📊 Validation accuracy ${(ev.val_accuracy * 100).toFixed(1)}%`;
+        case 'exported':
+            return '💾 Model exported';
+        case 'trainer_exit':
+            return ev.exit_code === 0 ? '🔄 Reloading model...' : `❌ Trainer exited with code ${ev.exit_code}`;
+        case 'reload':
+            return ev.ok ? '🔄 Model reloaded' : '❌ Model reload failed';
+        default:
+            return null;
+    }
+}
+
+// Live progress over Server-Sent Events; falls back to polling when the stream is unavailable.
 async function monitorOrbRetrainProgress(resultDiv, shouldReloadOnSuccess = false) {
+    if (typeof EventSource === 'undefined') {
+        return pollOrbRetrainProgress(resultDiv, shouldReloadOnSuccess);
+    }
+
+    const statusId = 'orb-retrain-live-status';
+    let statusEl = document.getElementById(statusId);
+    if (!statusEl) {
+        resultDiv.insertAdjacentHTML('beforeend', `<span id="${statusId}" class="result-subline"></span>`);
+        statusEl = document.getElementById(statusId);
+    }
+
+    const saveState = () => saveAddCardUiState({
+        modalOpen: true,
+        tabId: 'one-shot',
+        resultHtml: resultDiv.innerHTML,
+        resultBackground: resultDiv.style.background,
+        resultColor: resultDiv.style.color,
+    });
+    saveState();
+
+    return new Promise((resolve) => {
+        const source = new EventSource(`${API_URL}/admin/orb-training-events`);
+        let done = false;
+        let failedConnects = 0;
+
+        const finish = (fallBackToPolling) => {
+            if (done) return;
+            done = true;
+            source.close();
+            if (fallBackToPolling) {
+                pollOrbRetrainProgress(resultDiv, shouldReloadOnSuccess).then(resolve);
+            } else {
+                resolve();
+            }
+        };
+
+        const progressEvents = ['queued', 'assets', 'started', 'phase', 'dataset', 'variants',
+            'step', 'epoch', 'evaluated', 'exported', 'trainer_exit', 'reload'];
+        progressEvents.forEach((name) => {
+            source.addEventListener(name, (e) => {
+                failedConnects = 0;
+                const text = describeRetrainEvent(name, JSON.parse(e.data));
+                if (!text) return;
+                resultDiv.style.background = '#FEF3C7';
+                resultDiv.style.color = '#92400E';
+                if (statusEl) statusEl.textContent = text;
+                saveState();
+            });
+        });
+
+        source.addEventListener('finished', (e) => {
+            const ev = JSON.parse(e.data);
+            if (ev.state === 'completed') {
+                resultDiv.style.background = '#DCFCE7';
+                resultDiv.style.color = '#10B981';
+                if (statusEl) statusEl.textContent = '✅ ORB retraining completed. Model updated.';
+                setTimeout(() => {
+                    closeAddCardModal(true);
+                    if (shouldReloadOnSuccess) {
+                        setTimeout(() => smoothReloadPage(), 220);
+                    }
+                }, 1200);
+            } else {
+                resultDiv.style.background = '#FEE2E2';
+                resultDiv.style.color = '#B91C1C';
+                const err = ev.error ? String(ev.error) : 'Unknown training error';
+                if (statusEl) statusEl.textContent = `❌ ORB retraining failed: ${err}`;
+                setAddCardModalLocked(false);
+            }
+            clearAddCardUiState();
+            finish(false);
+        });
+
+        // The server ends idle/long streams and EventSource reconnects on its own;
+        // give up on the stream (busy server, no run in progress) after repeated failures.
+        source.onerror = () => {
+            failedConnects += 1;
+            if (source.readyState === EventSource.CLOSED || failedConnects >= 3) {
+                finish(true);
+            }
+        };
+    });
+}
+
+async function pollOrbRetrainProgress(resultDiv, shouldReloadOnSuccess = false) {
     const maxChecks = 120; // ~6 minutes at 3s interval
     let checks = 0;
 
@@ -2578,7 +2725,11 @@ async function monitorOrbRetrainProgress(resultDiv, shouldReloadOnSuccess = fals
             if (state === 'queued' || state === 'running') {
                 resultDiv.style.background = '#FEF3C7';
                 resultDiv.style.color = '#92400E';
-                if (statusEl) statusEl.textContent = `⏳ ORB retraining ${state}...`;
+                const savingImages = state === 'queued' && data.assets
+                    && (data.assets.state === 'queued' || data.assets.state === 'running');
+                if (statusEl) {
+                    statusEl.textContent = savingImages ? '⏳ Saving card images...' : `⏳ ORB retraining ${state}...`;
+                }
                 saveAddCardUiState({
                     modalOpen: true,
                     tabId: 'one-shot',
@@ -4,6 +4,7 @@
 
 const API_URL = 'http://localhost:5000';
 const RESULTS_REDIRECT_KEY = 'ecolearn_results_redirect';
+const KIOSK_TOKEN_KEY = 'ecolearn_kiosk_token';
 
 // Game State
 let sessionId = null;
@@ -34,6 +35,24 @@ let lastErrorReason = '';
 const SCAN_COOLDOWN_MS = 500;
 const ERROR_FEEDBACK_COOLDOWN_MS = 500;
 const CAMERA_ROI_RATIO = 0.50;
+const STREAM_FRAME_MAX_SIDE = 384;
+const STREAM_FRAME_QUALITY = 0.85;
+const STREAM_FRAME_INTERVAL_MS = 70;
+const LIVE_FRAME_MAX_SIDE = 320;
+const LIVE_FRAME_INTERVAL_MS = 200;
+const LIVE_RECONNECT_BASE_MS = 1000;
+const LIVE_RECONNECT_MAX_MS = 30000;
+
+// Upload profile negotiated with the backend (/health -> capture_profile).
+// Defaults mirror the server so older backends still get small uploads.
+const CAPTURE_PROFILE = {
+    version: 280,
+    max_side: 280,
+    formats: ['image/webp', 'image/jpeg'],
+    quality: 0.8,
+    header: 'X-Capture-Profile',
+    encoding: null
+};
 
 const SYSTEM_CONFIG = {
     orb_feature_count: 1000,
@@ -44,6 +63,9 @@ const SYSTEM_CONFIG = {
     webcam_fps: 30,
     roi_box_color: '#00FF00',
     enable_audio_feedback: true,
+    stream_scan_enabled: false,
+    stream_burst_frames: 4,
+    live_recognition_enabled: false,
     assessment_timer_seconds: 60
 };
 
@@ -176,6 +198,11 @@ async function waitForBackendStartup() {
 
             const response = await fetch(`${API_URL}/health`, { cache: 'no-store' });
             if (response.ok) {
+                try {
+                    applyCaptureProfile((await response.json()).capture_profile);
+                } catch (err) {
+                    // Keep default capture profile.
+                }
                 startupOverlay.classList.add('hidden');
                 return;
             }
@@ -294,6 +321,25 @@ function applyRoiOverlayGeometry() {
     roiBox.style.top = `${offsetPct}%`;
 }
 
+// Kiosk identity - one backend serves many kiosks, each keyed by a
+// token that survives page reloads.
+function getKioskToken() {
+    let token = localStorage.getItem(KIOSK_TOKEN_KEY);
+    if (!token) {
+        token = (window.crypto && typeof window.crypto.randomUUID === 'function')
+            ? window.crypto.randomUUID()
+            : `kiosk-${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 10)}`;
+        localStorage.setItem(KIOSK_TOKEN_KEY, token);
+    }
+    return token;
+}
+
+function kioskHeaders(extra = {}) {
+    const headers = { ...extra, 'X-Kiosk-Token': getKioskToken() };
+    if (sessionId) headers['X-Kiosk-Session'] = String(sessionId);
+    return headers;
+}
+
 // Session persistence - save/restore from localStorage
 function saveSessionToStorage() {
     if (!sessionId) return;
@@ -482,7 +528,7 @@ async function autoEndSessionForInactivity() {
     try {
         const response = await fetch(`${API_URL}/session/end`, {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' }
+            headers: kioskHeaders({ 'Content-Type': 'application/json' })
         });
         const data = await response.json();
 
@@ -694,6 +740,7 @@ async function initCamera() {
         });
         video.srcObject = stream;
         setCameraStatus('Live', false);
+        startLiveRecognition();
     } catch (err) {
         setCameraStatus('Camera unavailable', true);
         alert('Camera access denied. Please allow camera access to use EcoLearn.');
@@ -755,7 +802,7 @@ async function startGame() {
     try {
         const response = await fetch(`${API_URL}/session/start`, {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
+            headers: kioskHeaders({ 'Content-Type': 'application/json' }),
             body: JSON.stringify({
                 nickname: studentNickname,
                 mode: sessionMode
@@ -1133,7 +1180,7 @@ async function forceEndSessionByTimer() {
     try {
         const response = await fetch(`${API_URL}/session/end`, {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' }
+            headers: kioskHeaders({ 'Content-Type': 'application/json' })
         });
         const data = await response.json();
 
@@ -1352,7 +1399,7 @@ async function confirmQuit() {
     try {
         const response = await fetch(`${API_URL}/session/end`, {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' }
+            headers: kioskHeaders({ 'Content-Type': 'application/json' })
         });
         
         const data = await response.json();
@@ -1613,54 +1660,30 @@ async function captureAndIdentify() {
     binbinImg.style.transform = "scale(0.9) rotate(-5deg)";
     binbinImg.src = 'assets/binbin_neutral.png';
     
-    // ============================================
-    // TIGHT ROI: 50% center crop of the frozen frame
-    // This cuts out the surrounding table/background
-    // that was causing white-region false matches.
-    // The dashed ROI box in the UI should visually
-    // match this 50% zone so kids know where to hold
-    // the card.
-    // ============================================
-    const vw = video.videoWidth;
-    const vh = video.videoHeight;
-    const cropW = Math.floor(vw * CAMERA_ROI_RATIO);
-    const cropH = Math.floor(vh * CAMERA_ROI_RATIO);
-    const startX = Math.floor((vw - cropW) / 2);
-    const startY = Math.floor((vh - cropH) / 2);
-    
-    canvas.width = cropW;
-    canvas.height = cropH;
-    const ctx = canvas.getContext('2d');
-    // The webcam element is mirrored in CSS for a natural UX. Canvas capture does NOT
-    // include CSS transforms, so we mirror here to ensure the model sees what the
-    // user sees (and what Teachable Machine's preview typically trains on).
-    ctx.save();
-    ctx.translate(cropW, 0);
-    ctx.scale(-1, 1);
-    ctx.drawImage(video, startX, startY, cropW, cropH, 0, 0, cropW, cropH);
-    ctx.restore();
+    if (SYSTEM_CONFIG.stream_scan_enabled) {
+        await captureAndIdentifyBurst();
+        return;
+    }
+
+    // Resize on canvas so the upload already matches what the recognizer needs.
+    drawRoiFrame(canvas, CAPTURE_PROFILE.max_side);
 
     // Resume live feed AFTER capture so user sees camera unfreeze
     video.play();
     
     canvas.toBlob(async (blob) => {
         const formData = new FormData();
-        formData.append('image', blob, 'scan.jpg');
+        formData.append('image', blob, captureUploadName('scan'));
         
         try {
             const response = await fetch(`${API_URL}/classify`, {
                 method: 'POST',
+                headers: captureProfileHeaders(),
                 body: formData
             });
             
             const data = await response.json();
-            
-            if (sessionMode === 'instructional') {
-                handleInstructionalMode(data);
-            } else {
-                handleAssessmentMode(data);
-            }
-            
+            handleClassificationResult(data);
         } catch (err) {
             showErrorFeedback({ reason: 'connection_error' });
             scheduleScanUnlock(SCAN_COOLDOWN_MS);
@@ -1669,7 +1692,242 @@ async function captureAndIdentify() {
                 scheduleScanUnlock(SCAN_COOLDOWN_MS);
             }
         }
-    }, 'image/jpeg', 0.95);
+    }, getCaptureEncoding(), CAPTURE_PROFILE.quality);
+}
+
+// ============================================
+// TIGHT ROI: 50% center crop of the current frame
+// This cuts out the surrounding table/background
+// that was causing white-region false matches.
+// The dashed ROI box in the UI should visually
+// match this 50% zone so kids know where to hold
+// the card. maxSide > 0 downscales the crop.
+// ============================================
+function drawRoiFrame(targetCanvas, maxSide) {
+    const vw = video.videoWidth;
+    const vh = video.videoHeight;
+    const cropW = Math.floor(vw * CAMERA_ROI_RATIO);
+    const cropH = Math.floor(vh * CAMERA_ROI_RATIO);
+    const startX = Math.floor((vw - cropW) / 2);
+    const startY = Math.floor((vh - cropH) / 2);
+
+    const scale = maxSide > 0 ? Math.min(1, maxSide / Math.max(cropW, cropH)) : 1;
+    const outW = Math.max(1, Math.round(cropW * scale));
+    const outH = Math.max(1, Math.round(cropH * scale));
+
+    targetCanvas.width = outW;
+    targetCanvas.height = outH;
+    const ctx = targetCanvas.getContext('2d');
+    // The webcam element is mirrored in CSS for a natural UX. Canvas capture does NOT
+    // include CSS transforms, so we mirror here to ensure the model sees what the
+    // user sees (and what Teachable Machine's preview typically trains on).
+    ctx.save();
+    ctx.translate(outW, 0);
+    ctx.scale(-1, 1);
+    ctx.drawImage(video, startX, startY, cropW, cropH, 0, 0, outW, outH);
+    ctx.restore();
+}
+
+function applyCaptureProfile(profile) {
+    if (profile && typeof profile === 'object') {
+        ['version', 'max_side', 'formats', 'quality', 'header'].forEach(function(key) {
+            if (profile[key] !== undefined && profile[key] !== null) CAPTURE_PROFILE[key] = profile[key];
+        });
+    }
+    CAPTURE_PROFILE.encoding = null;
+}
+
+// The server no longer accepts our profile version (settings changed): re-negotiate.
+let captureProfileRefresh = null;
+function refreshCaptureProfile() {
+    if (captureProfileRefresh) return captureProfileRefresh;
+    captureProfileRefresh = fetch(`${API_URL}/capture-profile`, { cache: 'no-store' })
+        .then(function(response) { return response.ok ? response.json() : null; })
+        .then(function(data) { if (data && data.profile) applyCaptureProfile(data.profile); })
+        .catch(function() { /* Keep the current profile until the next scan. */ })
+        .finally(function() { captureProfileRefresh = null; });
+    return captureProfileRefresh;
+}
+
+// First advertised format this browser's canvas can actually encode.
+function getCaptureEncoding() {
+    if (CAPTURE_PROFILE.encoding) return CAPTURE_PROFILE.encoding;
+
+    const probe = document.createElement('canvas');
+    probe.width = probe.height = 1;
+    const formats = Array.isArray(CAPTURE_PROFILE.formats) ? CAPTURE_PROFILE.formats : [];
+    CAPTURE_PROFILE.encoding = formats.find(function(type) {
+        return probe.toDataURL(type).indexOf('data:' + type) === 0;
+    }) || 'image/jpeg';
+    return CAPTURE_PROFILE.encoding;
+}
+
+function captureUploadName(prefix) {
+    return prefix + (getCaptureEncoding() === 'image/webp' ? '.webp' : '.jpg');
+}
+
+function captureProfileHeaders() {
+    const headers = kioskHeaders();
+    headers[CAPTURE_PROFILE.header || 'X-Capture-Profile'] = String(CAPTURE_PROFILE.version);
+    return headers;
+}
+
+// ============================================
+// LIVE RECOGNITION CHANNEL: small frames pushed
+// over a WebSocket while the camera is idle. The
+// server keeps only the newest frame, so results
+// track what the camera sees now. A recognized
+// card lights up the ROI corners ("ready to scan").
+// ============================================
+let liveChannel = null;
+let liveFrameTimer = null;
+let liveReconnectTimer = null;
+let liveReconnectDelayMs = LIVE_RECONNECT_BASE_MS;
+
+function startLiveRecognition() {
+    if (liveChannel || !SYSTEM_CONFIG.live_recognition_enabled || !('WebSocket' in window)) return;
+
+    let socket;
+    try {
+        socket = new WebSocket(API_URL.replace(/^http/, 'ws') + '/ws/classify');
+    } catch (err) {
+        scheduleLiveReconnect();
+        return;
+    }
+    liveChannel = socket;
+    const frameCanvas = document.createElement('canvas');
+
+    socket.onopen = function() {
+        liveReconnectDelayMs = LIVE_RECONNECT_BASE_MS;
+        liveFrameTimer = setInterval(async function() {
+            if (socket.readyState !== WebSocket.OPEN) return;
+            if (isScanning || video.paused || !video.videoWidth || gameScreen.classList.contains('hidden')) return;
+            // Previous frame still on the wire: skip instead of queueing stale frames.
+            if (socket.bufferedAmount > 0) return;
+
+            drawRoiFrame(frameCanvas, Math.min(LIVE_FRAME_MAX_SIDE, CAPTURE_PROFILE.max_side || LIVE_FRAME_MAX_SIDE));
+            const blob = await canvasToBlob(frameCanvas, getCaptureEncoding(), 0.7);
+            if (blob && socket.readyState === WebSocket.OPEN) socket.send(blob);
+        }, LIVE_FRAME_INTERVAL_MS);
+    };
+
+    socket.onmessage = function(event) {
+        try {
+            const data = JSON.parse(event.data);
+            setRoiReady(data.status === 'success');
+        } catch (err) {
+            // Ignore malformed preview messages.
+        }
+    };
+
+    // Network blip or worker restart: come back with backoff. A close requested by
+    // stopLiveRecognition() has already cleared liveChannel and stays closed.
+    socket.onclose = function() {
+        if (liveChannel !== socket) return;
+        stopLiveRecognition();
+        scheduleLiveReconnect();
+    };
+}
+
+function scheduleLiveReconnect() {
+    if (liveReconnectTimer) return;
+    const delay = liveReconnectDelayMs;
+    liveReconnectDelayMs = Math.min(LIVE_RECONNECT_MAX_MS, liveReconnectDelayMs * 2);
+    liveReconnectTimer = setTimeout(function() {
+        liveReconnectTimer = null;
+        // Scanner view closed: keep waiting instead of streaming from an idle screen.
+        if (gameScreen.classList.contains('hidden')) {
+            scheduleLiveReconnect();
+            return;
+        }
+        startLiveRecognition();
+    }, delay);
+}
+
+function stopLiveRecognition() {
+    if (liveReconnectTimer) {
+        clearTimeout(liveReconnectTimer);
+        liveReconnectTimer = null;
+    }
+    if (liveFrameTimer) {
+        clearInterval(liveFrameTimer);
+        liveFrameTimer = null;
+    }
+    if (liveChannel) {
+        const socket = liveChannel;
+        liveChannel = null;
+        if (socket.readyState === WebSocket.OPEN || socket.readyState === WebSocket.CONNECTING) {
+            socket.close();
+        }
+    }
+    setRoiReady(false);
+}
+
+function setRoiReady(ready) {
+    document.querySelectorAll('.roi-corner').forEach(el => el.classList.toggle('roi-ready', !!ready));
+}
+
+function canvasToBlob(sourceCanvas, type, quality) {
+    return new Promise((resolve) => sourceCanvas.toBlob(resolve, type, quality));
+}
+
+// ============================================
+// STREAMING SCAN: the frozen frame plus a short
+// burst of small live frames. The server fuses one
+// CNN pass per frame and stops once it is confident,
+// so real viewpoint diversity replaces synthetic passes.
+// ============================================
+async function captureAndIdentifyBurst() {
+    const frameCount = Math.max(2, Math.min(8, parseInt(SYSTEM_CONFIG.stream_burst_frames, 10) || 4));
+    const frameMaxSide = Math.min(STREAM_FRAME_MAX_SIDE, CAPTURE_PROFILE.max_side || STREAM_FRAME_MAX_SIDE);
+    const encoding = getCaptureEncoding();
+    const blobs = [];
+
+    try {
+        const frameCanvas = document.createElement('canvas');
+        drawRoiFrame(frameCanvas, frameMaxSide);
+        blobs.push(await canvasToBlob(frameCanvas, encoding, STREAM_FRAME_QUALITY));
+
+        // Resume live feed AFTER the press frame so the rest of the burst sees motion.
+        video.play();
+
+        for (let i = 1; i < frameCount; i++) {
+            await new Promise((resolve) => setTimeout(resolve, STREAM_FRAME_INTERVAL_MS));
+            drawRoiFrame(frameCanvas, frameMaxSide);
+            blobs.push(await canvasToBlob(frameCanvas, encoding, STREAM_FRAME_QUALITY));
+        }
+
+        const formData = new FormData();
+        blobs.forEach((blob, idx) => {
+            if (blob) formData.append('frames', blob, captureUploadName(`frame_${idx}`));
+        });
+
+        const response = await fetch(`${API_URL}/classify/stream`, {
+            method: 'POST',
+            headers: captureProfileHeaders(),
+            body: formData
+        });
+
+        const data = await response.json();
+        handleClassificationResult(data);
+    } catch (err) {
+        video.play();
+        showErrorFeedback({ reason: 'connection_error' });
+        scheduleScanUnlock(SCAN_COOLDOWN_MS);
+    } finally {
+        if (sessionMode === 'instructional') {
+            scheduleScanUnlock(SCAN_COOLDOWN_MS);
+        }
+    }
+}
+
+function handleClassificationResult(data) {
+    if (data && data.capture_profile_stale) refreshCaptureProfile();
+    if (sessionMode === 'instructional') {
+        handleInstructionalMode(data);
+    } else {
+        handleAssessmentMode(data);
+    }
 }
 
 function handleInstructionalMode(data) {
@@ -1941,7 +2199,7 @@ async function selectAssessmentChoice(selectedCategory) {
     try {
         const response = await fetch(`${API_URL}/assessment/submit`, {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
+            headers: kioskHeaders({ 'Content-Type': 'application/json' }),
             body: JSON.stringify({
                 selected_category: selectedCategory,
                 correct_category: correctCategory,
@@ -2390,24 +2648,15 @@ function speak(text) {
 
     const assessmentSpeechRate = sessionMode === 'assessment' ? 1.35 : 1.1;
     
-    fetch(API_URL + '/tts', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ text: text, lang: 'tl' })
-    })
+    // GET returns raw MP3 from the server's phrase cache; the browser's HTTP cache
+    // (strong ETag) makes repeated feedback play without any round-trip.
+    fetch(API_URL + '/tts?lang=tl&text=' + encodeURIComponent(text))
     .then(response => {
         if (!response.ok) throw new Error('TTS failed');
-        return response.json();
+        return response.blob();
     })
-    .then(data => {
-        if (!data.audio) throw new Error('No audio data');
-        // Decode base64 to audio blob
-        const byteChars = atob(data.audio);
-        const byteArray = new Uint8Array(byteChars.length);
-        for (let i = 0; i < byteChars.length; i++) {
-            byteArray[i] = byteChars.charCodeAt(i);
-        }
-        const blob = new Blob([byteArray], { type: 'audio/mpeg' });
+    .then(blob => {
+        if (!blob.size) throw new Error('No audio data');
         const audioUrl = URL.createObjectURL(blob);
         currentTTSAudio = new Audio(audioUrl);
         currentTTSAudio.volume = 0.8;